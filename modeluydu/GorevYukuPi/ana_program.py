@@ -19,11 +19,13 @@ if FORCE_SIMULATION:
     os.environ['IS_RASPBERRY_PI'] = '0'  # Platform tespitini zorla override et
 
 # Proje modüllerini içeri aktar (Türkçe isimlerle güncellendi)
-from moduller.yapilandirma import TELEMETRI_GONDERIM_SIKLIGI, SERIAL_PORT_XBEE, SERIAL_BAUD_XBEE, IS_RASPBERRY_PI
+from moduller.yapilandirma import TELEMETRI_GONDERIM_SIKLIGI, SERIAL_PORT_XBEE, SERIAL_BAUD_XBEE, IS_RASPBERRY_PI, VIDEO_PARCALAMA
+from moduller.yapilandirma import KOMUT_ONBELLEK_BOYUTU, KOMUT_ONBELLEK_SURESI, KANAL_OZETI_SURESI
 
 from moduller.sensorler import SensorManager
 # from moduller.haberlesme import Communication  # DEPRECATED - BirlesikXBeeAlici kullanılıyor
 from moduller.telemetri_isleyici import TelemetryHandler
+from moduller.telemetri_kodlayici import xbee_satiri
 from moduller.aktuatorler import AktuatorYoneticisi
 # from moduller.kamera import KameraYoneticisi
 from moduller.kamera_basit import BasitKameraYoneticisi as KameraYoneticisi
@@ -33,6 +35,9 @@ from moduller.sd_kayitci import SDKayitci
 # from moduller.iot_xbee_alici import IoTXBeeAlici
 from moduller.birlesik_xbee_alici import BirlesikXBeeAlici  # 🔥 TEK XBee modülü
 from moduller.guc_yoneticisi import GucYoneticisi
+from moduller.mesaj_dagitici import MesajDagitici
+from moduller.komut_zarfi import TekrarsizKomutIsleyici, SONUC_TAMAM, SONUC_HATA, SONUC_BILINMEYEN
+from moduller.paket_halkasi import RESEND_ONEKI, yeniden_gonderim_isleyicisi
 
 # Global değişkenler ve olaylar
 stop_event = threading.Event()
@@ -62,104 +67,128 @@ def shutdown_callback():
     
     print("✅ Güvenli kapanma tamamlandı")
 
+def _komut_manuel_ayrilma(command):
+    """Manuel ayrılma komutu (Gereksinim 21)"""
+    print("🚨 MANUEL AYRILMA KOMUTU ALINDI!")
+    
+    # Ayrılma komutunu XBee üzerinden gönder
+    if birlesik_xbee:
+        try:
+            birlesik_xbee.send_telemetry("AYIRMA_KOMUTU")
+            print("✅ Ayrılma komutu taşıyıcıya gönderildi")
+        except Exception as e:
+            print(f"❌ Ayrılma komutu gönderilemedi: {e}")
+    
+    # Buzzer ile ses uyarısı
+    if aktuator_yoneticisi:
+        aktuator_yoneticisi.buzzer_kontrol(True)
+        time.sleep(2)  # 2 saniye buzzer
+        aktuator_yoneticisi.buzzer_kontrol(False)
+    return SONUC_TAMAM
+
+def _komut_kalibrasyon(command):
+    """
+    🔧 KALİBRASYON KOMUTLARI (Yer istasyonu kalibrasyon komutları için)
+    (sonuç, eski_yanit) döndürür: eski yanıtı (GYRO_CALIB_OK vb.) zarfsız
+    komutlar için komut_isleyici gönderir, zarflı komutlara yalnızca ACK gider
+    """
+    if "CALIB_GYRO:RESET" in command:
+        print("🔄 Gyro kalibrasyon komutu alındı...")
+        # IMU yöneticisi sensor_yonetici içinde bulunur
+        if sensor_yonetici and hasattr(sensor_yonetici, 'imu_yoneticisi'):
+            try:
+                # Mevcut gyro kalibrasyonunu yeniden başlat
+                sensor_yonetici.imu_yoneticisi._calibrate_gyro()
+                print("✅ Gyro kalibrasyonu yeniden başlatıldı")
+                return SONUC_TAMAM, "GYRO_CALIB_OK"
+            except Exception as e:
+                print(f"❌ Gyro kalibrasyon hatası: {e}")
+                return SONUC_HATA, "GYRO_CALIB_ERROR"
+        else:
+            print("❌ IMU yöneticisi bulunamadı")
+        return SONUC_HATA
+            
+    elif "CALIB_PRESSURE" in command:
+        print("🔧 Basınç kalibrasyon komutu alındı...")
+        try:
+            # Komut formatı: #CALIB_PRESSURE:911.75:850#
+            parts = command.replace("#", "").split(":")
+            if len(parts) >= 3:
+                deniz_seviyesi_basinc = float(parts[1])
+                rakim = int(parts[2])
+                
+                print(f"📊 Yeni basınç kalibrasyonu: {deniz_seviyesi_basinc} hPa, Rakım: {rakim}m")
+                
+                # yapilandirma.py değerlerini güncelle (runtime)
+                import GorevYukuPi.moduller.yapilandirma as config
+                config._cached_basinc = deniz_seviyesi_basinc
+                
+                print("✅ Basınç kalibrasyonu güncellendi")
+                return SONUC_TAMAM, f"PRESSURE_CALIB_OK:{deniz_seviyesi_basinc}"
+            else:
+                print("❌ Geçersiz basınç kalibrasyon formatı")
+        except Exception as e:
+            print(f"❌ Basınç kalibrasyon hatası: {e}")
+            return SONUC_HATA, "PRESSURE_CALIB_ERROR"
+        return SONUC_HATA
+    else:
+        print(f"⚠️ Bilinmeyen kalibrasyon komutu: {command}")
+        return SONUC_BILINMEYEN
+
+def _komut_motor(command):
+    """🔧 MOTOR KONTROL KOMUTLARI (Yer istasyonu motor komutları için) - DEVRE DIŞI"""
+    print(f"🚫 Motor kontrol komutu devre dışı: {command}")
+    print("⚠️ Spektral filtreleme şu anda devre dışı - servo kontrolü kapalı")
+    return "DEVRE_DISI"
+
+def _komut_filtre(command):
+    """Multi-spektral filtreleme komutları (Gereksinim 35) - DEVRE DIŞI"""
+    if "M1:" in command or "M2:" in command:
+        return _komut_motor(command)
+    
+    # Komut formatı: !6R7G! (4 haneli: Rakam-Harf-Rakam-Harf)
+    komut_ici = command[1:-1]  # ! işaretlerini kaldır
+    
+    print(f"🚫 Multi-spektral filtreleme komutu devre dışı: {komut_ici}")
+    print("⚠️ Spektral filtreleme şu anda devre dışı - servo kontrolü kapalı")
+    return "DEVRE_DISI"
+
+# Komut tablosu: modüller komut_dagitici.kaydet(...) ile kendi komutlarını ekleyebilir
+komut_dagitici = MesajDagitici()
+komut_dagitici.kaydet("!MANUAL_SEPARATION!", _komut_manuel_ayrilma, tam=True)
+komut_dagitici.kaydet("!xT!", _komut_manuel_ayrilma, tam=True)
+komut_dagitici.kaydet("#CALIB_", _komut_kalibrasyon)
+komut_dagitici.kaydet("!M1:", _komut_motor)
+komut_dagitici.kaydet("!M2:", _komut_motor)
+komut_dagitici.kaydet("!", _komut_filtre, sonek="!")
+
+def _komut_yurut(command):
+    """Komutu tablodaki işleyicisine verir; işleyicinin sonucunu döndürür"""
+    isleyici = komut_dagitici.isleyici_bul(command)
+    if isleyici is None:
+        komut_dagitici.eslesmeyen += 1
+        print(f"⚠️ Bilinmeyen komut: {command}")
+        return SONUC_BILINMEYEN
+    komut_dagitici.dagitilan += 1
+    return isleyici(command)
+
+# Zarflı komutlar (@<id>:<komut>) kimlik başına bir kez çalışır; onay
+# göndericisi XBee başlatıldığında main() içinde bağlanır
+komut_isleyici = TekrarsizKomutIsleyici(_komut_yurut, kapasite=KOMUT_ONBELLEK_BOYUTU,
+                                        sure=KOMUT_ONBELLEK_SURESI)
+
 def komut_isle(command):
     """
     Yer istasyonundan gelen komutları işler
     Requirements.md Gereksinim 21: Manuel ayrılma komutu
     Requirements.md Gereksinim 35: Multi-spektral filtreleme komutları
+    Zarflı komutlar tekrar gelirse yeniden çalıştırılmaz, ACK önbellekten döner
     """
-    global aktuator_yoneticisi, birlesik_xbee, sensor_yonetici
-    
     try:
         print(f"📻 Komut alındı: {command}")
-        
-        # Manuel ayrılma komutu (Gereksinim 21)
-        if command == "!MANUAL_SEPARATION!" or command == "!xT!":
-            print("🚨 MANUEL AYRILMA KOMUTU ALINDI!")
-            
-            # Ayrılma komutunu XBee üzerinden gönder
-            if birlesik_xbee:
-                try:
-                    birlesik_xbee.send_telemetry("AYIRMA_KOMUTU")
-                    print("✅ Ayrılma komutu taşıyıcıya gönderildi")
-                except Exception as e:
-                    print(f"❌ Ayrılma komutu gönderilemedi: {e}")
-            
-            # Buzzer ile ses uyarısı
-            if aktuator_yoneticisi:
-                aktuator_yoneticisi.buzzer_kontrol(True)
-                time.sleep(2)  # 2 saniye buzzer
-                aktuator_yoneticisi.buzzer_kontrol(False)
-            
-            return
-        
-        # 🔧 KALİBRASYON KOMUTLARI (Yer istasyonu kalibrasyon komutları için)
-        if command.startswith("#CALIB_"):
-            if "CALIB_GYRO:RESET" in command:
-                print("🔄 Gyro kalibrasyon komutu alındı...")
-                # IMU yöneticisi sensor_yonetici içinde bulunur
-                if sensor_yonetici and hasattr(sensor_yonetici, 'imu_yoneticisi'):
-                    try:
-                        # Mevcut gyro kalibrasyonunu yeniden başlat
-                        sensor_yonetici.imu_yoneticisi._calibrate_gyro()
-                        print("✅ Gyro kalibrasyonu yeniden başlatıldı")
-                        
-                        # Yer istasyonuna onay gönder
-                        if birlesik_xbee:
-                            birlesik_xbee.send_telemetry("GYRO_CALIB_OK")
-                    except Exception as e:
-                        print(f"❌ Gyro kalibrasyon hatası: {e}")
-                        if birlesik_xbee:
-                            birlesik_xbee.send_telemetry("GYRO_CALIB_ERROR")
-                else:
-                    print("❌ IMU yöneticisi bulunamadı")
-                    
-            elif "CALIB_PRESSURE" in command:
-                print("🔧 Basınç kalibrasyon komutu alındı...")
-                try:
-                    # Komut formatı: #CALIB_PRESSURE:911.75:850#
-                    parts = command.replace("#", "").split(":")
-                    if len(parts) >= 3:
-                        deniz_seviyesi_basinc = float(parts[1])
-                        rakim = int(parts[2])
-                        
-                        print(f"📊 Yeni basınç kalibrasyonu: {deniz_seviyesi_basinc} hPa, Rakım: {rakim}m")
-                        
-                        # yapilandirma.py değerlerini güncelle (runtime)
-                        import GorevYukuPi.moduller.yapilandirma as config
-                        config._cached_basinc = deniz_seviyesi_basinc
-                        
-                        # Yer istasyonuna onay gönder
-                        if birlesik_xbee:
-                            birlesik_xbee.send_telemetry(f"PRESSURE_CALIB_OK:{deniz_seviyesi_basinc}")
-                        
-                        print("✅ Basınç kalibrasyonu güncellendi")
-                    else:
-                        print("❌ Geçersiz basınç kalibrasyon formatı")
-                except Exception as e:
-                    print(f"❌ Basınç kalibrasyon hatası: {e}")
-                    if birlesik_xbee:
-                        birlesik_xbee.send_telemetry("PRESSURE_CALIB_ERROR")
-            else:
-                print(f"⚠️ Bilinmeyen kalibrasyon komutu: {command}")
-            
-            return
-        
-        # 🔧 MOTOR KONTROL KOMUTLARI (Yer istasyonu motor komutları için) - DEVRE DIŞI
-        if command.startswith("!M1:") or command.startswith("!M2:") or (command.startswith("!") and ("M1:" in command or "M2:" in command)):
-            print(f"🚫 Motor kontrol komutu devre dışı: {command}")
-            print("⚠️ Spektral filtreleme şu anda devre dışı - servo kontrolü kapalı")
-            return
-        
-        # Multi-spektral filtreleme komutları (Gereksinim 35) - DEVRE DIŞI
-        if command.startswith("!") and command.endswith("!"):
-            # Komut formatı: !6R7G! (4 haneli: Rakam-Harf-Rakam-Harf)
-            komut_ici = command[1:-1]  # ! işaretlerini kaldır
-            
-            print(f"🚫 Multi-spektral filtreleme komutu devre dışı: {komut_ici}")
-            print("⚠️ Spektral filtreleme şu anda devre dışı - servo kontrolü kapalı")
-            return
-        
+        sonuc = komut_isleyici.isle(command)
+        if sonuc is None:
+            print(f"🔁 Tekrarlanan komut hâlâ çalışıyor, atlandı: {command}")
     except Exception as e:
         print(f"❌ Komut işleme hatası: {e}")
 
@@ -213,7 +242,7 @@ def telemetry_sending_worker(
                 emergency_data = f"286570,{telemetri_counter},T+{telemetri_counter:03d}:00:00,{sensor_verisi.get('basinc', 0)},25.0,0.0,0.0,0.0,0.0,0.0,7.4,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,286570"
                 telemetri_paketi_dict = {
                     'ham_veri': emergency_data,
-                    'xbee_paketi': f"${emergency_data}*00"
+                    'xbee_paketi': xbee_satiri(emergency_data)
                 }
                 print(f"  🆘 EMERGENCY telemetri paketi oluşturuldu")
             
@@ -228,9 +257,13 @@ def telemetry_sending_worker(
                     with open(f"emergency_{telemetri_counter}.csv", "w") as f:
                         f.write(ham_veri + '\n')
                 
-                # 4. XBee'ye gönder (HIZLI)
+                # 4. XBee'ye gönder (HIZLI) - binary downlink seçiliyse binary paket
                 try:
-                    haberlesme_yoneticisi.send_telemetry(telemetri_paketi_dict['xbee_paketi'])
+                    binary_paket = telemetri_paketi_dict.get('binary_paket')
+                    if binary_paket is not None and hasattr(haberlesme_yoneticisi, 'send_binary'):
+                        haberlesme_yoneticisi.send_binary(binary_paket)
+                    else:
+                        haberlesme_yoneticisi.send_telemetry(telemetri_paketi_dict['xbee_paketi'])
                 except:
                     pass  # Sessiz hata - SD zaten kaydedildi
                 
@@ -271,8 +304,8 @@ def telemetry_sending_worker(
             except Exception as actuator_error:
                 print(f"  ⚠️ Aktüatör kontrol hatası: {actuator_error}")
 
-            # 6. Sleep (1 Hz için optimize)
-            time.sleep(TELEMETRI_GONDERIM_SIKLIGI)
+            # 6. Sleep (1 Hz; link tahmini telemetriyi bile taşıyamıyorsa uzar)
+            time.sleep(getattr(haberlesme_yoneticisi, 'telemetri_araligi', TELEMETRI_GONDERIM_SIKLIGI))
             
         except Exception as e:
             consecutive_errors += 1
@@ -422,6 +455,8 @@ def main():
                     def send_telemetry(self, telemetri_data):
                         print(f"📡 SİMÜLASYON: Telemetri gönderildi (XBee yok): {telemetri_data[:50]}...")
                         return True
+                    def yeniden_gonder(self, paketler):
+                        print(f"📡 SİMÜLASYON: {len(paketler)} geçmiş paket yeniden gönderildi (XBee yok)")
                     def start_listening(self):
                         pass
                     def stop_listening(self):
@@ -438,6 +473,7 @@ def main():
             )
             birlesik_xbee.connect_xbee()
             birlesik_xbee.start_listening()
+        komut_isleyici.onay_gonder = birlesik_xbee.send_telemetry
         
         # 🔧 KRİTİK MODÜL 3: Sensör Yöneticisi
         try:
@@ -455,6 +491,9 @@ def main():
         # 🔧 KRİTİK MODÜL 4: Telemetri İşleyici
         try:
             telemetri_isleyici = TelemetryHandler(saha_alici=birlesik_xbee)
+            # Eksik paket isteği: #RESEND:<ilk>-<son>#
+            komut_dagitici.kaydet(RESEND_ONEKI, yeniden_gonderim_isleyicisi(
+                telemetri_isleyici.paket_halkasi, birlesik_xbee.yeniden_gonder))
             print("✅ Telemetri İşleyici başlatıldı (SAHA entegrasyonu aktif)")
         except Exception as e:
             print(f"❌ FATALh HATA: Telemetri İşleyici başlatılamadı: {e}")
@@ -537,11 +576,19 @@ def main():
                 import threading
                 def video_streaming_wrapper():
                     try:
-                        kamera_yonetici.baslat_canli_yayin(haberlesme_yoneticisi.send_telemetry)
+                        if VIDEO_PARCALAMA and hasattr(haberlesme_yoneticisi, 'send_video'):
+                            # CRC'li parçalar: tek parça kaybı yalnızca o kareyi kaybettirir
+                            kamera_yonetici.baslat_canli_yayin(haberlesme_yoneticisi.send_video, ham_kare=True)
+                        else:
+                            kamera_yonetici.baslat_canli_yayin(haberlesme_yoneticisi.send_telemetry)
                         print("✅ Canlı video yayını başlatıldı")
                     except Exception as ve:
                         print(f"❌ Video streaming thread hatası: {ve}")
                 
+                # Ölçülen link kapasitesine göre FPS / kare boyutu
+                if hasattr(haberlesme_yoneticisi, 'link_tahmincisi'):
+                    haberlesme_yoneticisi.link_tahmincisi.abone_ol(kamera_yonetici.link_tahmini_guncelle)
+                
                 video_thread = threading.Thread(target=video_streaming_wrapper, daemon=True)
                 video_thread.start()
                 print("📹 Video streaming thread başlatıldı")
@@ -625,6 +672,32 @@ def main():
                     uptime = int(current_time - program_start_time)
                     print(f"✅ Sistem çalışıyor: {len(active_threads)}/{len([t for t in threads if t is not None])} thread aktif")
                     print(f"📊 Çalışma süresi: {uptime} saniye ({uptime//60}:{uptime%60:02d})")
+                    
+                    # XBee link metrikleri: uçuş sonrası link yükü analizi için SD'ye
+                    if birlesik_xbee:
+                        try:
+                            link_metrikleri = birlesik_xbee.get_link_metrikleri()
+                            print(f"📡 XBee link: RX {link_metrikleri['rx_bayt_s']} B/s, "
+                                  f"TX {link_metrikleri['tx_bayt_s']} B/s, "
+                                  f"checksum hatası {link_metrikleri.get('checksum_hatasi', 0)}")
+                            tahmin = link_metrikleri.get('link_tahmini', {}).get('son')
+                            if tahmin:
+                                print(f"📊 Link tahmini: kapasite {tahmin['kapasite_bps']} B/s, "
+                                      f"goodput {tahmin['goodput_bps']} B/s, video {tahmin['video_fps']} FPS "
+                                      f"x %{tahmin['video_boyut_orani'] * 100:.0f}")
+                            if sd_kayitci:
+                                sd_kayitci.kaydet_metrik(link_metrikleri)
+                        except Exception as metrik_error:
+                            print(f"⚠️ XBee metrik kayıt hatası: {metrik_error}")
+                    
+                    # Kanal geçmişi özeti: son 30 s ortalama/min/max/eğim SD'ye
+                    if sd_kayitci and telemetri_isleyici and telemetri_isleyici.kanal_gecmisi is not None:
+                        try:
+                            ozet = telemetri_isleyici.kanal_gecmisi.ozet(sure=KANAL_OZETI_SURESI)
+                            if ozet:
+                                sd_kayitci.kaydet_metrik({'tur': 'kanal_ozeti', 'zaman': time.time(), **ozet})
+                        except Exception as ozet_error:
+                            print(f"⚠️ Kanal özeti kayıt hatası: {ozet_error}")
                     last_status_time = current_time
                 
                 # 5 saniye bekle ve tekrar kontrol et
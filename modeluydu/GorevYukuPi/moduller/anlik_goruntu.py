@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Anlık Görüntü Modülü
+
+XBee üzerinden gelen SAHA (BASINÇ2) ve IoT sıcaklık verilerinin değişmez
+(immutable), sürümlü görüntüsü. Yazıcı (XBee okuyucu thread'i) her
+güncellemede yeni bir görüntü oluşturup tek bir referans atamasıyla
+yayınlar; okuyucular (sensör, telemetri, durum) kilit almadan tek bir
+görüntü okur ve tüm alanları tutarlı görür.
+
+Zaman damgaları time.time() (epoch, saniye) cinsindendir; 0 hiç veri
+gelmediği anlamına gelir.
+"""
+
+import time
+from collections import namedtuple
+
+BASINC2_TAZELIK_SURESI = 10.0  # s - bu süreden eski BASINÇ2 geçersiz sayılır
+IOT_TAZELIK_SURESI = 30.0      # s - bu süreden eski IoT verisi geçersiz sayılır
+
+
+class XBeeAnlikGoruntu(namedtuple('XBeeAnlikGoruntu', [
+        'surum',              # Her güncellemede 1 artar
+        'basinc2',            # Pa (taşıyıcı tam sayı Pascal gönderir)
+        'basinc2_zamani',
+        'iot1_sicaklik',      # °C
+        'iot1_zamani',
+        'iot2_sicaklik',      # °C
+        'iot2_zamani',
+        'guncelleme_zamani'   # Görüntünün yayınlandığı an
+])):
+    """
+    Değişmez veri görüntüsü. Yeni görüntü guncelle() ile türetilir; mevcut
+    görüntü hiçbir zaman yerinde değiştirilmez.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def bos(cls):
+        """Hiç veri alınmamış başlangıç görüntüsü"""
+        return cls(0, 0.0, 0, 0.0, 0, 0.0, 0, 0)
+
+    def guncelle(self, **alanlar):
+        """Verilen alanlarla yeni sürüm görüntü döndürür"""
+        return self._replace(surum=self.surum + 1, guncelleme_zamani=time.time(), **alanlar)
+
+    def basinc2_taze(self, simdi: float = None) -> bool:
+        """Son BASINÇ2_TAZELIK_SURESI içinde BASINÇ2 geldi mi?"""
+        if not self.basinc2_zamani:
+            return False
+        simdi = time.time() if simdi is None else simdi
+        return (simdi - self.basinc2_zamani) < BASINC2_TAZELIK_SURESI
+
+    def basinc2_degeri(self, simdi: float = None) -> float:
+        """Taze ise BASINÇ2 (Pa), değilse 0.0"""
+        return self.basinc2 if self.basinc2_taze(simdi) else 0.0
+
+    def iot_taze(self, istasyon_id: int, simdi: float = None) -> bool:
+        """Son IOT_TAZELIK_SURESI içinde istasyondan veri geldi mi?"""
+        if istasyon_id == 1:
+            zaman = self.iot1_zamani
+        elif istasyon_id == 2:
+            zaman = self.iot2_zamani
+        else:
+            return False
+        if not zaman:
+            return False
+        simdi = time.time() if simdi is None else simdi
+        return (simdi - zaman) < IOT_TAZELIK_SURESI
+
+    def iot_sicakligi(self, istasyon_id: int, simdi: float = None) -> float:
+        """Taze ise istasyon sıcaklığı (°C), değilse 0.0"""
+        if not self.iot_taze(istasyon_id, simdi):
+            return 0.0
+        return self.iot1_sicaklik if istasyon_id == 1 else self.iot2_sicaklik
+
+    def iot_sicakliklari(self, simdi: float = None):
+        """(IoT1, IoT2) sıcaklıkları - aynı görüntüden, tutarlı"""
+        simdi = time.time() if simdi is None else simdi
+        return (self.iot_sicakligi(1, simdi), self.iot_sicakligi(2, simdi))
+
+    def tazelik(self, simdi: float = None) -> dict:
+        """Her kaynağın yaşı (s); hiç veri gelmediyse None"""
+        simdi = time.time() if simdi is None else simdi
+        return {
+            'basinc2': simdi - self.basinc2_zamani if self.basinc2_zamani else None,
+            'iot1': simdi - self.iot1_zamani if self.iot1_zamani else None,
+            'iot2': simdi - self.iot2_zamani if self.iot2_zamani else None
+        }
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import threading
+
+    # Yazıcı: tek referans ataması ile yayın. Okuyucular: kilitsiz okuma
+    # ve tutarlılık kontrolü (iot1 ve iot2 her güncellemede aynı değeri alır).
+    durum = {'goruntu': XBeeAnlikGoruntu.bos()}
+    dur = threading.Event()
+    tutarsiz = [0]
+    okuma = [0]
+
+    def yazici():
+        i = 0
+        while not dur.is_set():
+            i += 1
+            simdi = time.time()
+            durum['goruntu'] = durum['goruntu'].guncelle(
+                basinc2=90000.0 + i, basinc2_zamani=simdi,
+                iot1_sicaklik=float(i), iot1_zamani=simdi,
+                iot2_sicaklik=float(i), iot2_zamani=simdi)
+
+    def okuyucu():
+        while not dur.is_set():
+            g = durum['goruntu']
+            if g.iot1_sicaklik != g.iot2_sicaklik or (g.surum and g.basinc2 != 90000.0 + g.iot1_sicaklik):
+                tutarsiz[0] += 1
+            okuma[0] += 1
+
+    threadler = [threading.Thread(target=yazici)] + [threading.Thread(target=okuyucu) for _ in range(3)]
+    for t in threadler:
+        t.start()
+    time.sleep(1.0)
+    dur.set()
+    for t in threadler:
+        t.join()
+
+    son = durum['goruntu']
+    print(f"📸 Sürüm: {son.surum}, okuma: {okuma[0]}, tutarsız okuma: {tutarsiz[0]}")
+    print(f"   BASINÇ2 taze: {son.basinc2_taze()}, IoT: {son.iot_sicakliklari()}")
+    print(f"   Tazelik: {son.tazelik()}")
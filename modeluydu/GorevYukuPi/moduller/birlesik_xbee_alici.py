@@ -16,10 +16,40 @@ import logging
 import struct
 import base64
 import json
-from moduller.yapilandirma import SERIAL_PORT_XBEE, SERIAL_BAUD_XBEE, XBEE_PAN_ID, IS_RASPBERRY_PI
+import os
+import select
+from collections import deque
+from moduller.yapilandirma import (
+    SERIAL_PORT_XBEE, SERIAL_BAUD_XBEE, XBEE_PAN_ID, IS_RASPBERRY_PI,
+    XBEE_OKUMA_MODU, XBEE_OKUMA_ZAMAN_ASIMI, XBEE_GIRIS_CIKIS_MODU, XBEE_API_MODU,
+    XBEE_YAKALAMA_KLASORU, VIDEO_FEC_PARITE_ORANI, TELEMETRI_GONDERIM_SIKLIGI,
+    TELEMETRI_DEPOSU_DOSYASI, TELEMETRI_DEPOSU_KAPASITESI, TELEMETRI_DEPOSU_BOSALTMA_HIZI,
+    TELEMETRI_DEPOSU_KUYRUK_ESIGI, TELEMETRI_DEPOSU_MIN_TESLIM
+)
+from moduller.xbee_api import (
+    GelenAkisAyristirici, RxCercevesi, TxDurumCercevesi, ATYanitCercevesi, tek_cerceve_coz
+)
+from moduller.xbee_link import XBeeLink
+from moduller.tx_zamanlayici import (
+    TxZamanlayici, ONCELIK_TELEMETRI, ONCELIK_ONAY, ONCELIK_GECMIS, ONCELIK_VIDEO, TX_YAZMA_DENEMESI
+)
+from moduller.xbee_teslim import TeslimTakipcisi
+from moduller.mesaj_dagitici import MesajDagitici
+from moduller.anlik_goruntu import XBeeAnlikGoruntu
+from moduller.xbee_metrikleri import XBeeMetrikleri
+from moduller.link_tahmincisi import LinkKapasiteTahmincisi
+from moduller.telemetri_deposu import TelemetriDeposu
+from moduller.xbee_yakalama import YakalamaKaydedici
+from moduller.video_parcalama import VideoParcalayici
+from moduller.iot_paketi import iot_paketi_coz, iot_checksum, IOT_PAKET_BOYUTU, IOT_ISTASYONLARI
+
+MAX_BINARY_BUFFER_SIZE = 8192  # API frame çözücü tampon sınırı
+MAX_TEXT_BUFFER_SIZE = 4096  # Metin buffer boyut sınırı (DoS koruması)
+KOMUT_GECIKME_GECMISI = 200  # Saklanan son komut gecikmesi ölçümü
 
 class BirlesikXBeeAlici:
-    def __init__(self, command_callback=None, debug=True, simulate=not IS_RASPBERRY_PI):
+    def __init__(self, command_callback=None, debug=True, simulate=not IS_RASPBERRY_PI,
+                 port=None, baud=None, api_modu=None):
         """
         Birleşik XBee alıcı başlatma
         
@@ -27,9 +57,12 @@ class BirlesikXBeeAlici:
             command_callback: Komut geldiğinde çağrılacak fonksiyon
             debug: Debug modu aktif/pasif
             simulate: Simülasyon modu
+            port: Seri port (varsayılan SERIAL_PORT_XBEE; ör. emülatör PTY'si)
+            baud: Baud hızı (varsayılan SERIAL_BAUD_XBEE)
+            api_modu: Gönderim için API modu (varsayılan XBEE_API_MODU)
         """
-        self.xbee_port = SERIAL_PORT_XBEE
-        self.baud_rate = SERIAL_BAUD_XBEE
+        self.xbee_port = port or SERIAL_PORT_XBEE
+        self.baud_rate = baud or SERIAL_BAUD_XBEE
         self.debug = debug
         # Eğer Raspberry Pi ise simülasyonu zorla False yap
         self.simulate = False if IS_RASPBERRY_PI else simulate
@@ -39,19 +72,70 @@ class BirlesikXBeeAlici:
         self.xbee_serial = None
         self.is_connected = False
         
-        # Thread safety için lock
+        # G/Ç modu: "thread" (okuma thread'i + kilitli senkron yazma) veya
+        # "asyncio" (XBeeLink: tüm okuma/yazma tek olay döngüsünde)
+        self.giris_cikis_modu = XBEE_GIRIS_CIKIS_MODU
+        self.link = None
+        self._yazma_kilidi = threading.Lock()  # Thread modunda yazmaları serileştirir
+        
+        # TX zamanlayıcı: telemetri > onay > geçmiş > video, baud'dan hesaplanan hava
+        # süresi bütçesi (her iki G/Ç modunda da tüm gönderimler buradan geçer)
+        self.tx_zamanlayici = TxZamanlayici(baud=self.baud_rate)
+        self.tx_thread = None
+        
+        # Canlı yayın kareleri: parçalar zamanlayıcı dilimleriyle hizalı
+        self.video_parcalayici = VideoParcalayici(self.tx_zamanlayici.parca_boyutu,
+                                                  VIDEO_FEC_PARITE_ORANI)
+        
+        # API modu gönderimi: 0x10 Transmit Request + 0x8B teslim takibi
+        self.api_modu = XBEE_API_MODU if api_modu is None else api_modu
+        self.teslim_takipcisi = TeslimTakipcisi(self.tx_zamanlayici) if self.api_modu else None
+        self._video_kredisi = 1.0
+        self.yavaslatilan_video = 0  # Teslim hatası nedeniyle gönderilmeyen video karesi
+        
+        # Link kesintisinde telemetri kaybolmasın: dosya destekli store-and-forward
+        self.telemetri_deposu = TelemetriDeposu(
+            TELEMETRI_DEPOSU_DOSYASI, TELEMETRI_DEPOSU_KAPASITESI, TELEMETRI_DEPOSU_BOSALTMA_HIZI
+        )
+        if self.teslim_takipcisi:
+            self.teslim_takipcisi.vazgecildi = self._depola
+        
+        # Paylaşılan veriler: değişmez görüntü, her güncellemede tek referans
+        # atamasıyla değiştirilir. Okuyucular kilit almaz; kilit yalnızca
+        # yazıcılar arasında (oku-değiştir-yaz) sıralama içindir.
         self._data_lock = threading.Lock()
+        self._goruntu = XBeeAnlikGoruntu.bos()
         
-        # Paylaşılan veriler (thread-safe erişim gerekli)
-        self.basinc2_veri = {
-            'value': 0.0,
-            'son_guncelleme': 0
-        }
+        # Gelen akış ayrıştırıcı: API frame çözücü + transparent mod satır
+        # tamponu (okumalar arası durum tutar)
+        self.ayristirici = GelenAkisAyristirici(
+            kapasite=MAX_BINARY_BUFFER_SIZE, maks_metin_tamponu=MAX_TEXT_BUFFER_SIZE
+        )
+        self.api_cozucu = self.ayristirici.api_cozucu
         
-        self.iot_verileri = {
-            1: {'sicaklik': 0.0, 'son_guncelleme': 0},
-            2: {'sicaklik': 0.0, 'son_guncelleme': 0}
-        }
+        # Link katmanı sayaçları (get_link_metrikleri ile okunur)
+        self.metrikler = XBeeMetrikleri(self.ayristirici)
+        
+        # Ölçülen link kapasitesi: kameralar abone olup FPS/kare boyutunu,
+        # telemetri thread'i telemetri_araligi'ni buna göre ayarlar
+        self.link_tahmincisi = LinkKapasiteTahmincisi(
+            self.tx_zamanlayici, self.metrikler, self.teslim_takipcisi, rx_birikimi=self._rx_birikimi
+        )
+        self.telemetri_araligi = TELEMETRI_GONDERIM_SIKLIGI
+        self.link_tahmincisi.abone_ol(self._link_tahmini_uygula)
+        
+        # Ham akış yakalama (XBEE_YAKALAMA_KLASORU verilirse start_listening'de açılır)
+        self.yakalama = None
+        
+        # Okuma modu: "select" (olay tabanlı) veya "poll" (eski 100 ms döngü)
+        self.okuma_modu = XBEE_OKUMA_MODU
+        
+        # Komut gecikmesi ölçümü: byte'ların görüldüğü an → command_callback
+        self._okuma_referansi = time.monotonic()
+        self._komut_gecikmeleri = deque(maxlen=KOMUT_GECIKME_GECMISI)
+        
+        # Gelen mesaj dağıtıcı (önek/ilk byte tablosu)
+        self._dagitici_kur()
         
         # Threading kontrol
         self.running = False
@@ -112,8 +196,31 @@ class BirlesikXBeeAlici:
         
         try:
             self.running = True
+            if XBEE_YAKALAMA_KLASORU and not self.simulate and self.yakalama is None:
+                self.yakalama_baslat(XBEE_YAKALAMA_KLASORU)
+            if self.giris_cikis_modu == "asyncio" and not self.simulate:
+                self.link = XBeeLink(
+                    self.xbee_serial,
+                    mesaj_callback=self._link_mesaji,
+                    ayristirici=self.ayristirici,
+                    zamanlayici=self.tx_zamanlayici,
+                    metrikler=self.metrikler,
+                    yakalama=self.yakalama,
+                    yazilamadi=self._yazilamadi
+                )
+                if not self.link.baslat():
+                    self.logger.error("XBee link olay döngüsü başlatılamadı")
+                    self.link = None
+                    self.running = False
+                    return False
+                self.logger.info("✅ Birleşik XBee asyncio link başlatıldı")
+                return True
+            
             self.receive_thread = threading.Thread(target=self._listen_xbee_data, daemon=True)
             self.receive_thread.start()
+            if not self.simulate:
+                self.tx_thread = threading.Thread(target=self._tx_dongusu, daemon=True)
+                self.tx_thread.start()
             self.logger.info("✅ Birleşik XBee veri dinleyicisi başlatıldı")
             return True
         except Exception as e:
@@ -124,24 +231,83 @@ class BirlesikXBeeAlici:
         """Veri dinlemeyi durdur"""
         try:
             self.running = False
+            if self.link:
+                self.link.durdur()
+                self.link = None
             if self.receive_thread and self.receive_thread.is_alive():
                 # 🔧 Thread timeout artırıldı (Analiz4.txt düzeltmesi)
                 self.receive_thread.join(timeout=8.0)  # 2s → 8s
+            if self.tx_thread and self.tx_thread.is_alive():
+                self.tx_zamanlayici.uyandir()
+                self.tx_thread.join(timeout=2.0)
             
             if self.xbee_serial and self.xbee_serial.is_open:
                 self.xbee_serial.close()
             
+            self.telemetri_deposu.kapat()
+            
+            if self.yakalama:
+                self.yakalama.kapat()
+                self.logger.info(f"XBee yakalama kapatıldı: {self.yakalama.kayit_sayisi} kayıt, "
+                                 f"{self.yakalama.bayt_sayisi} byte")
+                self.yakalama = None
+            
             self.logger.info("Birleşik XBee veri dinleyicisi durduruldu")
         except Exception as e:
             self.logger.error(f"XBee dinleyici durdurma hatası: {e}")
     
+    def yakalama_baslat(self, klasor: str):
+        """Okunan her parçayı zaman damgasıyla yakalama dosyasına yazmaya başla"""
+        dosya_yolu = os.path.join(klasor, f"xbee_yakalama_{time.strftime('%Y%m%d_%H%M%S')}.xbk")
+        try:
+            self.yakalama = YakalamaKaydedici(dosya_yolu)
+            self.logger.info(f"📼 XBee ham akış yakalama: {dosya_yolu}")
+        except OSError as e:
+            self.logger.error(f"XBee yakalama dosyası açılamadı: {e}")
+            self.yakalama = None
+    
+    def _tx_dongusu(self):
+        """Thread modu TX yazıcısı: zamanlayıcının verdiği parçaları sırayla yazar"""
+        hata_sayisi = 0
+        while self.running:
+            parca, bekleme, biten = self.tx_zamanlayici.al()
+            if parca is None:
+                # Kuyruk boşsa yeni veri gelene kadar, değilse jeton dolana kadar bekle
+                if bekleme is None:
+                    self.tx_zamanlayici.bekle(1.0)
+                else:
+                    time.sleep(bekleme)
+                continue
+            try:
+                with self._yazma_kilidi:
+                    self.xbee_serial.write(parca)
+                self.metrikler.tx(len(parca))
+            except Exception as e:
+                self.logger.error(f"XBee yazma hatası: {e}")
+                hata_sayisi += 1
+                if hata_sayisi < TX_YAZMA_DENEMESI:
+                    # Parça kaybolmasın: aynı parça bir sonraki turda yeniden yazılır
+                    self.tx_zamanlayici.geri_al()
+                else:
+                    hata_sayisi = 0
+                    self._yazilamadi(self.tx_zamanlayici.vazgec(e))
+                time.sleep(0.1)
+                continue
+            hata_sayisi = 0
+            if biten is not None:
+                self.tx_zamanlayici.tamamlandi(biten)
+    
+    def _yazilamadi(self, oge):
+        """Yazma denemeleri tükenen zamanlayıcı öğesini telemetri deposuna verir"""
+        if oge is None:
+            return
+        if self.teslim_takipcisi and oge.etiket is not None:
+            # API modu: yazılmış frame'lerin sonucu artık yeniden gönderim/vazgeçme doğurmaz
+            self.teslim_takipcisi.birak(oge.etiket)
+        self._depola(bytes(oge.veri), oge.oncelik)
+    
     def _listen_xbee_data(self):
         """XBee'den gelen verileri dinleyen ana döngü"""
-        buffer = ""
-        binary_buffer = bytearray()  # API frame'ler için binary buffer
-        MAX_BUFFER_SIZE = 4096  # Buffer boyut sınırı (DoS koruması)
-        MAX_BINARY_BUFFER_SIZE = 8192  # Binary buffer sınırı
-        
         while self.running:
             try:
                 if self.simulate:
@@ -150,7 +316,7 @@ class BirlesikXBeeAlici:
                     
                     # Test BASINÇ2
                     if time.time() % 10 < 5:
-                        self._process_message("SAHA:BASINC2:1012.45")
+                        self._process_message("SAHA:BASINC2:101245")
                     
                     # Test IoT (varyasyonlu veriler)
                     import random
@@ -160,296 +326,283 @@ class BirlesikXBeeAlici:
                     self._process_message(f"IOT:2:{temp2:.1f}")
                     continue
                 
-                if self.xbee_serial and self.xbee_serial.in_waiting > 0:
-                    data = self.xbee_serial.read(self.xbee_serial.in_waiting)
-                    
-                    if self.debug and data:
-                        print(f"🔍 DEBUG: XBee'den ham veri alındı: {len(data)} bytes")
-                        # İlk birkaç byte'a bak
-                        if len(data) > 0:
-                            if data[0] == 0x7E:
-                                print(f"🔍 DEBUG: API frame tespit edildi (0x7E ile başlıyor)")
-                            else:
-                                try:
-                                    print(f"🔍 DEBUG: Text veri: {data.decode('utf-8', errors='ignore')[:100]}")
-                                except:
-                                    print(f"🔍 DEBUG: Binary veri: {data.hex()[:100]}")
-                    
-                    # Binary buffer'a ekle (API frame kontrolü için)
-                    binary_buffer.extend(data)
-                    if len(binary_buffer) > MAX_BINARY_BUFFER_SIZE:
-                        binary_buffer = binary_buffer[-MAX_BINARY_BUFFER_SIZE//2:]
-                        self.logger.warning("Binary buffer overflow koruması")
-                    
-                    # API frame kontrolü
-                    self._process_binary_buffer(binary_buffer)
-                    
-                    # Text buffer işleme (transparent mode için)
-                    try:
-                        decoded_data = data.decode('utf-8', errors='ignore')
-                        buffer += decoded_data
-                        if len(buffer) > MAX_BUFFER_SIZE:
-                            buffer = buffer[-MAX_BUFFER_SIZE//2:]
-                            self.logger.warning("Text buffer overflow koruması")
-                        
-                        # Satır sonu karakterine göre mesajları ayır
-                        lines = buffer.split('\n')
-                        buffer = lines[-1]  # Son tamamlanmamış satırı sakla
-                        
-                        # Tamamlanmış satırları işle
-                        for line in lines[:-1]:
-                            line = line.strip()
-                            if line:
-                                if self.debug:
-                                    print(f"🔍 DEBUG: Text satır işleniyor: '{line}'")
-                                self._process_message(line)
-                    except Exception as e:
-                        if self.debug:
-                            print(f"🔍 DEBUG: Text decode hatası: {e}")
+                if not self.xbee_serial:
+                    time.sleep(1)
+                    continue
                 
-                time.sleep(0.1)
+                data = self._veri_bekle()
+                if data:
+                    if self.yakalama:
+                        self.yakalama.yaz(data, self._okuma_referansi)
+                    self._isle_ham_veri(data)
                 
             except UnicodeDecodeError as e:
+                self.metrikler.hata('decode')
                 self.logger.warning(f"XBee veri decode hatası: {e}")
-                buffer = ""  # Buffer'ı temizle
+                self.ayristirici.metin_tamponunu_temizle()  # Buffer'ı temizle
                 time.sleep(0.5)
             except serial.SerialException as e:
+                self.metrikler.hata('seri_port')
                 self.logger.error(f"XBee seri port hatası: {e}")
                 time.sleep(1)
             except Exception as e:
+                self.metrikler.hata('dinleme')
                 self.logger.error(f"XBee veri dinleme hatası: {e}")
                 time.sleep(1)
     
+    def _veri_bekle(self) -> bytes:
+        """
+        Seri porttan veri gelmesini bekler ve gelen byte'ları döndürür.
+        
+        "select" modunda thread seri portun fd'si üzerinde uyur ve byte
+        geldiği anda uyanır (komut gecikmesi ~ms). fd desteklenmiyorsa
+        (Windows) read(1) + port timeout'u ile VTIME benzeri bekleme yapılır.
+        "poll" modu eski davranıştır: in_waiting kontrolü + 100 ms uyku.
+        Her iki durumda da zaman aşımı, running bayrağının kontrol
+        edilebilmesi için XBEE_OKUMA_ZAMAN_ASIMI ile sınırlıdır.
+        """
+        port = self.xbee_serial
+        
+        if self.okuma_modu == "poll":
+            # Veri bu uyku sırasında herhangi bir anda gelmiş olabilir:
+            # gecikme referansı uykunun başlangıcıdır (üst sınır)
+            bekleme_baslangici = time.monotonic()
+            if port.in_waiting > 0:
+                self._okuma_referansi = bekleme_baslangici
+                return port.read(port.in_waiting)
+            time.sleep(0.1)
+            if port.in_waiting > 0:
+                self._okuma_referansi = bekleme_baslangici
+                return port.read(port.in_waiting)
+            return b""
+        
+        fd = self._seri_fd()
+        if fd is not None:
+            hazir, _, _ = select.select([fd], [], [], XBEE_OKUMA_ZAMAN_ASIMI)
+            if not hazir:
+                return b""
+            self._okuma_referansi = time.monotonic()
+            return port.read(port.in_waiting or 1)
+        
+        # fd yok: ilk byte'ı port timeout'u ile bekle, kalanı hemen oku
+        ilk = port.read(1)
+        if not ilk:
+            return b""
+        self._okuma_referansi = time.monotonic()
+        kalan = port.in_waiting
+        return ilk + port.read(kalan) if kalan else ilk
+    
+    def _seri_fd(self):
+        """Seri portun dosya tanımlayıcısı (select desteklenmiyorsa None)"""
+        try:
+            return self.xbee_serial.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+    
+    def _isle_ham_veri(self, data: bytes):
+        """Seri porttan okunan bir parçayı API ve metin ayrıştırıcılarına ver"""
+        self.metrikler.rx(len(data))
+        if self.debug and data:
+            print(f"🔍 DEBUG: XBee'den ham veri alındı: {len(data)} bytes")
+            # İlk birkaç byte'a bak
+            if data[0] == 0x7E:
+                print(f"🔍 DEBUG: API frame tespit edildi (0x7E ile başlıyor)")
+            else:
+                try:
+                    print(f"🔍 DEBUG: Text veri: {data.decode('utf-8', errors='ignore')[:100]}")
+                except:
+                    print(f"🔍 DEBUG: Binary veri: {data.hex()[:100]}")
+        
+        tasma_oncesi = (self.ayristirici.api_cozucu.tasma_sayisi,
+                        self.ayristirici.metin_tasma_sayisi)
+        for mesaj in self.ayristirici.besle(data):
+            self._isle_gelen_mesaj(mesaj)
+        if self.ayristirici.api_cozucu.tasma_sayisi != tasma_oncesi[0]:
+            self.logger.warning("Binary buffer overflow koruması")
+        if self.ayristirici.metin_tasma_sayisi != tasma_oncesi[1]:
+            self.logger.warning("Text buffer overflow koruması")
+    
+    def _link_mesaji(self, mesaj):
+        """XBeeLink geri çağrısı (asyncio döngü thread'inde çalışır)"""
+        self._okuma_referansi = time.monotonic()
+        self._isle_gelen_mesaj(mesaj)
+    
+    def _isle_gelen_mesaj(self, mesaj):
+        """Ayrıştırıcıdan çıkan tek mesajı (API frame veya metin satırı) işle"""
+        if isinstance(mesaj, str):
+            self.metrikler.cerceve('metin')
+            if self.debug:
+                print(f"🔍 DEBUG: Text satır işleniyor: '{mesaj}'")
+            self._process_message(mesaj)
+        else:
+            self.metrikler.cerceve(f"0x{mesaj.TIP:02X}")
+            self._process_api_frame(mesaj)
+    
+    def _dagitici_kur(self):
+        """Gelen mesaj işleyicilerini kaydet (diğer modüller self.dagitici'ye ekleyebilir)"""
+        self.dagitici = MesajDagitici()
+        # Binary: ilk byte ile
+        self.dagitici.kaydet_bayt(0x7E, self._isle_api_bayt)
+        for istasyon_id in IOT_ISTASYONLARI:
+            self.dagitici.kaydet_bayt(istasyon_id, self._process_binary_message,
+                                      kontrol=self._is_binary_packet)
+        # Metin: önek ile
+        self.dagitici.kaydet("SAHA:BASINC2:", self._isle_saha_basinc)
+        self.dagitici.kaydet("IOT:", self._isle_iot_metin)
+        self.dagitici.kaydet("!", self._isle_komut, sonek="!")
+        self.dagitici.kaydet("#CALIB_", self._isle_komut, sonek="#")
+        self.dagitici.kaydet("#RESEND:", self._isle_komut, sonek="#")
+        self.dagitici.kaydet("@", self._isle_komut)  # Zarflı komut: @<id>:<komut>
+    
     def _process_message(self, message):
-        """Gelen mesajı işle"""
+        """Gelen mesajı işle (binary → metin dönüşümü tek geçişte, özyineleme yok)"""
         try:
-            if isinstance(message, bytes):
-                # XBee API frame kontrolü (0x7E ile başlar)
-                if len(message) > 0 and message[0] == 0x7E:
-                    if self.debug:
-                        print(f"🔍 DEBUG: XBee API frame tespit edildi: {len(message)} bytes")
-                    self._process_api_frame(message)
-                    return
-                # Binary veri (IoT)
-                elif self._is_binary_packet(message):
-                    self._process_binary_message(message)
-                    return
-                else:
-                    # Binary'yi string'e çevirmeyi dene
-                    try:
-                        decoded = message.decode('utf-8', errors='ignore').strip()
-                        if decoded:
-                            if self.debug:
-                                print(f"🔍 DEBUG: Binary string'e çevrildi: '{decoded}'")
-                            self._process_message(decoded)  # Recursive call with string
-                        return
-                    except:
-                        if self.debug:
-                            print(f"🔍 DEBUG: Binary veri decode edilemedi: {message.hex()}")
-                        return
-            
-            # String mesaj işleme
-            if isinstance(message, str):
-                message = message.strip()
+            if isinstance(message, (bytes, bytearray)):
                 if not message:
                     return
-            
-            # SAHA basınç verisi: "SAHA:BASINC2:1012.45"
-            if message.startswith("SAHA:BASINC2:"):
-                try:
-                    basinc2_deger = float(message.split(":")[2])
-                
-                    # Thread-safe veri güncellemesi
-                    with self._data_lock:
-                        self.basinc2_veri = {
-                            'value': basinc2_deger,
-                            'son_guncelleme': time.time()
-                        }
-                
-                    if self.debug:
-                        print(f"📡 SAHA BASINÇ2 alındı: {basinc2_deger} hPa")
-                except (IndexError, ValueError) as e:
-                    self.logger.error(f"SAHA:BASINC2 parse hatası: {e}")
-            
-            # IoT string verisi: "IOT:1:25.3"
-            elif message.startswith("IOT:"):
-                try:
-                    parts = message.split(":")
-                    if len(parts) >= 3:
-                        istasyon_id = int(parts[1])
-                        sicaklik = float(parts[2])
-                        
-                        if istasyon_id in [1, 2]:
-                            # Thread-safe veri güncellemesi
-                            with self._data_lock:
-                                self.iot_verileri[istasyon_id] = {
-                                    'sicaklik': sicaklik,
-                                    'son_guncelleme': time.time()
-                                }
-                            
-                            if self.debug:
-                                print(f"📡 IoT{istasyon_id} sıcaklık alındı: {sicaklik}°C")
-                except (IndexError, ValueError) as e:
-                    self.logger.error(f"IoT string parse hatası: {e}")
-            
-            # Komut mesajları
-            elif message.startswith("!") and message.endswith("!"):
+                isleyici = self.dagitici.isleyici_bul(message)
+                if isleyici is not None:
+                    isleyici(message)
+                    return
+                # Binary işleyicisi yoksa metin olarak dene
+                message = message.decode('utf-8', errors='ignore')
                 if self.debug:
-                    print(f"🔍 DEBUG: XBee'den komut alındı: {message}")
-                if self.command_callback:
-                    self.command_callback(message)
-                else:
-                    print("⚠️ UYARI: command_callback tanımlanmamış!")
+                    print(f"🔍 DEBUG: Binary string'e çevrildi: '{message.strip()}'")
+            
+            message = message.strip()
+            if message:
+                self.dagitici.dagit(message)
             
         except Exception as e:
             self.logger.error(f"Mesaj işleme hatası: {e}")
     
-    def _process_api_frame(self, frame_data: bytes):
-        """XBee API frame'ini işle"""
+    def _isle_api_bayt(self, message: bytes):
+        """0x7E ile başlayan tek parça XBee API frame'i"""
+        if self.debug:
+            print(f"🔍 DEBUG: XBee API frame tespit edildi: {len(message)} bytes")
+        cerceve = tek_cerceve_coz(message)
+        if cerceve is not None:
+            self._process_api_frame(cerceve)
+        elif self.debug:
+            print("🔍 DEBUG: Geçersiz/eksik API frame")
+    
+    def _isle_saha_basinc(self, message: str):
+        """SAHA basınç verisi (Pa), ör. SAHA:BASINC2:90123"""
         try:
-            if len(frame_data) < 4:
-                if self.debug:
-                    print("🔍 DEBUG: API frame çok kısa")
-                return
-            
-            # API frame yapısı: 0x7E | Length MSB | Length LSB | Frame Data | Checksum
-            if frame_data[0] != 0x7E:
-                if self.debug:
-                    print("🔍 DEBUG: Geçersiz API frame başlangıcı")
-                return
-            
-            # Frame uzunluğu
-            length = (frame_data[1] << 8) | frame_data[2]
+            basinc2_deger = float(message.split(":")[2])
+        
+            self._goruntu_guncelle(basinc2=basinc2_deger, basinc2_zamani=time.time())
+            self.metrikler.varis_kaydet('saha')
+        
             if self.debug:
-                print(f"🔍 DEBUG: API frame uzunluğu: {length}")
-            
-            if len(frame_data) < length + 4:
-                if self.debug:
-                    print("🔍 DEBUG: API frame eksik")
-                return
-            
-            # Frame tipi
-            frame_type = frame_data[3]
+                print(f"📡 SAHA BASINÇ2 alındı: {basinc2_deger} Pa")
+        except (IndexError, ValueError) as e:
+            self.logger.error(f"SAHA:BASINC2 parse hatası: {e}")
+    
+    def _isle_iot_metin(self, message: str):
+        """IoT string verisi, ör. IOT:1:25.3"""
+        try:
+            parts = message.split(":")
+            if len(parts) >= 3:
+                istasyon_id = int(parts[1])
+                sicaklik = float(parts[2])
+                
+                if istasyon_id in [1, 2]:
+                    self._iot_guncelle(istasyon_id, sicaklik)
+                    
+                    if self.debug:
+                        print(f"📡 IoT{istasyon_id} sıcaklık alındı: {sicaklik}°C")
+        except (IndexError, ValueError) as e:
+            self.logger.error(f"IoT string parse hatası: {e}")
+    
+    def _isle_komut(self, message: str):
+        """Yer istasyonu komutları: !...!, #CALIB_...# ve zarflı @<id>:<komut>"""
+        if self.debug:
+            print(f"🔍 DEBUG: XBee'den komut alındı: {message}")
+        if self.command_callback:
+            self._komut_gecikmeleri.append(time.monotonic() - self._okuma_referansi)
+            self.command_callback(message)
+        else:
+            print("⚠️ UYARI: command_callback tanımlanmamış!")
+    
+    def _process_api_frame(self, cerceve):
+        """Çözülmüş (checksum'ı doğrulanmış) XBee API frame'ini işle"""
+        try:
             if self.debug:
-                print(f"🔍 DEBUG: API frame tipi: 0x{frame_type:02X}")
+                print(f"🔍 DEBUG: API frame tipi: 0x{cerceve.TIP:02X}")
             
             # RX Indicator (0x90) - Received data
-            if frame_type == 0x90:
-                # 64-bit source address (8 bytes) + 16-bit source address (2 bytes) + options (1 byte) = 11 bytes
-                if length >= 12:  # En az 11 byte header + 1 byte data
-                    payload_start = 14  # 3 (header) + 11 (addressing)
-                    payload_end = 3 + length - 1  # Checksum hariç
-                    
-                    if payload_end > payload_start and payload_end < len(frame_data):
-                        payload = frame_data[payload_start:payload_end]
-                        
-                        if self.debug:
-                            print(f"🔍 DEBUG: API frame payload: {len(payload)} bytes")
-                            try:
-                                payload_str = payload.decode('utf-8', errors='ignore')
-                                print(f"🔍 DEBUG: API frame içeriği: '{payload_str}'")
-                            except:
-                                print(f"🔍 DEBUG: API frame binary: {payload.hex()}")
-                        
-                        # Payload'u string olarak işle
-                        try:
-                            message = payload.decode('utf-8', errors='ignore').strip()
-                            if message:
-                                if self.debug:
-                                    print(f"🔍 DEBUG: API frame'den mesaj çıkarıldı: '{message}'")
-                                self._process_message(message)  # Recursive call
-                        except Exception as e:
-                            if self.debug:
-                                print(f"🔍 DEBUG: API frame payload decode hatası: {e}")
+            if isinstance(cerceve, RxCercevesi):
+                if len(cerceve.veri) == 0:
+                    return
+                
+                # memoryview bir sonraki okumada geçersizleşir, payload'u kopyala
+                payload = bytes(cerceve.veri)
+                if self.debug:
+                    print(f"🔍 DEBUG: API frame payload: {len(payload)} bytes "
+                          f"(kaynak: {cerceve.kaynak64:016X})")
+                
+                # Binary IoT paketi veya metin mesajı
+                self._process_message(payload)
             
             # TX Status (0x8B) - Transmission status
-            elif frame_type == 0x8B:
+            elif isinstance(cerceve, TxDurumCercevesi):
                 if self.debug:
-                    print("🔍 DEBUG: TX Status frame alındı")
+                    print(f"🔍 DEBUG: TX Status frame alındı (id={cerceve.cerceve_id}, "
+                          f"durum=0x{cerceve.teslim_durumu:02X})")
+                if self.teslim_takipcisi:
+                    self.teslim_takipcisi.durum_isle(cerceve)
+            
+            # AT Command Response (0x88)
+            elif isinstance(cerceve, ATYanitCercevesi):
+                if self.debug:
+                    print(f"🔍 DEBUG: AT yanıtı: {cerceve.komut} durum={cerceve.durum} "
+                          f"veri={bytes(cerceve.veri).hex()}")
             
             else:
                 if self.debug:
-                    print(f"🔍 DEBUG: Bilinmeyen API frame tipi: 0x{frame_type:02X}")
+                    print(f"🔍 DEBUG: Bilinmeyen API frame tipi: 0x{cerceve.TIP:02X}")
                     
         except Exception as e:
             self.logger.error(f"API frame işleme hatası: {e}")
             if self.debug:
                 print(f"🔍 DEBUG: API frame işleme hatası: {e}")
     
-    def _process_binary_buffer(self, buffer: bytearray):
-        """Binary buffer'da API frame'leri ara ve işle"""
-        try:
-            i = 0
-            while i < len(buffer):
-                # API frame başlangıcı ara (0x7E)
-                if buffer[i] == 0x7E:
-                    if i + 3 < len(buffer):  # En az header için yeterli byte var mı?
-                        # Frame uzunluğunu oku
-                        length = (buffer[i+1] << 8) | buffer[i+2]
-                        frame_end = i + 3 + length + 1  # Header(3) + Data(length) + Checksum(1)
-                        
-                        if frame_end <= len(buffer):
-                            # Tam frame mevcut
-                            frame_data = buffer[i:frame_end]
-                            if self.debug:
-                                print(f"🔍 DEBUG: Tam API frame bulundu: {len(frame_data)} bytes")
-                            self._process_api_frame(bytes(frame_data))
-                            
-                            # İşlenen frame'i buffer'dan çıkar
-                            del buffer[i:frame_end]
-                            continue
-                        else:
-                            # Frame henüz tam değil, daha fazla veri bekle
-                            if self.debug:
-                                print(f"🔍 DEBUG: Eksik API frame, bekleniyor: {frame_end - len(buffer)} bytes")
-                            break
-                    else:
-                        # Header bile tam değil
-                        break
-                else:
-                    # 0x7E değil, sonraki byte'a geç
-                    i += 1
-                    
-        except Exception as e:
-            if self.debug:
-                print(f"🔍 DEBUG: Binary buffer işleme hatası: {e}")
-    
     def _process_binary_message(self, data: bytes):
         """Binary IoT mesajını ayrıştır"""
         try:
-            # 16-byte IoT paketi format: <StationID><PacketNum><Temp><Battery><Timestamp><Checksum>
-            if len(data) != 16:
+            # 16-byte IoT paketi (moduller/iot_paketi.py): <StationID><PacketNum><Temp><Battery><Timestamp><Checksum>
+            if len(data) != IOT_PAKET_BOYUTU:
+                self.metrikler.iot_reddedildi('boyut')
                 if self.debug:
-                    print(f"⚠️ Binary paket boyut hatası: {len(data)} (16 olmalı)")
+                    print(f"⚠️ Binary paket boyut hatası: {len(data)} ({IOT_PAKET_BOYUTU} olmalı)")
                 return
             
             # Struct ile ayrıştır
-            station_id, packet_num, temperature, battery, timestamp, checksum = struct.unpack('<BIfBIH', data)
+            station_id, packet_num, temperature, battery, timestamp, checksum = iot_paketi_coz(data)
             
             # Checksum doğrulama
-            calculated_checksum = sum(data[:14]) & 0xFFFF
+            calculated_checksum = iot_checksum(data)
             if calculated_checksum != checksum:
+                self.metrikler.iot_reddedildi('checksum')
                 if self.debug:
                     print(f"⚠️ Binary paket checksum hatası: {calculated_checksum} != {checksum}")
                 return
             
             # Station ID kontrolü
-            if station_id not in [1, 2]:
+            if station_id not in IOT_ISTASYONLARI:
+                self.metrikler.iot_reddedildi('istasyon')
                 if self.debug:
                     print(f"⚠️ Geçersiz station ID: {station_id}")
                 return
             
-            # Thread-safe veri güncellemesi
-            with self._data_lock:
-                self.iot_verileri[station_id] = {
-                    'sicaklik': temperature,
-                    'son_guncelleme': time.time()
-                }
+            self._iot_guncelle(station_id, temperature)
             
             if self.debug:
                 print(f"📡 IoT{station_id} binary: {temperature:.1f}°C (paket #{packet_num})")
             
         except struct.error as e:
+            self.metrikler.iot_reddedildi('struct')
             self.logger.error(f"Binary paket struct hatası: {e}")
         except Exception as e:
             self.logger.error(f"Binary mesaj işleme hatası: {e}")
@@ -461,19 +614,19 @@ class BirlesikXBeeAlici:
         """
         try:
             # Boyut kontrolü: tam 16 byte olmalı
-            if len(data) != 16:
+            if len(data) != IOT_PAKET_BOYUTU:
                 return False
             
             # İlk byte station ID olmalı (1 veya 2)
             station_id = data[0]
-            if station_id not in [1, 2]:
+            if station_id not in IOT_ISTASYONLARI:
                 return False
             
             # Magic number kontrolü: son 4 byte'ta özel pattern arayabiliriz
             # Veya checksum validation yapabiliriz
             try:
                 # Checksum validation test
-                calculated_checksum = sum(data[:14]) & 0xFFFF
+                calculated_checksum = iot_checksum(data)
                 received_checksum = struct.unpack('<H', data[14:16])[0]
                 
                 # Checksum eşleşmesi binary paket olma ihtimalini artırır
@@ -495,7 +648,7 @@ class BirlesikXBeeAlici:
         except Exception:
             return False
     
-    def send_telemetry(self, telemetry_data):
+    def send_telemetry(self, telemetry_data, oncelik=None):
         """TIMEOUT DÜZELTMESİ - SD kaydını asla engelleme"""
         # String/bytes dönüşüm güvenliği
         if isinstance(telemetry_data, bytes):
@@ -507,74 +660,269 @@ class BirlesikXBeeAlici:
             print(f"SİMÜLASYON - Telemetri: {telemetry_data[:50]}...")
             return True
         
+        data_to_send = (telemetry_data + '\n').encode('utf-8')
+        if oncelik is None:
+            oncelik = self._oncelik_belirle(telemetry_data)
+        
         # 🔥 KRİTİK: XBee problemi SD kaydını engellememesin
         if not self.xbee_serial or not self.xbee_serial.is_open:
-            return True  # ✅ SD kaydet, XBee gönderme
+            self._depola(data_to_send, oncelik)
+            return True  # ✅ SD kaydet, XBee gönderme (telemetri depoda bekler)
         
         try:
-            data_to_send = telemetry_data + '\n'
-            self.xbee_serial.write(data_to_send.encode('utf-8'))
+            self.link_tahmincisi.guncelle()
+            if (oncelik == ONCELIK_VIDEO and self.teslim_takipcisi and self._yazici_calisiyor()
+                    and not self._video_gonderilsin_mi()):
+                return True
+            self._gonder(data_to_send, oncelik)
+            if oncelik == ONCELIK_TELEMETRI:
+                self._depoyu_bosalt()
             return True
         except:
             # HER TÜRLÜ HATA: SD kaydını engellememe
+            self._depola(data_to_send, oncelik)
             return True  # ✅ XBee hatası olsa da SD kaydet
     
-    # SAHA (BASINÇ2) verileri için getter'lar
-    def is_basinc2_available(self) -> bool:
-        """BASINÇ2 verisi mevcut mu?"""
-        with self._data_lock:
-            if self.basinc2_veri['son_guncelleme'] is None:
+    def send_binary(self, veri: bytes, oncelik=ONCELIK_TELEMETRI, bolunebilir=False):
+        """
+        Binary paketi (ör. binary telemetri) olduğu gibi gönderir: satır sonu
+        eklenmez, metne çevrilmez. send_telemetry ile aynı hata sözleşmesi.
+        bolunebilir=True ise zamanlayıcı parçalar arasında öncelikli veriye yer açar.
+        """
+        if self.simulate:
+            print(f"SİMÜLASYON - Binary paket: {len(veri)} byte")
+            return True
+        
+        if not self.xbee_serial or not self.xbee_serial.is_open:
+            self._depola(veri, oncelik)
+            return True
+        
+        try:
+            self.link_tahmincisi.guncelle()
+            self._gonder(veri, oncelik, bolunebilir)
+            if oncelik == ONCELIK_TELEMETRI:
+                self._depoyu_bosalt()
+            return True
+        except Exception:
+            self._depola(veri, oncelik)
+            return True
+    
+    def _yazici_calisiyor(self) -> bool:
+        """Zamanlayıcıyı boşaltan yazıcı (asyncio link veya TX thread'i) var mı?"""
+        return bool((self.link and self.link.calisiyor) or (self.tx_thread and self.tx_thread.is_alive()))
+    
+    def _gonder(self, veri: bytes, oncelik, bolunebilir=False):
+        """Veriyi G/Ç moduna göre yazıcıya verir; yazma hatasında istisna fırlatır"""
+        if self.teslim_takipcisi and self._yazici_calisiyor():
+            # API modu: teslim takipli 0x10 frame'leri (yazıcı link veya TX thread'i)
+            self.teslim_takipcisi.zaman_asimlarini_kontrol()
+            self.teslim_takipcisi.gonder(veri, oncelik, bolunebilir)
+        elif self.link:
+            # asyncio modu: link yazıcısının zamanlayıcısına ekle, çağıran bloklanmaz
+            if not self.link.send_threadsafe(veri, oncelik, bolunebilir):
+                raise OSError("XBee link kapalı")  # Çağıran depolar
+        elif self.tx_thread and self.tx_thread.is_alive():
+            # Thread modu: TX thread'i öncelik ve hava süresi bütçesine göre yazar
+            self.tx_zamanlayici.ekle(bytes(veri), oncelik, bolunebilir)
+        else:
+            # Thread modu: telemetri/kamera/komut thread'lerinin
+            # yazmaları iç içe geçmesin
+            with self._yazma_kilidi:
+                self.xbee_serial.write(veri)
+                self.metrikler.tx(len(veri))
+    
+    # Telemetri deposu (store-and-forward): kesintide gönderilemeyen ve API
+    # modunda teslim edilemeyen telemetri, link düzelince geçmiş sınıfında gider
+    def _depola(self, veri, oncelik):
+        if oncelik in (ONCELIK_TELEMETRI, ONCELIK_GECMIS):
+            self.telemetri_deposu.ekle(veri)
+    
+    def yeniden_gonder(self, paketler):
+        """
+        #RESEND ile istenen geçmiş paketleri depoya ekler: canlı telemetriden
+        sonra, depo boşaltma hızıyla gönderilirler (ASCII satıra '\\n' eklenir)
+        """
+        for paket in paketler:
+            if isinstance(paket, str):
+                paket = (paket + '\n').encode('utf-8')
+            if self.simulate:
+                print(f"SİMÜLASYON - Yeniden gönderim: {len(paket)} byte")
+                continue
+            self.telemetri_deposu.ekle(paket)
+    
+    def _link_saglikli(self) -> bool:
+        """Port açık ve (API modunda) son frame'ler yer istasyonuna ulaşıyor mu?"""
+        if not self.xbee_serial or not self.xbee_serial.is_open:
+            return False
+        if self.teslim_takipcisi:
+            return self.teslim_takipcisi.son_teslim_orani() >= TELEMETRI_DEPOSU_MIN_TESLIM
+        return True
+    
+    def _depoyu_bosalt(self):
+        """Canlı telemetriden sonra depodaki birikimi hız sınırlı zamanlayıcıya verir"""
+        if not len(self.telemetri_deposu) or not self._link_saglikli():
+            return
+        bos_yer = None
+        if self._yazici_calisiyor():
+            bos_yer = max(0, TELEMETRI_DEPOSU_KUYRUK_ESIGI - self.tx_zamanlayici.kuyruk_derinligi()['gecmis'])
+        
+        def gonder(veri):
+            try:
+                self._gonder(veri, ONCELIK_GECMIS)
+                return True
+            except Exception:
                 return False
         
-        # Son 10 saniye içinde güncelleme var mı?
-        return (time.time() - self.basinc2_veri['son_guncelleme']) < 10.0
+        self.telemetri_deposu.bosalt(gonder, bos_yer)
     
-    def get_basinc2_value(self) -> float:
-        """BASINÇ2 değerini al (hPa)"""
+    def send_video(self, kare: bytes):
+        """
+        Canlı yayın karesini (ham JPEG) CRC'li parçalara bölerek gönderir.
+        Kare, zamanlayıcıda tek bölünebilir video öğesidir: kuyruk dolunca
+        kare bütün olarak atılır, parçalar arasında telemetri araya girer.
+        """
+        if self.teslim_takipcisi and not self.simulate and not self._video_gonderilsin_mi():
+            return True
+        parcalar = self.video_parcalayici.parcala(kare)
+        if not parcalar:
+            return True
+        return self.send_binary(b"".join(parcalar), ONCELIK_VIDEO, bolunebilir=True)
+    
+    def _video_gonderilsin_mi(self) -> bool:
+        """
+        Teslim hatası arttıkça video karelerinin bir kısmını atla: her kare
+        video_katsayisi kadar kredi kazandırır, 1 kredi biriken kare gönderilir.
+        """
+        self._video_kredisi = min(1.0, self._video_kredisi + self.teslim_takipcisi.video_katsayisi())
+        if self._video_kredisi >= 1.0:
+            self._video_kredisi -= 1.0
+            return True
+        self.yavaslatilan_video += 1
+        return False
+    
+    def _rx_birikimi(self) -> int:
+        """Seri portta okunmamış byte (link tahmincisi için)"""
+        if not self.xbee_serial or not self.xbee_serial.is_open:
+            return 0
+        return self.xbee_serial.in_waiting
+    
+    def _link_tahmini_uygula(self, tahmin):
+        """Telemetri aralığı: 1 Hz korunur, yalnızca telemetri bile sığmıyorsa uzar"""
+        aralik = tahmin.get('telemetri_araligi_s') or 0.0
+        self.telemetri_araligi = max(TELEMETRI_GONDERIM_SIKLIGI, aralik)
+    
+    @staticmethod
+    def _oncelik_belirle(veri: str) -> int:
+        """Giden verinin öncelik sınıfı: telemetri > onay/komut > video"""
+        if veri.startswith("$"):
+            return ONCELIK_TELEMETRI
+        if veri.startswith("#VIDEO:"):
+            return ONCELIK_VIDEO
+        return ONCELIK_ONAY
+    
+    # Anlık görüntü: yazıcılar _goruntu_guncelle() ile yeni görüntü yayınlar,
+    # okuyucular get_anlik_goruntu() ile kilitsiz okur
+    def _goruntu_guncelle(self, **alanlar):
+        """Yeni sürüm görüntü oluşturup tek atamayla yayınlar (yalnızca yazıcılar)"""
         with self._data_lock:
-            if self.is_basinc2_available():
-                return self.basinc2_veri['value']
-            else:
-                return 0.0
+            self._goruntu = self._goruntu.guncelle(**alanlar)
+    
+    def _iot_guncelle(self, istasyon_id: int, sicaklik: float):
+        if istasyon_id == 1:
+            self._goruntu_guncelle(iot1_sicaklik=sicaklik, iot1_zamani=time.time())
+            self.metrikler.varis_kaydet('iot1')
+        elif istasyon_id == 2:
+            self._goruntu_guncelle(iot2_sicaklik=sicaklik, iot2_zamani=time.time())
+            self.metrikler.varis_kaydet('iot2')
+    
+    def get_anlik_goruntu(self) -> XBeeAnlikGoruntu:
+        """SAHA/IoT verilerinin tutarlı, değişmez görüntüsü (kilitsiz)"""
+        return self._goruntu
+    
+    @property
+    def basinc2_veri(self) -> dict:
+        """Eski sözlük biçimi (salt okunur uyumluluk)"""
+        g = self._goruntu
+        return {'value': g.basinc2, 'son_guncelleme': g.basinc2_zamani}
+    
+    @property
+    def iot_verileri(self) -> dict:
+        """Eski sözlük biçimi (salt okunur uyumluluk)"""
+        g = self._goruntu
+        return {
+            1: {'sicaklik': g.iot1_sicaklik, 'son_guncelleme': g.iot1_zamani},
+            2: {'sicaklik': g.iot2_sicaklik, 'son_guncelleme': g.iot2_zamani}
+        }
+    
+    # SAHA (BASINÇ2) verileri için getter'lar
+    def is_basinc2_available(self) -> bool:
+        """BASINÇ2 verisi mevcut mu? (son 10 saniye)"""
+        return self._goruntu.basinc2_taze()
+    
+    def get_basinc2_value(self) -> float:
+        """BASINÇ2 değerini al (Pa)"""
+        return self._goruntu.basinc2_degeri()
     
     # IoT verileri için getter'lar
     def get_iot_data(self, istasyon_id: int) -> float:
-        """IoT istasyon sıcaklık verisini al"""
-        with self._data_lock:
-            if istasyon_id not in [1, 2]:
-                return 0.0
-        
-        veri = self.iot_verileri[istasyon_id]
-        if veri['son_guncelleme'] is None:
-            return 0.0
-        
-        # Son 30 saniye içinde güncelleme var mı?
-        if (time.time() - veri['son_guncelleme']) > 30.0:
-            return 0.0
-        
-        return veri['sicaklik']
+        """IoT istasyon sıcaklık verisini al (son 30 saniye, yoksa 0.0)"""
+        return self._goruntu.iot_sicakligi(istasyon_id)
     
     def get_iot_temperatures(self):
         """
         IoT istasyonlarının sıcaklık verilerini tuple olarak döndürür
         Ana programda kullanılan method (compatibility için)
         """
-        with self._data_lock:
-            return (self.get_iot_data(1), self.get_iot_data(2))
+        return self._goruntu.iot_sicakliklari()
+    
+    def get_komut_gecikmesi(self) -> dict:
+        """
+        Komut gecikme istatistikleri (ms): byte'ların okuyucu tarafından
+        görüldüğü an ile command_callback çağrısı arası. "poll" modunda
+        referans 100 ms uykunun başlangıcıdır, yani değerler üst sınırdır.
+        """
+        olcumler = sorted(self._komut_gecikmeleri)
+        if not olcumler:
+            return {'adet': 0, 'son_ms': 0.0, 'ortalama_ms': 0.0, 'maks_ms': 0.0, 'p99_ms': 0.0}
+        return {
+            'adet': len(olcumler),
+            'son_ms': self._komut_gecikmeleri[-1] * 1000.0,
+            'ortalama_ms': sum(olcumler) / len(olcumler) * 1000.0,
+            'maks_ms': olcumler[-1] * 1000.0,
+            'p99_ms': olcumler[min(len(olcumler) - 1, int(len(olcumler) * 0.99))] * 1000.0
+        }
+    
+    def get_tx_istatistikleri(self) -> dict:
+        """TX zamanlayıcı: sınıf başına kuyruk derinliği, atılan öğeler, telemetri gecikmesi p99"""
+        istatistikler = self.tx_zamanlayici.get_istatistikler()
+        if self.teslim_takipcisi:
+            istatistikler['teslim'] = self.teslim_takipcisi.get_istatistikler()
+            istatistikler['yavaslatilan_video'] = self.yavaslatilan_video
+        return istatistikler
+    
+    def get_link_metrikleri(self) -> dict:
+        """Link katmanı sayaçları (SD karta periyodik kayıt için)"""
+        metrikler = self.metrikler.snapshot()
+        metrikler['tx'] = self.get_tx_istatistikleri()
+        metrikler['link_tahmini'] = self.link_tahmincisi.get_istatistikler()
+        metrikler['telemetri_deposu'] = self.telemetri_deposu.get_istatistikler()
+        return metrikler
     
     def get_status(self) -> dict:
         """Birleşik XBee durumunu al"""
-        with self._data_lock:
-            return {
-                'baglanti': self.is_connected,
-                'dinleme': self.running,
-                'basinc2_mevcut': self.is_basinc2_available(),
-                'basinc2_deger': self.get_basinc2_value(),
-                'iot1_sicaklik': self.get_iot_data(1),
-                'iot2_sicaklik': self.get_iot_data(2),
-                'iot1_aktif': (time.time() - self.iot_verileri[1].get('son_guncelleme', 0)) < 30,
-                'iot2_aktif': (time.time() - self.iot_verileri[2].get('son_guncelleme', 0)) < 30
-            }
+        g = self._goruntu
+        simdi = time.time()
+        return {
+            'baglanti': self.is_connected,
+            'dinleme': self.running,
+            'basinc2_mevcut': g.basinc2_taze(simdi),
+            'basinc2_deger': g.basinc2_degeri(simdi),
+            'iot1_sicaklik': g.iot_sicakligi(1, simdi),
+            'iot2_sicaklik': g.iot_sicakligi(2, simdi),
+            'iot1_aktif': g.iot_taze(1, simdi),
+            'iot2_aktif': g.iot_taze(2, simdi),
+            'goruntu_surumu': g.surum
+        }
 
 # Test için örnek kullanım
 if __name__ == '__main__':
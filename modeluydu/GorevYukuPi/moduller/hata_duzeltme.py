@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+İleri Hata Düzeltme (FEC) Modülü
+
+GF(2^8) üzerinde sistematik Reed-Solomon silinme (erasure) kodu:
+k veri bloğuna m parite bloğu eklenir; k+m bloktan HERHANGİ k tanesi
+gelirse veri blokları yeniden oluşturulur. Video parçaları yeniden
+gönderilmediği için kayıp parçalar bu paritelerle telafi edilir.
+
+Üreteç matrisi [I; C] biçimindedir; C Cauchy matrisidir:
+    C[i][j] = 1 / (x_i + y_j),  x_i = k + i,  y_j = j
+Cauchy matrisinin her kare alt matrisi tersinir olduğundan eksik veri
+bloklarının sayısı kadar parite ile çözüm her zaman vardır.
+
+Blok çarpımı, katsayı başına 256 byte'lık tablo ile bytes.translate()
+kullanır; XOR tam sayı üzerinden yapılır (saf Python, ek bağımlılık yok).
+"""
+
+GF_POLINOMU = 0x11D  # x^8 + x^4 + x^3 + x^2 + 1
+MAKS_BLOK_SAYISI = 255  # k + m
+
+_USTEL = [0] * 512
+_LOG = [0] * 256
+_x = 1
+for _i in range(255):
+    _USTEL[_i] = _x
+    _LOG[_x] = _i
+    _x <<= 1
+    if _x & 0x100:
+        _x ^= GF_POLINOMU
+for _i in range(255, 512):
+    _USTEL[_i] = _USTEL[_i - 255]
+del _x, _i
+
+_carpim_tablolari = {}
+
+
+def gf_carp(a: int, b: int) -> int:
+    if a == 0 or b == 0:
+        return 0
+    return _USTEL[_LOG[a] + _LOG[b]]
+
+
+def gf_ters(a: int) -> int:
+    if a == 0:
+        raise ZeroDivisionError("GF(256)'da 0'ın tersi yok")
+    return _USTEL[255 - _LOG[a]]
+
+
+def _carpim_tablosu(katsayi: int) -> bytes:
+    """bytes.translate() için katsayı ile çarpım tablosu (önbellekli)"""
+    tablo = _carpim_tablolari.get(katsayi)
+    if tablo is None:
+        tablo = _carpim_tablolari[katsayi] = bytes(gf_carp(katsayi, b) for b in range(256))
+    return tablo
+
+
+def _dogrusal_birlesim(katsayilar, bloklar, boyut: int) -> bytes:
+    """sum(katsayi * blok) - toplam GF(256)'da XOR"""
+    toplam = 0
+    for katsayi, blok in zip(katsayilar, bloklar):
+        if katsayi == 0:
+            continue
+        if katsayi != 1:
+            blok = blok.translate(_carpim_tablosu(katsayi))
+        toplam ^= int.from_bytes(blok, 'little')
+    return toplam.to_bytes(boyut, 'little')
+
+
+def cauchy_katsayisi(parite: int, veri: int, k: int) -> int:
+    return gf_ters((k + parite) ^ veri)
+
+
+def _matris_tersi(matris):
+    """Kare matrisin GF(256) tersini Gauss-Jordan ile hesaplar"""
+    n = len(matris)
+    a = [list(satir) + [1 if i == j else 0 for j in range(n)] for i, satir in enumerate(matris)]
+    for sutun in range(n):
+        pivot = next((r for r in range(sutun, n) if a[r][sutun]), None)
+        if pivot is None:
+            raise ValueError("Matris tersinir değil")
+        a[sutun], a[pivot] = a[pivot], a[sutun]
+        ters = gf_ters(a[sutun][sutun])
+        a[sutun] = [gf_carp(ters, x) for x in a[sutun]]
+        for r in range(n):
+            carpan = a[r][sutun]
+            if r != sutun and carpan:
+                a[r] = [x ^ gf_carp(carpan, y) for x, y in zip(a[r], a[sutun])]
+    return [satir[n:] for satir in a]
+
+
+def parite_uret(bloklar, m: int) -> list:
+    """
+    Eşit uzunluktaki k veri bloğu için m parite bloğu üretir.
+    """
+    k = len(bloklar)
+    if k == 0 or m <= 0:
+        return []
+    if k + m > MAKS_BLOK_SAYISI:
+        raise ValueError(f"k + m en fazla {MAKS_BLOK_SAYISI} olabilir: {k} + {m}")
+    boyut = len(bloklar[0])
+    return [_dogrusal_birlesim([cauchy_katsayisi(i, j, k) for j in range(k)], bloklar, boyut)
+            for i in range(m)]
+
+
+def kurtar(alinan: dict, k: int, m: int) -> list:
+    """
+    Alınan bloklardan (indeks -> blok; 0..k-1 veri, k..k+m-1 parite)
+    k veri bloğunu döndürür. Yetersiz blokta ValueError.
+
+    Yalnızca eksik veri blokları kadar bilinmeyenli sistem çözülür:
+        p_i + sum(C[i][j] * d_j, j bilinen) = sum(C[i][j] * d_j, j eksik)
+    """
+    eksik = [j for j in range(k) if j not in alinan]
+    if not eksik:
+        return [alinan[j] for j in range(k)]
+    pariteler = [i for i in range(m) if k + i in alinan][:len(eksik)]
+    if len(pariteler) < len(eksik):
+        raise ValueError(f"Kurtarma için yetersiz blok: {len(alinan)}/{k}")
+
+    bilinen = [j for j in range(k) if j in alinan]
+    boyut = len(alinan[k + pariteler[0]])
+    sag = [_dogrusal_birlesim([1] + [cauchy_katsayisi(i, j, k) for j in bilinen],
+                              [alinan[k + i]] + [alinan[j] for j in bilinen], boyut)
+           for i in pariteler]
+    ters = _matris_tersi([[cauchy_katsayisi(i, j, k) for j in eksik] for i in pariteler])
+
+    veri = [alinan.get(j) for j in range(k)]
+    for satir, j in zip(ters, eksik):
+        veri[j] = _dogrusal_birlesim(satir, sag, boyut)
+    return veri
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import os
+    import random
+    import time
+
+    random.seed(3)
+    for k, m in ((1, 1), (5, 2), (35, 6), (200, 55)):
+        veri = [os.urandom(90) for _ in range(k)]
+        parite = parite_uret(veri, m)
+        bloklar = dict(enumerate(veri + parite))
+        for sil in random.sample(range(k + m), m):
+            del bloklar[sil]
+        assert kurtar(bloklar, k, m) == veri, f"k={k}, m={m} kurtarılamadı"
+        print(f"✅ k={k:3d}, m={m:2d}: {m} blok silindi, veri kurtarıldı")
+
+    # Video karesi boyutu: ~3.5 KB, 90 byte'lık 39 blok, %15 parite
+    veri = [os.urandom(90) for _ in range(39)]
+    t0 = time.perf_counter()
+    for _ in range(100):
+        parite = parite_uret(veri, 6)
+    kodlama = (time.perf_counter() - t0) / 100
+    bloklar = dict(enumerate(veri + parite))
+    for sil in range(6):
+        del bloklar[sil * 5]
+    t0 = time.perf_counter()
+    for _ in range(100):
+        kurtar(bloklar, 39, 6)
+    cozme = (time.perf_counter() - t0) / 100
+    print(f"⏱️ 39+6 blok: kodlama {kodlama * 1000:.2f} ms, 6 eksikle çözme {cozme * 1000:.2f} ms")
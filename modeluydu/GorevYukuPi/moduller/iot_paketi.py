@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+IoT Binary Paket Modülü
+
+IoT istasyonlarının 16 byte'lık binary paketi (little-endian):
+    istasyon (u8) | paket_no (u32) | sicaklik (f32) | pil (u8) |
+    zaman_damgasi (u32, ms) | checksum (u16 = ilk 14 byte'ın toplamı)
+
+Alan tablosu (IOT_PAKET_ALANLARI) tek tanımdır: canlı yolun struct biçimi
+ve uçuş sonrası analizin NumPy structured dtype'ı buradan üretilir.
+
+- iot_paketi_coz(): tek paket (BirlesikXBeeAlici canlı yolu)
+- iot_paketlerini_coz(): art arda eklenmiş paketlerden oluşan blob'u tek
+  vektörel geçişte çözer; sütun dizileri + geçersiz satır maskesi döndürür
+  (NumPy gerekir, yalnızca analiz için)
+"""
+
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# (alan adı, struct karakteri, NumPy tipi)
+IOT_PAKET_ALANLARI = (
+    ('istasyon', 'B', 'u1'),
+    ('paket_no', 'I', '<u4'),
+    ('sicaklik', 'f', '<f4'),
+    ('pil', 'B', 'u1'),
+    ('zaman_damgasi', 'I', '<u4'),
+    ('checksum', 'H', '<u2'),
+)
+IOT_PAKET_FORMATI = '<' + ''.join(alan[1] for alan in IOT_PAKET_ALANLARI)  # '<BIfBIH'
+IOT_PAKET_STRUCT = struct.Struct(IOT_PAKET_FORMATI)
+IOT_PAKET_BOYUTU = IOT_PAKET_STRUCT.size  # 16
+IOT_CHECKSUM_KAPSAMI = IOT_PAKET_BOYUTU - 2
+IOT_ISTASYONLARI = (1, 2)
+
+IOT_DTYPE = np.dtype([(ad, tip) for ad, _, tip in IOT_PAKET_ALANLARI]) if np is not None else None
+
+
+def iot_checksum(veri) -> int:
+    """İlk 14 byte'ın 16-bit toplamı"""
+    return sum(veri[:IOT_CHECKSUM_KAPSAMI]) & 0xFFFF
+
+
+def iot_paketi_olustur(istasyon_id, paket_no, sicaklik, pil=95, zaman_damgasi=0) -> bytes:
+    """16 byte IoT paketi (checksum dahil)"""
+    veri = IOT_PAKET_STRUCT.pack(istasyon_id, paket_no, sicaklik, pil,
+                                 zaman_damgasi & 0xFFFFFFFF, 0)[:IOT_CHECKSUM_KAPSAMI]
+    return veri + struct.pack('<H', iot_checksum(veri))
+
+
+def iot_paketi_coz(veri):
+    """
+    Tek paketi çözer: (istasyon, paket_no, sicaklik, pil, zaman_damgasi, checksum).
+    Boyut yanlışsa struct.error; checksum/istasyon kontrolü çağırana aittir.
+    """
+    return IOT_PAKET_STRUCT.unpack(veri)
+
+
+def iot_paketlerini_coz(blob, istasyonlar=IOT_ISTASYONLARI) -> dict:
+    """
+    Art arda eklenmiş 16 byte'lık paketleri vektörel olarak çözer.
+
+    Returns:
+        {'istasyon', 'paket_no', 'sicaklik', 'pil', 'zaman_damgasi': sütun
+         dizileri, 'gecersiz': checksum veya istasyon hatalı satır maskesi,
+         'artik_bayt': sonda tam pakete tamamlanmayan byte sayısı}
+    """
+    if np is None:
+        raise ImportError("iot_paketlerini_coz için NumPy gerekli")
+    adet = len(blob) // IOT_PAKET_BOYUTU
+    paketler = np.frombuffer(blob, dtype=IOT_DTYPE, count=adet)
+    baytlar = np.frombuffer(blob, dtype=np.uint8, count=adet * IOT_PAKET_BOYUTU).reshape(adet, IOT_PAKET_BOYUTU)
+
+    hesaplanan = baytlar[:, :IOT_CHECKSUM_KAPSAMI].sum(axis=1, dtype=np.uint32) & 0xFFFF
+    gecersiz = (hesaplanan != paketler['checksum']) | ~np.isin(paketler['istasyon'], istasyonlar)
+
+    sonuc = {ad: paketler[ad].copy() for ad, _, _ in IOT_PAKET_ALANLARI if ad != 'checksum'}
+    sonuc['gecersiz'] = gecersiz
+    sonuc['artik_bayt'] = len(blob) - adet * IOT_PAKET_BOYUTU
+    return sonuc
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import random
+    import time
+
+    random.seed(0)
+    paketler = []
+    for i in range(200000):
+        paket = bytearray(iot_paketi_olustur(1 + i % 2, i // 2, 24.0 + random.uniform(-2, 2),
+                                             95 - i // 20000, i * 500))
+        if i % 1000 == 0:
+            paket[5] ^= 0x01  # Bozuk paket
+        paketler.append(bytes(paket))
+    blob = b"".join(paketler) + b"\x01\x02\x03"
+
+    # Tek tek (canlı yol mantığı)
+    baslangic = time.perf_counter()
+    tek_gecersiz = 0
+    for i in range(0, len(blob) - IOT_PAKET_BOYUTU + 1, IOT_PAKET_BOYUTU):
+        paket = blob[i:i + IOT_PAKET_BOYUTU]
+        istasyon, _, _, _, _, checksum = iot_paketi_coz(paket)
+        if iot_checksum(paket) != checksum or istasyon not in IOT_ISTASYONLARI:
+            tek_gecersiz += 1
+    tek_sure = time.perf_counter() - baslangic
+
+    # Vektörel
+    baslangic = time.perf_counter()
+    sonuc = iot_paketlerini_coz(blob)
+    vektor_sure = time.perf_counter() - baslangic
+
+    assert int(sonuc['gecersiz'].sum()) == tek_gecersiz == 200
+    gecerli = ~sonuc['gecersiz']
+    for istasyon in IOT_ISTASYONLARI:
+        secim = gecerli & (sonuc['istasyon'] == istasyon)
+        print(f"📡 IoT{istasyon}: {int(secim.sum())} paket, ortalama {sonuc['sicaklik'][secim].mean():.2f}°C, "
+              f"pil %{sonuc['pil'][secim].min()}-{sonuc['pil'][secim].max()}")
+    print(f"⏱️ {len(paketler)} paket: tek tek {tek_sure * 1000:.0f} ms, vektörel {vektor_sure * 1000:.1f} ms "
+          f"({tek_sure / vektor_sure:.0f}x), geçersiz {tek_gecersiz}, artık {sonuc['artik_bayt']} byte")
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+İrtifa Filtresi Modülü
+
+Barometrik irtifadan irtifa ve dikey hız kestiren 2 durumlu Kalman filtresi.
+Eski yöntem (iki ölçümün farkı + 5 örneklik medyan + 50 m/s üstünü atma)
+gürültülü ve gecikmeliydi; ARAS 12-14 m/s ve 6-8 m/s kontrolleri bu hıza
+bağlı.
+
+Durum: [irtifa (m), dikey hız (m/s, yukarı +)]
+- Tahmin: sabit hız modeli; IMU dikey ivmesi verilirse kontrol girdisi
+  olarak eklenir. Modellenmeyen ivme beyaz gürültü (ivme_std) sayılır
+- Güncelleme: barometrik irtifa (olcum_std). İnovasyon kapi sigmadan
+  büyükse ölçüm aykırı sayılıp atlanır; art arda YENIDEN_KILITLENME kez
+  atlanırsa (ör. ayrılma, faz geçişi) filtre son iki ölçümle yeniden başlar
+- 2x2 kovaryans skaler alanlarda tutulur: örnek başına O(1), liste/dizi
+  ayrılmaz
+"""
+
+import math
+
+YERCEKIMI = 9.80665
+YENIDEN_KILITLENME = 2  # Art arda reddedilen ölçüm sayısı
+VERI_BOSLUGU_SURESI = 5.0  # Bundan uzun örnek boşluğunda filtre yeniden başlatılır (s)
+
+
+def dikey_ivme(ivme_x, ivme_y, ivme_z, pitch, roll) -> float:
+    """
+    Gövde eksenindeki ivmeölçer okumasından (m/s²) yerçekimi çıkarılmış dikey
+    ivme (yukarı +). pitch/roll derece; IMU montaj yönü doğrulanmalıdır.
+    """
+    teta = math.radians(pitch)
+    fi = math.radians(roll)
+    return (-ivme_x * math.sin(teta) + ivme_y * math.sin(fi) * math.cos(teta)
+            + ivme_z * math.cos(fi) * math.cos(teta) - YERCEKIMI)
+
+
+class IrtifaKalmanFiltresi:
+    """
+    Sabit adımlı irtifa + dikey hız Kalman filtresi.
+
+    Args:
+        adim: Varsayılan örnek aralığı (s); guncelle(dt=...) ile değiştirilebilir
+        olcum_std: Barometrik irtifa gürültüsü (m)
+        ivme_std: Modellenmeyen dikey ivme (m/s²)
+        kapi: Aykırı ölçüm eşiği (inovasyon standart sapması katı)
+    """
+
+    def __init__(self, adim=1.0, olcum_std=0.5, ivme_std=2.0, kapi=5.0):
+        self.adim = adim
+        self.r = olcum_std * olcum_std
+        self.qa = ivme_std * ivme_std
+        self.kapi2 = kapi * kapi
+        self.sifirla()
+
+        # İstatistikler
+        self.ornek = 0
+        self.reddedilen = 0
+        self.yeniden_kilitlenme = 0
+
+    def sifirla(self):
+        """Bir sonraki ölçümle yeniden başlar (ör. uzun veri boşluğundan sonra)"""
+        self.irtifa = 0.0
+        self.dikey_hiz = 0.0
+        self.p00 = self.p01 = self.p11 = 0.0
+        self.baslatildi = False
+        self._ardisik_red = 0
+        self._red_irtifa = 0.0
+        self._red_dt = 0.0
+
+    @property
+    def inis_hizi(self) -> float:
+        """İniş hızı (m/s, aşağı +)"""
+        return -self.dikey_hiz
+
+    def guncelle(self, olcum, dt=None, ivme=None):
+        """
+        Bir örnek işler; (irtifa, dikey_hiz) döndürür.
+
+        Args:
+            olcum: Barometrik irtifa (m)
+            dt: Önceki örnekten bu yana geçen süre (None: adim)
+            ivme: Yerçekimi çıkarılmış dikey ivme (m/s², yukarı +) veya None
+        """
+        self.ornek += 1
+        if not self.baslatildi:
+            self.irtifa = olcum
+            self.dikey_hiz = 0.0
+            self.p00 = self.r
+            self.p01 = 0.0
+            self.p11 = 50.0 * 50.0  # Hız bilinmiyor
+            self.baslatildi = True
+            return self.irtifa, self.dikey_hiz
+
+        if dt is None or dt <= 0.0:
+            dt = self.adim
+        dt2 = dt * dt
+
+        # Tahmin: x = F x + B a,  P = F P F' + Q
+        a = ivme if ivme is not None else 0.0
+        irtifa = self.irtifa + self.dikey_hiz * dt + 0.5 * a * dt2
+        dikey_hiz = self.dikey_hiz + a * dt
+        qa = self.qa
+        p00 = self.p00 + dt * (2.0 * self.p01 + dt * self.p11) + qa * dt2 * dt2 * 0.25
+        p01 = self.p01 + dt * self.p11 + qa * dt2 * dt * 0.5
+        p11 = self.p11 + qa * dt2
+
+        # Aykırı ölçüm kapısı
+        self._red_dt += dt
+        inovasyon = olcum - irtifa
+        s = p00 + self.r
+        if inovasyon * inovasyon > self.kapi2 * s:
+            self.reddedilen += 1
+            self._ardisik_red += 1
+            if self._ardisik_red >= YENIDEN_KILITLENME:
+                # Ölçümler tutarlı biçimde tahminden uzak: son iki ölçümle yeniden başla
+                self.dikey_hiz = (olcum - self._red_irtifa) / self._red_dt
+                self.irtifa = olcum
+                self.p00 = self.r
+                self.p01 = self.r / self._red_dt
+                self.p11 = 2.0 * self.r / (self._red_dt * self._red_dt) + self.qa * dt2
+                self._ardisik_red = 0
+                self.yeniden_kilitlenme += 1
+                return self.irtifa, self.dikey_hiz
+            if self._ardisik_red == 1:
+                self._red_irtifa = olcum
+                self._red_dt = 0.0
+            self.irtifa, self.dikey_hiz = irtifa, dikey_hiz
+            self.p00, self.p01, self.p11 = p00, p01, p11
+            return self.irtifa, self.dikey_hiz
+        if self._ardisik_red:
+            self._ardisik_red = 0
+
+        # Güncelleme
+        k0 = p00 / s
+        k1 = p01 / s
+        self.irtifa = irtifa + k0 * inovasyon
+        self.dikey_hiz = dikey_hiz + k1 * inovasyon
+        self.p00 = (1.0 - k0) * p00
+        self.p01 = (1.0 - k0) * p01
+        self.p11 = p11 - k1 * p01
+        return self.irtifa, self.dikey_hiz
+
+    def get_istatistikler(self) -> dict:
+        return {
+            'irtifa': round(self.irtifa, 2),
+            'dikey_hiz': round(self.dikey_hiz, 2),
+            'irtifa_std': round(math.sqrt(max(0.0, self.p00)), 3),
+            'hiz_std': round(math.sqrt(max(0.0, self.p11)), 3),
+            'ornek': self.ornek,
+            'reddedilen': self.reddedilen,
+            'yeniden_kilitlenme': self.yeniden_kilitlenme
+        }
+
+
+# Test için örnek kullanım: simüle uçuş profilinde çevrimdışı doğrulama
+if __name__ == '__main__':
+    import random
+    import time
+
+    def simule_irtifa(t):
+        """SensorManager._oku_sensorler_simule ile aynı profil: (irtifa, dikey hız)"""
+        if t < 10:
+            return 500 + t * 50, 50.0
+        if t < 30:
+            return max(0, 500 - (t - 10) * 15), -15.0
+        return max(0, 400 - (t - 30) * 7), -7.0 if t < 30 + 400 / 7 else 0.0
+
+    class EskiYontem:
+        """Eski _hesapla_inis_hizi: fark + 5 örneklik medyan, 50 m/s üstü atılır"""
+        def __init__(self):
+            self.gecmis = []
+            self.onceki = None
+
+        def guncelle(self, irtifa, dt):
+            if self.onceki is None:
+                self.onceki = irtifa
+                return 0.0
+            ham = abs((self.onceki - irtifa) / dt)
+            if ham > 50.0:
+                return self.gecmis[-1] if self.gecmis else 0.0
+            self.gecmis.append(ham)
+            if len(self.gecmis) > 5:
+                self.gecmis.pop(0)
+            sirali = sorted(self.gecmis)
+            self.onceki = irtifa
+            return sirali[len(sirali) // 2] if len(sirali) >= 3 else sum(sirali) / len(sirali)
+
+    random.seed(7)
+    for adim, gurultu in ((1.0, 0.5), (1.0, 1.5), (0.1, 0.5)):
+        filtre = IrtifaKalmanFiltresi(adim=adim, olcum_std=gurultu)
+        eski = EskiYontem()
+        hata_kalman, hata_eski = [], []
+        n = int(80 / adim)
+        for i in range(n):
+            t = i * adim
+            gercek, hiz = simule_irtifa(t)
+            olcum = gercek + random.gauss(0.0, gurultu)
+            if i == n // 3:
+                olcum += 80.0  # Tek örneklik basınç sıçraması
+            filtre.guncelle(olcum, adim)
+            eski_hiz = eski.guncelle(olcum, adim)
+            # Faz geçişlerinden (t=10, 30) sonraki 3 s kilitlenme süresi olarak dışarıda
+            if t < 3 or 10 <= t < 13 or 30 <= t < 33 or hiz > 0:
+                continue
+            hata_kalman.append(filtre.inis_hizi + hiz)
+            hata_eski.append(eski_hiz + hiz)
+
+        def rms(hatalar):
+            return (sum(h * h for h in hatalar) / len(hatalar)) ** 0.5
+
+        def bant_disi(hatalar):
+            # ARAS bantları ±1 m/s genişliğinde (12-14, 6-8): daha büyük hata yanlış alarm verebilir
+            return sum(abs(h) > 1.0 for h in hatalar)
+
+        print(f"📉 dt={adim}s σ={gurultu}m: iniş hızı RMS hata eski {rms(hata_eski):.2f} m/s, "
+              f"Kalman {rms(hata_kalman):.2f} m/s | >1 m/s hatalı örnek eski {bant_disi(hata_eski)}, "
+              f"Kalman {bant_disi(hata_kalman)} / {len(hata_kalman)}")
+        print(f"   {filtre.get_istatistikler()}")
+        assert rms(hata_kalman) < rms(hata_eski)
+
+    # Örnek başına maliyet
+    filtre = IrtifaKalmanFiltresi()
+    olcumler = [500 - 7 * i + random.gauss(0.0, 0.5) for i in range(100000)]
+    baslangic = time.perf_counter()
+    for olcum in olcumler:
+        filtre.guncelle(olcum)
+    sure = time.perf_counter() - baslangic
+    print(f"⏱️ Kalman: {sure / len(olcumler) * 1e6:.2f} µs/örnek")
@@ -28,6 +28,11 @@ try:
 except ImportError:
     print("UYARI: Picamera2 kütüphanesi bulunamadı. Kamera simülasyon modunda çalışacak.")
 
+# Canlı yayın varsayılanları (link tahmini gelene kadar / link boşken)
+CANLI_YAYIN_MAKS_KARE = 8192     # Byte
+CANLI_YAYIN_KARE_ARALIGI = 0.25  # Saniye (4 FPS)
+CANLI_YAYIN_JPEG_KALITESI = 25
+
 
 class KameraYoneticisi:
     def __init__(self, simulate=not IS_RASPBERRY_PI):
@@ -50,6 +55,11 @@ class KameraYoneticisi:
         
         # Video streaming callback
         self.gonder_callback = None
+        self.ham_kare = False
+        
+        # Link tahmincisi abonesi ayarlar (link_tahmini_guncelle)
+        self.kare_araligi = CANLI_YAYIN_KARE_ARALIGI
+        self.maks_kare_bayt = CANLI_YAYIN_MAKS_KARE
 
         if not self.simulate:
             self._setup_camera()
@@ -248,8 +258,12 @@ class KameraYoneticisi:
             except Exception as e:
                 print(f"❌ HATA: Kayıt başlatılamadı: {e}")
 
-    def baslat_canli_yayin(self, gonder_callback):
-        """Canlı video yayınını başlatır."""
+    def baslat_canli_yayin(self, gonder_callback, ham_kare=False):
+        """
+        Canlı video yayınını başlatır.
+        ham_kare=True ise callback DEADBEEF çerçevesi yerine ham JPEG alır
+        (ör. BirlesikXBeeAlici.send_video ile parçalı gönderim).
+        """
         with self._streaming_lock:
             if self.is_streaming:
                 print("UYARI: Canlı yayın zaten aktif.")
@@ -257,6 +271,7 @@ class KameraYoneticisi:
             
             self.is_streaming = True
             self.gonder_callback = gonder_callback
+            self.ham_kare = ham_kare
             
             # Thread başlat
             self.streaming_thread = threading.Thread(target=self._stream_loop, daemon=True)
@@ -361,6 +376,34 @@ class KameraYoneticisi:
         except Exception as e:
             print(f"⚠️ MP4 dönüştürme hatası: {e}")
 
+    def link_tahmini_guncelle(self, tahmin):
+        """LinkKapasiteTahmincisi abonesi: canlı yayın FPS'i ve kare boyutu sınırı"""
+        fps = tahmin['video_fps']
+        self.kare_araligi = 1.0 / fps if fps > 0 else None
+        self.maks_kare_bayt = int(CANLI_YAYIN_MAKS_KARE * tahmin['video_boyut_orani'])
+
+    def _kare_kucult(self, frame_data):
+        """Boyut sınırını aşan kareyi sınırla orantılı düşük kaliteyle yeniden sıkıştırır"""
+        if len(frame_data) <= self.maks_kare_bayt:
+            return frame_data
+        try:
+            from PIL import Image
+        except ImportError:
+            return frame_data
+        kalite = max(5, int(CANLI_YAYIN_JPEG_KALITESI * self.maks_kare_bayt / CANLI_YAYIN_MAKS_KARE))
+        cikti = BytesIO()
+        Image.open(BytesIO(frame_data)).save(cikti, format='JPEG', quality=kalite, optimize=True)
+        return cikti.getvalue()
+
+    def _kare_gonder(self, frame_data):
+        """Kareyi callback'e verir: ham JPEG veya DEADBEEF çerçeveli paket"""
+        if not self.gonder_callback:
+            return
+        if self.ham_kare:
+            self.gonder_callback(frame_data)
+        else:
+            self.gonder_callback(VIDEO_FRAME_BASLANGIC + frame_data + VIDEO_FRAME_BITIS)
+
     def _stream_loop(self):
         """Video akışını sürekli gönderen loop (thread içinde çalışır)."""
         print("📹 Video streaming loop başlatıldı")
@@ -371,15 +414,18 @@ class KameraYoneticisi:
                     # Simülasyon modu: sahte frame gönder
                     time.sleep(0.33)  # 3 FPS
                     sahte_frame = b"FAKE_JPEG_DATA_FOR_SIMULATION"
-                    paket = VIDEO_FRAME_BASLANGIC + sahte_frame + VIDEO_FRAME_BITIS
-                    if self.gonder_callback:
-                        self.gonder_callback(paket)
+                    self._kare_gonder(sahte_frame)
                     continue
                 
                 if not self.camera:
                     print("HATA: Kamera başlatılmamış")
                     break
                 
+                if self.kare_araligi is None:
+                    # Link tahmini videoya bütçe bırakmıyor
+                    time.sleep(1.0)
+                    continue
+                
                 # 🔧 XBee BANDWIDTH OPTİMİZESİ: Düşük çözünürlük + düşük kalite
                 try:
                     # Memory-safe frame capture: BytesIO buffer'ı yeniden kullan
@@ -420,14 +466,12 @@ class KameraYoneticisi:
                             raise capture_error
                     
                     self.stream_buffer.seek(0)
-                    frame_data = self.stream_buffer.getvalue()
+                    frame_data = self._kare_kucult(self.stream_buffer.getvalue())
                     
-                    # Frame boyutu kontrolü (XBee için maksimum ~8KB)
-                    if frame_data and len(frame_data) <= 8192:  # 8KB limit
-                        paket = VIDEO_FRAME_BASLANGIC + frame_data + VIDEO_FRAME_BITIS
-                        if self.gonder_callback:
-                            self.gonder_callback(paket)
-                    elif len(frame_data) > 8192:
+                    # Frame boyutu kontrolü (link tahminine göre, en fazla ~8KB)
+                    if frame_data and len(frame_data) <= self.maks_kare_bayt:
+                        self._kare_gonder(frame_data)
+                    elif len(frame_data) > self.maks_kare_bayt:
                         print(f"⚠️ Frame çok büyük ({len(frame_data)} bytes), atlanıyor")
                 
                 except Exception as buffer_error:
@@ -460,23 +504,19 @@ class KameraYoneticisi:
                             self.stream_buffer.seek(0)
                             self.stream_buffer.truncate(0)
                             img.save(self.stream_buffer, format='JPEG', quality=18)
-                            frame_data = self.stream_buffer.getvalue()
+                            frame_data = self._kare_kucult(self.stream_buffer.getvalue())
                             
                             # Frame gönder
-                            if frame_data and len(frame_data) <= 8192:
-                                paket = VIDEO_FRAME_BASLANGIC + frame_data + VIDEO_FRAME_BITIS
-                                if self.gonder_callback:
-                                    self.gonder_callback(paket)
+                            if frame_data and len(frame_data) <= self.maks_kare_bayt:
+                                self._kare_gonder(frame_data)
                             
                     except Exception as alt_error:
                         print(f"HATA: Alternatif capture da başarısız: {alt_error}")
                         # Son çare: sahte frame gönder
                         sahte_frame = self._create_dummy_frame()
-                        paket = VIDEO_FRAME_BASLANGIC + sahte_frame + VIDEO_FRAME_BITIS
-                        if self.gonder_callback:
-                            self.gonder_callback(paket)
+                        self._kare_gonder(sahte_frame)
                 
-                time.sleep(0.25)  # 4 FPS timing (XBee hızlandırılmış)
+                time.sleep(self.kare_araligi or 1.0)  # Link tahminine göre (varsayılan 4 FPS)
                 
             except Exception as e:
                 print(f"HATA: Frame yakalanamadı: {e}")
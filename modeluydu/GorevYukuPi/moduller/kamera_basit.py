@@ -17,6 +17,11 @@ try:
 except ImportError:
     print("UYARI: Picamera2 kütüphanesi bulunamadı. Kamera simülasyon modunda çalışacak.")
 
+# Canlı yayın varsayılanları (link tahmini gelene kadar / link boşken)
+CANLI_YAYIN_MAKS_KARE = 5120     # Byte
+CANLI_YAYIN_KARE_ARALIGI = 0.25  # Saniye (4 FPS)
+CANLI_YAYIN_JPEG_KALITESI = 18
+
 class BasitKameraYoneticisi:
     def __init__(self, simulate=not IS_RASPBERRY_PI):
         self.simulate = simulate
@@ -30,6 +35,9 @@ class BasitKameraYoneticisi:
         self.is_streaming = False
         self.streaming_thread = None
         self.gonder_callback = None
+        self.ham_kare = False
+        self.kare_araligi = CANLI_YAYIN_KARE_ARALIGI
+        self.maks_kare_bayt = CANLI_YAYIN_MAKS_KARE
         
         print(f"🎥 Basit Kamera Yöneticisi başlatılıyor (simulate={simulate})")
         
@@ -151,8 +159,12 @@ class BasitKameraYoneticisi:
         
         self.camera = None
     
-    def baslat_canli_yayin(self, gonder_callback):
-        """Canlı yayın başlat - YER İSTASYONU İÇİN"""
+    def baslat_canli_yayin(self, gonder_callback, ham_kare=False):
+        """
+        Canlı yayın başlat - YER İSTASYONU İÇİN
+        ham_kare=True ise callback #VIDEO:base64# yerine ham JPEG alır
+        (ör. BirlesikXBeeAlici.send_video ile parçalı gönderim)
+        """
         if self.simulate:
             print("📹 Canlı yayın simülasyonu (basit kamera)")
             return
@@ -164,6 +176,7 @@ class BasitKameraYoneticisi:
         try:
             print("📹 Canlı yayın başlatılıyor (yer istasyonu)")
             self.gonder_callback = gonder_callback
+            self.ham_kare = ham_kare
             
             # Canlı yayın thread'i başlat
             self.streaming_thread = threading.Thread(target=self._canli_yayin_loop, daemon=True)
@@ -175,6 +188,12 @@ class BasitKameraYoneticisi:
         except Exception as e:
             print(f"❌ Canlı yayın başlatma hatası: {e}")
             
+    def link_tahmini_guncelle(self, tahmin):
+        """LinkKapasiteTahmincisi abonesi: canlı yayın FPS'i ve kare boyutu sınırı"""
+        fps = tahmin['video_fps']
+        self.kare_araligi = 1.0 / fps if fps > 0 else None
+        self.maks_kare_bayt = int(CANLI_YAYIN_MAKS_KARE * tahmin['video_boyut_orani'])
+            
     def _canli_yayin_loop(self):
         """Canlı yayın döngüsü - YER İSTASYONU İÇİN OPTİMİZE EDİLDİ"""
         print("📹 Canlı yayın döngüsü başladı (Optimize Edilmiş)")
@@ -182,6 +201,11 @@ class BasitKameraYoneticisi:
         try:
             while self.is_streaming and self.camera:
                 try:
+                    if self.kare_araligi is None:
+                        # Link tahmini videoya bütçe bırakmıyor
+                        time.sleep(1)
+                        continue
+                    
                     # Frame yakala (Optimize edilmiş)
                     from io import BytesIO
                     
@@ -192,8 +216,9 @@ class BasitKameraYoneticisi:
                     frame_data = stream.getvalue()
                     stream.close()
                     
-                    # Frame boyutu çok büyükse PIL ile kaliteyi daha da düşür (5KB sınırı - hızlandırılmış)
-                    if len(frame_data) > 5120:
+                    # Frame boyutu çok büyükse PIL ile kaliteyi daha da düşür (link tahminine göre, en fazla 5KB)
+                    maks_kare = self.maks_kare_bayt
+                    if len(frame_data) > maks_kare:
                         try:
                             from PIL import Image
                             import io
@@ -201,27 +226,33 @@ class BasitKameraYoneticisi:
                             img = Image.open(io.BytesIO(frame_data))
                             output_stream = BytesIO()
                             # Kaliteyi düşürerek boyutu küçült (hızlandırılmış ayar)
-                            img.save(output_stream, format='JPEG', quality=18, optimize=True)
+                            kalite = max(5, int(CANLI_YAYIN_JPEG_KALITESI * maks_kare / CANLI_YAYIN_MAKS_KARE))
+                            img.save(output_stream, format='JPEG', quality=kalite, optimize=True)
                             frame_data = output_stream.getvalue()
                             output_stream.close()
                         except ImportError:
                             print("⚠️ PIL kütüphanesi bulunamadı, frame sıkıştırılamıyor!")
 
                     # Sadece geçerli ve boyutu uygun frame'leri gönder (hızlandırılmış limit)
-                    if self.gonder_callback and len(frame_data) > 100 and len(frame_data) <= 5120:
-                        # YER İSTASYONU UYUMLU FORMAT: #VIDEO:base64_data#
-                        import base64
-                        base64_data = base64.b64encode(frame_data).decode('utf-8')
-                        video_string = f"#VIDEO:{base64_data}#\n"
-                        
-                        # Callback ile string formatını gönder
-                        self.gonder_callback(video_string.encode('utf-8'))
-                        print(f"📡 Video frame gönderildi ({len(frame_data)} bytes)")
-                    elif len(frame_data) > 5120:
-                        print(f"⚠️ Frame çok büyük ({len(frame_data)} bytes), atlanıyor (>5KB)")
+                    if self.gonder_callback and len(frame_data) > 100 and len(frame_data) <= maks_kare:
+                        if self.ham_kare:
+                            # Parçalı gönderim: ham JPEG, parçalama gönderici tarafında
+                            self.gonder_callback(frame_data)
+                            print(f"📡 Video frame gönderildi ({len(frame_data)} bytes, parçalı)")
+                        else:
+                            # YER İSTASYONU UYUMLU FORMAT: #VIDEO:base64_data#
+                            import base64
+                            base64_data = base64.b64encode(frame_data).decode('utf-8')
+                            video_string = f"#VIDEO:{base64_data}#\n"
+                            
+                            # Callback ile string formatını gönder
+                            self.gonder_callback(video_string.encode('utf-8'))
+                            print(f"📡 Video frame gönderildi ({len(frame_data)} bytes)")
+                    elif len(frame_data) > maks_kare:
+                        print(f"⚠️ Frame çok büyük ({len(frame_data)} bytes), atlanıyor (>{maks_kare} bytes)")
 
-                    # FPS kontrolü (XBee için hızlandırılmış)
-                    time.sleep(0.25)  # 4 FPS'e denk gelir (1/4) - HIZLANDIRILDI
+                    # FPS kontrolü: link tahminine göre (varsayılan 4 FPS)
+                    time.sleep(self.kare_araligi or 1)
                     
                 except Exception as e:
                     print(f"⚠️ Frame yakalama/gönderme hatası: {e}")
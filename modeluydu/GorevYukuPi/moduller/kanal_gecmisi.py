@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Kanal Geçmişi Modülü
+
+Tek geçmiş TelemetryHandler'daki 5 elemanlı hız listesiydi; "son 3 s
+ortalama iniş hızı" veya "ayrılmadan beri en büyük eğim" gibi sorular
+sorulamıyordu. KanalGecmisi tüm telemetri kanallarının son N örneğini
+(kanal x zaman) baştan ayrılmış 2 boyutlu bir NumPy halkasında tutar:
+
+- Aynalı halka: her örnek hem i hem i+N sütununa yazılır; son n örnek her
+  zaman bitişik bir dilimdir. pencere() kopya değil salt-okunur görünüm
+  (view) döndürür - durum makinesi, ARAS kontrolleri ve SD özeti aynı
+  tampona ek bellek ayırmadan bakar
+- ekle() O(1): bir sütun (kanal sayısı kadar değer) iki kez yazılır
+- Pencere örnek sayısıyla (n), son örneğe göre süreyle (sure) veya mutlak
+  başlangıç zamanıyla (baslangic, ör. ayrılma anı) seçilir; zaman araması
+  searchsorted ile O(log N)
+- istatistik()/ozet(): ortalama, en küçük/büyük ve en küçük kareler eğimi
+  (birim/s) tüm kanallar için tek vektörel geçişte
+
+Görünümler halka üzerinde canlıdır: (kapasite - n) yeni örnekten sonra
+üzerine yazılır; uzun süre tutulacaksa kopyalanmalıdır.
+NumPy gerekir; yoksa TelemetryHandler geçmişi devre dışı bırakır.
+"""
+
+import math
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# TelemetryHandler'ın geçmişe yazdığı kanallar (egim türetilir)
+TELEMETRI_KANALLARI = (
+    'irtifa', 'inis_hizi', 'basinc', 'tasiyici_basinci', 'sicaklik', 'pil_gerilimi',
+    'pitch', 'roll', 'yaw', 'egim', 'ivme_x', 'ivme_y', 'ivme_z',
+    'gyro_x', 'gyro_y', 'gyro_z', 'iot_s1', 'iot_s2'
+)
+
+
+def egim_acisi(pitch, roll) -> float:
+    """Pitch/roll'dan (derece) düşeyden sapma açısı (derece)"""
+    cos_egim = math.cos(math.radians(pitch)) * math.cos(math.radians(roll))
+    return math.degrees(math.acos(max(-1.0, min(1.0, cos_egim))))
+
+
+def telemetri_degerleri(kayit) -> tuple:
+    """TelemetriKaydi'ndan TELEMETRI_KANALLARI sırasıyla değerler"""
+    return (kayit.irtifa, kayit.inis_hizi, kayit.basinc, kayit.tasiyici_basinci,
+            kayit.sicaklik, kayit.pil_gerilimi, kayit.pitch, kayit.roll, kayit.yaw,
+            egim_acisi(kayit.pitch, kayit.roll), kayit.ivme_x, kayit.ivme_y, kayit.ivme_z,
+            kayit.gyro_x, kayit.gyro_y, kayit.gyro_z, kayit.iot_s1, kayit.iot_s2)
+
+
+class KanalGecmisi:
+    """
+    Kanal x zaman sabit kapasiteli aynalı halka (yazma thread-safe).
+
+    Args:
+        kanallar: Kanal adları (ekle() değerleri bu sırayla verilir)
+        kapasite: Kanal başına tutulacak en fazla örnek (ör. 600 = 1 Hz'de 10 dakika)
+    """
+
+    def __init__(self, kanallar=TELEMETRI_KANALLARI, kapasite=600):
+        if np is None:
+            raise ImportError("KanalGecmisi için NumPy gerekli")
+        self.kanallar = tuple(kanallar)
+        self.indeks = {ad: i for i, ad in enumerate(self.kanallar)}
+        self.kapasite = kapasite
+        self._veri = np.zeros((len(self.kanallar), 2 * kapasite), dtype=np.float64)
+        self._zaman = np.zeros(2 * kapasite, dtype=np.float64)
+        self._yaz = 0       # Sonraki yazılacak yuva [0, kapasite)
+        self._dolu = 0
+        self._lock = threading.Lock()
+        self.eklenen = 0
+
+    def ekle(self, zaman: float, degerler):
+        """Bir örnek (tüm kanallar) ekler; en eski örneğin üzerine yazar"""
+        with self._lock:
+            i = self._yaz
+            self._veri[:, i] = degerler
+            self._veri[:, i + self.kapasite] = self._veri[:, i]
+            self._zaman[i] = self._zaman[i + self.kapasite] = zaman
+            self._yaz = i + 1 if i + 1 < self.kapasite else 0
+            if self._dolu < self.kapasite:
+                self._dolu += 1
+            self.eklenen += 1
+
+    def __len__(self):
+        return self._dolu
+
+    def _aralik(self, n=None, sure=None, baslangic=None):
+        """İstenen pencerenin aynalı tampondaki [bas, son) sütunları"""
+        with self._lock:
+            son = self._yaz + self.kapasite
+            dolu = self._dolu
+        adet = dolu if n is None else min(n, dolu)
+        bas = son - adet
+        if (sure is not None or baslangic is not None) and adet:
+            esik = baslangic if baslangic is not None else self._zaman[son - 1] - sure
+            bas += int(np.searchsorted(self._zaman[bas:son], esik, side='left'))
+        return bas, son
+
+    def _gorunum(self, dizi):
+        dizi.flags.writeable = False
+        return dizi
+
+    def pencere(self, kanal=None, n=None, sure=None, baslangic=None):
+        """
+        Pencerenin salt-okunur görünümü (kopya yok).
+
+        Args:
+            kanal: Kanal adı (1 boyutlu görünüm) veya None (kanal x zaman)
+            n: Son n örnek
+            sure: Son örnekten geriye saniye
+            baslangic: Bu zamandan (dahil) sonraki örnekler
+        Returns:
+            (zamanlar, degerler) görünümleri
+        """
+        bas, son = self._aralik(n, sure, baslangic)
+        zamanlar = self._gorunum(self._zaman[bas:son])
+        if kanal is None:
+            return zamanlar, self._gorunum(self._veri[:, bas:son])
+        return zamanlar, self._gorunum(self._veri[self.indeks[kanal], bas:son])
+
+    def son(self, kanal):
+        """Kanalın son değeri (boşsa None)"""
+        if not self._dolu:
+            return None
+        return float(self._veri[self.indeks[kanal], self._yaz + self.kapasite - 1])
+
+    @staticmethod
+    def _egim(zamanlar, degerler):
+        """En küçük kareler eğimi (birim/s); degerler 1 veya 2 boyutlu (son eksen zaman)"""
+        if len(zamanlar) < 2:
+            return np.zeros(degerler.shape[:-1]) if degerler.ndim > 1 else 0.0
+        t = zamanlar - zamanlar.mean()
+        payda = t @ t
+        if payda == 0.0:
+            return np.zeros(degerler.shape[:-1]) if degerler.ndim > 1 else 0.0
+        return (degerler @ t) / payda  # sum(t * (y - ort)) = sum(t * y) çünkü sum(t) = 0
+
+    def istatistik(self, kanal, n=None, sure=None, baslangic=None):
+        """Tek kanal için pencere istatistikleri (boş pencerede None)"""
+        zamanlar, degerler = self.pencere(kanal, n, sure, baslangic)
+        if not len(degerler):
+            return None
+        return {
+            'n': len(degerler),
+            'ortalama': float(degerler.mean()),
+            'en_kucuk': float(degerler.min()),
+            'en_buyuk': float(degerler.max()),
+            'egim': float(self._egim(zamanlar, degerler))
+        }
+
+    def ozet(self, kanallar=None, n=None, sure=None, baslangic=None, basamak=3) -> dict:
+        """Birden çok kanal için istatistikler, tek vektörel geçişte (SD özeti için)"""
+        zamanlar, blok = self.pencere(None, n, sure, baslangic)
+        if not len(zamanlar):
+            return {}
+        satirlar = [self.indeks[k] for k in kanallar] if kanallar else slice(None)
+        blok = blok[satirlar]  # Liste indeksi kopyalar; slice görünüm kalır
+        adlar = kanallar or self.kanallar
+        ortalama = np.round(blok.mean(axis=1), basamak)
+        en_kucuk = np.round(blok.min(axis=1), basamak)
+        en_buyuk = np.round(blok.max(axis=1), basamak)
+        egim = np.round(self._egim(zamanlar, blok), basamak)
+        return {
+            'n': len(zamanlar),
+            'sure_s': round(float(zamanlar[-1] - zamanlar[0]), 3),
+            'kanallar': {
+                ad: {'ortalama': float(ortalama[i]), 'en_kucuk': float(en_kucuk[i]),
+                     'en_buyuk': float(en_buyuk[i]), 'egim': float(egim[i])}
+                for i, ad in enumerate(adlar)
+            }
+        }
+
+    def get_istatistikler(self) -> dict:
+        return {
+            'kanal': len(self.kanallar),
+            'kapasite': self.kapasite,
+            'dolu': self._dolu,
+            'eklenen': self.eklenen,
+            'bellek_bayt': self._veri.nbytes + self._zaman.nbytes
+        }
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import time
+    import tracemalloc
+
+    gecmis = KanalGecmisi(('irtifa', 'inis_hizi', 'egim'), kapasite=600)
+
+    # 1 Hz'de 25 dakika (sentetik): 10 s yükselme, sonra 7 m/s iniş; 900. saniyede tek eğim sıçraması
+    tracemalloc.start()
+    for t in range(600):
+        irtifa = 10500 + 50 * t if t < 10 else 11000 - 7 * (t - 10)
+        gecmis.ekle(float(t), (irtifa, 7.0 if t >= 10 else -50.0, abs((t % 40) - 20)))
+    onceki, _ = tracemalloc.get_traced_memory()
+    for t in range(600, 1500):
+        gecmis.ekle(float(t), (11000 - 7 * (t - 10), 7.0 + (t % 3 - 1) * 0.3, 10.0 if t == 900 else 3.0))
+    sonraki, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"💾 900 ekleme sonrası bellek farkı: {sonraki - onceki} byte ({gecmis.get_istatistikler()})")
+
+    zamanlar, irtifa = gecmis.pencere('irtifa', sure=3)
+    assert list(zamanlar) == [1496.0, 1497.0, 1498.0, 1499.0]
+    assert np.shares_memory(irtifa, gecmis._veri), "Pencere kopya değil görünüm olmalı"
+    assert not irtifa.flags.writeable
+    assert abs(gecmis.istatistik('irtifa', n=60)['egim'] + 7.0) < 1e-9
+    assert gecmis.istatistik('egim', baslangic=850.0)['en_buyuk'] == 10.0
+    assert len(gecmis.pencere('irtifa')[1]) == 600 and gecmis.son('irtifa') == 11000 - 7 * 1489
+    print(f"📈 Son 3 s iniş hızı: {gecmis.istatistik('inis_hizi', sure=3)}")
+    print(f"📋 Son 30 s özet: {gecmis.ozet(sure=30)}")
+
+    # Eski yöntem (liste + kopya) ile karşılaştırma: tüm kanallar için 60 s istatistik
+    tam = KanalGecmisi(kapasite=600)
+    liste = []
+    for t in range(1200):
+        degerler = tuple(float(t + k) for k in range(len(TELEMETRI_KANALLARI)))
+        tam.ekle(float(t), degerler)
+        liste.append((float(t), degerler))
+        if len(liste) > 600:
+            liste.pop(0)
+
+    def liste_ozeti():
+        son = liste[-60:]
+        return [(sum(d[k] for _, d in son) / len(son), min(d[k] for _, d in son),
+                 max(d[k] for _, d in son)) for k in range(len(TELEMETRI_KANALLARI))]
+
+    for ad, fonksiyon in (("liste özeti", liste_ozeti), ("NumPy özeti", lambda: tam.ozet(n=60)),
+                          ("ekle", lambda: tam.ekle(0.0, degerler))):
+        baslangic = time.perf_counter()
+        for _ in range(2000):
+            fonksiyon()
+        print(f"⏱️ {ad:12s}: {(time.perf_counter() - baslangic) / 2000 * 1e6:.1f} µs")
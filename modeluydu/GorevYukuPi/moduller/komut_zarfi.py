@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Komut Zarfı Modülü
+
+Yer istasyonu komutları sıra numarası taşımaz; link gürültüsü yüzünden
+tekrarlanan bir komut (ör. saniyelerce süren gyro kalibrasyonu) yeniden
+çalışır. İsteğe bağlı zarf ile her komut bir kimlik taşır:
+
+    @<id>:<komut>          ör. @17:!xT!   @18:#CALIB_GYRO:RESET#
+    ACK:<id>:<sonuç>       ör. ACK:17:OK  ACK:18:HATA
+
+- Her kimlik bir kez çalıştırılır ve tam bir onay üretir
+- Son çalıştırılan kimlikler LRU önbellekte tutulur; tekrar gelen komut
+  işleyici çalıştırılmadan önbellekteki sonuçla yanıtlanır (ilk onay
+  kaybolduysa yer istasyonu yine yanıt alır)
+- Önbellek kaydı KOMUT_ONBELLEK_SURESI sonra düşer: yer istasyonu yeniden
+  başlayıp kimlikleri baştan kullanırsa eski sonuç dönmez
+- Zarfsız komutlar eskisi gibi doğrudan çalıştırılır: ACK yerine
+  işleyicinin eski yanıt satırı (ör. GYRO_CALIB_OK) gönderilir. Zarflı
+  komutta yalnızca ACK gider; yanıt her denemede aynıdır
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+ZARF_ONEKI = "@"
+ONAY_ONEKI = "ACK:"
+MAKS_KIMLIK_UZUNLUGU = 8
+
+SONUC_TAMAM = "OK"
+SONUC_HATA = "HATA"
+SONUC_BILINMEYEN = "BILINMEYEN"
+
+
+def zarf_coz(mesaj: str):
+    """(komut_id, komut) döndürür; zarfsız/geçersiz zarfta (None, mesaj)"""
+    if not mesaj.startswith(ZARF_ONEKI):
+        return None, mesaj
+    komut_id, ayirici, komut = mesaj[1:].partition(":")
+    if not ayirici or not komut or not komut_id.isalnum() or len(komut_id) > MAKS_KIMLIK_UZUNLUGU:
+        return None, mesaj
+    return komut_id, komut
+
+
+def zarf_olustur(komut_id, komut: str) -> str:
+    return f"{ZARF_ONEKI}{komut_id}:{komut}"
+
+
+def onay_olustur(komut_id, sonuc: str) -> str:
+    return f"{ONAY_ONEKI}{komut_id}:{sonuc}"
+
+
+class TekrarsizKomutIsleyici:
+    """
+    Zarflı komutları kimlik başına bir kez çalıştırır.
+
+    Args:
+        yurut: yurut(komut) -> sonuç (str/None=OK) veya (sonuç, eski_yanit);
+            istisna HATA sayılır. eski_yanit yalnızca zarfsız komutta gönderilir
+        onay_gonder: onay_gonder(satir) - ACK ve eski yanıtlar için, ör. birlesik_xbee.send_telemetry
+        kapasite: LRU önbellekteki kimlik sayısı
+        sure: Önbellek kaydının geçerlilik süresi (s)
+        saat: Zaman fonksiyonu (varsayılan time.monotonic)
+    """
+
+    def __init__(self, yurut, onay_gonder=None, kapasite=64, sure=300.0, saat=time.monotonic):
+        self.yurut = yurut
+        self.onay_gonder = onay_gonder
+        self.kapasite = kapasite
+        self.sure = sure
+        self.saat = saat
+        self._onbellek = OrderedDict()  # komut_id -> (sonuc, zaman)
+        self._calisan = set()
+        self._lock = threading.Lock()
+
+        # İstatistikler
+        self.yurutulen = 0
+        self.tekrar = 0
+        self.zarfsiz = 0
+
+    def isle(self, mesaj: str):
+        """Komutu işler; çalıştırma/önbellek sonucunu döndürür (çalışıyorsa None)"""
+        komut_id, komut = zarf_coz(mesaj)
+        if komut_id is None:
+            self.zarfsiz += 1
+            sonuc, eski_yanit = self._calistir(komut)
+            if eski_yanit and self.onay_gonder is not None:
+                self.onay_gonder(eski_yanit)
+            return sonuc
+
+        with self._lock:
+            simdi = self.saat()
+            kayit = self._onbellek.get(komut_id)
+            if kayit is not None and simdi - kayit[1] > self.sure:
+                del self._onbellek[komut_id]
+                kayit = None
+            if kayit is not None or komut_id in self._calisan:
+                self.tekrar += 1
+                if kayit is None:
+                    return None  # Aynı komut hâlâ çalışıyor; onayı o gönderecek
+                self._onbellek.move_to_end(komut_id)
+                sonuc = kayit[0]
+            else:
+                self._calisan.add(komut_id)
+                sonuc = None
+
+        if sonuc is None:
+            try:
+                sonuc, _ = self._calistir(komut)
+            finally:
+                with self._lock:
+                    self._calisan.discard(komut_id)
+            with self._lock:
+                self.yurutulen += 1
+                self._onbellek[komut_id] = (sonuc, self.saat())
+                while len(self._onbellek) > self.kapasite:
+                    self._onbellek.popitem(last=False)
+
+        if self.onay_gonder is not None:
+            self.onay_gonder(onay_olustur(komut_id, sonuc))
+        return sonuc
+
+    def _calistir(self, komut: str):
+        """(sonuç, eski_yanit) döndürür"""
+        try:
+            sonuc = self.yurut(komut)
+        except Exception:
+            return SONUC_HATA, None
+        eski_yanit = None
+        if isinstance(sonuc, tuple):
+            sonuc, eski_yanit = sonuc
+        return (SONUC_TAMAM if sonuc is None else str(sonuc)), eski_yanit
+
+    def get_istatistikler(self) -> dict:
+        return {
+            'yurutulen': self.yurutulen,
+            'tekrar': self.tekrar,
+            'zarfsiz': self.zarfsiz,
+            'onbellek': len(self._onbellek)
+        }
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import random
+
+    calisma = {}
+    onaylar = []
+
+    def yurut(komut):
+        calisma[komut] = calisma.get(komut, 0) + 1
+        if komut.startswith("#CALIB_GYRO"):
+            return "OK", "GYRO_CALIB_OK"
+        if komut == "!HATA!":
+            raise RuntimeError("örnek hata")
+        return None
+
+    isleyici = TekrarsizKomutIsleyici(yurut, onaylar.append, kapasite=16)
+
+    # Her komut gürültülü linkte 1-3 kez gelir
+    random.seed(0)
+    komutlar = [zarf_olustur(i, random.choice(("!xT!", "#CALIB_GYRO:RESET#", "!6R7G!", "!HATA!")))
+                for i in range(50)]
+    gelen = [k for k in komutlar for _ in range(random.randint(1, 3))]
+    for mesaj in gelen:
+        isleyici.isle(mesaj)
+
+    assert sum(calisma.values()) == len(komutlar), "Her kimlik bir kez çalışmalı"
+    assert len({o.split(":")[1] for o in onaylar}) == len(komutlar)
+    assert all(o.startswith("ACK:") for o in onaylar), "Zarflı komuta yalnızca ACK gider"
+    print(f"✅ {len(gelen)} mesaj ({len(gelen) - len(komutlar)} tekrar) -> {sum(calisma.values())} çalıştırma, "
+          f"{len(onaylar)} onay, {isleyici.get_istatistikler()}")
+    print(f"   Örnek onaylar: {onaylar[:4]}")
+
+    # Zarfsız komut: eskisi gibi çalışır, ACK yok, eski yanıt satırı gider
+    onaylar.clear()
+    isleyici.isle("!xT!")
+    isleyici.isle("!xT!")
+    isleyici.isle("#CALIB_GYRO:RESET#")
+    assert onaylar == ["GYRO_CALIB_OK"], onaylar
+    print(f"📻 Zarfsız: {calisma['!xT!']} çalıştırma (tekrar korunmaz), yanıtlar: {onaylar}")
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+Link Kapasite Tahmincisi Modülü
+
+yapilandirma.py'deki bant genişliği bütçesi el ile hesaplanmıştır; bu
+modül aynı bütçeyi uçuş sırasında ölçer:
+1. Seri porta gerçekten yazılan byte (XBeeMetrikleri.tx_bayt) ve sınıf
+   başına payload (TxZamanlayici.gonderilen_bayt) -> çerçeve ek yükü oranı
+2. API modunda 0x8B TX Status gecikmesi ve son teslim oranı
+   (TeslimTakipcisi); gecikme artışı XBee'nin MAC yeniden denemesi veya
+   modül tamponunda bekleme demektir, kapasite orantılı düşürülür
+3. Gelen trafik (yarı çift yönlü radyo hava süresini paylaşır) ve okunmamış
+   RX birikimi
+4. TX kuyruğunda bekleyen byte ve atılan öğeler (aşırı yük işareti)
+
+Çıktı: etkin goodput tahmini, telemetri/onay/geçmiş trafiğinden sonra videoya
+kalan bütçe ve buna göre önerilen video FPS'i / kare boyutu oranı.
+Aboneler (kamera döngüleri, telemetri aralığı) her güncellemede tahmin
+sözlüğünü alır. Video bütçesi, kapasiteden güvenlik payı, öncelikli trafik
+ve kuyruk birikimini eritme payı düşülerek hesaplanır; token bucket
+zaten hattı sınırlar, bu modül kuyruğa hiç fazla veri girmemesini sağlar.
+
+guncelle() ucuzdur ve LINK_TAHMIN_ARALIGI'ndan sık çağrılırsa hiçbir şey
+yapmaz; gönderim yollarından her çağrıda çağrılabilir. Her tahmin uçuş
+sonrası ayar için geçmişe eklenir, SD metrik kaydında boşaltılır.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+from moduller.yapilandirma import (
+    LINK_TAHMIN_ARALIGI, LINK_TAHMIN_YUMUSATMA, LINK_GUVENLIK_PAYI,
+    LINK_HEDEF_DURUM_GECIKMESI, LINK_RX_BIRIKIM_SINIRI, LINK_KUYRUK_BOSALTMA_SURESI,
+    LINK_VIDEO_MIN_FPS, LINK_VIDEO_MAKS_FPS, LINK_VIDEO_MIN_BOYUT_ORANI
+)
+from moduller.tx_zamanlayici import ONCELIK_TELEMETRI, ONCELIK_ONAY, ONCELIK_GECMIS, ONCELIK_VIDEO
+
+logger = logging.getLogger('LinkTahmincisi')
+
+TAHMIN_GECMISI = 120       # SD kaydına kadar saklanan en fazla tahmin
+ASIRI_YUK_KATSAYISI = 0.5  # Kuyrukta öğe atıldıysa video bütçesi bu oranla çarpılır
+
+
+class LinkKapasiteTahmincisi:
+    """
+    Ölçülen link kapasitesi ve video bütçesi (thread-safe).
+
+    Args:
+        zamanlayici: Giden veriyi yazan TxZamanlayici (hava süresi bütçesi hiz)
+        metrikler: XBeeMetrikleri (yazılan/okunan byte sayaçları)
+        teslim_takipcisi: API modunda TeslimTakipcisi (yoksa teslim oranı 1.0)
+        rx_birikimi: Okunmamış RX byte sayısını veren fonksiyon (ör. in_waiting)
+        aralik: En kısa güncelleme aralığı (s)
+        saat: Zaman fonksiyonu (varsayılan time.monotonic)
+    """
+
+    def __init__(self, zamanlayici, metrikler, teslim_takipcisi=None, rx_birikimi=None,
+                 aralik=LINK_TAHMIN_ARALIGI, saat=time.monotonic):
+        self.zamanlayici = zamanlayici
+        self.metrikler = metrikler
+        self.teslim_takipcisi = teslim_takipcisi
+        self.rx_birikimi = rx_birikimi
+        self.aralik = aralik
+        self.saat = saat
+
+        self._kilit = threading.Lock()
+        self._aboneler = []
+        self._onceki = self._sayaclari_oku(saat())
+
+        # EWMA ile yumuşatılmış ölçümler (byte/s, byte)
+        self._ek_yuk_orani = 1.0     # Yazılan byte / payload byte (API frame ek yükü)
+        self._yazilan_bps = 0.0
+        self._rx_bps = 0.0
+        self._yuk_bps = 0.0          # Zamanlayıcıdan çıkan payload
+        self._oncelikli_bps = 0.0    # Telemetri + onay + geçmiş (hat üzerindeki byte)
+        self._video_bps = 0.0
+        self._video_tam_kare = None  # Hat üzerinde tam boyut (oran 1.0) kare başına byte
+        self._telemetri_paket_bayt = None
+        self._boyut_orani = 1.0      # Son önerilen kare boyutu oranı
+
+        self.son_tahmin = None
+        self.asiri_yuk_sayisi = 0
+        self._gecmis = deque(maxlen=TAHMIN_GECMISI)
+
+    def abone_ol(self, geri_cagir):
+        """geri_cagir(tahmin) her güncellemede (güncelleyen thread'de) çağrılır"""
+        with self._kilit:
+            self._aboneler.append(geri_cagir)
+        if self.son_tahmin is not None:
+            geri_cagir(self.son_tahmin)
+
+    def _sayaclari_oku(self, simdi):
+        z = self.zamanlayici
+        return (simdi, self.metrikler.tx_bayt, self.metrikler.rx_bayt,
+                tuple(z.gonderilen_bayt), tuple(z.tamamlanan), sum(z.dusurulen))
+
+    def _yumusat(self, eski, yeni):
+        return eski + LINK_TAHMIN_YUMUSATMA * (yeni - eski)
+
+    def guncelle(self, zorla=False):
+        """
+        Aralık dolduysa ölçümleri günceller, aboneleri bilgilendirir ve yeni
+        tahmini döndürür; dolmadıysa None.
+        """
+        with self._kilit:
+            simdi = self.saat()
+            sure = simdi - self._onceki[0]
+            if sure <= 0 or (sure < self.aralik and not zorla):
+                return None
+            sayaclar = self._sayaclari_oku(simdi)
+            tahmin = self._hesapla(sayaclar, sure)
+            self._onceki = sayaclar
+            self.son_tahmin = tahmin
+            self._gecmis.append(tahmin)
+            aboneler = list(self._aboneler)
+
+        for geri_cagir in aboneler:
+            try:
+                geri_cagir(tahmin)
+            except Exception as e:
+                logger.error(f"Link tahmini abonesi hatası: {e}")
+        return tahmin
+
+    def _hesapla(self, sayaclar, sure) -> dict:
+        _, tx, rx, gonderilen, tamamlanan, dusurulen = sayaclar
+        _, onceki_tx, onceki_rx, onceki_gonderilen, onceki_tamamlanan, onceki_dusurulen = self._onceki
+
+        d_tx = tx - onceki_tx
+        d_yuk = [g - o for g, o in zip(gonderilen, onceki_gonderilen)]
+        d_kare = [t - o for t, o in zip(tamamlanan, onceki_tamamlanan)]
+        toplam_yuk = sum(d_yuk)
+        if toplam_yuk > 0 and d_tx >= toplam_yuk:
+            self._ek_yuk_orani = self._yumusat(self._ek_yuk_orani, d_tx / toplam_yuk)
+        ek_yuk = self._ek_yuk_orani
+
+        self._yazilan_bps = self._yumusat(self._yazilan_bps, d_tx / sure)
+        self._rx_bps = self._yumusat(self._rx_bps, (rx - onceki_rx) / sure)
+        # Zamanlayıcı kullanılmıyorsa (TX thread'i yokken doğrudan yazma) payload = yazılan
+        self._yuk_bps = self._yumusat(self._yuk_bps, (toplam_yuk or d_tx) / sure)
+        self._oncelikli_bps = self._yumusat(
+            self._oncelikli_bps,
+            (d_yuk[ONCELIK_TELEMETRI] + d_yuk[ONCELIK_ONAY] + d_yuk[ONCELIK_GECMIS]) * ek_yuk / sure)
+        self._video_bps = self._yumusat(self._video_bps, d_yuk[ONCELIK_VIDEO] * ek_yuk / sure)
+        if d_kare[ONCELIK_VIDEO] > 0:
+            # Kareler son önerilen oranla küçültülmüş gönderildi: tam boyuta çevir
+            kare = d_yuk[ONCELIK_VIDEO] * ek_yuk / d_kare[ONCELIK_VIDEO] / self._boyut_orani
+            self._video_tam_kare = kare if self._video_tam_kare is None else self._yumusat(self._video_tam_kare, kare)
+        if d_kare[ONCELIK_TELEMETRI] > 0:
+            paket = d_yuk[ONCELIK_TELEMETRI] * ek_yuk / d_kare[ONCELIK_TELEMETRI]
+            self._telemetri_paket_bayt = paket if self._telemetri_paket_bayt is None else self._yumusat(
+                self._telemetri_paket_bayt, paket)
+
+        # Teslim (API modu)
+        teslim_orani, durum_gecikmesi = 1.0, 0.0
+        if self.teslim_takipcisi is not None:
+            teslim_orani = self.teslim_takipcisi.son_teslim_orani()
+            durum_gecikmesi = self.teslim_takipcisi.durum_gecikmesi()
+
+        # Kapasite: hava süresi bütçesi - gelen trafik, gecikme/RX birikimiyle kısılır
+        kapasite = max(0.0, self.zamanlayici.hiz - self._rx_bps)
+        if durum_gecikmesi > LINK_HEDEF_DURUM_GECIKMESI:
+            kapasite *= LINK_HEDEF_DURUM_GECIKMESI / durum_gecikmesi
+        rx_birikimi = 0
+        if self.rx_birikimi is not None:
+            try:
+                rx_birikimi = self.rx_birikimi() or 0
+            except Exception:
+                rx_birikimi = 0
+        if rx_birikimi > LINK_RX_BIRIKIM_SINIRI:
+            kapasite *= 0.5
+
+        # Video bütçesi: öncelikli trafik ve kuyruk birikimi önce
+        kuyruk_bayt = self.zamanlayici.kuyruk_bayti()
+        bosaltma = kuyruk_bayt * ek_yuk / LINK_KUYRUK_BOSALTMA_SURESI
+        video_butcesi = max(0.0, kapasite * (1.0 - LINK_GUVENLIK_PAYI) - self._oncelikli_bps - bosaltma)
+        asiri_yuk = dusurulen > onceki_dusurulen
+        if asiri_yuk:
+            self.asiri_yuk_sayisi += 1
+            video_butcesi *= ASIRI_YUK_KATSAYISI
+            logger.warning(f"Link aşırı yüklü: {dusurulen - onceki_dusurulen} öğe atıldı, "
+                           f"video bütçesi {video_butcesi:.0f} B/s")
+
+        video_fps, boyut_orani = self._video_hedefi(video_butcesi)
+
+        # Telemetri aralığı: yalnızca telemetri bile sığmıyorsa uzar
+        telemetri_araligi = None
+        if self._telemetri_paket_bayt and kapasite > 0:
+            telemetri_araligi = self._telemetri_paket_bayt / (kapasite * (1.0 - LINK_GUVENLIK_PAYI))
+
+        return {
+            'zaman': time.time(),
+            'kapasite_bps': round(kapasite, 1),
+            'goodput_bps': round(self._yuk_bps * teslim_orani, 1),
+            'yazilan_bps': round(self._yazilan_bps, 1),
+            'rx_bps': round(self._rx_bps, 1),
+            'oncelikli_bps': round(self._oncelikli_bps, 1),
+            'video_bps': round(self._video_bps, 1),
+            'video_butcesi_bps': round(video_butcesi, 1),
+            'video_tam_kare_bayt': round(self._video_tam_kare, 1) if self._video_tam_kare else None,
+            'video_fps': round(video_fps, 2),
+            'video_boyut_orani': round(boyut_orani, 2),
+            'telemetri_araligi_s': round(telemetri_araligi, 3) if telemetri_araligi else None,
+            'ek_yuk_orani': round(ek_yuk, 3),
+            'teslim_orani': round(teslim_orani, 3),
+            'durum_gecikmesi_ms': round(durum_gecikmesi * 1000.0, 1),
+            'rx_birikimi': rx_birikimi,
+            'kuyruk_bayt': kuyruk_bayt,
+            'asiri_yuk': asiri_yuk
+        }
+
+    def _video_hedefi(self, video_butcesi):
+        """
+        (fps, kare boyutu oranı). FPS LINK_VIDEO_MIN_FPS'e inene kadar kare
+        boyutu korunur; kare boyutu henüz ölçülmediyse en düşük FPS önerilir.
+        """
+        if not self._video_tam_kare:
+            return LINK_VIDEO_MIN_FPS, 1.0
+        tam_kare = self._video_tam_kare
+        fps = video_butcesi / tam_kare
+        oran = 1.0
+        if fps < LINK_VIDEO_MIN_FPS:
+            oran = max(LINK_VIDEO_MIN_BOYUT_ORANI, video_butcesi / (LINK_VIDEO_MIN_FPS * tam_kare))
+            fps = video_butcesi / (tam_kare * oran)
+        self._boyut_orani = oran
+        return min(fps, LINK_VIDEO_MAKS_FPS), oran
+
+    def gecmisi_al(self) -> list:
+        """Son kayıttan bu yana biriken tahminleri verir ve geçmişi boşaltır"""
+        with self._kilit:
+            gecmis = list(self._gecmis)
+            self._gecmis.clear()
+        return gecmis
+
+    def get_istatistikler(self) -> dict:
+        """SD metrik kaydı için: son tahmin + son kayıttan bu yana geçmiş"""
+        return {
+            'son': self.son_tahmin,
+            'asiri_yuk_sayisi': self.asiri_yuk_sayisi,
+            'gecmis': self.gecmisi_al()
+        }
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    from moduller.tx_zamanlayici import TxZamanlayici
+    from moduller.xbee_metrikleri import XBeeMetrikleri
+
+    # Sanal saat, 57600 baud: kamera tahmine göre FPS/kare boyutu ayarlar;
+    # 20-40 s arası yer istasyonundan yoğun trafik gelir (hava süresi paylaşımı)
+    sanal_zaman = [0.0]
+    saat = lambda: sanal_zaman[0]
+    zamanlayici = TxZamanlayici(saat=saat)
+    metrikler = XBeeMetrikleri(saat=saat)
+    tahminci = LinkKapasiteTahmincisi(zamanlayici, metrikler, saat=saat)
+
+    kamera = {'fps': LINK_VIDEO_MAKS_FPS, 'oran': 1.0, 'sonraki': 0.0}
+    tam_kare = 4500  # ~4.5 KB JPEG (VIDEO_MAX_FRAME_SIZE_KB'ye yakın)
+
+    def kamera_ayarla(tahmin):
+        kamera['fps'] = tahmin['video_fps']
+        kamera['oran'] = tahmin['video_boyut_orani']
+
+    tahminci.abone_ol(kamera_ayarla)
+
+    adim = 0.001
+    for ms in range(60000):
+        sanal_zaman[0] = ms * adim
+        if ms % 1000 == 0:
+            zamanlayici.ekle(b"$" + b"T" * 199, ONCELIK_TELEMETRI)
+        if kamera['fps'] > 0 and sanal_zaman[0] >= kamera['sonraki']:
+            zamanlayici.ekle(b"V" * int(tam_kare * kamera['oran']), ONCELIK_VIDEO, bolunebilir=True)
+            kamera['sonraki'] = sanal_zaman[0] + 1.0 / kamera['fps']
+        if 20000 <= ms < 40000 and ms % 10 == 0:
+            metrikler.rx(30)  # ~3000 B/s gelen trafik
+        parca, _, biten = zamanlayici.al()
+        if parca is not None:
+            metrikler.tx(len(parca))
+        if biten is not None:
+            zamanlayici.tamamlandi(biten)
+        tahmin = tahminci.guncelle()
+        if tahmin and ms % 5000 == 0:
+            print(f"t={sanal_zaman[0]:4.0f}s kapasite {tahmin['kapasite_bps']:6.0f} B/s, "
+                  f"goodput {tahmin['goodput_bps']:6.0f} B/s, video bütçesi {tahmin['video_butcesi_bps']:6.0f} B/s "
+                  f"-> {tahmin['video_fps']:.2f} FPS x %{tahmin['video_boyut_orani'] * 100:.0f} kare, "
+                  f"kuyruk {tahmin['kuyruk_bayt']} B")
+
+    istatistik = zamanlayici.get_istatistikler()
+    print(f"Atılan öğe: {istatistik['dusurulen']}, telemetri gecikmesi p99: "
+          f"{istatistik['telemetri_gecikme_p99_ms']:.1f} ms, aşırı yük: {tahminci.asiri_yuk_sayisi}")
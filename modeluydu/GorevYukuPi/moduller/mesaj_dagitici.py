@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Mesaj Dağıtıcı Modülü
+
+Gelen mesajları (XBee satırları, komutlar, binary paketler) tablo ile
+işleyicilere yönlendirir:
+1. Tam eşleşme: tek dict araması (ör. "!xT!")
+2. Önek: ilk karaktere göre dict araması, o kovadaki birkaç önek içinde
+   en uzun eşleşen (isteğe bağlı sonek kontrolü, ör. "!...!")
+3. Binary: ilk byte'a göre dict araması (isteğe bağlı kontrol fonksiyonu)
+
+startswith zinciri ve özyinelemeli çağrı yoktur; modüller kendi
+işleyicilerini kaydet() ile ekleyebilir.
+
+Kazanç bakım kolaylığıdır, hız değil: bugünkü ~6 önekle eski if/elif
+zinciriyle aynı mertebede (~1 µs/mesaj, __main__ ölçümü). Tablo, işleyici
+sayısı arttıkça zincir gibi uzamaz.
+"""
+
+import logging
+
+logger = logging.getLogger('MesajDagitici')
+
+
+class MesajDagitici:
+    """
+    Önek tablolu mesaj dağıtıcı.
+
+    İşleyiciler isleyici(mesaj) olarak çağrılır. Eşleşme yoksa varsayilan
+    işleyici (tanımlıysa) çağrılır.
+    """
+
+    def __init__(self, varsayilan=None):
+        self._tam = {}       # mesaj -> işleyici
+        self._onekler = {}   # ilk karakter -> [(onek, sonek, isleyici)], uzun önek önce
+        self._baytlar = {}   # ilk byte -> [(kontrol, isleyici)]
+        self.varsayilan = varsayilan
+
+        # İstatistikler
+        self.dagitilan = 0
+        self.eslesmeyen = 0
+
+    def kaydet(self, onek: str, isleyici, sonek: str = None, tam: bool = False):
+        """
+        Metin mesajı işleyicisi kaydeder.
+
+        Args:
+            onek: Mesaj öneki (tam=True ise mesajın kendisi)
+            sonek: Verilirse mesaj bu sonekle de bitmelidir
+            tam: True ise yalnızca mesaj == onek olduğunda çağrılır
+        """
+        if tam:
+            self._tam[onek] = isleyici
+            return
+        kova = self._onekler.setdefault(onek[0], [])
+        kova[:] = [k for k in kova if k[:2] != (onek, sonek)]
+        kova.append((onek, sonek, isleyici))
+        kova.sort(key=lambda k: len(k[0]), reverse=True)
+
+    def kaydet_bayt(self, ilk_bayt: int, isleyici, kontrol=None):
+        """
+        Binary mesaj işleyicisi kaydeder. kontrol(mesaj) verilirse yalnızca
+        True döndüğünde çağrılır (aynı ilk byte için sırayla denenir).
+        """
+        self._baytlar.setdefault(ilk_bayt, []).append((kontrol, isleyici))
+
+    def kaldir(self, onek: str, sonek: str = None):
+        """kaydet() ile eklenen işleyiciyi kaldırır"""
+        self._tam.pop(onek, None)
+        kova = self._onekler.get(onek[:1])
+        if kova:
+            kova[:] = [k for k in kova if k[:2] != (onek, sonek)]
+
+    def isleyici_bul(self, mesaj):
+        """Mesajın işleyicisini döndürür (yoksa None)"""
+        if not mesaj:
+            return None
+
+        if isinstance(mesaj, str):
+            isleyici = self._tam.get(mesaj)
+            if isleyici is not None:
+                return isleyici
+            for onek, sonek, isleyici in self._onekler.get(mesaj[0], ()):
+                if mesaj.startswith(onek) and (sonek is None or mesaj.endswith(sonek)):
+                    return isleyici
+            return None
+
+        for kontrol, isleyici in self._baytlar.get(mesaj[0], ()):
+            if kontrol is None or kontrol(mesaj):
+                return isleyici
+        return None
+
+    def dagit(self, mesaj) -> bool:
+        """Mesajı işleyicisine iletir; işleyici bulunduysa True döner"""
+        isleyici = self.isleyici_bul(mesaj)
+        if isleyici is None:
+            self.eslesmeyen += 1
+            if self.varsayilan is not None:
+                self.varsayilan(mesaj)
+            return False
+        self.dagitilan += 1
+        isleyici(mesaj)
+        return True
+
+    def get_istatistikler(self) -> dict:
+        return {
+            'dagitilan': self.dagitilan,
+            'eslesmeyen': self.eslesmeyen,
+            'tam_eslesme': len(self._tam),
+            'onek': sum(len(k) for k in self._onekler.values()),
+            'bayt': sum(len(k) for k in self._baytlar.values())
+        }
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import random
+    import time
+
+    sayac = {}
+    isleyiciler = {}
+
+    def say(ad):
+        if ad not in isleyiciler:
+            def isleyici(mesaj):
+                sayac[ad] = sayac.get(ad, 0) + 1
+            isleyiciler[ad] = isleyici
+        return isleyiciler[ad]
+
+    # Eski startswith zinciri (BirlesikXBeeAlici._process_message + komut_isle)
+    def eski_zincir(mesaj):
+        if isinstance(mesaj, bytes):
+            mesaj = mesaj.decode('utf-8', errors='ignore').strip()
+        if mesaj.startswith("SAHA:BASINC2:"):
+            say('saha')(mesaj)
+        elif mesaj.startswith("IOT:"):
+            say('iot')(mesaj)
+        elif mesaj.startswith("!") and mesaj.endswith("!"):
+            if mesaj == "!MANUAL_SEPARATION!" or mesaj == "!xT!":
+                say('ayrilma')(mesaj)
+            elif mesaj.startswith("!M1:") or mesaj.startswith("!M2:"):
+                say('motor')(mesaj)
+            else:
+                say('filtre')(mesaj)
+        elif mesaj.startswith("#CALIB_"):
+            say('kalibrasyon')(mesaj)
+
+    dagitici = MesajDagitici()
+    dagitici.kaydet("SAHA:BASINC2:", say('saha'))
+    dagitici.kaydet("IOT:", say('iot'))
+    dagitici.kaydet("!xT!", say('ayrilma'), tam=True)
+    dagitici.kaydet("!MANUAL_SEPARATION!", say('ayrilma'), tam=True)
+    dagitici.kaydet("!M1:", say('motor'), sonek="!")
+    dagitici.kaydet("!M2:", say('motor'), sonek="!")
+    dagitici.kaydet("!", say('filtre'), sonek="!")
+    dagitici.kaydet("#CALIB_", say('kalibrasyon'))
+
+    def yeni(mesaj):
+        if isinstance(mesaj, bytes):
+            mesaj = mesaj.decode('utf-8', errors='ignore').strip()
+        dagitici.dagit(mesaj)
+
+    random.seed(0)
+    ornekler = ["SAHA:BASINC2:1012.45", "IOT:1:25.3", "IOT:2:24.8", "!6R7G!", "!xT!",
+                "!M1:90!", "#CALIB_GYRO:RESET#", "GURULTU"]
+    mesajlar = [random.choice(ornekler).encode() + b"\n" for _ in range(1000)]
+
+    for ad, fonksiyon in (("startswith zinciri", eski_zincir), ("MesajDagitici", yeni)):
+        sayac.clear()
+        en_iyi = float('inf')
+        for _ in range(20):
+            baslangic = time.perf_counter()
+            for mesaj in mesajlar:
+                fonksiyon(mesaj)
+            en_iyi = min(en_iyi, time.perf_counter() - baslangic)
+        # 1000 mesaj/s'de bir saniyelik yük: CPU payı = 1000 mesajın süresi
+        print(f"{ad:20s}: {en_iyi * 1000:.3f} µs/mesaj, 1k mesaj/s'de CPU %{en_iyi * 100:.3f} "
+              f"- {dict(sorted(sayac.items()))}")
+    print("ℹ️ Bu önek sayısında iki yöntem aynı mertebede: dağıtıcının amacı hız değil, "
+          "kaydet() ile genişletilebilir tablo")
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Paket Halkası Modülü
+
+Yer istasyonu paket numaralarındaki boşlukları görür ama eksik paketi
+isteyemiyordu. TelemetryHandler son N gönderilen paketi (varsayılan 600,
+1 Hz'de 10 dakika) paket numarasıyla indekslenmiş sabit boyutlu bir
+halkada tutar:
+
+    #RESEND:<ilk>-<son>#    ör. #RESEND:120-135#   #RESEND:9990-5#
+
+- Paket sayacı 9999'dan sonra 1'e döner; halka sarma sayısını tutup
+  numarayı artan sıra numarasına çevirir, yuva = sıra % kapasite
+  (9999 kapasitenin katı olmasa da sarmada yuvalar çakışmaz)
+- Ekleme ve arama O(1); listeler baştan ayrıldığı için sürekli çalışmada
+  yeni bellek ayrılmaz (yalnızca referans yazılır)
+- Her yuvada sıra numarası da tutulur: üzerine yazılmış (eski) paket
+  istenen numarayla karışmaz. İstekte ilk > son ise aralık sarmalıdır
+- Bulunan paketler alıcıda geçmiş sınıfında, canlı telemetriden sonra
+  hız sınırlı gönderilir
+"""
+
+import threading
+
+RESEND_ONEKI = "#RESEND:"
+RESEND_SONEKI = "#"
+PAKET_NO_MAKS = 9999  # TelemetryHandler paket sayacı bu değerden sonra 1'e döner
+
+
+def yeniden_gonderim_araligi(komut: str):
+    """'#RESEND:a-b#' -> (a, b); geçersiz komutta ValueError"""
+    if not (komut.startswith(RESEND_ONEKI) and komut.endswith(RESEND_SONEKI)):
+        raise ValueError(f"Geçersiz yeniden gönderim komutu: {komut}")
+    ilk, ayirici, son = komut[len(RESEND_ONEKI):-len(RESEND_SONEKI)].partition("-")
+    ilk = int(ilk)
+    son = int(son) if ayirici else ilk
+    if not (1 <= ilk <= PAKET_NO_MAKS and 1 <= son <= PAKET_NO_MAKS):
+        raise ValueError(f"Paket numarası aralık dışında: {komut}")
+    return ilk, son
+
+
+def aralik_numaralari(ilk: int, son: int, maks=PAKET_NO_MAKS):
+    """ilk..son paket numaraları; ilk > son ise maks'tan 1'e sarar"""
+    if ilk <= son:
+        return range(ilk, son + 1)
+    return list(range(ilk, maks + 1)) + list(range(1, son + 1))
+
+
+class PaketHalkasi:
+    """
+    Paket numarasıyla indekslenen sabit boyutlu paket geçmişi (thread-safe).
+
+    Args:
+        kapasite: Tutulacak en fazla paket (ör. 600 = 1 Hz'de 10 dakika)
+        maks: Paket sayacının 1'e dönmeden önceki en büyük değeri
+    """
+
+    def __init__(self, kapasite=600, maks=PAKET_NO_MAKS):
+        self.kapasite = kapasite
+        self.maks = maks
+        self._siralar = [-1] * kapasite
+        self._paketler = [None] * kapasite
+        self._tur = 0        # Sayacın kaç kez 1'e döndüğü
+        self._son_no = 0     # Son eklenen paket numarası
+        self._lock = threading.Lock()
+
+        # İstatistikler
+        self.eklenen = 0
+        self.istenen = 0
+        self.bulunan = 0
+
+    def ekle(self, paket_no: int, paket):
+        """Gönderilen paketi numarasının yuvasına yazar (en eskisinin üzerine)"""
+        with self._lock:
+            if paket_no < self._son_no:
+                self._tur += 1  # Sayaç 1'e döndü
+            self._son_no = paket_no
+            sira = self._tur * self.maks + paket_no
+            yuva = sira % self.kapasite
+            self._siralar[yuva] = sira
+            self._paketler[yuva] = paket
+            self.eklenen += 1
+
+    def al(self, paket_no: int):
+        """Paket halkada ise döndürür, yoksa (hiç olmadı/üzerine yazıldı) None"""
+        with self._lock:
+            # Son numaradan büyükse önceki turdandır
+            tur = self._tur if paket_no <= self._son_no else self._tur - 1
+            sira = tur * self.maks + paket_no
+            yuva = sira % self.kapasite
+            if self._siralar[yuva] != sira:
+                return None
+            return self._paketler[yuva]
+
+    def aralik(self, ilk: int, son: int):
+        """ilk..son (sarmalı olabilir) aralığında halkada bulunan paketler, sırayla"""
+        numaralar = aralik_numaralari(ilk, son)
+        bulunan = []
+        for paket_no in numaralar:
+            paket = self.al(paket_no)
+            if paket is not None:
+                bulunan.append(paket)
+        self.istenen += len(numaralar)
+        self.bulunan += len(bulunan)
+        return bulunan
+
+    def __len__(self):
+        return min(self.eklenen, self.kapasite)
+
+    def get_istatistikler(self) -> dict:
+        return {
+            'kapasite': self.kapasite,
+            'dolu': len(self),
+            'eklenen': self.eklenen,
+            'istenen': self.istenen,
+            'bulunan': self.bulunan
+        }
+
+
+def yeniden_gonderim_isleyicisi(halka: PaketHalkasi, gonder):
+    """
+    #RESEND:a-b# komut işleyicisi üretir: halkada bulunan paketler
+    gonder(paketler) ile verilir, sonuç '<bulunan>/<istenen>' olur
+    (zarflı komutta ACK:<id>:12/16 gibi döner).
+    """
+    def isle(komut):
+        ilk, son = yeniden_gonderim_araligi(komut)
+        paketler = halka.aralik(ilk, son)
+        if paketler:
+            gonder(paketler)
+        sonuc = f"{len(paketler)}/{len(aralik_numaralari(ilk, son))}"
+        print(f"🔁 Yeniden gönderim {ilk}-{son}: {sonuc} paket bulundu")
+        return sonuc
+    return isle
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import time
+    import tracemalloc
+
+    halka = PaketHalkasi(600)
+
+    # 1 Hz'de 25 dakika uçuş, sayaç 9999'dan sonra 1'e döner
+    paketler = [f"$286570,{(9000 + i) % PAKET_NO_MAKS + 1},...*00".encode() for i in range(1500)]
+    numaralar = [(9000 + i) % PAKET_NO_MAKS + 1 for i in range(1500)]
+
+    # Sürekli çalışma: halka dolduktan sonra ekleme bellek büyütmemeli
+    tracemalloc.start()
+    for paket_no, paket in zip(numaralar[:600], paketler[:600]):
+        halka.ekle(paket_no, paket)
+    onceki, _ = tracemalloc.get_traced_memory()
+    for paket_no, paket in zip(numaralar[600:], paketler[600:]):
+        halka.ekle(paket_no, paket)
+    sonraki, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"💾 900 ekleme sonrası bellek farkı: {sonraki - onceki} byte")
+
+    gonderilen = []
+    isle = yeniden_gonderim_isleyicisi(halka, gonderilen.extend)
+    assert isle("#RESEND:9001-9010#") == "0/10", "Halkadan çıkmış paketler bulunmamalı"
+    assert isle("#RESEND:9995-5#") == "10/10", "Sayaç sarması (9999 -> 1) tek aralık olmalı"
+    assert isle(f"#RESEND:{numaralar[-20]}-{numaralar[-11]}#") == "10/10"
+    assert gonderilen[-10:] == paketler[-20:-10]
+    assert halka.al(numaralar[-601]) is None and halka.al(numaralar[-600]) == paketler[-600]
+    for hatali in ("#RESEND:abc#", "#RESEND:0-5#", "#RESEND:5-10"):
+        try:
+            isle(hatali)
+            raise AssertionError(hatali)
+        except ValueError:
+            pass
+
+    # O(1) arama: halka boyutundan bağımsız
+    for kapasite in (600, 60000):
+        h = PaketHalkasi(kapasite)
+        for i in range(1, kapasite + 1):
+            h.ekle(i, b"x")
+        baslangic = time.perf_counter()
+        for i in range(100000):
+            h.al(i % kapasite + 1)
+        sure = time.perf_counter() - baslangic
+        print(f"⏱️ Kapasite {kapasite}: {sure / 100000 * 1e9:.0f} ns/arama")
+    print(f"✅ {halka.get_istatistikler()}")
@@ -7,6 +7,7 @@ dosya isimlerinin yönetiminden ve kayıt klasörlerinin oluşturulmasından sor
 """
 
 import os
+import json
 import time
 import shutil
 from datetime import datetime
@@ -38,6 +39,13 @@ class SDKayitci:
             f"video_{zaman_damgasi}.mp4"  # MP4 format (H.264 uyumlu)
         )
         
+        # Link metrikleri (JSON satırları, ilk kayıtta açılır)
+        self.metrik_dosya_yolu = os.path.join(
+            self.kayit_ana_klasoru,
+            f"xbee_metrikleri_{zaman_damgasi}.jsonl"
+        )
+        self.metrik_dosyasi = None
+        
         # İlk disk alanı kontrolü
         self._check_disk_space(show_info=True)
         
@@ -183,6 +191,20 @@ class SDKayitci:
             print(f"❌ Telemetri kayıt hatası: {e}")
             return False
 
+    def kaydet_metrik(self, metrikler: dict):
+        """
+        Link metrikleri snapshot'ını JSON satırı olarak SD karta ekler
+        """
+        try:
+            if self.metrik_dosyasi is None:
+                self.metrik_dosyasi = open(self.metrik_dosya_yolu, 'a', encoding='utf-8')
+            self.metrik_dosyasi.write(json.dumps(metrikler, ensure_ascii=False, default=str) + '\n')
+            self.metrik_dosyasi.flush()
+            return True
+        except Exception as e:
+            print(f"❌ Metrik kayıt hatası: {e}")
+            return False
+
     def get_video_kayit_yolu(self):
         """Oluşturulan video kayıt yolunu döndürür."""
         return self.video_dosya_yolu
@@ -195,6 +217,11 @@ class SDKayitci:
                 print("Telemetri kayıt dosyası kapatıldı.")
             except Exception as e:
                 print(f"HATA: Telemetri dosyası kapatılırken hata: {e}")
+        if self.metrik_dosyasi:
+            try:
+                self.metrik_dosyasi.close()
+            except Exception as e:
+                print(f"HATA: Metrik dosyası kapatılırken hata: {e}")
         print("SD Kayıtçı temizlendi.")
 
 if __name__ == '__main__':
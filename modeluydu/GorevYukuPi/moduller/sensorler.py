@@ -33,6 +33,7 @@ import struct
 
 from moduller.imu_sensoru import IMUSensorYoneticisi
 from moduller.pil_gerilimi import PilGerilimiYoneticisi
+from moduller.telemetri_kaydi import TelemetriKaydi
 from moduller.yapilandirma import (
     IS_RASPBERRY_PI, SERIAL_PORT_GPS, SIMULATE_GPS,
     GOREV_BASLANGIC_DOSYASI
@@ -105,6 +106,9 @@ else:
 # 🔧 DENIZ_SEVIYESI_BASINC_HPA import et (Analiz4.txt düzeltmesi)
 from moduller.yapilandirma import DENIZ_SEVIYESI_BASINC_HPA
 
+# _read_gps sonucu: (enlem, boylam, yukseklik, fix_kalitesi, uydu_sayisi, hdop)
+GPS_VERISI_YOK = (0.0, 0.0, 0.0, 0, 0, 99.9)
+
 
 class SensorManager:
     def __init__(self, saha_alici_instance, simulate=not IS_RASPBERRY_PI):
@@ -308,27 +312,17 @@ class SensorManager:
                     basinc, sicaklik, irtifa = self._read_bmp280()
                     print(f"📊 HIZLI BMP280: {basinc} Pa, {sicaklik}°C")
                     
+                    # Hızlı veri paketi (GPS yok, taşıyıcı basıncı yok)
+                    kayit = TelemetriKaydi(basinc=basinc, irtifa=irtifa, sicaklik=sicaklik,
+                                           pil_gerilimi=7.4, iot_s1=25.0, iot_s2=25.0)  # Varsayılan pil/IoT
+                    
                     # 🔧 FIX: IMU verilerini de fallback'e dahil et
-                    imu_verisi = {'pitch': 0.0, 'roll': 0.0, 'yaw': 0.0, 'ivme_x': 0.0, 'ivme_y': 0.0, 'ivme_z': 0.0, 'gyro_x': 0.0, 'gyro_y': 0.0, 'gyro_z': 0.0, 'mag_x': 0.0, 'mag_y': 0.0, 'mag_z': 0.0}
                     try:
-                        imu_verisi = self._read_imu()
-                        print(f"📊 HIZLI IMU: P={imu_verisi.get('pitch', 0):.1f}° R={imu_verisi.get('roll', 0):.1f}° Y={imu_verisi.get('yaw', 0):.1f}°")
+                        kayit.imu_ata(self._read_imu())
+                        print(f"📊 HIZLI IMU: P={kayit.pitch:.1f}° R={kayit.roll:.1f}° Y={kayit.yaw:.1f}°")
                     except Exception as imu_error:
                         print(f"⚠️ IMU fallback hatası: {imu_error}")
-                    
-                    # Hızlı veri paketi
-                    return {
-                        "basinc": basinc,
-                        "irtifa": irtifa, 
-                        "sicaklik": sicaklik,
-                        "pil_gerilimi": 7.4,  # Varsayılan
-                        "gps_verisi": {'enlem': 0.0, 'boylam': 0.0, 'yukseklik': 0.0, 'fix_quality': 0, 'satellite_count': 0},
-                        "imu_verisi": imu_verisi,
-                        "iot_verileri": {"sicaklik1": 25.0, "sicaklik2": 25.0},
-                        "tasiyici_basinci": 0.0,
-                        "rtc_time": None,
-                        "uydu_statusu": 0
-                    }
+                    return kayit
                 except Exception as e:
                     print(f"🚨 HIZLI OKUMA HATASI: {e}")
                     print(f"🔧 Son çare: Güvenli boş değerler")
@@ -353,31 +347,9 @@ class SensorManager:
 
     def _get_empty_sensor_data(self):
         """
-        Boş/güvenli sensör verisi döndür (simülasyon yerine)
+        Boş/güvenli sensör verisi döndür (simülasyon yerine) - tüm alanlar sıfır
         """
-        return {
-            "basinc": 0,                 # Boş basınç
-            "irtifa": 0.0,               # Boş irtifa
-            "sicaklik": 0.0,             # Boş sıcaklık
-            "pil_gerilimi": 0.0,         # Boş pil
-            "gps_verisi": {
-                'enlem': 0.0, 'boylam': 0.0, 'yukseklik': 0.0,
-                'fix_quality': 0, 'satellite_count': 0
-            },
-            "imu_verisi": {
-                'pitch': 0.0, 'roll': 0.0, 'yaw': 0.0,
-                'ivme_x': 0.0, 'ivme_y': 0.0, 'ivme_z': 0.0,
-                'gyro_x': 0.0, 'gyro_y': 0.0, 'gyro_z': 0.0,
-                'mag_x': 0.0, 'mag_y': 0.0, 'mag_z': 0.0
-            },
-            "iot_verileri": {
-                "sicaklik1": 0.0, 
-                "sicaklik2": 0.0
-            },
-            "tasiyici_basinci": 0.0,
-            "rtc_time": None,
-            "uydu_statusu": 0
-        }
+        return TelemetriKaydi()
     
     def _validate_sensor_data(self, sensor_verisi):
         """
@@ -386,23 +358,23 @@ class SensorManager:
         """
         # Basınç kontrolü - GENİŞLETİLMİŞ ARALUK
         # BMP280 sensörü bazen yüksek değerler verebilir, geçici kabul et
-        if not (0 <= sensor_verisi['basinc'] <= 15000000):  # 15M Pa'ya kadar kabul et
-            logger.warning(f"⚠️ Anormal basınç değeri: {sensor_verisi['basinc']} Pa (devam ediyor)")
+        if not (0 <= sensor_verisi.basinc <= 15000000):  # 15M Pa'ya kadar kabul et
+            logger.warning(f"⚠️ Anormal basınç değeri: {sensor_verisi.basinc} Pa (devam ediyor)")
             # Exception atmak yerine warning ver ve devam et
 
         # İrtifa kontrolü - GENİŞLETİLMİŞ ARALUK  
-        if not (-2000 <= sensor_verisi['irtifa'] <= 50000):  # -2km ile +50km arası kabul et
-            logger.warning(f"⚠️ Anormal irtifa değeri: {sensor_verisi['irtifa']} m (devam ediyor)")
+        if not (-2000 <= sensor_verisi.irtifa <= 50000):  # -2km ile +50km arası kabul et
+            logger.warning(f"⚠️ Anormal irtifa değeri: {sensor_verisi.irtifa} m (devam ediyor)")
             # Exception atmak yerine warning ver ve devam et
 
         # GPS fix kalitesi kontrolü - ESNEK MOD
-        if sensor_verisi['gps_verisi']['fix_quality'] == 0:
+        if sensor_verisi.gps_fix_kalitesi == 0:
             # GPS olmasa da telemetri yazmaya devam et
             logger.warning("⚠️ GPS fix kalitesi yetersiz (devam ediyor)")
 
         # Pil gerilimi kontrolü - ESNEK MOD
-        if not (1.0 <= sensor_verisi['pil_gerilimi'] <= 15.0):  # Geniş aralık
-            logger.warning(f"⚠️ Anormal pil gerilimi: {sensor_verisi['pil_gerilimi']} V (devam ediyor)")
+        if not (1.0 <= sensor_verisi.pil_gerilimi <= 15.0):  # Geniş aralık
+            logger.warning(f"⚠️ Anormal pil gerilimi: {sensor_verisi.pil_gerilimi} V (devam ediyor)")
             # Exception atmak yerine warning ver ve devam et
 
     def _oku_sensorler_simule(self):
@@ -480,35 +452,20 @@ class SensorManager:
         # RTC zaman simülasyonu
         rtc_time = time.localtime(self._sim_start_time + elapsed_time)
 
-        # Detaylı sensör verisi sözlüğü
-        sensor_verisi = {
-            "basinc": basinc_pascal,
-            "irtifa": self._sim_irtifa,
-            "sicaklik": sicaklik,
-            "pil_gerilimi": pil_gerilimi,
-            "gps_verisi": {
-                "enlem": enlem, 
-                "boylam": boylam, 
-                "yukseklik": self._sim_irtifa,
-                "fix_quality": 1,  # Her zaman fix
-                "satellit_count": 8,  # Varsayılan uydu sayısı
-                "hdop": 1.0  # En iyi hassasiyet
-            },
-            "imu_verisi": {
-                "pitch": pitch, 
-                "roll": roll, 
-                "yaw": yaw
-            },
-            "iot_verileri": {
-                "sicaklik1": iot_sicaklik1, 
-                "sicaklik2": iot_sicaklik2
-            },
-            "tasiyici_basinci": tasiyici_basinci,
-            "rtc_time": rtc_time,
-            "uydu_statusu": uydu_statusu
-        }
-
-        return sensor_verisi
+        # Detaylı sensör kaydı (GPS: her zaman fix, 8 uydu, en iyi hassasiyet)
+        return TelemetriKaydi(
+            basinc=basinc_pascal,
+            irtifa=self._sim_irtifa,
+            sicaklik=sicaklik,
+            pil_gerilimi=pil_gerilimi,
+            gps_enlem=enlem, gps_boylam=boylam, gps_yukseklik=self._sim_irtifa,
+            gps_fix_kalitesi=1, gps_uydu_sayisi=8, gps_hdop=1.0,
+            pitch=pitch, roll=roll, yaw=yaw,
+            iot_s1=iot_sicaklik1, iot_s2=iot_sicaklik2,
+            tasiyici_basinci=tasiyici_basinci,
+            rtc_time=rtc_time,
+            uydu_statusu=uydu_statusu
+        )
 
     def _oku_gercek_sensorler(self):
         """
@@ -525,106 +482,70 @@ class SensorManager:
                 logger.warning(f"⚠️ BMP280 okuma hatası, boş değerler: {bmp_error}")
                 basinc, sicaklik, irtifa = 0.0, 0.0, 0.0  # BOŞ değerler
             
-            # GPS verisi (güvenli)
+            kayit = TelemetriKaydi(basinc=basinc, sicaklik=sicaklik, irtifa=irtifa)
+            
+            # GPS verisi (güvenli) - hata olursa alanlar boş kalır
             try:
-                gps_verisi = self._read_gps()
+                kayit.gps_ata(*self._read_gps())
             except Exception as gps_error:
                 logger.warning(f"⚠️ GPS okuma hatası, boş değerler: {gps_error}")
-                gps_verisi = {
-                    'enlem': 0.0, 'boylam': 0.0, 'yukseklik': 0.0,
-                    'fix_quality': 0, 'satellite_count': 0
-                }  # BOŞ değerler
             
-            # IMU verileri (güvenli)
+            # IMU verileri (güvenli) - hata olursa alanlar boş kalır
             try:
-                imu_verisi = self._read_imu()
+                kayit.imu_ata(self._read_imu())
             except Exception as imu_error:
                 logger.warning(f"⚠️ IMU okuma hatası, boş değerler: {imu_error}")
-                imu_verisi = {
-                    'pitch': 0.0, 'roll': 0.0, 'yaw': 0.0,
-                    'ivme_x': 0.0, 'ivme_y': 0.0, 'ivme_z': 0.0,
-                    'gyro_x': 0.0, 'gyro_y': 0.0, 'gyro_z': 0.0,
-                    'mag_x': 0.0, 'mag_y': 0.0, 'mag_z': 0.0
-                }  # BOŞ değerler
             
             # Pil gerilimi (güvenli)
             try:
-                pil_gerilimi = self._read_battery()
+                kayit.pil_gerilimi = self._read_battery()
             except Exception as battery_error:
                 logger.warning(f"⚠️ Pil okuma hatası, boş değer: {battery_error}")
-                pil_gerilimi = 0.0  # BOŞ değer
             
-            # RTC zaman damgası (güvenli)
-            # RTC KALDIRILDI - sistem zamanı kullanılıyor
-            rtc_time = None
+            # RTC zaman damgası: RTC KALDIRILDI - sistem zamanı kullanılıyor (rtc_time=None)
+            
+            # Taşıyıcı basınç ve IoT verileri: tek bir anlık görüntüden (kilitsiz,
+            # tutarlı). Görüntü sunmayan alıcılar için eski getter'lar kullanılır.
+            xbee_goruntusu = None
+            if hasattr(self.saha_alici, 'get_anlik_goruntu'):
+                try:
+                    xbee_goruntusu = self.saha_alici.get_anlik_goruntu()
+                except Exception as saha_error:
+                    logger.warning(f"XBee anlık görüntüsü alınamadı: {saha_error}")
+            kayit.xbee_goruntusu = xbee_goruntusu  # Sürüm/tazelik bilgisi (yoksa None)
             
             # Taşıyıcı basınç verisi (güvenli çağrı)
-            tasiyici_basinci = 0.0
             try:
-                if hasattr(self.saha_alici, 'get_tasiyici_basiinci'):
-                    tasiyici_basinci = self.saha_alici.get_tasiyici_basiinci()
+                if xbee_goruntusu is not None:
+                    kayit.tasiyici_basinci = xbee_goruntusu.basinc2_degeri()
+                elif hasattr(self.saha_alici, 'get_tasiyici_basiinci'):
+                    kayit.tasiyici_basinci = self.saha_alici.get_tasiyici_basiinci()
                 elif hasattr(self.saha_alici, 'get_basinc2_value'):
-                    tasiyici_basinci = self.saha_alici.get_basinc2_value()
+                    kayit.tasiyici_basinci = self.saha_alici.get_basinc2_value()
             except Exception as saha_error:
                 logger.warning(f"Taşıyıcı basınç verisi alınamadı: {saha_error}")
             
             # IoT sıcaklık verileri (bonus görev)
-            iot_s1_data, iot_s2_data = 0.0, 0.0
             try:
-                if hasattr(self.saha_alici, 'get_iot_temperatures'):
-                    iot_s1_data, iot_s2_data = self.saha_alici.get_iot_temperatures()
+                if xbee_goruntusu is not None:
+                    kayit.iot_s1, kayit.iot_s2 = xbee_goruntusu.iot_sicakliklari()
+                elif hasattr(self.saha_alici, 'get_iot_temperatures'):
+                    kayit.iot_s1, kayit.iot_s2 = self.saha_alici.get_iot_temperatures()
             except Exception as iot_error:
                 logger.warning(f"IoT sıcaklık verileri alınamadı: {iot_error}")
             
-            # Detaylı sensör verisi sözlüğü
-            sensor_verisi = {
-                "basinc": basinc,
-                "irtifa": irtifa,
-                "sicaklik": sicaklik,
-                "pil_gerilimi": pil_gerilimi,
-                "gps_verisi": gps_verisi,
-                "imu_verisi": imu_verisi,
-                "iot_verileri": {
-                    "sicaklik1": iot_s1_data, 
-                    "sicaklik2": iot_s2_data
-                },
-                "tasiyici_basinci": tasiyici_basinci,
-                "rtc_time": rtc_time,
-                # Uçuş durumu için varsayılan değer
-                "uydu_statusu": 0  # Uçuşa hazır
-            }
+            # Veri doğrulaması (uydu_statusu varsayılan 0: uçuşa hazır)
+            self._validate_sensor_data(kayit)
             
-            # Veri doğrulaması
-            self._validate_sensor_data(sensor_verisi)
-            
-            return sensor_verisi
+            return kayit
         
         except Exception as e:
             logger.error(f"❌ KRİTİK sensör sistemi hatası: {e}")
             logger.error(traceback.format_exc())
             
-            # KRİTİK hata durumunda BOŞ değerler döndür
+            # KRİTİK hata durumunda BOŞ değerler döndür (rtc_time=None: sistem zamanı)
             logger.warning("🔄 Kritik hata - boş değerlerle devam ediliyor...")
-            return {
-                "basinc": 0.0,               # BOŞ
-                "irtifa": 0.0,               # BOŞ
-                "sicaklik": 0.0,             # BOŞ
-                "pil_gerilimi": 0.0,         # BOŞ
-                "gps_verisi": {
-                    'enlem': 0.0, 'boylam': 0.0, 'yukseklik': 0.0,
-                    'fix_quality': 0, 'satellite_count': 0
-                },
-                "imu_verisi": {
-                    'pitch': 0.0, 'roll': 0.0, 'yaw': 0.0,
-                    'ivme_x': 0.0, 'ivme_y': 0.0, 'ivme_z': 0.0,
-                    'gyro_x': 0.0, 'gyro_y': 0.0, 'gyro_z': 0.0,
-                    'mag_x': 0.0, 'mag_y': 0.0, 'mag_z': 0.0
-                },
-                "iot_verileri": {"sicaklik1": 0.0, "sicaklik2": 0.0},
-                "tasiyici_basinci": 0.0,
-                "rtc_time": None,            # Sistem zamanı kullanılacak
-                "uydu_statusu": 0            # Uçuşa hazır
-            }
+            return TelemetriKaydi()
 
     def _to_signed_16(self, value):
         """16-bit unsigned değeri signed değere dönüştürür."""
@@ -751,28 +672,17 @@ class SensorManager:
     def _read_gps(self):
         """
         GPS modülünden NMEA verilerini güvenli bir şekilde okur ve ayrıştırır.
+        (enlem, boylam, yukseklik, fix_kalitesi, uydu_sayisi, hdop) döndürür
+        (TelemetriKaydi.gps_ata sırası); veri yoksa GPS_VERISI_YOK.
         """
         try:
             if self.simulate:
-                return {
-                    "enlem": self._sim_lat, 
-                    "boylam": self._sim_lon, 
-                    "yukseklik": self._sim_irtifa,
-                    "fix_quality": 1,  # Simülasyonda her zaman fix
-                    "satellit_count": 8,  # Varsayılan uydu sayısı
-                    "hdop": 1.0  # En iyi hassasiyet
-                }
+                # Simülasyonda her zaman fix, 8 uydu, en iyi hassasiyet
+                return self._sim_lat, self._sim_lon, self._sim_irtifa, 1, 8, 1.0
                 
             if not self.gps_serial or not self.gps_serial.is_open:
                 logger.warning("GPS seri portu açık değil")
-                return {
-                    "enlem": 0.0, 
-                    "boylam": 0.0, 
-                    "yukseklik": 0.0,
-                    "fix_quality": 0,
-                    "satellit_count": 0,
-                    "hdop": 99.9  # Kötü hassasiyet
-                }
+                return GPS_VERISI_YOK
 
             # GPS veri okuma
             start_time = time.time()
@@ -791,14 +701,14 @@ class SensorManager:
                             # Fix kalitesi kontrolü (0: geçersiz, 1-5: geçerli)
                             try:
                                 fix_quality = int(parts[6]) if parts[6] else 0
-                                satellit_count = int(parts[7]) if parts[7] else 0
+                                uydu_sayisi = int(parts[7]) if parts[7] else 0
                                 hdop = float(parts[8]) if parts[8] else 99.9
                             except (ValueError, TypeError):
                                 logger.warning(f"GPS fix bilgisi parse edilemedi: {parts[6:9]}")
                                 continue
                             
                             # Sadece yeterli fix kalitesinde veri al
-                            if fix_quality > 0 and satellit_count >= 4:
+                            if fix_quality > 0 and uydu_sayisi >= 4:
                                 # Enlem dönüştürme
                                 latitude = self._parse_gps_coordinate(parts[2], parts[3])
                                 
@@ -812,14 +722,7 @@ class SensorManager:
                                     logger.warning(f"GPS yükseklik verisi parse edilemedi: {parts[9]}")
                                     altitude = 0.0
 
-                                return {
-                                    "enlem": latitude,
-                                    "boylam": longitude,
-                                    "yukseklik": altitude,
-                                    "fix_quality": fix_quality,
-                                    "satellit_count": satellit_count,
-                                    "hdop": hdop
-                                }
+                                return latitude, longitude, altitude, fix_quality, uydu_sayisi, hdop
                 
                     # GPRMC cümlesi (alternatif konum verisi)
                     elif line.startswith('$GPRMC') or line.startswith('$GNRMC'):
@@ -833,47 +736,18 @@ class SensorManager:
                             # Boylam dönüştürme
                             longitude = self._parse_gps_coordinate(parts[5], parts[6])
                             
-                            # Hız ve yön bilgisi
-                            try:
-                                ground_speed = float(parts[7]) if parts[7] else 0.0
-                                ground_course = float(parts[8]) if parts[8] else 0.0
-                            except (ValueError, TypeError):
-                                logger.warning(f"GPS hız/yön verisi parse edilemedi: {parts[7:9]}")
-                                ground_speed, ground_course = 0.0, 0.0
-
-                            return {
-                                "enlem": latitude,
-                                "boylam": longitude,
-                                "yukseklik": 0.0,  # GPRMC'de yükseklik bilgisi yok
-                                "ground_speed": ground_speed,
-                                "ground_course": ground_course,
-                                "fix_quality": 1,  # A = aktif
-                                "satellit_count": 0,  # Bilinmiyor
-                                "hdop": 99.9  # Bilinmiyor
-                            }
+                            # GPRMC'de yükseklik yok; A = aktif fix, uydu sayısı/HDOP bilinmiyor
+                            # (hız/yön alanları telemetride kullanılmıyor)
+                            return latitude, longitude, 0.0, 1, 0, 99.9
             
             # Eğer hiçbir geçerli veri bulunamazsa
             logger.warning("GPS verisi bulunamadı")
-            return {
-                "enlem": 0.0, 
-                "boylam": 0.0, 
-                "yukseklik": 0.0,
-                "fix_quality": 0,
-                "satellit_count": 0,
-                "hdop": 99.9
-            }
+            return GPS_VERISI_YOK
                 
         except Exception as e:
             logger.error(f"❌ GPS HATASI: {e}")
             logger.error(traceback.format_exc())
-            return {
-                "enlem": 0.0, 
-                "boylam": 0.0, 
-                "yukseklik": 0.0,
-                "fix_quality": 0,
-                "satellit_count": 0,
-                "hdop": 99.9
-            }
+            return GPS_VERISI_YOK
 
     def _parse_gps_coordinate(self, raw_str, direction):
         """
@@ -1071,7 +945,7 @@ if __name__ == '__main__':
     veri = sensor_yonetici.oku_tum_sensorler()
     print("Okunan sensör verisi:")
     import json
-    print(json.dumps(veri, indent=2))
+    print(json.dumps(veri.sozluk(), indent=2, default=str))
     
     sensor_yonetici.temizle()
     print("\nTest tamamlandı.")
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Telemetri Deposu Modülü (store-and-forward)
+
+XBee linki kesikken gönderilemeyen veya API modunda yeniden denemelere
+rağmen teslim edilemeyen telemetri paketleri kaybolmaz:
+1. Paket sınırlı bir FIFO'ya eklenir (dolunca en eski paket atılır)
+2. Her paket dosyaya da eklenir (2 byte uzunluk + veri); program yeniden
+   başlarsa boşaltılmamış paketler dosyadan geri yüklenir. Boşaltılan
+   kısmın ofseti ayrı bir dosyada tutulur, depo boşalınca ikisi de silinir
+3. Link düzelince bosalt() token bucket ile hız sınırlı çağrılır; paketler
+   TX zamanlayıcıda canlı telemetriden sonra gelen "geçmiş" sınıfında
+   gönderilir (paket numaraları sayesinde yer istasyonu grafikteki
+   boşlukları doldurur)
+
+Dosya en fazla kapasitenin iki katı kayda ulaşınca bellekteki kuyrukla
+yeniden yazılır, uzun kesintide de sınırlı kalır.
+"""
+
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+_UZUNLUK = struct.Struct('<H')
+
+
+class TelemetriDeposu:
+    """
+    Sınırlı, dosya destekli giden telemetri kuyruğu (thread-safe).
+
+    Args:
+        dosya_yolu: Kalıcı depo dosyası (None: yalnızca bellek)
+        kapasite: Tutulacak en fazla paket
+        hiz: bosalt() ile saniyede verilecek en fazla paket
+        saat: Zaman fonksiyonu (varsayılan time.monotonic)
+    """
+
+    def __init__(self, dosya_yolu=None, kapasite=1800, hiz=4.0, saat=time.monotonic):
+        self.dosya_yolu = dosya_yolu
+        self.ofset_yolu = dosya_yolu + ".ofset" if dosya_yolu else None
+        self.kapasite = kapasite
+        self.hiz = hiz
+        self.saat = saat
+
+        self._kilit = threading.Lock()
+        self._kuyruk = deque()
+        self._dosya = None
+        self._dosya_kayit = 0    # Dosyadaki toplam kayıt
+        self._ofset = 0          # Dosyada boşaltılmış/atılmış kısmın byte ofseti
+        self._jeton = 0.0
+        self._son_dolum = saat()
+
+        # İstatistikler
+        self.eklenen = 0
+        self.gonderilen = 0
+        self.dusurulen = 0
+        self.geri_yuklenen = 0
+        self._bosaltma_baslangici = None
+        self.son_bosaltma_suresi = None  # s - son kesintinin birikimi kaç saniyede eridi
+
+        if dosya_yolu:
+            self._geri_yukle()
+
+    # ------------------------------------------------------------------
+    # Kalıcılık
+    # ------------------------------------------------------------------
+    def _geri_yukle(self):
+        """Önceki çalışmadan kalan boşaltılmamış kayıtları okur"""
+        try:
+            with open(self.ofset_yolu, 'r') as f:
+                ofset = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            ofset = 0
+        try:
+            with open(self.dosya_yolu, 'rb') as f:
+                f.seek(ofset)
+                veri = f.read()
+        except OSError:
+            return
+
+        i = 0
+        while i + _UZUNLUK.size <= len(veri):
+            (n,) = _UZUNLUK.unpack_from(veri, i)
+            if i + _UZUNLUK.size + n > len(veri):
+                break  # Yarım kalmış son kayıt (yazarken kesinti)
+            self._kuyruk.append(veri[i + _UZUNLUK.size:i + _UZUNLUK.size + n])
+            i += _UZUNLUK.size + n
+        while len(self._kuyruk) > self.kapasite:
+            self._kuyruk.popleft()
+        self.geri_yuklenen = len(self._kuyruk)
+        # Dosya bellekteki kuyrukla yeniden yazılır (yarım kayıt ve ofset temizlenir)
+        self._dosyayi_yeniden_yaz()
+
+    def _dosyayi_yeniden_yaz(self):
+        """Dosyayı bellekteki kuyrukla değiştirir (kilit altında çağrılır)"""
+        if not self.dosya_yolu:
+            return
+        try:
+            if self._dosya:
+                self._dosya.close()
+                self._dosya = None
+            if not self._kuyruk:
+                for yol in (self.dosya_yolu, self.ofset_yolu):
+                    if os.path.exists(yol):
+                        os.remove(yol)
+            else:
+                gecici = self.dosya_yolu + ".tmp"
+                with open(gecici, 'wb') as f:
+                    for kayit in self._kuyruk:
+                        f.write(_UZUNLUK.pack(len(kayit)) + kayit)
+                os.replace(gecici, self.dosya_yolu)
+                if os.path.exists(self.ofset_yolu):
+                    os.remove(self.ofset_yolu)
+        except OSError as e:
+            print(f"⚠️ Telemetri deposu dosyası yazılamadı: {e}")
+        self._dosya_kayit = len(self._kuyruk)
+        self._ofset = 0
+
+    def _dosyaya_ekle(self, kayit: bytes):
+        if not self.dosya_yolu:
+            return
+        try:
+            if self._dosya is None:
+                klasor = os.path.dirname(self.dosya_yolu)
+                if klasor:
+                    os.makedirs(klasor, exist_ok=True)
+                self._dosya = open(self.dosya_yolu, 'ab')
+            self._dosya.write(_UZUNLUK.pack(len(kayit)) + kayit)
+            self._dosya.flush()
+            self._dosya_kayit += 1
+        except OSError as e:
+            print(f"⚠️ Telemetri deposu dosyasına eklenemedi: {e}")
+
+    def _ofset_kaydet(self):
+        if not self.ofset_yolu:
+            return
+        try:
+            gecici = self.ofset_yolu + ".tmp"
+            with open(gecici, 'w') as f:
+                f.write(str(self._ofset))
+            os.replace(gecici, self.ofset_yolu)
+        except OSError as e:
+            print(f"⚠️ Telemetri deposu ofseti yazılamadı: {e}")
+
+    # ------------------------------------------------------------------
+    # Kuyruk
+    # ------------------------------------------------------------------
+    def ekle(self, veri):
+        """Gönderilemeyen paketi depoya ekler (dolunca en eskisi atılır)"""
+        kayit = bytes(veri)
+        with self._kilit:
+            self._kuyruk.append(kayit)
+            self.eklenen += 1
+            self._dosyaya_ekle(kayit)
+            if len(self._kuyruk) > self.kapasite:
+                eski = self._kuyruk.popleft()
+                self._ofset += _UZUNLUK.size + len(eski)
+                self.dusurulen += 1
+            if self._dosya_kayit > 2 * self.kapasite:
+                self._dosyayi_yeniden_yaz()
+
+    def bosalt(self, gonder, sinir=None) -> int:
+        """
+        Jeton izin verdiği kadar paketi gonder(veri) ile verir; gonder False
+        dönerse paket depoda kalır ve boşaltma durur. Verilen paket sayısını
+        döndürür.
+
+        Args:
+            sinir: Bu çağrıda verilecek en fazla paket (ör. TX kuyruğundaki boş yer)
+        """
+        with self._kilit:
+            simdi = self.saat()
+            self._jeton = min(max(1.0, self.hiz), self._jeton + (simdi - self._son_dolum) * self.hiz)
+            self._son_dolum = simdi
+            if not self._kuyruk:
+                return 0
+            if self._bosaltma_baslangici is None:
+                self._bosaltma_baslangici = simdi
+
+        verilen = 0
+        while sinir is None or verilen < sinir:
+            with self._kilit:
+                if not self._kuyruk or self._jeton < 1.0:
+                    break
+                kayit = self._kuyruk[0]
+            if not gonder(kayit):
+                break
+            with self._kilit:
+                # gonder sırasında ekle() en eskiyi atmış olabilir
+                if self._kuyruk and self._kuyruk[0] is kayit:
+                    self._kuyruk.popleft()
+                    self._ofset += _UZUNLUK.size + len(kayit)
+                self._jeton -= 1.0
+                self.gonderilen += 1
+            verilen += 1
+
+        if verilen:
+            with self._kilit:
+                if self._kuyruk:
+                    self._ofset_kaydet()
+                else:
+                    self.son_bosaltma_suresi = self.saat() - self._bosaltma_baslangici
+                    self._bosaltma_baslangici = None
+                    self._dosyayi_yeniden_yaz()
+        return verilen
+
+    def __len__(self):
+        return len(self._kuyruk)
+
+    def kapat(self):
+        with self._kilit:
+            if self._dosya:
+                self._dosya.close()
+                self._dosya = None
+
+    def get_istatistikler(self) -> dict:
+        derinlik = len(self._kuyruk)
+        baslangic = self._bosaltma_baslangici
+        return {
+            'derinlik': derinlik,
+            'eklenen': self.eklenen,
+            'gonderilen': self.gonderilen,
+            'dusurulen': self.dusurulen,
+            'geri_yuklenen': self.geri_yuklenen,
+            'bosaltma_suresi_s': round(self.saat() - baslangic, 1) if baslangic is not None else None,
+            'tahmini_kalan_s': round(derinlik / self.hiz, 1) if self.hiz > 0 else None,
+            'son_bosaltma_suresi_s': round(self.son_bosaltma_suresi, 1) if self.son_bosaltma_suresi is not None else None
+        }
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import tempfile
+
+    sanal_zaman = [0.0]
+    klasor = tempfile.mkdtemp()
+    yol = os.path.join(klasor, "telemetri_deposu.bin")
+
+    # 60 s kesinti: 1 Hz telemetri depoya girer, program 40. saniyede yeniden başlar
+    depo = TelemetriDeposu(yol, kapasite=50, hiz=4.0, saat=lambda: sanal_zaman[0])
+    for i in range(40):
+        depo.ekle(f"$286570,{i},...*00\n".encode())
+    depo._dosya.close()  # Güç kesintisi benzetimi (kapat() çağrılmadan)
+
+    depo = TelemetriDeposu(yol, kapasite=50, hiz=4.0, saat=lambda: sanal_zaman[0])
+    print(f"🔁 Yeniden başlatma: {depo.geri_yuklenen} paket dosyadan geri yüklendi")
+    for i in range(40, 60):
+        depo.ekle(f"$286570,{i},...*00\n".encode())
+    print(f"📦 Kesinti sonu: {depo.get_istatistikler()}")
+
+    # Link düzeldi: canlı telemetri 1 Hz, depo en fazla 4 paket/s
+    yer_istasyonu = []
+    while len(depo):
+        sanal_zaman[0] += 1.0
+        depo.bosalt(lambda veri: yer_istasyonu.append(int(veri.split(b",")[1])) or True)
+    numaralar = sorted(yer_istasyonu)
+    assert numaralar == list(range(10, 60)), "En eski 10 paket kapasite nedeniyle atılmalı"
+    assert not os.path.exists(yol), "Boşalan depo dosyası silinmeli"
+    print(f"📡 {len(yer_istasyonu)} geçmiş paket gönderildi ({numaralar[0]}..{numaralar[-1]}), "
+          f"{depo.get_istatistikler()}")
@@ -14,8 +14,20 @@ from moduller.yapilandirma import (
     AYRILMA_YUKSEKLIK as AYRILMA_IRTIFASI, paket_sayisi_yukle, paket_sayisi_kaydet,
     HIZ_LIMIT_MODEL_UYDU_MIN, HIZ_LIMIT_MODEL_UYDU_MAX,
     HIZ_LIMIT_GOREV_YUKU_MIN, HIZ_LIMIT_GOREV_YUKU_MAX,
-    AYRILMA_TOLERANS
+    AYRILMA_TOLERANS, TELEMETRI_DOWNLINK_FORMATI, TELEMETRI_HALKA_BOYUTU,
+    TELEMETRI_GONDERIM_SIKLIGI, IRTIFA_FILTRESI_OLCUM_STD, IRTIFA_FILTRESI_IVME_STD,
+    IRTIFA_FILTRESI_KAPI, IRTIFA_FILTRESI_IVME_KULLAN, KANAL_GECMISI_BOYUTU,
+    UCUS_DURUMU_ONAY_ORNEK, UCUS_KALKIS_HIZI, UCUS_KALKIS_IRTIFASI, UCUS_TEPE_HIZI,
+    UCUS_TEPE_PAYI, UCUS_AYRILMA_FARKI
 )
+from moduller.telemetri_kodlayici import (
+    telemetri_satirlari, binary_kodla, xbee_satiri, DeltaKodlayici, ZAMAN_BICIMI
+)
+from moduller.paket_halkasi import PaketHalkasi
+from moduller.telemetri_kaydi import TelemetriKaydi
+from moduller.irtifa_filtresi import IrtifaKalmanFiltresi, dikey_ivme, VERI_BOSLUGU_SURESI
+from moduller.kanal_gecmisi import KanalGecmisi, telemetri_degerleri
+from moduller.ucus_durumu import UcusDurumMakinesi
 
 logger = logging.getLogger(__name__)
 
@@ -37,50 +49,49 @@ class TelemetryHandler:
         self.saha_alici = saha_alici
 
         # Timing ve durum takibi
-        self.ayrilma_baslangic_zamani = None
         self.son_irtifa = 0.0
         self.son_irtifa_zamani = time.time()
-        self.hiz_gecmisi = []  # Son 5 ölçüm için hız geçmişi
+        # İrtifa + dikey hız Kalman filtresi (iniş hızı ve ARAS hız kontrolleri)
+        self.irtifa_filtresi = IrtifaKalmanFiltresi(
+            adim=TELEMETRI_GONDERIM_SIKLIGI, olcum_std=IRTIFA_FILTRESI_OLCUM_STD,
+            ivme_std=IRTIFA_FILTRESI_IVME_STD, kapi=IRTIFA_FILTRESI_KAPI)
+        self.son_filtre_zamani = None
         self.tasiyici_irtifa = 0.0
         
+        # Uçuş durum makinesi (uydu statüsü, tepe noktası ve ayrılma tespiti)
+        self.durum_makinesi = UcusDurumMakinesi(
+            ayrilma_irtifasi=AYRILMA_IRTIFASI, ayrilma_toleransi=AYRILMA_TOLERANS,
+            onay_ornek=UCUS_DURUMU_ONAY_ORNEK, kalkis_hizi=UCUS_KALKIS_HIZI,
+            kalkis_irtifasi=UCUS_KALKIS_IRTIFASI, tepe_hizi=UCUS_TEPE_HIZI,
+            tepe_payi=UCUS_TEPE_PAYI, ayrilma_farki=UCUS_AYRILMA_FARKI)
+        
         # RHRH komutu - varsayılan
         self.rhrh_komut = "0000"
         
         # Hız hesaplama için zaman aşımı süreleri
         self.gps_timeout_suresi = 30.0  # 30 saniye
         
-        # Hız hesaplama için gerekli değişkenler
-        self.onceki_zaman = time.time()
-        self.onceki_yukseklik = 0.0
-        self.max_hiz_gecmis = 5
         self.basinc_timeout_suresi = 15.0  # 15 saniye
         self.son_gps_zamani = time.time()
         self.son_tasiyici_basinc_zamani = time.time()
         
         # Ek durumlar
-        self.ayrilma_gerceklesti = False
         self.multispektral_sistem_hatasi = False
         self.son_gonderim_zamani = ""
         
-    def _hesapla_checksum(self, veri):
-        """
-        XOR checksum hesaplama (TÜRKSAT yer istasyonu uyumlu)
-        """
-        checksum = 0
-        for char in veri:
-            checksum ^= ord(char)
-        return checksum
-
-    def _hesapla_checksum_duplicate(self, veri: str) -> int:
-        """
-        XOR checksum hesapla (C# yer istasyonu ile uyumlu)
-        Yer istasyonu HesaplaChecksum metodu ile aynı algoritma
-        """
-        checksum = 0
-        for char in veri:
-            checksum ^= ord(char)
-        return checksum & 0xFF  # 8-bit checksum
-
+        # "delta" downlink: anahtar kare + değişen alan farkları
+        self.delta_kodlayici = DeltaKodlayici()
+        
+        # Son gönderilen paketler (#RESEND ile yeniden gönderim için)
+        self.paket_halkasi = PaketHalkasi(TELEMETRI_HALKA_BOYUTU)
+        
+        # Tüm kanalların son örnekleri (pencere istatistikleri için, NumPy gerekir)
+        try:
+            self.kanal_gecmisi = KanalGecmisi(kapasite=KANAL_GECMISI_BOYUTU)
+        except ImportError as e:
+            print(f"UYARI: Kanal geçmişi devre dışı: {e}")
+            self.kanal_gecmisi = None
+        
     def set_rhrh_komut(self, komut):
         """
         Yer istasyonundan gelen RHRH komutunu telemetriye eklenmek üzere kaydeder.
@@ -93,82 +104,36 @@ class TelemetryHandler:
         """
         self.multispektral_sistem_hatasi = durum
 
-    def _guncelle_uydu_statusu(self, yukseklik, inis_hizi):
+    def _guncelle_uydu_statusu(self, irtifa_farki=None):
         """
-        🔧 DÜZELTME: Mevcut irtifa ve hıza göre uydu durumunu günceller.
+        Uçuş durum makinesini filtrelenmiş irtifa/dikey hızla bir adım ilerletir.
         0: Uçuşa Hazır, 1: Yükselme, 2: Model Uydu İniş,
-        3: Ayrılma, 4: Görev Yükü İniş, 5: Kurtarma
+        3: Ayrılma, 4: Görev Yükü İniş, 5: Kurtarma (yalnızca ileri yönde)
         """
-        # Yükselme/iniş tespiti için yükseklik değişimini hesapla
-        yukseklik_farki = self.onceki_yukseklik - yukseklik if self.onceki_yukseklik > 0 else 0
-        zaman_farki = time.time() - self.onceki_zaman if self.onceki_zaman > 0 else 0
-        # Bu mantık, gerçek uçuş verilerine göre daha da geliştirilebilir.
-        # Örneğin, yükselme apogee noktası tespiti ile daha hassas hale getirilebilir.
-        if self.uydu_statusu == 5:  # Kurtarma modundaysa durumu değiştirme
-            return
-
-        # 🔧 DÜZELTME: Kurtarma modu geçişi (Gereksinim 24)
-        if self.uydu_statusu == 4 and yukseklik < 10.0:
-            self.uydu_statusu = 5  # Kurtarma
-            print("🚨 KURTARMA MODU BAŞLATILDI! (Yükseklik: {:.1f}m)".format(yukseklik))
-            return
+        self.uydu_statusu = self.durum_makinesi.guncelle(
+            time.time(), self.irtifa_filtresi.irtifa, self.irtifa_filtresi.dikey_hiz, irtifa_farki)
+        return self.uydu_statusu
 
-        if self.ayrilma_gerceklesti:
-            self.uydu_statusu = 4  # Görev Yükü İniş
-        elif yukseklik >= (AYRILMA_IRTIFASI - AYRILMA_TOLERANS) and yukseklik <= (AYRILMA_IRTIFASI + AYRILMA_TOLERANS):
-            if self.uydu_statusu != 3:
-                # Ayrılma durumuna ilk kez giriliyor
-                self.ayrilma_baslangic_zamani = time.time()
-                print("BİLGİ: Ayrılma sekansı başlatıldı, zamanlayıcı kuruldu.")
-            self.uydu_statusu = 3  # Ayrılma
-        elif yukseklik > 50 and yukseklik_farki > 1 and zaman_farki > 0:  # İniş tespit edildi
-            self.uydu_statusu = 2  # Model Uydu İniş
-        elif yukseklik > 10 and yukseklik_farki < -1 and zaman_farki > 0:  # Yükselme tespit edildi
-            self.uydu_statusu = 1
-        else:
-            self.uydu_statusu = 0  # Uçuşa Hazır
-
-    def _hesapla_inis_hizi(self, anlik_yukseklik):
+    def _hesapla_inis_hizi(self, anlik_yukseklik, kayit: TelemetriKaydi = None):
         """
-        🔧 İYİLEŞTİRİLMİŞ: İki yükseklik ölçümü arasındaki farktan hızı hesaplar.
-        Smoothing filter ve outlier detection içerir.
+        İrtifa filtresini bir örnek ilerletir, iniş hızını (m/s, aşağı +) döndürür.
+        Örnek aralığı ölçülür; 5 saniyeden uzun boşlukta filtre yeniden başlar.
         """
-        simdiki_zaman = time.time()
-        zaman_farki = simdiki_zaman - self.onceki_zaman
-        
-        if zaman_farki == 0 or zaman_farki > 5.0:  # 5 saniyeden fazla gap varsa sıfırla
-            self.onceki_yukseklik = anlik_yukseklik
-            self.onceki_zaman = simdiki_zaman
-            return 0.0
+        simdiki_zaman = time.monotonic()
+        zaman_farki = None
+        if self.son_filtre_zamani is not None:
+            zaman_farki = simdiki_zaman - self.son_filtre_zamani
+            if zaman_farki > VERI_BOSLUGU_SURESI:
+                self.irtifa_filtresi.sifirla()
+        self.son_filtre_zamani = simdiki_zaman
 
-        # Ham hız hesaplama - MUTLAK DEĞER (şartname belirsiz, praktik yaklaşım)
-        yukseklik_farki = self.onceki_yukseklik - anlik_yukseklik
-        ham_hiz = abs(yukseklik_farki / zaman_farki)  # Her zaman pozitif hız değeri
-
-        # 🔧 OUTLIER DETECTION: Aşırı hız değerlerini filtrele
-        if abs(ham_hiz) > 50.0:  # 50 m/s'den fazla hız fiziksel olarak imkansız
-            print(f"UYARI: Aşırı hız değeri filtrelendi: {ham_hiz:.1f} m/s")
-            return self.hiz_gecmisi[-1] if self.hiz_gecmisi else 0.0
-
-        # 🔧 SMOOTHING FILTER: Son 5 hız değerinin ortalaması
-        self.hiz_gecmisi.append(ham_hiz)
-        if len(self.hiz_gecmisi) > self.max_hiz_gecmis:
-            self.hiz_gecmisi.pop(0)
-        
-        # Median filter (outlier'lara karşı robust)
-        sorted_speeds = sorted(self.hiz_gecmisi)
-        if len(sorted_speeds) >= 3:
-            smoothed_hiz = sorted_speeds[len(sorted_speeds)//2]  # Median
-        else:
-            smoothed_hiz = sum(self.hiz_gecmisi) / len(self.hiz_gecmisi)  # Ortalama
+        ivme = None
+        if IRTIFA_FILTRESI_IVME_KULLAN and kayit is not None:
+            ivme = dikey_ivme(kayit.ivme_x, kayit.ivme_y, kayit.ivme_z, kayit.pitch, kayit.roll)
+        self.irtifa_filtresi.guncelle(anlik_yukseklik, zaman_farki, ivme)
+        return self.irtifa_filtresi.inis_hizi
 
-        # Önceki değerleri güncelle
-        self.onceki_yukseklik = anlik_yukseklik
-        self.onceki_zaman = simdiki_zaman
-        
-        return smoothed_hiz
-
-    def _guncelle_hata_kodu(self, sensor_data):
+    def _guncelle_hata_kodu(self, kayit: TelemetriKaydi):
         """
         🔧 İYİLEŞTİRİLMİŞ: ARAS (Arayüz Alarm Sistemi) kurallarına göre hata kodunu günceller.
         Şartname bölüm 2.2'ye göre 6 haneli hata kodu:
@@ -182,20 +147,16 @@ class TelemetryHandler:
         hata_listesi = ['0'] * 6
         simdiki_zaman = time.time()
 
-        # İyileştirilmiş hız hesaplama
-        mevcut_irtifa = sensor_data.get('irtifa', 0.0)
-        inis_hizi = 0.0
-        if self.onceki_zaman > 0:  # Önceki veri varsa hız hesapla
-            inis_hizi = abs(self._hesapla_inis_hizi(mevcut_irtifa))
+        # Filtrelenmiş iniş hızı (olustur_telemetri_paketi kayda yazar)
+        inis_hizi = abs(kayit.inis_hizi)
         
         # Taşıyıcı basınç verisi kontrolü
-        tasiyici_basinci = sensor_data.get('tasiyici_basinci', 0.0)
+        tasiyici_basinci = kayit.tasiyici_basinci
         if tasiyici_basinci > 0:
             self.son_tasiyici_basinc_zamani = simdiki_zaman
         
         # GPS verisi kontrolü
-        gps_verisi = sensor_data.get('gps_verisi', {})
-        gps_valid = (gps_verisi.get('enlem', 0.0) != 0.0 and gps_verisi.get('boylam', 0.0) != 0.0)
+        gps_valid = (kayit.gps_enlem != 0.0 and kayit.gps_boylam != 0.0)
         if gps_valid:
             self.son_gps_zamani = simdiki_zaman
         
@@ -226,9 +187,8 @@ class TelemetryHandler:
                 print(f"🚨 ARAS Hata 4: GPS timeout ({self.gps_timeout_suresi}s)")
             
         # Kural 5: Ayrılmanın gerçekleşmemesi (Timeout)
-        if (self.uydu_statusu == 3 and 
-            self.ayrilma_baslangic_zamani > 0 and 
-            (simdiki_zaman - self.ayrilma_baslangic_zamani > AYRILMA_TIMEOUT)):
+        if (self.uydu_statusu == 3 and
+                self.durum_makinesi.durum_suresi(simdiki_zaman) > AYRILMA_TIMEOUT):
             hata_listesi[4] = '1'
             print(f"🚨 ARAS Hata 5: Ayrılma timeout ({AYRILMA_TIMEOUT}s)")
             
@@ -240,133 +200,86 @@ class TelemetryHandler:
         
         self.hata_kodu = "".join(hata_listesi)
 
-    def _irtifa_hesapla(self, basinc, deniz_seviyesi_basinc=DENIZ_SEVIYESI_BASINC_HPA):
-        """Verilen basınç değerine göre irtifayı hesaplar (Barometrik formül)."""
+    def _irtifa_hesapla(self, basinc, deniz_seviyesi_basinc=DENIZ_SEVIYESI_BASINC_HPA * 100.0):
+        """Verilen basınç değerine (Pa) göre irtifayı hesaplar (Barometrik formül)."""
         if basinc <= 0:
             return 0.0
-        # 44330 * (1 - (P/P0)^(1/5.255))
+        # 44330 * (1 - (P/P0)^(1/5.255)), P ve P0 Pascal
         return 44330.0 * (1.0 - pow(basinc / deniz_seviyesi_basinc, 0.1903))
 
-    def olustur_telemetri_paketi(self, sensor_verisi: dict, iot_s1_data=None, iot_s2_data=None):
+    def _xbee_verileri(self, kayit: TelemetriKaydi):
+        """
+        (taşıyıcı basıncı, IoT1, IoT2) - sensör okumasının kullandığı XBee anlık
+        görüntüsünden, yoksa alıcının güncel görüntüsünden; ikisi de yoksa
+        kayıt alanlarından.
+        """
+        goruntu = kayit.xbee_goruntusu
+        if goruntu is None and hasattr(self.saha_alici, 'get_anlik_goruntu'):
+            goruntu = self.saha_alici.get_anlik_goruntu()
+        if goruntu is not None:
+            simdi = time.time()
+            iot_s1, iot_s2 = goruntu.iot_sicakliklari(simdi)
+            return goruntu.basinc2_degeri(simdi), iot_s1, iot_s2
+        
+        return kayit.tasiyici_basinci, kayit.iot_s1, kayit.iot_s2
+    
+    def olustur_telemetri_paketi(self, sensor_verisi, iot_s1_data=None, iot_s2_data=None):
         """
         🔥 BASİT VE GÜVENİLİR TELEMETRİ PAKETİ OLUŞTURUCU
-        Tüm karmaşık fonksiyonlar bypass edildi - sadece SD kaydı odaklı!
+        sensor_verisi: SensorManager'ın TelemetriKaydi'si (eski iç içe sözlük de kabul edilir)
         """
-        print("  🔧 DEBUG: BASİT telemetri paketi oluşturuluyor...")
+        kayit = sensor_verisi
+        if not isinstance(kayit, TelemetriKaydi):
+            kayit = TelemetriKaydi.sozlukten(kayit)
         
         # 🔥 GERÇEK SENSÖR VERİLERİNİ KULLAN!
         try:
             # Temel sensör verileri (GERÇEK)
-            gorev_yuku_basinci = sensor_verisi.get("basinc", 101325)  # Pascal cinsinden - GERÇEK BMP280
-            gorev_yuku_irtifa = sensor_verisi.get("irtifa", 0.0)  # GERÇEK yükseklik
+            gorev_yuku_basinci = kayit.basinc  # Pascal cinsinden - GERÇEK BMP280
+            gorev_yuku_irtifa = kayit.irtifa   # GERÇEK yükseklik
             
             # 🔧 ŞARTNAME: Yükseklik konfigürasyonu - uçuşa başlanacak yer 0 metre
             # Basınçtan yükseklik hesapla (barometrik formül) - GERÇEK HESAPLAMA
+            # Taşıyıcı ile aynı referans (P0, Pa): irtifa farkı ayrılma tespitinde kullanılır
             if gorev_yuku_basinci > 0 and gorev_yuku_basinci != 101325:
-                # P0 = deniz seviyesi basıncı (101325 Pa)
-                # h = 44330 * (1 - (P/P0)^0.1903) 
-                deniz_seviyesi_basinc = 101325.0
-                calculated_altitude = 44330.0 * (1.0 - pow(gorev_yuku_basinci / deniz_seviyesi_basinc, 0.1903))
-                gorev_yuku_irtifa = max(0.0, calculated_altitude)  # Negatif yükseklik olmasın
-            sicaklik = sensor_verisi.get("sicaklik", 25.0)  # GERÇEK BMP280 sıcaklık
-            pil_gerilimi = sensor_verisi.get("pil_gerilimi", 7.4)  # GERÇEK pil voltajı
-            
-            # GPS verileri (GERÇEK) - FAKE KOORDİNATLARI KALDIR!
-            gps_verisi = sensor_verisi.get("gps_verisi", {})
-            gps_lat = gps_verisi.get("enlem", 0.0)  # GERÇEK GPS enlem (fake İstanbul yok!)
-            gps_lon = gps_verisi.get("boylam", 0.0)  # GERÇEK GPS boylam (fake İstanbul yok!)
-            gps_alt = gps_verisi.get("yukseklik", 0.0)  # GERÇEK GPS yükseklik
-            
-            # IMU verileri (GERÇEK) - Hem işlenmiş hem ham veriler
-            imu_verisi = sensor_verisi.get("imu_verisi", {})
-            pitch = imu_verisi.get("pitch", 0.0)  # GERÇEK MPU açı
-            roll = imu_verisi.get("roll", 0.0)    # GERÇEK MPU açı
-            yaw = imu_verisi.get("yaw", 0.0)      # GERÇEK MPU açı
-            
-            # Ham IMU verileri (10DOF sensör ham değerleri)
-            acc_x = imu_verisi.get("ivme_x", 0.0)    # Accelerometer X
-            acc_y = imu_verisi.get("ivme_y", 0.0)    # Accelerometer Y
-            acc_z = imu_verisi.get("ivme_z", 0.0)    # Accelerometer Z
-            gyro_x = imu_verisi.get("gyro_x", 0.0)   # Gyroscope X
-            gyro_y = imu_verisi.get("gyro_y", 0.0)   # Gyroscope Y
-            gyro_z = imu_verisi.get("gyro_z", 0.0)   # Gyroscope Z
-            mag_x = imu_verisi.get("mag_x", 0.0)     # Magnetometer X
-            mag_y = imu_verisi.get("mag_y", 0.0)     # Magnetometer Y
-            mag_z = imu_verisi.get("mag_z", 0.0)     # Magnetometer Z
+                gorev_yuku_irtifa = max(0.0, self._irtifa_hesapla(gorev_yuku_basinci))  # Negatif yükseklik olmasın
             
             # 🔧 GERÇEK HESAPLAMALAR - ARTIK BYPASS YOK!
             # Taşıyıcı basıncı (saha alıcısından)
-            tasiyici_basinci = sensor_verisi.get("tasiyici_basinc", 0.0)  # GERÇEK taşıyıcı
+            tasiyici_basinci, iot_s1_temp, iot_s2_temp = self._xbee_verileri(kayit)  # GERÇEK taşıyıcı + IoT
             self.tasiyici_irtifa = self._irtifa_hesapla(tasiyici_basinci) if tasiyici_basinci > 0 else 0.0
             irtifa_farki = gorev_yuku_irtifa - self.tasiyici_irtifa  # GERÇEK fark
-            inis_hizi = sensor_verisi.get("inis_hizi", 0.0)  # GERÇEK hız
             
-            # Uydu statusü - gerçek duruma göre
-            if tasiyici_basinci > 0 and irtifa_farki < 10:  # Henüz ayrılmamış
-                self.uydu_statusu = 1  # Uçuş
-            elif irtifa_farki > 10:  # Ayrıldı
-                self.uydu_statusu = 3  # Ayrılma
-            else:
-                self.uydu_statusu = 0  # Hazır
-            
-            # Hata kodu hesapla (gerçek)
-            self._guncelle_hata_kodu(sensor_verisi)
+            # Filtrelenmiş irtifa/hız -> uydu statüsü (durum makinesi) -> ARAS hata kodu.
+            # Filtreye SD'ye yazılan YÜKSEKLİK1 verilir: ucus_kaydini_oynat aynı girdiyi kullanır
+            inis_hizi = self._hesapla_inis_hizi(gorev_yuku_irtifa, kayit)
+            kayit.inis_hizi = inis_hizi
+            self._guncelle_uydu_statusu(irtifa_farki if tasiyici_basinci > 0 else None)
+            self._guncelle_hata_kodu(kayit)
+            if self.kanal_gecmisi is not None:
+                self.kanal_gecmisi.ekle(time.monotonic(), telemetri_degerleri(kayit))
         
-            # IoT verileri (güvenli)
-            iot_s1_temp = 25.0
-            iot_s2_temp = 25.0
-            
             # Zaman (güvenli) - Şartname: DD/MM/YYYY HH:MM:SS
-            # RTC zamanını kullan (sensor_verisi'nden)
-            rtc_time = sensor_verisi.get('rtc_time', None)
+            # RTC zamanını kullan (kayıttan)
+            rtc_time = kayit.rtc_time
             if rtc_time:
-                # struct_time'ı datetime'a çevir
-                if hasattr(rtc_time, 'tm_year'):  # struct_time kontrolü
-                    rtc_datetime = datetime(*rtc_time[:6])  # struct_time'dan datetime
-                    gonderme_saati = rtc_datetime.strftime("%d/%m/%Y %H:%M:%S")
+                if hasattr(rtc_time, 'tm_year'):  # struct_time doğrudan biçimlenir
+                    gonderme_saati = time.strftime(ZAMAN_BICIMI, rtc_time)
                 else:
-                    gonderme_saati = rtc_time.strftime("%d/%m/%Y %H:%M:%S")
+                    gonderme_saati = rtc_time.strftime(ZAMAN_BICIMI)
             else:
-                gonderme_saati = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-            
-            print("  🔧 DEBUG: Tüm veriler güvenli şekilde hazırlandı")
-            
+                gonderme_saati = time.strftime(ZAMAN_BICIMI)
+                        
         except Exception as e:
             print(f"  🚨 DEBUG: Veri hazırlama hatası: {e}")
-            # FULL EMERGENCY FALLBACK - GERÇEK VERİLER İLE
-            gorev_yuku_basinci = sensor_verisi.get("basinc", 101325)  # GERÇEK BMP280
-            gorev_yuku_irtifa = sensor_verisi.get("irtifa", 0.0)      # GERÇEK yükseklik
-            sicaklik = sensor_verisi.get("sicaklik", 25.0)            # GERÇEK sıcaklık
-            pil_gerilimi = sensor_verisi.get("pil_gerilimi", 7.4)     # GERÇEK pil
-            
-            # GPS - GERÇEK VERİLER (fake İstanbul koordinatları YOK!)
-            gps_verisi = sensor_verisi.get("gps_verisi", {})
-            gps_lat = gps_verisi.get("enlem", 0.0)      # GERÇEK GPS
-            gps_lon = gps_verisi.get("boylam", 0.0)     # GERÇEK GPS  
-            gps_alt = gps_verisi.get("yukseklik", 0.0)  # GERÇEK GPS
-            
-            # IMU - GERÇEK VERİLER (hem işlenmiş hem ham)
-            imu_verisi = sensor_verisi.get("imu_verisi", {})
-            pitch = imu_verisi.get("pitch", 0.0)        # GERÇEK MPU
-            roll = imu_verisi.get("roll", 0.0)          # GERÇEK MPU
-            yaw = imu_verisi.get("yaw", 0.0)            # GERÇEK MPU
-            
-            # Ham IMU verileri (emergency fallback)
-            acc_x = imu_verisi.get("ivme_x", 0.0)
-            acc_y = imu_verisi.get("ivme_y", 0.0)
-            acc_z = imu_verisi.get("ivme_z", 0.0)
-            gyro_x = imu_verisi.get("gyro_x", 0.0)
-            gyro_y = imu_verisi.get("gyro_y", 0.0)
-            gyro_z = imu_verisi.get("gyro_z", 0.0)
-            mag_x = imu_verisi.get("mag_x", 0.0)
-            mag_y = imu_verisi.get("mag_y", 0.0)
-            mag_z = imu_verisi.get("mag_z", 0.0)
-            
-            tasiyici_basinci = sensor_verisi.get("tasiyici_basinc", 0.0)  # GERÇEK saha
+            # FULL EMERGENCY FALLBACK - GERÇEK VERİLER İLE (sensör alanları kayıttan)
+            gorev_yuku_basinci = kayit.basinc
+            gorev_yuku_irtifa = kayit.irtifa
+            tasiyici_basinci = kayit.tasiyici_basinci  # GERÇEK saha
             self.tasiyici_irtifa = 0.0
             irtifa_farki = 0.0
             inis_hizi = 0.0
-            self.uydu_statusu = 0
+            self.uydu_statusu = self.durum_makinesi.durum  # Statü uçuş ortasında 0'a dönmez
             self.hata_kodu = "000000"
             iot_s1_temp = iot_s2_temp = 25.0  # IoT simülasyon (GPS/ADC gibi)
             gonderme_saati = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
@@ -376,63 +289,72 @@ class TelemetryHandler:
             # Paket numarası arttır (Gereksinim 15: 1'den başlar)
             if not hasattr(self, 'packet_number') or self.packet_number is None:
                 self.packet_number = 1
-                print(f"  🔧 DEBUG: Paket sayacı 1'den başlatıldı")
+                logger.debug("Paket sayacı 1'den başlatıldı")
             else:
                 self.packet_number += 1
                 
             # ŞARTNAME UYUMLULUK: Paket sayacı çok yüksekse sıfırla
             if self.packet_number > 9999:  # 4 haneli limit
                 self.packet_number = 1
-                print(f"  🔧 DEBUG: Paket sayacı sıfırlandı (>9999)")
+                logger.debug("Paket sayacı sıfırlandı (>9999)")
+            
+            # Telemetri alan değerleri (ŞARTNAME UYUMLU + 10DOF HAM VERİLER)
+            # ASCII ve binary kodlama aynı değerlerden üretilir
+            degerler = {
+                'paket_numarasi': self.packet_number,       # PAKET NUMARASI
+                'uydu_statusu': self.uydu_statusu,          # UYDU STATÜSÜ
+                'hata_kodu': self.hata_kodu,                # HATA KODU
+                'gonderme_saati': gonderme_saati,           # GÖNDERME SAATİ
+                'basinc1': gorev_yuku_basinci,              # BASINÇ1 (Pascal)
+                'basinc2': tasiyici_basinci,                # BASINÇ2 (Pascal)
+                'yukseklik1': gorev_yuku_irtifa,            # YÜKSEKLİK1
+                'yukseklik2': self.tasiyici_irtifa,         # YÜKSEKLİK2
+                'irtifa_farki': irtifa_farki,               # İRTİFA FARKI
+                'inis_hizi': inis_hizi,                     # İNİŞ HIZI
+                'sicaklik': kayit.sicaklik,                 # SICAKLIK
+                'pil_gerilimi': kayit.pil_gerilimi,         # PİL GERİLİMİ
+                'gps1_latitude': kayit.gps_enlem,           # GPS1 LATITUDE
+                'gps1_longitude': kayit.gps_boylam,         # GPS1 LONGITUDE
+                'gps1_altitude': kayit.gps_yukseklik,       # GPS1 ALTITUDE
+                'pitch': kayit.pitch,                       # PITCH
+                'roll': kayit.roll,                         # ROLL
+                'yaw': kayit.yaw,                           # YAW
+                'ivme_x': kayit.ivme_x,                     # 10DOF ACCELEROMETER X
+                'ivme_y': kayit.ivme_y,                     # 10DOF ACCELEROMETER Y
+                'ivme_z': kayit.ivme_z,                     # 10DOF ACCELEROMETER Z
+                'gyro_x': kayit.gyro_x,                     # 10DOF GYROSCOPE X
+                'gyro_y': kayit.gyro_y,                     # 10DOF GYROSCOPE Y
+                'gyro_z': kayit.gyro_z,                     # 10DOF GYROSCOPE Z
+                'mag_x': kayit.mag_x,                       # 10DOF MAGNETOMETER X
+                'mag_y': kayit.mag_y,                       # 10DOF MAGNETOMETER Y
+                'mag_z': kayit.mag_z,                       # 10DOF MAGNETOMETER Z
+                'rhrh': "00",                               # RHRH
+                'iot_s1': iot_s1_temp,                      # IoT S1 DATA
+                'iot_s2': iot_s2_temp,                      # IoT S2 DATA
+                'takim_no': TAKIM_NUMARASI                  # TAKIM NO
+            }
             
-            # Telemetri paketini birleştir (ŞARTNAME UYUMLU + 10DOF HAM VERİLER)
-            paket_parcalari = [
-                str(self.packet_number),           # PAKET NUMARASI
-                str(self.uydu_statusu),           # UYDU STATÜSÜ
-                self.hata_kodu,                   # HATA KODU
-                gonderme_saati,                   # GÖNDERME SAATİ
-                f"{gorev_yuku_basinci:.0f}",      # BASINÇ1 (Pascal)
-                f"{tasiyici_basinci:.0f}",        # BASINÇ2 (Pascal)
-                f"{gorev_yuku_irtifa:.3f}",       # YÜKSEKLİK1
-                f"{self.tasiyici_irtifa:.3f}",    # YÜKSEKLİK2
-                f"{irtifa_farki:.3f}",            # İRTİFA FARKI
-                f"{inis_hizi:.2f}",               # İNİŞ HIZI
-                f"{sicaklik:.1f}",                # SICAKLIK
-                f"{pil_gerilimi:.2f}",            # PİL GERİLİMİ
-                f"{gps_lat:.6f}",                 # GPS1 LATITUDE
-                f"{gps_lon:.6f}",                 # GPS1 LONGITUDE
-                f"{gps_alt:.2f}",                 # GPS1 ALTITUDE
-                f"{pitch:.1f}",                   # PITCH
-                f"{roll:.1f}",                    # ROLL
-                f"{yaw:.1f}",                     # YAW
-                f"{acc_x:.2f}",                   # 10DOF ACCELEROMETER X
-                f"{acc_y:.2f}",                   # 10DOF ACCELEROMETER Y
-                f"{acc_z:.2f}",                   # 10DOF ACCELEROMETER Z
-                f"{gyro_x:.2f}",                  # 10DOF GYROSCOPE X
-                f"{gyro_y:.2f}",                  # 10DOF GYROSCOPE Y
-                f"{gyro_z:.2f}",                  # 10DOF GYROSCOPE Z
-                f"{mag_x:.0f}",                   # 10DOF MAGNETOMETER X
-                f"{mag_y:.0f}",                   # 10DOF MAGNETOMETER Y
-                f"{mag_z:.0f}",                   # 10DOF MAGNETOMETER Z
-                "00",                             # RHRH
-                f"{iot_s1_temp:.1f}",            # IoT S1 DATA
-                f"{iot_s2_temp:.1f}",            # IoT S2 DATA
-                "286570"                          # TAKIM NO
-            ]
+            # SD satırı ve XBee paketi (checksum ile) derlenmiş biçimleyiciyle birlikte
+            ham_telemetri, xbee_paketi = telemetri_satirlari(degerler)
             
-            # Ham telemetri verisi
-            ham_telemetri = ",".join(paket_parcalari)
-        
-            # XBee paketi (checksum ile)
-            checksum = self._hesapla_checksum(ham_telemetri)
-            xbee_paketi = f"${ham_telemetri}*{checksum:02X}"
+            # Binary/delta downlink (yapılandırmaya bağlı) - SD her zaman ASCII
+            if TELEMETRI_DOWNLINK_FORMATI == "binary":
+                binary_paket = binary_kodla(degerler)
+            elif TELEMETRI_DOWNLINK_FORMATI == "delta":
+                binary_paket = self.delta_kodlayici.kodla(degerler)
+            else:
+                binary_paket = None
             
-            print("  🔧 DEBUG: BASİT telemetri paketi oluşturuldu!")
+            # Geçmiş için bağımsız çözülebilen biçim: delta karesi sırası
+            # dışında gönderilemeyeceği için delta modunda ASCII satır tutulur
+            self.paket_halkasi.ekle(self.packet_number,
+                                    binary_paket if TELEMETRI_DOWNLINK_FORMATI == "binary" else xbee_paketi)
             
             return {
                 'ham_veri': ham_telemetri,        # SD için
                 'xbee_paketi': xbee_paketi,       # XBee için
-                'legacy_format': xbee_paketi
+                'legacy_format': xbee_paketi,
+                'binary_paket': binary_paket      # Binary downlink için (ascii modunda None)
             }
             
         except Exception as e:
@@ -441,8 +363,8 @@ class TelemetryHandler:
             emergency_data = f"{self.packet_number or 1},0,000000,{datetime.now().strftime('%d/%m/%Y %H:%M:%S')},101325,0,0.000,0.000,0.000,0.00,25.0,7.40,0.000000,0.000000,0.00,0.0,0.0,0.0,00,25.0,25.0,286570"
             return {
                 'ham_veri': emergency_data,
-                'xbee_paketi': f"${emergency_data}*00",
-                'legacy_format': f"${emergency_data}*00"
+                'xbee_paketi': xbee_satiri(emergency_data),
+                'legacy_format': xbee_satiri(emergency_data)
             }
 
     def get_hiz_istatistikleri(self):
@@ -451,8 +373,9 @@ class TelemetryHandler:
         Debug ve kalibrasyon amaçlı.
         """
         return {
-            'mevcut_hiz_gecmisi': list(self.hiz_gecmisi),
-            'ortalama_hiz': sum(self.hiz_gecmisi) / len(self.hiz_gecmisi) if self.hiz_gecmisi else 0.0,
+            'irtifa_filtresi': self.irtifa_filtresi.get_istatistikler(),
+            'ucus_durumu': self.durum_makinesi.get_istatistikler(),
+            'inis_hizi': self.irtifa_filtresi.inis_hizi,
             'son_gps_zamani': self.son_gps_zamani,
             'son_basinc_zamani': self.son_tasiyici_basinc_zamani,
             'gps_timeout_durumu': (time.time() - self.son_gps_zamani) > self.gps_timeout_suresi,
@@ -465,11 +388,15 @@ if __name__ == '__main__':
     from moduller.yapilandirma import AYRILMA_TIMEOUT
     
     handler = TelemetryHandler()
+
+    def irtifa_basinci(irtifa):
+        """_irtifa_hesapla'nın tersi: irtifadaki basınç (Pa)"""
+        return DENIZ_SEVIYESI_BASINC_HPA * 100.0 * (1.0 - irtifa / 44330.0) ** (1.0 / 0.1903)
     
     # Örnek sensör verisi (olustur_telemetri_paketi formatında)
     test_sensor_data = {
-        'basinc': 1006.15,
-        'tasiyici_basinci': 1002.34,
+        'basinc': irtifa_basinci(402.39),            # Pa
+        'tasiyici_basinci': irtifa_basinci(402.39),  # Pa - taşıyıcıya bağlı (irtifa farkı 0)
         'irtifa': 402.39,
         'sicaklik': 24.2,
         'pil_gerilimi': 6.59,
@@ -493,34 +420,39 @@ if __name__ == '__main__':
     print("--- Uçuşa Hazır Testi ---")
     packet = handler.olustur_telemetri_paketi(test_sensor_data)
     print(packet)
+    assert handler.uydu_statusu == 0
+
+    def bir_saniye_sonra(irtifa):
+        """
+        1 Hz örnekleme benzetimi: filtrenin ölçtüğü aralık 1 s olur. Filtre
+        basınçtan hesaplanan YÜKSEKLİK1'i kullandığından irtifa basınca
+        çevrilir; taşıyıcı aynı basınçta (bağlı, irtifa farkı 0)
+        """
+        handler.son_filtre_zamani -= 1.0
+        basinc = irtifa_basinci(irtifa)
+        test_sensor_data.update(irtifa=irtifa, basinc=basinc, tasiyici_basinci=basinc)
+        return handler.olustur_telemetri_paketi(test_sensor_data)
 
-    # İniş durumu ve hız hatası testi
+    # İniş durumu ve hız hatası testi: 20 m/s alçalma (12-14 m/s dışında)
     print("\n--- İniş ve Hız Hatası Testi ---")
-    handler.uydu_statusu = 2  # Manuel olarak durumu inişe alalım
-    test_sensor_data['irtifa'] = 350  # Yükseklik düşüyor
-    time.sleep(0.5)  # Zaman farkı yarat
-    test_sensor_data['irtifa'] = 340  # Yükseklik düşüyor
-    packet = handler.olustur_telemetri_paketi(test_sensor_data)
+    handler.durum_makinesi.zorla(2, time.time(), "test")
+    for irtifa in (1000, 980, 960, 940, 920):
+        packet = bir_saniye_sonra(irtifa)
     print(packet)
-    # Beklenen hata kodu: 100000 (Model uydu hız limiti dışında)
+    assert handler.uydu_statusu == 2 and handler.hata_kodu[0] == '1'
 
-    # Ayrılma hatası testi
+    # Ayrılma hatası testi: ayrılma irtifasına inildi, taşıyıcıdan ayrılma görülmüyor
     print("\n--- Ayrılma Hatası Testi ---")
-    handler.uydu_statusu = 2
-    test_sensor_data['irtifa'] = 405
-    packet = handler.olustur_telemetri_paketi(test_sensor_data)
-    print(f"Ayrılma öncesi: {packet}")
-    
-    # Zamanlayıcıyı başlat
-    time.sleep(1)
-    packet = handler.olustur_telemetri_paketi(test_sensor_data)
+    for irtifa in range(900, 740, -20):
+        packet = bir_saniye_sonra(irtifa)
     print(f"Ayrılma anı: {packet}")
     assert handler.uydu_statusu == 3
-    assert handler.ayrilma_baslangic_zamani > 0
-    
+
     # Timeout süresi kadar bekle
     print(f"{AYRILMA_TIMEOUT + 1} saniye bekleniyor...")
     time.sleep(AYRILMA_TIMEOUT + 1)
     packet = handler.olustur_telemetri_paketi(test_sensor_data)
     print(f"Timeout sonrası: {packet}")
+    assert handler.uydu_statusu == 3, "Statü veri boşluğundan sonra da geri dönmemeli"
     assert handler.hata_kodu[4] == '1'
+    print(f"✅ {handler.durum_makinesi.get_istatistikler()}")
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Telemetri Kaydı Modülü
+
+SensorManager her döngüde iç içe sözlükler (gps_verisi, imu_verisi,
+iot_verileri) kuruyor, TelemetryHandler alanları tek tek geri çıkarıyordu;
+anahtarlar da tutarsızdı (satellit_count / satellite_count). TelemetriKaydi
+tüm kanalları tek bir __slots__ nesnesinde, düz ve adlandırılmış alanlarla
+taşır:
+
+- Döngü başına tek nesne (sözlük ve alan tablosu yok); alan adı yanlış
+  yazılırsa AttributeError - sessizce varsayılan değer dönmez
+- get()/[] eski sözlük anahtarlarını (iç içe olanlar dahil) okur; eski test
+  betikleri ve uzak çağıranlar değişmeden çalışır
+- sozlukten() eski biçimdeki sözlüğü kayda çevirir
+"""
+
+# (alan, varsayılan) - düz kanal listesi
+KAYIT_ALANLARI = (
+    ('basinc', 0.0), ('irtifa', 0.0), ('sicaklik', 0.0), ('pil_gerilimi', 0.0),
+    ('gps_enlem', 0.0), ('gps_boylam', 0.0), ('gps_yukseklik', 0.0),
+    ('gps_fix_kalitesi', 0), ('gps_uydu_sayisi', 0), ('gps_hdop', 99.9),
+    ('pitch', 0.0), ('roll', 0.0), ('yaw', 0.0),
+    ('ivme_x', 0.0), ('ivme_y', 0.0), ('ivme_z', 0.0),
+    ('gyro_x', 0.0), ('gyro_y', 0.0), ('gyro_z', 0.0),
+    ('mag_x', 0.0), ('mag_y', 0.0), ('mag_z', 0.0),
+    ('iot_s1', 0.0), ('iot_s2', 0.0),
+    ('tasiyici_basinci', 0.0), ('inis_hizi', 0.0), ('uydu_statusu', 0),
+    ('rtc_time', None), ('xbee_goruntusu', None),
+)
+
+IMU_ALANLARI = ('pitch', 'roll', 'yaw', 'ivme_x', 'ivme_y', 'ivme_z',
+                'gyro_x', 'gyro_y', 'gyro_z', 'mag_x', 'mag_y', 'mag_z')
+
+# Eski iç içe sözlük anahtarları -> alan
+_GPS_ANAHTARLARI = {
+    'enlem': 'gps_enlem', 'boylam': 'gps_boylam', 'yukseklik': 'gps_yukseklik',
+    'fix_quality': 'gps_fix_kalitesi', 'satellite_count': 'gps_uydu_sayisi',
+    'satellit_count': 'gps_uydu_sayisi', 'hdop': 'gps_hdop'
+}
+_IOT_ANAHTARLARI = {'sicaklik1': 'iot_s1', 'sicaklik2': 'iot_s2'}
+_TAKMA_ADLAR = {'tasiyici_basinc': 'tasiyici_basinci'}
+_YOK = object()
+
+
+def _init_uret():
+    """
+    KAYIT_ALANLARI'ndan anahtar kelimeli __init__ üretir (dataclasses gibi):
+    setattr döngüsü yerine düz atamalar, alan listesi tek yerde kalır
+    """
+    parametreler = ", ".join(f"{ad}={varsayilan!r}" for ad, varsayilan in KAYIT_ALANLARI)
+    govde = "".join(f"\n    self.{ad} = {ad}" for ad, _ in KAYIT_ALANLARI)
+    ad_alani = {}
+    exec(f"def __init__(self, *, {parametreler}):{govde}\n", ad_alani)
+    return ad_alani['__init__']
+
+
+class TelemetriKaydi:
+    """
+    Bir sensör döngüsünün tüm kanalları (düz, adlandırılmış alanlar).
+    Oluştururken alanlar anahtar kelimeyle verilir (ör. basinc=96512);
+    verilmeyenler KAYIT_ALANLARI'ndaki varsayılanı alır.
+    """
+
+    __slots__ = tuple(ad for ad, _ in KAYIT_ALANLARI)
+    __init__ = _init_uret()
+
+    def gps_ata(self, enlem, boylam, yukseklik, fix_kalitesi=0, uydu_sayisi=0, hdop=99.9):
+        self.gps_enlem = enlem
+        self.gps_boylam = boylam
+        self.gps_yukseklik = yukseklik
+        self.gps_fix_kalitesi = fix_kalitesi
+        self.gps_uydu_sayisi = uydu_sayisi
+        self.gps_hdop = hdop
+
+    def imu_ata(self, imu_verisi: dict):
+        """IMU yöneticisinin sözlüğünden bilinen alanları kopyalar"""
+        for ad in IMU_ALANLARI:
+            deger = imu_verisi.get(ad)
+            if deger is not None:
+                setattr(self, ad, deger)
+
+    # ------------------------------------------------------------------
+    # Eski sözlük arayüzü
+    # ------------------------------------------------------------------
+    def get(self, anahtar, varsayilan=None):
+        """Eski sensor_verisi sözlüğü gibi okur (gps_verisi vb. için sözlük üretir)"""
+        if anahtar == 'gps_verisi':
+            return {eski: getattr(self, alan) for eski, alan in _GPS_ANAHTARLARI.items()}
+        if anahtar == 'imu_verisi':
+            return {ad: getattr(self, ad) for ad in IMU_ALANLARI}
+        if anahtar == 'iot_verileri':
+            return {eski: getattr(self, alan) for eski, alan in _IOT_ANAHTARLARI.items()}
+        return getattr(self, _TAKMA_ADLAR.get(anahtar, anahtar), varsayilan)
+
+    def __getitem__(self, anahtar):
+        deger = self.get(anahtar, _YOK)
+        if deger is _YOK:
+            raise KeyError(anahtar)
+        return deger
+
+    def sozluk(self) -> dict:
+        """Düz alan sözlüğü (JSON/log için)"""
+        return {ad: getattr(self, ad) for ad, _ in KAYIT_ALANLARI if ad != 'xbee_goruntusu'}
+
+    @classmethod
+    def sozlukten(cls, sensor_verisi: dict):
+        """Eski biçimdeki (iç içe) sensor_verisi sözlüğünden kayıt"""
+        kayit = cls()
+        for anahtar, deger in sensor_verisi.items():
+            if anahtar == 'gps_verisi':
+                for eski, alan in _GPS_ANAHTARLARI.items():
+                    if eski in deger:
+                        setattr(kayit, alan, deger[eski])
+            elif anahtar == 'imu_verisi':
+                kayit.imu_ata(deger)
+            elif anahtar == 'iot_verileri':
+                for eski, alan in _IOT_ANAHTARLARI.items():
+                    if eski in deger:
+                        setattr(kayit, alan, deger[eski])
+            else:
+                alan = _TAKMA_ADLAR.get(anahtar, anahtar)
+                if alan in cls.__slots__:
+                    setattr(kayit, alan, deger)
+        return kayit
+
+    def __repr__(self):
+        return f"TelemetriKaydi({self.sozluk()})"
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import sys
+    import timeit
+
+    eski = {
+        'basinc': 96512, 'irtifa': 402.39, 'sicaklik': 24.2, 'pil_gerilimi': 7.38,
+        'gps_verisi': {'enlem': 39.925533, 'boylam': 32.866287, 'yukseklik': 1012.4,
+                       'fix_quality': 1, 'satellit_count': 8, 'hdop': 1.0},
+        'imu_verisi': {'pitch': 10.1, 'roll': -5.3, 'yaw': 180.7},
+        'iot_verileri': {'sicaklik1': 25.2, 'sicaklik2': 24.8},
+        'tasiyici_basinc': 95877, 'rtc_time': None, 'uydu_statusu': 1
+    }
+    kayit = TelemetriKaydi.sozlukten(eski)
+    assert kayit.gps_uydu_sayisi == 8 and kayit.tasiyici_basinci == 95877
+    assert kayit.get('gps_verisi')['satellite_count'] == kayit['gps_verisi']['satellit_count'] == 8
+    assert kayit['iot_verileri'] == eski['iot_verileri'] and kayit.get('tasiyici_basinci') == 95877
+    try:
+        kayit.gps_uydu = 3  # Yanlış yazılmış alan sessizce kabul edilmemeli
+        raise AssertionError("__slots__ dışı alan atanabildi")
+    except AttributeError:
+        pass
+    print(f"✅ {kayit}")
+
+    def sozluk_dongusu():
+        return {
+            "basinc": 96512, "irtifa": 402.39, "sicaklik": 24.2, "pil_gerilimi": 7.38,
+            "gps_verisi": {"enlem": 39.9, "boylam": 32.8, "yukseklik": 1012.4,
+                           "fix_quality": 1, "satellit_count": 8, "hdop": 1.0},
+            "imu_verisi": {"pitch": 10.1, "roll": -5.3, "yaw": 180.7},
+            "iot_verileri": {"sicaklik1": 25.2, "sicaklik2": 24.8},
+            "tasiyici_basinci": 95877, "rtc_time": None, "uydu_statusu": 1
+        }
+
+    def kayit_dongusu():
+        k = TelemetriKaydi(basinc=96512, irtifa=402.39, sicaklik=24.2, pil_gerilimi=7.38,
+                           tasiyici_basinci=95877, iot_s1=25.2, iot_s2=24.8, uydu_statusu=1)
+        k.gps_ata(39.9, 32.8, 1012.4, 1, 8, 1.0)
+        return k
+
+    def sozluk_okuma(d=sozluk_dongusu()):
+        gps = d.get("gps_verisi", {})
+        imu = d.get("imu_verisi", {})
+        return (d.get("basinc", 0), gps.get("enlem", 0.0), gps.get("boylam", 0.0),
+                imu.get("pitch", 0.0), imu.get("roll", 0.0), d.get("iot_verileri", {}).get("sicaklik1", 0.0))
+
+    def kayit_okuma(k=kayit_dongusu()):
+        return k.basinc, k.gps_enlem, k.gps_boylam, k.pitch, k.roll, k.iot_s1
+
+    boyut_sozluk = sys.getsizeof(sozluk_dongusu()) + sum(
+        sys.getsizeof(v) for v in sozluk_dongusu().values() if isinstance(v, dict))
+    print(f"💾 Döngü başına: iç içe sözlükler {boyut_sozluk} byte, kayıt {sys.getsizeof(kayit_dongusu())} byte")
+    for ad, fonksiyon in (("sözlük oluştur", sozluk_dongusu), ("kayıt oluştur", kayit_dongusu),
+                          ("sözlük oku", sozluk_okuma), ("kayıt oku", kayit_okuma)):
+        sure = min(timeit.repeat(fonksiyon, number=20000, repeat=5)) / 20000
+        print(f"⏱️ {ad:15s}: {sure * 1e6:.2f} µs")
@@ -0,0 +1,530 @@
+# -*- coding: utf-8 -*-
+"""
+Telemetri Kodlayıcı Modülü
+
+Bu modül, telemetri paketinin 31 mantıksal alanını tek bir alan tablosundan
+iki biçime dönüştürür:
+1. ASCII: virgülle ayrılmış ondalık metin (SD kaydı ve $...*CS paketi)
+2. Binary: sürümlü, sabit boyutlu little-endian struct (ölçeklenmiş
+   tamsayılar) + CRC-16/CCITT; downlink'te hava süresi kazandırır
+3. Delta: periyodik anahtar kare (binary paket) arasında yalnızca değişen
+   alanların bit maskesi + zigzag varint farkları
+
+Binary paket yapısı (sürüm 1):
+    0xA5 0x5A | Sürüm (1) | Alanlar (struct) | CRC-16 (2, LE)
+CRC, senkron byte'ları dahil CRC'den önceki tüm byte'lar üzerinden hesaplanır.
+
+ASCII paket: $<alanlar>*<XOR checksum, 2 hex> (xor_checksum / xbee_satiri).
+ASCII biçimleyici alan tablosundan modül yüklenirken bir kez derlenir
+(tek % şablonu + alan sırasıyla değer çeken itemgetter); telemetri_satirlari
+SD satırını ve $...*CS paketini birlikte üretir.
+"""
+
+import calendar
+import operator
+import struct
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from moduller.yapilandirma import TAKIM_NUMARASI, TELEMETRI_ANAHTAR_KARE_ARALIGI
+
+BINARY_SENKRON = b'\xa5\x5a'
+BINARY_SURUM = 1
+ZAMAN_BICIMI = "%d/%m/%Y %H:%M:%S"
+
+# Alan tablosu (paket sırası): (ad, ASCII biçimi, struct kodu, ölçek)
+# Ölçek sayı ise değer * ölçek tamsayıya yuvarlanır; 'bit' 6 haneli hata
+# kodunu bit maskesine, 'zaman' gönderme saatini epoch saniyesine, 'metin'
+# ASCII alanı sabit uzunlukta byte dizisine çevirir.
+TELEMETRI_ALANLARI = (
+    ('paket_numarasi', 'd', 'H', 1),
+    ('uydu_statusu', 'd', 'B', 1),
+    ('hata_kodu', 's', 'B', 'bit'),
+    ('gonderme_saati', 's', 'I', 'zaman'),
+    ('basinc1', '.0f', 'I', 1),
+    ('basinc2', '.0f', 'I', 1),
+    ('yukseklik1', '.3f', 'i', 1000),
+    ('yukseklik2', '.3f', 'i', 1000),
+    ('irtifa_farki', '.3f', 'i', 1000),
+    ('inis_hizi', '.2f', 'h', 100),
+    ('sicaklik', '.1f', 'h', 10),
+    ('pil_gerilimi', '.2f', 'H', 100),
+    ('gps1_latitude', '.6f', 'i', 1000000),
+    ('gps1_longitude', '.6f', 'i', 1000000),
+    ('gps1_altitude', '.2f', 'i', 100),
+    ('pitch', '.1f', 'h', 10),
+    ('roll', '.1f', 'h', 10),
+    ('yaw', '.1f', 'h', 10),
+    ('ivme_x', '.2f', 'h', 100),
+    ('ivme_y', '.2f', 'h', 100),
+    ('ivme_z', '.2f', 'h', 100),
+    ('gyro_x', '.2f', 'i', 100),
+    ('gyro_y', '.2f', 'i', 100),
+    ('gyro_z', '.2f', 'i', 100),
+    ('mag_x', '.0f', 'h', 1),
+    ('mag_y', '.0f', 'h', 1),
+    ('mag_z', '.0f', 'h', 1),
+    ('rhrh', 's', '4s', 'metin'),
+    ('iot_s1', '.1f', 'h', 10),
+    ('iot_s2', '.1f', 'h', 10),
+    ('takim_no', 'd', 'I', 1),
+)
+
+ALAN_ADLARI = tuple(alan[0] for alan in TELEMETRI_ALANLARI)
+
+# Derlenmiş ASCII biçimleyici: düz kayıttan alan sırasıyla tuple + tek % şablonu
+_ASCII_SABLONU = ",".join("%" + bicim for _, bicim, _, _ in TELEMETRI_ALANLARI)
+_ALAN_SIRASI = operator.itemgetter(*ALAN_ADLARI)
+
+_GOVDE = struct.Struct('<' + ''.join(alan[2] for alan in TELEMETRI_ALANLARI))
+_BASLIK_BOYUTU = len(BINARY_SENKRON) + 1
+BINARY_PAKET_BOYUTU = _BASLIK_BOYUTU + _GOVDE.size + 2
+
+# Ölçeklenmiş tamsayı alanları için struct sınırları (taşmada kırpılır)
+_SINIRLAR = {
+    'B': (0, 0xFF), 'H': (0, 0xFFFF), 'I': (0, 0xFFFFFFFF),
+    'h': (-0x8000, 0x7FFF), 'i': (-0x80000000, 0x7FFFFFFF)
+}
+
+
+def _crc16_tablosu_olustur():
+    tablo = []
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        tablo.append(crc & 0xFFFF)
+    return tuple(tablo)
+
+
+_CRC16_TABLOSU = _crc16_tablosu_olustur()
+
+
+def crc16_ccitt(veri, crc=0xFFFF) -> int:
+    """CRC-16/CCITT-FALSE (poly 0x1021, başlangıç 0xFFFF)"""
+    tablo = _CRC16_TABLOSU
+    for bayt in veri:
+        crc = ((crc << 8) & 0xFF00) ^ tablo[(crc >> 8) ^ bayt]
+    return crc
+
+
+# Bu uzunluktan itibaren NumPy'nin C döngüsü tamsayı katlamadan hızlı
+XOR_NUMPY_ESIGI = 128
+
+
+def _xor_katla(veri) -> int:
+    """Byte'ların XOR'u: üst yarıyı alt yarıyla XOR'la, tek byte kalana dek"""
+    n = len(veri)
+    katlanan = int.from_bytes(veri, 'little')
+    while n > 1:
+        yarim = (n + 1) // 2
+        bit = yarim * 8
+        katlanan = (katlanan >> bit) ^ (katlanan & ((1 << bit) - 1))
+        n = yarim
+    return katlanan
+
+
+def xor_checksum(veri, checksum=0) -> int:
+    """
+    XOR checksum (C# yer istasyonu HesaplaChecksum ile aynı). veri str veya
+    bytes olabilir; checksum önceki parçaların sonucudur, böylece paket
+    alan alan eklenirken checksum katlanabilir (XOR birleşmelidir).
+    """
+    if isinstance(veri, str):
+        try:
+            veri = veri.encode('latin-1')
+        except UnicodeEncodeError:
+            for karakter in veri:
+                checksum ^= ord(karakter)
+            return checksum
+    if np is not None and len(veri) >= XOR_NUMPY_ESIGI:
+        return checksum ^ int(np.bitwise_xor.reduce(np.frombuffer(veri, dtype=np.uint8)))
+    return checksum ^ _xor_katla(veri)
+
+
+def xbee_satiri(ham: str) -> str:
+    """Ham telemetri satırından $<ham>*CS paketi"""
+    return f"${ham}*{xor_checksum(ham):02X}"
+
+
+def ascii_kodla(degerler: dict) -> str:
+    """Alan değerlerini virgülle ayrılmış telemetri satırına çevirir ($ ve checksum hariç)"""
+    return _ASCII_SABLONU % _ALAN_SIRASI(degerler)
+
+
+def telemetri_satirlari(degerler: dict):
+    """Düz alan kaydından (SD satırı, $<satır>*CS paketi) tek geçişte"""
+    ham = _ASCII_SABLONU % _ALAN_SIRASI(degerler)
+    return ham, f"${ham}*{xor_checksum(ham):02X}"
+
+
+def _ham_alanlar(degerler: dict) -> list:
+    """Alan değerlerini struct'a yazılacak ham (ölçeklenmiş) değerlere çevirir"""
+    alanlar = []
+    for ad, _, kod, olcek in TELEMETRI_ALANLARI:
+        deger = degerler[ad]
+        if olcek == 'bit':
+            deger = int(str(deger)[:8], 2)
+        elif olcek == 'zaman':
+            deger = calendar.timegm(time.strptime(deger, ZAMAN_BICIMI))
+        elif olcek == 'metin':
+            deger = str(deger).encode('ascii', errors='replace')
+        else:
+            alt, ust = _SINIRLAR[kod]
+            deger = min(ust, max(alt, int(round(deger * olcek))))
+        alanlar.append(deger)
+    return alanlar
+
+
+def _alan_degerleri(alanlar) -> dict:
+    """_ham_alanlar'ın tersi: ham değerlerden alan sözlüğü"""
+    degerler = {}
+    for (ad, _, _, olcek), deger in zip(TELEMETRI_ALANLARI, alanlar):
+        if olcek == 'bit':
+            deger = format(deger, '06b')
+        elif olcek == 'zaman':
+            deger = time.strftime(ZAMAN_BICIMI, time.gmtime(deger))
+        elif olcek == 'metin':
+            deger = deger.rstrip(b'\x00').decode('ascii', errors='replace')
+        elif olcek != 1:
+            deger = deger / olcek
+        degerler[ad] = deger
+    return degerler
+
+
+def _binary_paketle(alanlar) -> bytes:
+    paket = bytearray(BINARY_PAKET_BOYUTU)
+    paket[0:2] = BINARY_SENKRON
+    paket[2] = BINARY_SURUM
+    _GOVDE.pack_into(paket, _BASLIK_BOYUTU, *alanlar)
+    struct.pack_into('<H', paket, BINARY_PAKET_BOYUTU - 2, crc16_ccitt(memoryview(paket)[:-2]))
+    return bytes(paket)
+
+
+def _binary_ac(paket):
+    """Tam binary paketin ham alanları (senkron/sürüm/boyut/CRC hatalıysa None)"""
+    if (len(paket) < BINARY_PAKET_BOYUTU or paket[0:2] != BINARY_SENKRON
+            or paket[2] != BINARY_SURUM):
+        return None
+    gorunum = memoryview(paket)[:BINARY_PAKET_BOYUTU]
+    if crc16_ccitt(gorunum[:-2]) != struct.unpack_from('<H', gorunum, BINARY_PAKET_BOYUTU - 2)[0]:
+        return None
+    return list(_GOVDE.unpack_from(gorunum, _BASLIK_BOYUTU))
+
+
+def binary_kodla(degerler: dict) -> bytes:
+    """Alan değerlerini sürümlü binary pakete (CRC-16 dahil) çevirir"""
+    return _binary_paketle(_ham_alanlar(degerler))
+
+
+def binary_coz(paket):
+    """
+    Binary telemetri paketini alan sözlüğüne çevirir.
+    Senkron/sürüm/boyut/CRC hatalıysa None döner.
+    """
+    alanlar = _binary_ac(paket)
+    return None if alanlar is None else _alan_degerleri(alanlar)
+
+
+# ----------------------------------------------------------------------
+# Delta kodlama: anahtar kare (tam binary paket) + değişen alanlar
+#
+# Delta paket yapısı:
+#     0xA5 0x5A | 0x02 | Uzunluk (1, tüm paket) | Paket no (2, LE) |
+#     Maske (varint) | Değişen alanların zigzag varint farkları | CRC-16 (2, LE)
+# Maskenin i. biti, paket numarasından sonraki i. alanın değiştiğini belirtir.
+# Fark, bir önceki paketin ham (ölçeklenmiş) değerine göredir; çözücü bir
+# paket kaçırırsa sonraki anahtar kareye kadar delta paketleri atar.
+# ----------------------------------------------------------------------
+DELTA_SURUM = 2
+PAKET_NO_UST_SINIRI = 9999  # TelemetryHandler bu değerden sonra 1'e döner
+_PAKET_NO = struct.Struct('<H')
+
+
+def zigzag_varint_yaz(tampon: bytearray, sayi: int):
+    """İşaretli tamsayıyı zigzag + LEB128 varint olarak ekler"""
+    sayi = (sayi << 1) if sayi >= 0 else ((-sayi << 1) - 1)
+    varint_yaz(tampon, sayi)
+
+
+def varint_yaz(tampon: bytearray, sayi: int):
+    while sayi > 0x7F:
+        tampon.append((sayi & 0x7F) | 0x80)
+        sayi >>= 7
+    tampon.append(sayi)
+
+
+def varint_oku(veri, konum: int):
+    """(sayi, yeni_konum) döner; veri biterse IndexError"""
+    sayi = kaydirma = 0
+    while True:
+        bayt = veri[konum]
+        konum += 1
+        sayi |= (bayt & 0x7F) << kaydirma
+        if not bayt & 0x80:
+            return sayi, konum
+        kaydirma += 7
+
+
+def zigzag_varint_oku(veri, konum: int):
+    sayi, konum = varint_oku(veri, konum)
+    return ((sayi >> 1) ^ -(sayi & 1)), konum
+
+
+def _delta_tamsayi(alanlar) -> list:
+    # Metin alanları (RHRH) fark alınabilsin diye tamsayıya çevrilir
+    return [int.from_bytes(d, 'little') if isinstance(d, bytes) else d for d in alanlar]
+
+
+class DeltaKodlayici:
+    """
+    Her anahtar_kare_araligi pakette bir tam binary paket, arada yalnızca
+    değişen alanların farkları.
+    """
+
+    def __init__(self, anahtar_kare_araligi=TELEMETRI_ANAHTAR_KARE_ARALIGI):
+        self.anahtar_kare_araligi = anahtar_kare_araligi
+        self._onceki = None
+        self._sayac = 0
+
+    def anahtar_kare_zorla(self):
+        """Bir sonraki paket anahtar kare olsun (ör. yer istasyonu senkron kaybı)"""
+        self._onceki = None
+
+    def kodla(self, degerler: dict) -> bytes:
+        alanlar = _ham_alanlar(degerler)
+        tamsayilar = _delta_tamsayi(alanlar)
+
+        if self._onceki is None or self._sayac % self.anahtar_kare_araligi == 0:
+            self._onceki = tamsayilar
+            self._sayac = 1
+            return _binary_paketle(alanlar)
+        self._sayac += 1
+
+        maske = 0
+        farklar = bytearray()
+        for i in range(1, len(tamsayilar)):
+            fark = tamsayilar[i] - self._onceki[i]
+            if fark:
+                maske |= 1 << (i - 1)
+                zigzag_varint_yaz(farklar, fark)
+        self._onceki = tamsayilar
+
+        paket = bytearray(BINARY_SENKRON)
+        paket.append(DELTA_SURUM)
+        paket.append(0)  # Uzunluk (aşağıda)
+        paket += _PAKET_NO.pack(tamsayilar[0])
+        varint_yaz(paket, maske)
+        paket += farklar
+        if len(paket) + 2 > 0xFF:
+            # 31 alanın hepsi büyük farkla değişti: anahtar kare daha kısa
+            self._sayac = 1
+            return _binary_paketle(alanlar)
+        paket[3] = len(paket) + 2
+        paket += struct.pack('<H', crc16_ccitt(paket))
+        return bytes(paket)
+
+
+class DeltaCozucu:
+    """Anahtar kare ve delta paketlerini alan sözlüğüne çevirir"""
+
+    def __init__(self):
+        self._onceki = None
+        self.kayip_paket = 0
+        self.atlanan_delta = 0   # Anahtar kare beklenirken atılan delta paketi
+        self.crc_hatasi = 0
+
+    def coz(self, paket):
+        """
+        Paketi çözer. CRC hatası, kayıp sonrası delta veya ilk anahtar kare
+        gelmeden delta gelirse None döner.
+        """
+        if len(paket) < 3 or paket[0:2] != BINARY_SENKRON:
+            return None
+
+        if paket[2] == BINARY_SURUM:
+            alanlar = _binary_ac(paket)
+            if alanlar is None:
+                self.crc_hatasi += 1
+                return None
+            if self._onceki is not None and alanlar[0] != self._beklenen_paket_no():
+                self.kayip_paket += 1
+            self._onceki = _delta_tamsayi(alanlar)
+            return _alan_degerleri(alanlar)
+
+        if paket[2] != DELTA_SURUM or len(paket) < 4:
+            return None
+        uzunluk = paket[3]
+        if uzunluk < 9 or len(paket) < uzunluk:
+            return None
+        paket = memoryview(paket)[:uzunluk]
+        if crc16_ccitt(paket[:-2]) != struct.unpack_from('<H', paket, uzunluk - 2)[0]:
+            self.crc_hatasi += 1
+            return None
+
+        paket_no = _PAKET_NO.unpack_from(paket, 4)[0]
+        if self._onceki is None:
+            self.atlanan_delta += 1
+            return None
+        if paket_no != self._beklenen_paket_no():
+            # Fark zinciri koptu: sonraki anahtar kareye kadar bekle
+            self.kayip_paket += 1
+            self.atlanan_delta += 1
+            self._onceki = None
+            return None
+
+        tamsayilar = list(self._onceki)
+        tamsayilar[0] = paket_no
+        try:
+            maske, konum = varint_oku(paket, 6)
+            i = 1
+            while maske:
+                if maske & 1:
+                    fark, konum = zigzag_varint_oku(paket, konum)
+                    tamsayilar[i] += fark
+                maske >>= 1
+                i += 1
+        except IndexError:
+            return None
+        self._onceki = tamsayilar
+
+        alanlar = [deger.to_bytes(_METIN_BOYUTLARI[i], 'little') if i in _METIN_BOYUTLARI else deger
+                   for i, deger in enumerate(tamsayilar)]
+        return _alan_degerleri(alanlar)
+
+    def _beklenen_paket_no(self) -> int:
+        return self._onceki[0] % PAKET_NO_UST_SINIRI + 1
+
+
+# Metin alanlarının (struct 'Ns') indeks -> byte uzunluğu
+_METIN_BOYUTLARI = {i: struct.calcsize(alan[2]) for i, alan in enumerate(TELEMETRI_ALANLARI)
+                    if alan[3] == 'metin'}
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    ornek = {
+        'paket_numarasi': 1234, 'uydu_statusu': 4, 'hata_kodu': '010100',
+        'gonderme_saati': '17/10/2026 12:34:56', 'basinc1': 96512, 'basinc2': 95877,
+        'yukseklik1': 402.391, 'yukseklik2': 455.102, 'irtifa_farki': -52.711,
+        'inis_hizi': 7.12, 'sicaklik': 24.2, 'pil_gerilimi': 7.38,
+        'gps1_latitude': 39.925533, 'gps1_longitude': 32.866287, 'gps1_altitude': 1012.45,
+        'pitch': 10.1, 'roll': -5.3, 'yaw': 180.7,
+        'ivme_x': 0.12, 'ivme_y': -0.08, 'ivme_z': 9.81,
+        'gyro_x': 1.25, 'gyro_y': -350.5, 'gyro_z': 0.0,
+        'mag_x': 231, 'mag_y': -118, 'mag_z': 402,
+        'rhrh': '00', 'iot_s1': 25.2, 'iot_s2': 24.8, 'takim_no': TAKIM_NUMARASI
+    }
+
+    ascii_satir = ascii_kodla(ornek)
+    binary_paket = binary_kodla(ornek)
+    cozulen = binary_coz(binary_paket)
+
+    print(f"ASCII  ({len(ascii_satir) + 4} byte): ${ascii_satir}*CS")
+    print(f"Binary ({len(binary_paket)} byte): {binary_paket.hex()}")
+    assert ascii_kodla(cozulen) == ascii_satir, "Binary → ASCII dönüşümü birebir olmalı"
+
+    bozuk = bytearray(binary_paket)
+    bozuk[10] ^= 0x01
+    assert binary_coz(bytes(bozuk)) is None, "CRC hatası yakalanmalı"
+
+    # Delta: 1 Hz uçuş benzetimi, 3 paket kayıp
+    kodlayici, cozucu = DeltaKodlayici(), DeltaCozucu()
+    toplam_delta = toplam_binary = cozulen_adet = 0
+    for n in range(100):
+        ornek = dict(ornek, paket_numarasi=n + 1, gonderme_saati=f"17/10/2026 12:{n // 60:02d}:{n % 60:02d}",
+                     basinc1=96512 + n * 7, yukseklik1=402.391 - n * 0.6, pitch=10.1 + (n % 3) * 0.1,
+                     ivme_z=9.81 + (n % 2) * 0.02)
+        paket = kodlayici.kodla(ornek)
+        toplam_delta += len(paket)
+        toplam_binary += BINARY_PAKET_BOYUTU
+        if n in (41, 42, 77):
+            continue  # Kayıp paket
+        sonuc = cozucu.coz(paket)
+        if sonuc is not None:
+            assert ascii_kodla(sonuc) == ascii_kodla(ornek), "Delta çözümü birebir olmalı"
+            cozulen_adet += 1
+    print(f"Delta: ortalama {toplam_delta / 100:.1f} byte/paket (binary {toplam_binary / 100:.0f}), "
+          f"çözülen {cozulen_adet}/97, kayıp {cozucu.kayip_paket}, atlanan delta {cozucu.atlanan_delta}")
+
+    baslangic = time.perf_counter()
+    for _ in range(10000):
+        binary_coz(binary_kodla(ornek))
+    print(f"Kodla+çöz: {(time.perf_counter() - baslangic) / 10000 * 1e6:.1f} µs/paket")
+
+    # XOR checksum: eski ord() döngüsü vs xor_checksum, 200 byte'lık paket
+    import functools
+    import operator
+    import timeit
+
+    def eski_checksum(veri):
+        checksum = 0
+        for karakter in veri:
+            checksum ^= ord(karakter)
+        return checksum
+
+    satir = (ascii_satir * 2)[:200]
+    satir_bayt = satir.encode()
+    assert eski_checksum(satir) == xor_checksum(satir) == xor_checksum(satir_bayt)
+    # Alan alan katlama tüm satırın checksum'ına eşit olmalı
+    katlanan = 0
+    for i, alan in enumerate(satir.split(",")):
+        katlanan = xor_checksum(("," if i else "") + alan, katlanan)
+    assert katlanan == eski_checksum(satir)
+    assert xbee_satiri(ascii_satir) == f"${ascii_satir}*{eski_checksum(ascii_satir):02X}"
+
+    adaylar = (
+        ("ord() döngüsü (eski)", lambda: eski_checksum(satir)),
+        ("reduce(xor, bytes)", lambda: functools.reduce(operator.xor, satir_bayt, 0)),
+        ("int katlama", lambda: _xor_katla(satir_bayt)),
+        ("xor_checksum(str)", lambda: xor_checksum(satir)),
+        ("xor_checksum(bytes)", lambda: xor_checksum(satir_bayt)),
+    )
+    print(f"XOR checksum, {len(satir_bayt)} byte (NumPy {'var' if np is not None else 'yok'}):")
+    for ad, fonksiyon in adaylar:
+        sure = min(timeit.repeat(fonksiyon, number=20000, repeat=5)) / 20000
+        print(f"   {ad:22s}: {sure * 1e6:.2f} µs")
+
+    # ASCII biçimleyici: SD satırı + $...*CS paketi, paket/s (Pi Zero 2W'de
+    # de çalıştırılabilir; oranlar aynı kalır)
+    def eski_fstring(d):
+        ham = ",".join([
+            f"{d['paket_numarasi']}", f"{d['uydu_statusu']}", f"{d['hata_kodu']}", f"{d['gonderme_saati']}",
+            f"{d['basinc1']:.0f}", f"{d['basinc2']:.0f}", f"{d['yukseklik1']:.3f}", f"{d['yukseklik2']:.3f}",
+            f"{d['irtifa_farki']:.3f}", f"{d['inis_hizi']:.2f}", f"{d['sicaklik']:.1f}",
+            f"{d['pil_gerilimi']:.2f}", f"{d['gps1_latitude']:.6f}", f"{d['gps1_longitude']:.6f}",
+            f"{d['gps1_altitude']:.2f}", f"{d['pitch']:.1f}", f"{d['roll']:.1f}", f"{d['yaw']:.1f}",
+            f"{d['ivme_x']:.2f}", f"{d['ivme_y']:.2f}", f"{d['ivme_z']:.2f}", f"{d['gyro_x']:.2f}",
+            f"{d['gyro_y']:.2f}", f"{d['gyro_z']:.2f}", f"{d['mag_x']:.0f}", f"{d['mag_y']:.0f}",
+            f"{d['mag_z']:.0f}", f"{d['rhrh']}", f"{d['iot_s1']:.1f}", f"{d['iot_s2']:.1f}", f"{d['takim_no']}"
+        ])
+        return ham, xbee_satiri(ham)
+
+    format_sablonu = ",".join("{%s:%s}" % (ad, bicim) for ad, bicim, _, _ in TELEMETRI_ALANLARI)
+
+    def format_kwargs(d):
+        ham = format_sablonu.format(**d)
+        return ham, xbee_satiri(ham)
+
+    import random
+    random.seed(0)
+    kayitlar = [ornek, cozulen]
+    for _ in range(1000):
+        kayitlar.append({ad: (random.uniform(-1000, 1000) if bicim[-1] == 'f' else ornek[ad])
+                         for ad, bicim, _, _ in TELEMETRI_ALANLARI})
+    for d in kayitlar:
+        assert eski_fstring(d) == format_kwargs(d) == telemetri_satirlari(d), "Biçimleyiciler aynı satırı üretmeli"
+
+    print("ASCII biçimleyici (SD satırı + $...*CS):")
+    adaylar = (
+        ("f-string listesi + join", lambda: eski_fstring(ornek)),
+        ("str.format(**kayit)", lambda: format_kwargs(ornek)),
+        ("derlenmiş % şablonu", lambda: telemetri_satirlari(ornek)),
+    )
+    for ad, fonksiyon in adaylar:
+        sure = min(timeit.repeat(fonksiyon, number=20000, repeat=5)) / 20000
+        print(f"   {ad:24s}: {sure * 1e6:6.2f} µs, {1 / sure:9.0f} paket/s")
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+XBee TX Zamanlayıcı Modülü
+
+Birleşik XBee linkinden çıkan tüm veri (telemetri, komut onayları, video)
+tek bir zamanlayıcıdan geçer:
+1. Katı öncelik sınıfları: telemetri > onay > geçmiş > video
+   (geçmiş: kesinti sonrası depodan boşaltılan / yer istasyonunun
+   yeniden istediği telemetri; canlı telemetriden sonra gelir)
+2. SERIAL_BAUD_XBEE'den hesaplanan token bucket (hava süresi bütçesi);
+   UART/çekirdek tamponu video ile dolup telemetriyi bekletmez
+3. Büyük payload'lar parçalara bölünür; bölünebilir öğeler (API frame'leri,
+   kendi başına çerçevelenmiş parçalar) parça aralarında daha yüksek
+   öncelikli veriye yol verir
+4. Sınıf başına kuyruk derinliği ve telemetri gecikmesinin p99 değeri
+
+Zamanlayıcı yazma yapmaz; yazıcı (BirlesikXBeeAlici TX thread'i veya
+XBeeLink yazıcı görevi) al() ile sıradaki parçayı çeker. API modunda
+cerceveleyici her parçayı yazılmadan hemen önce 0x10 frame'ine çevirir.
+
+NOT: Transparent modda satır tabanlı mesajlar (ör. #VIDEO:...#) başka bir
+mesajla iç içe yazılamaz (yer istasyonu satır okur); bu öğeler parçalar
+halinde hız sınırlı yazılır ama araya başka mesaj girmez.
+"""
+
+import threading
+import time
+from collections import deque
+
+from moduller.yapilandirma import SERIAL_BAUD_XBEE, XBEE_TX_PARCA_BOYUTU, XBEE_HAVA_BUTCESI
+
+# Gönderim öncelikleri (küçük değer = yüksek öncelik)
+ONCELIK_TELEMETRI = 0
+ONCELIK_ONAY = 1
+ONCELIK_GECMIS = 2
+ONCELIK_VIDEO = 3
+SINIF_ADLARI = ('telemetri', 'onay', 'gecmis', 'video')
+
+# Sınıf başına kuyrukta bekleyebilecek en fazla öğe; dolunca en eskisi atılır
+# (bayat video karesi göndermenin anlamı yok, 2 kare yeterli; geçmiş
+# telemetri depodan kuyruk boşaldıkça verilir, dolmaması gerekir)
+MAKS_KUYRUK_OGESI = (50, 50, 20, 2)
+
+GECIKME_GECMISI = 1000  # p99 için saklanan son telemetri gecikmesi sayısı
+TX_YAZMA_DENEMESI = 3  # Art arda yazılamayan parça bu kadar denemeden sonra yazıcı öğeden vazgeçer
+BIT_PER_BAYT = 10  # 8N1: 1 start + 8 data + 1 stop
+
+
+def yuzdelik(sirali_degerler, oran):
+    """Sıralı listede yüzdelik değer (boş liste için 0.0)"""
+    if not sirali_degerler:
+        return 0.0
+    return sirali_degerler[min(len(sirali_degerler) - 1, int(len(sirali_degerler) * oran))]
+
+
+class _TxOgesi:
+    __slots__ = ('veri', 'ofset', 'oncelik', 'bolunebilir', 'zaman', 'tamamlandi', 'etiket', 'dusuruldu')
+
+    def __init__(self, veri, oncelik, bolunebilir, zaman, tamamlandi, etiket, dusuruldu):
+        self.veri = memoryview(veri)
+        self.ofset = 0
+        self.oncelik = oncelik
+        self.bolunebilir = bolunebilir
+        self.zaman = zaman
+        self.tamamlandi = tamamlandi
+        self.etiket = etiket
+        self.dusuruldu = dusuruldu
+
+
+def _dusurulduler(ogeler, hata=None):
+    # Kilit dışında çağrılır: geri çağrılar zamanlayıcıya yeniden ekleme yapabilir
+    for oge in ogeler:
+        if oge.dusuruldu:
+            oge.dusuruldu(hata)
+
+
+class TxZamanlayici:
+    """
+    Öncelikli, hava süresi bütçeli TX zamanlayıcı (thread-safe).
+
+    Args:
+        baud: Seri hat hızı (token bucket hızı baud/10 * butce_orani byte/s)
+        parca_boyutu: Tek seferde yazılan en büyük parça (byte)
+        butce_orani: Hat kapasitesinin kullanılabilecek oranı
+    """
+
+    def __init__(self, baud=SERIAL_BAUD_XBEE, parca_boyutu=XBEE_TX_PARCA_BOYUTU,
+                 butce_orani=XBEE_HAVA_BUTCESI, saat=time.monotonic):
+        self.parca_boyutu = parca_boyutu
+        self.saat = saat
+
+        # Token bucket: byte/s hız, ~100 ms'lik patlama kapasitesi
+        self.hiz = baud / BIT_PER_BAYT * butce_orani
+        self.kova_kapasitesi = max(float(parca_boyutu), self.hiz * 0.1)
+        self._jeton = self.kova_kapasitesi
+        self._son_dolum = saat()
+
+        self._kuyruklar = tuple(deque() for _ in SINIF_ADLARI)
+        self._kuyruk_bayt = [0] * len(SINIF_ADLARI)
+        self._aktif = None  # Bölünemeyen ve yarıda kalmış öğe
+        self._son = None    # Son verilen (oge, parca, biten): yazma hatasında geri_al/vazgec için
+        self._geri = None   # geri_al() ile geri verilen, yeniden yazılacak parça
+        self._kosul = threading.Condition()
+
+        # Yeni veri eklendiğinde çağrılır (ör. asyncio yazıcısını uyandırmak için)
+        self.bildirim = None
+
+        # API modu: cerceveleyici(parca, etiket) -> yazılacak frame bytes;
+        # parca_ek_yuku frame başına eklenen byte (jeton hesabına katılır)
+        self.cerceveleyici = None
+        self.parca_ek_yuku = 0
+
+        # İstatistikler
+        self._telemetri_gecikmeleri = deque(maxlen=GECIKME_GECMISI)
+        self.gonderilen_bayt = [0] * len(SINIF_ADLARI)
+        self.tamamlanan = [0] * len(SINIF_ADLARI)  # Son parçası verilen öğe sayısı
+        self.dusurulen = [0] * len(SINIF_ADLARI)
+
+    def ekle(self, veri, oncelik=ONCELIK_TELEMETRI, bolunebilir=False, tamamlandi=None,
+             etiket=None, dusuruldu=None) -> bool:
+        """
+        Veriyi ilgili öncelik kuyruğuna ekler (çağıran bloklanmaz).
+
+        Args:
+            bolunebilir: True ise parça aralarında daha yüksek öncelikli
+                veriye yol verilebilir
+            tamamlandi: Öğenin son parçası yazıldığında tamamlandi(gecikme_s)
+                olarak çağrılır (yazıcı thread'inde)
+            etiket: cerceveleyici'ye parça ile birlikte verilen öğe bilgisi
+            dusuruldu: Öğe yazılmadan atılırsa (kuyruk taşması, bosalt(),
+                vazgec()) dusuruldu(hata) olarak çağrılır; hata yalnızca
+                vazgec(hata) ile dolu gelir
+        """
+        if not veri:
+            return False
+        oge = _TxOgesi(veri, oncelik, bolunebilir, self.saat(), tamamlandi, etiket, dusuruldu)
+        atilan = []
+
+        with self._kosul:
+            kuyruk = self._kuyruklar[oncelik]
+            if len(kuyruk) >= MAKS_KUYRUK_OGESI[oncelik]:
+                # Henüz yazılmaya başlanmamış en eski öğeyi at
+                for eski in kuyruk:
+                    if eski.ofset == 0:
+                        kuyruk.remove(eski)
+                        self._kuyruk_bayt[oncelik] -= len(eski.veri) - eski.ofset
+                        self.dusurulen[oncelik] += 1
+                        atilan.append(eski)
+                        break
+            kuyruk.append(oge)
+            self._kuyruk_bayt[oncelik] += len(oge.veri)
+            self._kosul.notify()
+
+        _dusurulduler(atilan)
+        if self.bildirim:
+            self.bildirim()
+        return True
+
+    def al(self):
+        """
+        Sıradaki parçayı verir: (parca, bekleme_s, biten_oge)
+        - parca: yazılacak memoryview (yoksa None)
+        - bekleme_s: parca None ise jeton için beklenecek süre (kuyruk boşsa None)
+        - biten_oge: bu parça bir öğeyi tamamladıysa o öğe; yazıldıktan sonra
+          tamamlandi() ile bildirilmelidir
+        """
+        with self._kosul:
+            if self._geri is not None:
+                # Yazılamayan parça: yeniden çerçevelenmeden aynen tekrar verilir
+                oge, parca, biten = self._geri
+                self._jeton_doldur()
+                if self._jeton < len(parca):
+                    return None, (len(parca) - self._jeton) / self.hiz, None
+                self._jeton -= len(parca)
+                self._geri = None
+                return parca, 0.0, biten
+
+            oge = self._aktif
+            if oge is None:
+                for kuyruk in self._kuyruklar:
+                    if kuyruk:
+                        oge = kuyruk[0]
+                        break
+                else:
+                    return None, None, None
+
+            n = min(self.parca_boyutu, len(oge.veri) - oge.ofset)
+            maliyet = n + self.parca_ek_yuku
+            self._jeton_doldur()
+            if self._jeton < maliyet:
+                return None, (maliyet - self._jeton) / self.hiz, None
+            self._jeton -= maliyet
+
+            parca = oge.veri[oge.ofset:oge.ofset + n]
+            oge.ofset += n
+            if self.cerceveleyici:
+                parca = self.cerceveleyici(parca, oge.etiket)
+            self._kuyruk_bayt[oge.oncelik] -= n
+            self.gonderilen_bayt[oge.oncelik] += n
+
+            if oge.ofset >= len(oge.veri):
+                self._kuyruklar[oge.oncelik].popleft()
+                self._aktif = None
+                self.tamamlanan[oge.oncelik] += 1
+                self._son = (oge, parca, oge)
+                return parca, 0.0, oge
+
+            # Bölünemeyen öğe bitene kadar araya başka öğe girmez
+            self._aktif = None if oge.bolunebilir else oge
+            self._son = (oge, parca, None)
+            return parca, 0.0, None
+
+    def geri_al(self):
+        """
+        Son al() parçası yazılamadı: bir sonraki al() aynı parçayı (aynı
+        frame ID ile, yeniden çerçevelemeden) öncelikli olarak tekrar verir
+        """
+        with self._kosul:
+            if self._son is not None:
+                self._geri = self._son
+                self._kosul.notify()
+
+    def vazgec(self, hata=None):
+        """
+        Son al() parçasının öğesinden vazgeç: kalan parçaları atılır,
+        dusuruldu(hata) çağrılır ve öğe döndürülür (çağıran ör. telemetri
+        deposuna alır). Öğe yoksa None.
+        """
+        oge = self._vazgec()
+        if oge is not None:
+            _dusurulduler((oge,), hata)
+        return oge
+
+    def _vazgec(self):
+        with self._kosul:
+            if self._son is None:
+                return None
+            oge, _, biten = self._son
+            self._son = self._geri = None
+            if biten is None:
+                kuyruk = self._kuyruklar[oge.oncelik]
+                if oge in kuyruk:
+                    kuyruk.remove(oge)
+                self._kuyruk_bayt[oge.oncelik] -= len(oge.veri) - oge.ofset
+                oge.ofset = len(oge.veri)
+                if self._aktif is oge:
+                    self._aktif = None
+            else:
+                self.tamamlanan[oge.oncelik] -= 1
+            self.dusurulen[oge.oncelik] += 1
+            return oge
+
+    def tamamlandi(self, oge):
+        """Öğenin son parçası yazıldı: gecikmeyi kaydet, geri çağrıyı çalıştır"""
+        gecikme = self.saat() - oge.zaman
+        if oge.oncelik == ONCELIK_TELEMETRI:
+            self._telemetri_gecikmeleri.append(gecikme)
+        if oge.tamamlandi:
+            oge.tamamlandi(gecikme)
+
+    def bekle(self, zaman_asimi):
+        """
+        Kuyruk boşsa yeni veri eklenene veya zaman aşımı dolana kadar bekle
+        (thread yazıcı için). Kuyruk kilit altında kontrol edilir: al() ile
+        bekle() arasında eklenen veri beklemeden alınır.
+        """
+        with self._kosul:
+            if self._geri is not None or self._aktif is not None or any(self._kuyruklar):
+                return
+            if zaman_asimi is None or zaman_asimi > 0:
+                self._kosul.wait(zaman_asimi)
+
+    def uyandir(self):
+        """Bekleyen yazıcı thread'ini uyandır (kapanış için)"""
+        with self._kosul:
+            self._kosul.notify_all()
+
+    def bosalt(self):
+        """Bekleyen tüm öğeleri at (dusuruldu geri çağrıları çalıştırılır)"""
+        with self._kosul:
+            atilan = [oge for kuyruk in self._kuyruklar for oge in kuyruk]
+            for kuyruk in self._kuyruklar:
+                kuyruk.clear()
+            self._kuyruk_bayt = [0] * len(SINIF_ADLARI)
+            self._aktif = self._son = self._geri = None
+        _dusurulduler(atilan)
+
+    def _jeton_doldur(self):
+        simdi = self.saat()
+        self._jeton = min(self.kova_kapasitesi, self._jeton + (simdi - self._son_dolum) * self.hiz)
+        self._son_dolum = simdi
+
+    def kuyruk_derinligi(self) -> dict:
+        with self._kosul:
+            return {ad: len(k) for ad, k in zip(SINIF_ADLARI, self._kuyruklar)}
+
+    def kuyruk_bayti(self) -> int:
+        """Tüm sınıflarda yazılmayı bekleyen payload byte'ı"""
+        with self._kosul:
+            return sum(self._kuyruk_bayt)
+
+    def get_istatistikler(self) -> dict:
+        """Sınıf başına kuyruk derinliği ve telemetri gecikmesi (ms)"""
+        gecikmeler = sorted(self._telemetri_gecikmeleri)
+        with self._kosul:
+            return {
+                'kuyruk_derinligi': {ad: len(k) for ad, k in zip(SINIF_ADLARI, self._kuyruklar)},
+                'kuyruk_bayt': dict(zip(SINIF_ADLARI, self._kuyruk_bayt)),
+                'gonderilen_bayt': dict(zip(SINIF_ADLARI, self.gonderilen_bayt)),
+                'tamamlanan': dict(zip(SINIF_ADLARI, self.tamamlanan)),
+                'dusurulen': dict(zip(SINIF_ADLARI, self.dusurulen)),
+                'telemetri_gecikme_ortalama_ms': (sum(gecikmeler) / len(gecikmeler) * 1000.0) if gecikmeler else 0.0,
+                'telemetri_gecikme_p99_ms': yuzdelik(gecikmeler, 0.99) * 1000.0,
+                'hiz_bayt_s': self.hiz
+            }
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    # Sanal saat ile 57600 baud'da 4 Hz video + 1 Hz telemetri simülasyonu
+    sanal_zaman = [0.0]
+    zamanlayici = TxZamanlayici(saat=lambda: sanal_zaman[0])
+
+    video = b"V" * 6900  # ~5 KB JPEG'in base64 hali
+    telemetri = b"$" + b"T" * 199
+
+    adim = 0.001
+    for ms in range(30000):
+        sanal_zaman[0] = ms * adim
+        if ms % 250 == 0:
+            zamanlayici.ekle(video, ONCELIK_VIDEO, bolunebilir=True)
+        if ms % 1000 == 500:
+            zamanlayici.ekle(telemetri, ONCELIK_TELEMETRI)
+        parca, _, biten = zamanlayici.al()
+        if biten is not None:
+            zamanlayici.tamamlandi(biten)
+
+    istatistik = zamanlayici.get_istatistikler()
+    print(f"Kuyruk derinliği: {istatistik['kuyruk_derinligi']}")
+    print(f"Atılan: {istatistik['dusurulen']}")
+    print(f"Telemetri gecikmesi p99: {istatistik['telemetri_gecikme_p99_ms']:.1f} ms")
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Uçuş Durumu Modülü
+
+TelemetryHandler uydu statüsünü her pakette basit bir irtifa farkı
+kuralıyla yeniden yazıyordu: statü uçuş ortasında 0'a dönebiliyor,
+_guncelle_uydu_statusu hiç çağrılmıyordu. UcusDurumMakinesi statüyü
+yalnızca ileri yönde ilerleten açık bir durum makinesidir:
+
+    0 Uçuşa Hazır -> 1 Yükselme -> 2 Model Uydu İniş -> 3 Ayrılma
+      -> 4 Görev Yükü İniş -> 5 Kurtarma
+
+- Girdiler irtifa filtresinin çıktısıdır (filtrelenmiş irtifa ve dikey
+  hız = irtifanın eğimi); zemin kalkıştan önceki irtifadır (şartname:
+  uçuşa başlanan yer 0 m), eşikler zeminden yüksekliğe uygulanır
+- Histerezis: her geçiş koşulu art arda onay_ornek kez sağlanmalıdır;
+  tek örneklik sıçramalar statüyü değiştirmez
+- Tepe noktası: yükselmede en yüksek irtifa izlenir; dikey hız tepe hız
+  eşiğinin altına iner ve irtifa tepeden tepe payı kadar düşerse tepe
+  (zamanı ve irtifası) kaydedilir
+- Ayrılma: görev yükü - taşıyıcı irtifa farkı eşiği aşınca veya
+  ayrilma_bildir() ile; iniş durumlarında uzun süre hareketsizlik (yere
+  yakınsa daha kısa) kurtarmaya geçirir
+- guncelle() örnek başına sabit süre; geçişler zaman damgasıyla loglanır
+  ve sınırlı bir listede tutulur
+- ucus_kaydini_oynat(): SD'deki telemetri satırlarını aynı filtre +
+  makineyle yeniden oynatır (uçuş sonrası doğrulama)
+"""
+
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+HAZIR = 0
+YUKSELME = 1
+MODEL_UYDU_INIS = 2
+AYRILMA = 3
+GOREV_YUKU_INIS = 4
+KURTARMA = 5
+
+DURUM_ADLARI = {
+    HAZIR: "Uçuşa Hazır",
+    YUKSELME: "Yükselme",
+    MODEL_UYDU_INIS: "Model Uydu İniş",
+    AYRILMA: "Ayrılma",
+    GOREV_YUKU_INIS: "Görev Yükü İniş",
+    KURTARMA: "Kurtarma"
+}
+
+
+class UcusDurumMakinesi:
+    """
+    Histerezisli uçuş durumu makinesi.
+
+    Args:
+        ayrilma_irtifasi: Ayrılma yüksekliği (m, zeminden)
+        ayrilma_toleransi: Ayrılma bandı payı (m)
+        onay_ornek: Geçiş için koşulun art arda sağlanacağı örnek sayısı
+        kalkis_hizi: Bundan hızlı yükselme kalkış sayılır (m/s)
+        kalkis_irtifasi: Kalkış için zeminden en az yükseklik (m)
+        tepe_hizi: Tepe sonrası bundan hızlı alçalma (m/s)
+        tepe_payi: Tepe için en yüksek irtifadan en az düşüş (m)
+        ayrilma_farki: Görev yükü - taşıyıcı irtifa farkı; aşılırsa ayrılmış (m)
+        durgun_hizi: Bundan yavaş dikey hız hareketsiz sayılır (m/s)
+        yer_irtifasi: Zemine bu kadar yakınsa iniş onay_ornek'te onaylanır (m)
+        durgun_ornek: Yerden uzakta iniş onayı için hareketsiz örnek sayısı
+    """
+
+    def __init__(self, ayrilma_irtifasi=400.0, ayrilma_toleransi=10.0, onay_ornek=3,
+                 kalkis_hizi=3.0, kalkis_irtifasi=10.0, tepe_hizi=2.0, tepe_payi=5.0,
+                 ayrilma_farki=10.0, durgun_hizi=1.0, yer_irtifasi=10.0, durgun_ornek=10):
+        self.ayrilma_irtifasi = ayrilma_irtifasi
+        self.ayrilma_toleransi = ayrilma_toleransi
+        self.onay_ornek = onay_ornek
+        self.kalkis_hizi = kalkis_hizi
+        self.kalkis_irtifasi = kalkis_irtifasi
+        self.tepe_hizi = tepe_hizi
+        self.tepe_payi = tepe_payi
+        self.ayrilma_farki = ayrilma_farki
+        self.durgun_hizi = durgun_hizi
+        self.yer_irtifasi = yer_irtifasi
+        self.durgun_ornek = durgun_ornek
+
+        self.durum = HAZIR
+        self.durum_zamani = None     # Mevcut duruma giriş zamanı
+        self.zemin = None            # Kalkış öncesi irtifa
+        self.tepe_irtifa = None
+        self.tepe_zamani = None
+        self.ayrilma_zamani = None
+        self.son_irtifa = 0.0
+        self.son_dikey_hiz = 0.0
+        self.gecisler = deque(maxlen=32)  # (zaman, önceki, yeni, irtifa, dikey_hiz, neden)
+
+        self._sayac = 0              # Mevcut geçiş koşulunun art arda sağlanma sayısı
+        self._durgun = 0             # Art arda hareketsiz örnek
+        self._ayrilma_sayaci = 0
+        self._ayrilma_bildirildi = False
+
+    @property
+    def durum_adi(self) -> str:
+        return DURUM_ADLARI[self.durum]
+
+    def durum_suresi(self, zaman) -> float:
+        """Mevcut durumda geçen süre (s)"""
+        return 0.0 if self.durum_zamani is None else zaman - self.durum_zamani
+
+    def _gec(self, yeni, zaman, irtifa, dikey_hiz, neden):
+        onceki = self.durum
+        self.durum = yeni
+        self.durum_zamani = zaman
+        self._sayac = 0
+        self.gecisler.append((zaman, onceki, yeni, irtifa, dikey_hiz, neden))
+        saat = time.strftime("%H:%M:%S", time.localtime(zaman))
+        yukseklik = irtifa - (self.zemin or 0.0)  # Zeminden yükseklik
+        print(f"🛰️ Uçuş durumu {onceki} -> {yeni} ({DURUM_ADLARI[yeni]}) {saat}: {neden} "
+              f"[yükseklik {yukseklik:.1f} m, dikey hız {dikey_hiz:.1f} m/s]")
+        logger.info("Uçuş durumu %s -> %s zaman=%.3f irtifa=%.2f yukseklik=%.2f dikey_hiz=%.2f neden=%s",
+                    onceki, yeni, zaman, irtifa, yukseklik, dikey_hiz, neden)
+
+    def _onayla(self, kosul) -> bool:
+        """Koşul art arda onay_ornek kez sağlandı mı (histerezis)"""
+        self._sayac = self._sayac + 1 if kosul else 0
+        return self._sayac >= self.onay_ornek
+
+    def ayrilma_bildir(self):
+        """Ayrılma dışarıdan doğrulandı (ör. manuel ayrılma komutu, servo geri bildirimi)"""
+        self._ayrilma_bildirildi = True
+
+    def zorla(self, durum, zaman, neden="manuel"):
+        """Durumu doğrudan ayarlar (yer istasyonu komutu / test)"""
+        if durum != self.durum:
+            self._gec(durum, zaman, self.son_irtifa, self.son_dikey_hiz, neden)
+
+    def guncelle(self, zaman, irtifa, dikey_hiz, irtifa_farki=None) -> int:
+        """
+        Bir örnek işler, güncel durumu döndürür.
+
+        Args:
+            zaman: Örnek zamanı (s, epoch)
+            irtifa: Filtrelenmiş irtifa (m)
+            dikey_hiz: Filtrelenmiş dikey hız (m/s, yukarı +)
+            irtifa_farki: Görev yükü - taşıyıcı irtifa farkı (m); taşıyıcı verisi yoksa None
+        """
+        durum = self.durum
+        self.son_irtifa, self.son_dikey_hiz = irtifa, dikey_hiz
+        if self.durum_zamani is None:
+            self.durum_zamani = zaman
+        if self.zemin is None:
+            self.zemin = irtifa
+        yukseklik = irtifa - self.zemin
+
+        if durum == HAZIR:
+            if dikey_hiz > self.kalkis_hizi:
+                if self._onayla(yukseklik > self.kalkis_irtifasi):
+                    self.tepe_irtifa, self.tepe_zamani = irtifa, zaman
+                    self._gec(YUKSELME, zaman, irtifa, dikey_hiz, "kalkış")
+            else:
+                self.zemin = irtifa  # Rampada: zemin filtrelenmiş irtifayı izler
+                self._sayac = 0
+            return self.durum
+
+        if durum == YUKSELME:
+            if irtifa > self.tepe_irtifa:
+                self.tepe_irtifa, self.tepe_zamani = irtifa, zaman
+            if self._onayla(dikey_hiz < -self.tepe_hizi and
+                            self.tepe_irtifa - irtifa > self.tepe_payi):
+                self._gec(MODEL_UYDU_INIS, zaman, irtifa, dikey_hiz,
+                          f"tepe noktası {self.tepe_irtifa - self.zemin:.1f} m")
+            return self.durum
+
+        # İniş durumları: ayrılma ve iniş (hareketsizlik) takibi
+        if irtifa_farki is not None and irtifa_farki > self.ayrilma_farki:
+            self._ayrilma_sayaci += 1
+        else:
+            self._ayrilma_sayaci = 0
+        ayrildi = self._ayrilma_bildirildi or self._ayrilma_sayaci >= self.onay_ornek
+        self._durgun = self._durgun + 1 if abs(dikey_hiz) < self.durgun_hizi else 0
+        indi = (self._durgun >= self.durgun_ornek or
+                (self._durgun >= self.onay_ornek and yukseklik < self.yer_irtifasi))
+
+        if durum == KURTARMA:
+            return durum
+        if indi:
+            self._gec(KURTARMA, zaman, irtifa, dikey_hiz, "yere iniş")
+        elif durum == MODEL_UYDU_INIS:
+            if ayrildi:
+                self._gec(AYRILMA, zaman, irtifa, dikey_hiz, "ayrılma algılandı")
+            elif self._onayla(yukseklik <= self.ayrilma_irtifasi + self.ayrilma_toleransi):
+                self._gec(AYRILMA, zaman, irtifa, dikey_hiz, "ayrılma irtifası")
+        elif durum == AYRILMA:
+            if ayrildi:
+                self.ayrilma_zamani = zaman
+                self._gec(GOREV_YUKU_INIS, zaman, irtifa, dikey_hiz, "ayrılma gerçekleşti")
+        return self.durum
+
+    def get_istatistikler(self) -> dict:
+        return {
+            'durum': self.durum,
+            'durum_adi': self.durum_adi,
+            'zemin': round(self.zemin, 2) if self.zemin is not None else None,
+            'tepe_irtifa': round(self.tepe_irtifa - self.zemin, 2) if self.tepe_irtifa is not None else None,
+            'tepe_zamani': self.tepe_zamani,
+            'ayrilma_zamani': self.ayrilma_zamani,
+            'gecisler': [(round(z, 3), o, y, n) for z, o, y, _, _, n in self.gecisler]
+        }
+
+
+def ucus_kaydini_oynat(satirlar, makine=None, filtre=None):
+    """
+    SD telemetri satırlarını (başlık ve '$...*CS' XBee satırları dahil)
+    irtifa filtresi + durum makinesinden geçirir. Filtreye canlı akıştaki
+    gibi YÜKSEKLİK1 verilir ve uzun veri boşluğunda filtre yeniden başlar. Kayıttaki statü ile
+    makinenin statüsünü karşılaştırmak için (paket_no, kayıttaki, yeni)
+    listesi ve makineyi döndürür.
+    """
+    from moduller.irtifa_filtresi import IrtifaKalmanFiltresi, VERI_BOSLUGU_SURESI
+    from moduller.telemetri_kodlayici import ALAN_ADLARI, ZAMAN_BICIMI
+
+    makine = makine or UcusDurumMakinesi()
+    filtre = filtre or IrtifaKalmanFiltresi()
+    i_no = ALAN_ADLARI.index('paket_numarasi')
+    i_statu = ALAN_ADLARI.index('uydu_statusu')
+    i_saat = ALAN_ADLARI.index('gonderme_saati')
+    i_basinc2 = ALAN_ADLARI.index('basinc2')
+    i_irtifa = ALAN_ADLARI.index('yukseklik1')
+    i_fark = ALAN_ADLARI.index('irtifa_farki')
+
+    sonuc = []
+    onceki_zaman = None
+    for satir in satirlar:
+        satir = satir.strip().lstrip('$').split('*')[0]
+        alanlar = satir.split(',')
+        if len(alanlar) < len(ALAN_ADLARI) or not alanlar[0].isdigit():
+            continue  # Başlık / bozuk satır
+        try:
+            zaman = time.mktime(time.strptime(alanlar[i_saat], ZAMAN_BICIMI))
+            irtifa = float(alanlar[i_irtifa])
+            irtifa_farki = float(alanlar[i_fark]) if float(alanlar[i_basinc2]) > 0 else None
+        except ValueError:
+            continue
+        dt = zaman - onceki_zaman if onceki_zaman is not None else None
+        onceki_zaman = zaman
+        if dt is not None and dt > VERI_BOSLUGU_SURESI:
+            filtre.sifirla()
+        filtre.guncelle(irtifa, dt)
+        yeni = makine.guncelle(zaman, filtre.irtifa, filtre.dikey_hiz, irtifa_farki)
+        sonuc.append((int(alanlar[i_no]), int(alanlar[i_statu]), yeni))
+    return sonuc, makine
+
+
+# Test için örnek kullanım: sentetik uçuş + SD kaydı üzerinden yeniden oynatma
+if __name__ == '__main__':
+    import random
+    import sys
+
+    from moduller.telemetri_kodlayici import ALAN_ADLARI, ZAMAN_BICIMI, ascii_kodla
+
+    if len(sys.argv) > 1:
+        # Kayıtlı uçuşu oynat: python3 -m moduller.ucus_durumu kayitlar/telemetri_....csv
+        with open(sys.argv[1], encoding='utf-8') as f:
+            sonuc, makine = ucus_kaydini_oynat(f)
+        farkli = sum(1 for _, eski, yeni in sonuc if eski != yeni)
+        print(f"📋 {len(sonuc)} paket, kayıttaki statüden farklı: {farkli}")
+        print(f"✅ {makine.get_istatistikler()}")
+        sys.exit(0)
+
+    # 1 Hz: 20 s rampada, 20 s yavaşlayan yükselme (tepe 800 m, t=40), 13 m/s
+    # iniş, 400 m'de ayrılma (taşıyıcı 13 m/s, görev yükü 7 m/s), yere iniş
+    random.seed(3)
+    baslangic = time.mktime((2026, 10, 17, 12, 0, 0, 0, 0, -1))
+    zemin, irtifa, tasiyici, hiz = 900.0, 900.0, 900.0, 0.0
+    satirlar, gercek = [], []
+    ayrilma_t = inis_t = None
+    for t in range(180):
+        if 20 <= t < 40:
+            hiz = 80.0 - 4.0 * (t - 20)
+        elif t >= 40 and inis_t is None:
+            hiz = max(-13.0, hiz - 6.0)
+        if ayrilma_t is None and t > 40 and irtifa - zemin <= 400.0:
+            ayrilma_t = t
+        irtifa = max(zemin, irtifa + (-7.0 if ayrilma_t is not None else hiz))
+        tasiyici = max(zemin, tasiyici + hiz)
+        if ayrilma_t is not None and irtifa == zemin and inis_t is None:
+            inis_t = t
+        olcum = irtifa + random.gauss(0.0, 0.5) + (60.0 if t == 90 else 0.0)  # t=90: basınç sıçraması
+        degerler = dict.fromkeys(ALAN_ADLARI, 0)
+        degerler.update(paket_numarasi=t + 1, hata_kodu="000000", rhrh="0000", takim_no=286570,
+                        gonderme_saati=time.strftime(ZAMAN_BICIMI, time.localtime(baslangic + t)),
+                        basinc1=90000, basinc2=90500, yukseklik1=olcum, yukseklik2=tasiyici,
+                        irtifa_farki=olcum - tasiyici)
+        satirlar.append(ascii_kodla(degerler))
+    satirlar.insert(0, "PAKET_NUMARASI,UYDU_STATUSU,...")
+
+    sonuc, makine = ucus_kaydini_oynat(satirlar)
+    durumlar = [yeni for _, _, yeni in sonuc]
+    gecis_sirasi = [y for _, _, y, _, _, _ in makine.gecisler]
+    assert gecis_sirasi == [YUKSELME, MODEL_UYDU_INIS, AYRILMA, GOREV_YUKU_INIS, KURTARMA], gecis_sirasi
+    assert all(a <= b for a, b in zip(durumlar, durumlar[1:])), "Statü geri dönmemeli"
+    tepe_t = makine.tepe_zamani - baslangic
+    assert abs(tepe_t - 40) <= 2, tepe_t
+    print(f"🎯 Tepe: t={tepe_t:.0f} s (gerçek 40 s), {makine.tepe_irtifa - makine.zemin:.1f} m; "
+          f"ayrılma irtifası t={ayrilma_t} s, iniş t={inis_t} s")
+    for z, onceki, yeni, _, _, neden in makine.gecisler:
+        print(f"   t={z - baslangic:5.0f} s  {onceki} -> {yeni}  {neden}")
+
+    # Örnek başına maliyet
+    makine = UcusDurumMakinesi()
+    ornek = 200000
+    bas = time.perf_counter()
+    for i in range(ornek):
+        makine.guncelle(float(i), 900.0 + (i % 7) * 0.1, 0.2, None)
+    print(f"⏱️ Durum makinesi: {(time.perf_counter() - bas) / ornek * 1e6:.2f} µs/örnek")
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+"""
+Video Parçalama Modülü
+
+Canlı yayın JPEG karelerini XBee RF payload sınırına sığan, kendi CRC'si
+olan parçalara böler ve yer istasyonu tarafında yeniden birleştirir.
+Tek bir bozuk/kayıp parça yalnızca o kareyi kaybettirir; akış durmaz.
+
+Parça yapısı, sürüm 1 (little-endian, PARCA_EK_YUKU = 10 byte ek yük):
+    0-1  : Senkron (0xC5 0x5C)
+    2    : Sürüm (1)
+    3-4  : Kare ID (uint16, dönerek artar)
+    5    : Parça indeksi (0..sayı-1)
+    6    : Parça sayısı (1..255)
+    7    : Veri uzunluğu (bu parçadaki JPEG byte'ı)
+    8..  : Veri
+    son 2: CRC-16/CCITT-FALSE (sürüm byte'ından verinin sonuna kadar)
+
+Sürüm 2 (FEC, PARCA_EK_YUKU_FEC = 13 byte): k veri + m parite parçası,
+herhangi k parça kareyi kurtarır (moduller/hata_duzeltme.py):
+    0-1  : Senkron
+    2    : Sürüm (2)
+    3-4  : Kare ID
+    5    : Parça indeksi (0..k-1 veri, k..k+m-1 parite)
+    6    : k (veri parçası sayısı)
+    7    : m (parite parçası sayısı)
+    8-9  : Kare boyutu (kurtarılan karenin dolgusunu kesmek için)
+    10   : Veri uzunluğu
+    11.. : Veri
+    son 2: CRC-16/CCITT-FALSE
+
+Son parça hariç tüm parçalar tam parca_boyutu uzunluğundadır (FEC'de son
+veri parçası sıfırla dolgulanır, pariteler veriden sonra gelir). Böylece
+birleştirilmiş parçalar TX zamanlayıcının parca_boyutu'luk dilimleriyle
+hizalanır (API modunda her parça tek 0x10 frame'i = tek RF paketi).
+
+Birleştirici:
+- Akış (transparent mod, metin satırlarıyla karışık) veya tek tek parça
+  (API modu payload'ları) kabul eder; senkron + uzunluk + CRC ile ayıklar
+- Zaman aşımına uğrayan yarım kareleri atar
+- En yeni tamamlanan kareden eski kareleri/parçaları atar
+- Kare ID boşluklarından kayıp kare sayısını çıkarır
+"""
+
+import math
+import struct
+import time
+
+from moduller.telemetri_kodlayici import crc16_ccitt
+from moduller.hata_duzeltme import parite_uret, kurtar, MAKS_BLOK_SAYISI
+
+PARCA_SENKRON = b'\xC5\x5C'
+PARCA_SURUMU = 1
+PARCA_SURUMU_FEC = 2
+_PARCA_BASLIK = struct.Struct('<2sBHBBB')
+_PARCA_BASLIK_FEC = struct.Struct('<2sBHBBBHB')
+PARCA_BASLIK_BOYUTU = _PARCA_BASLIK.size  # 8
+PARCA_EK_YUKU = PARCA_BASLIK_BOYUTU + 2   # + CRC
+PARCA_EK_YUKU_FEC = _PARCA_BASLIK_FEC.size + 2  # 13
+MAKS_PARCA_SAYISI = MAKS_BLOK_SAYISI
+MAKS_PARCA_VERISI = 255
+
+KARE_ID_MODU = 0x10000
+# Son tamamlanandan bu kadar "eski" kare ID'si gönderenin yeniden başladığı
+# anlamına gelir (kare ID'si 0'dan başlar); birleştirici sıfırlanır
+YENIDEN_BASLAMA_ESIGI = 256
+
+
+def _daha_yeni(a: int, b: int) -> bool:
+    """Dönen 16-bit kare ID'lerinde a, b'den yeni mi?"""
+    return 0 < (a - b) % KARE_ID_MODU < KARE_ID_MODU // 2
+
+
+def _baslik_coz(tampon, bas: int = 0):
+    """
+    (başlık_boyutu, kare_id, indeks, k, m, kare_boyutu, uzunluk) veya
+    geçersiz başlıkta None; başlık henüz tamamlanmadıysa ... (Ellipsis)
+    """
+    if len(tampon) - bas < 3:
+        return ...
+    surum = tampon[bas + 2]
+    if surum == PARCA_SURUMU:
+        if len(tampon) - bas < _PARCA_BASLIK.size:
+            return ...
+        _, _, kare_id, indeks, k, uzunluk = _PARCA_BASLIK.unpack_from(tampon, bas)
+        m, kare_boyutu, boyut = 0, None, _PARCA_BASLIK.size
+    elif surum == PARCA_SURUMU_FEC:
+        if len(tampon) - bas < _PARCA_BASLIK_FEC.size:
+            return ...
+        _, _, kare_id, indeks, k, m, kare_boyutu, uzunluk = _PARCA_BASLIK_FEC.unpack_from(tampon, bas)
+        boyut = _PARCA_BASLIK_FEC.size
+    else:
+        return None
+    if k == 0 or indeks >= k + m or k + m > MAKS_PARCA_SAYISI:
+        return None
+    return boyut, kare_id, indeks, k, m, kare_boyutu, uzunluk
+
+
+class VideoParcalayici:
+    """
+    JPEG karesini parçalara böler.
+
+    Args:
+        parca_boyutu: Parça başına toplam byte (ek yük dahil), ör. XBEE_TX_PARCA_BOYUTU
+        parite_orani: Veri parçası başına parite oranı (0: FEC yok, sürüm 1
+            parçalar; 0.2: 10 veri parçasına 2 parite)
+    """
+
+    def __init__(self, parca_boyutu=100, parite_orani=0.0):
+        if parite_orani < 0:
+            raise ValueError(f"Parite oranı negatif olamaz: {parite_orani}")
+        self.parite_orani = parite_orani
+        ek_yuk = PARCA_EK_YUKU_FEC if parite_orani > 0 else PARCA_EK_YUKU
+        self.veri_boyutu = min(parca_boyutu - ek_yuk, MAKS_PARCA_VERISI)
+        if self.veri_boyutu < 1:
+            raise ValueError(f"Parça boyutu çok küçük: {parca_boyutu}")
+        self.kare_id = 0
+
+        # İstatistikler
+        self.gonderilen_kare = 0
+        self.atlanan_buyuk_kare = 0
+        self.parite_parcasi = 0
+
+    def parcala(self, kare) -> list:
+        """Kareyi parça listesine çevirir; MAKS_PARCA_SAYISI'nı aşarsa boş liste"""
+        k = max(1, -(-len(kare) // self.veri_boyutu))
+        m = min(math.ceil(k * self.parite_orani), MAKS_PARCA_SAYISI - k) if self.parite_orani > 0 else 0
+        if k > MAKS_PARCA_SAYISI or (self.parite_orani > 0 and (m < 1 or len(kare) > 0xFFFF)):
+            self.atlanan_buyuk_kare += 1
+            return []
+
+        kare_id = self.kare_id
+        self.kare_id = (self.kare_id + 1) % KARE_ID_MODU
+        self.gonderilen_kare += 1
+
+        gorunum = memoryview(kare)
+        veriler = [gorunum[i * self.veri_boyutu:(i + 1) * self.veri_boyutu] for i in range(k)]
+        if not m:
+            return [self._parca(_PARCA_BASLIK.pack(PARCA_SENKRON, PARCA_SURUMU, kare_id, i, k, len(veri)), veri)
+                    for i, veri in enumerate(veriler)]
+
+        dolgulu = [bytes(veri) for veri in veriler]
+        dolgulu[-1] = dolgulu[-1].ljust(self.veri_boyutu, b'\x00')
+        pariteler = parite_uret(dolgulu, m)
+        self.parite_parcasi += m
+
+        return [self._parca(_PARCA_BASLIK_FEC.pack(PARCA_SENKRON, PARCA_SURUMU_FEC, kare_id,
+                                                   indeks, k, m, len(kare), len(veri)), veri)
+                for indeks, veri in enumerate(dolgulu + pariteler)]
+
+    @staticmethod
+    def _parca(baslik, veri) -> bytes:
+        parca = bytearray(baslik)
+        parca += veri
+        parca += struct.pack('<H', crc16_ccitt(memoryview(parca)[2:]))
+        return bytes(parca)
+
+
+class _YarimKare:
+    __slots__ = ('k', 'm', 'kare_boyutu', 'parcalar', 'ilk_zaman')
+
+    def __init__(self, k, m, kare_boyutu, zaman):
+        self.k = k
+        self.m = m
+        self.kare_boyutu = kare_boyutu
+        self.parcalar = {}
+        self.ilk_zaman = zaman
+
+
+class VideoBirlestirici:
+    """
+    Parçalardan kareleri yeniden oluşturur.
+
+    Args:
+        zaman_asimi: İlk parçasından bu kadar sonra tamamlanmayan kare atılır (s)
+        maks_tampon: Akış tamponu üst sınırı (byte)
+        saat: Zaman fonksiyonu (varsayılan time.monotonic)
+    """
+
+    def __init__(self, zaman_asimi=2.0, maks_tampon=16384, saat=time.monotonic):
+        self.zaman_asimi = zaman_asimi
+        self.maks_tampon = maks_tampon
+        self.saat = saat
+        self._tampon = bytearray()
+        self._kareler = {}  # kare_id -> _YarimKare
+        self._son_tamamlanan = None
+
+        # İstatistikler
+        self.tamamlanan = 0
+        self.kurtarilan = 0      # Eksik veri parçası pariteyle yeniden oluşturulan kare
+        self.kayip_kare = 0      # Tamamlanan kareler arasındaki kare ID boşlukları
+        self.crc_hatasi = 0
+        self.zaman_asimi_kare = 0
+        self.eski_atilan_kare = 0
+        self.eski_parca = 0
+        self.fazla_parca = 0     # Kare tamamlandıktan sonra gelen (parite) parçalar
+
+    def besle(self, veri) -> list:
+        """
+        Akış parçasını işler (parçalar başka verilerle karışık olabilir).
+        Tamamlanan karelerin (kare_id, jpeg) listesini döndürür.
+        """
+        self._tampon += veri
+        tamamlanan = []
+        konum = 0
+        while True:
+            bas = self._tampon.find(PARCA_SENKRON, konum)
+            if bas < 0:
+                # Son byte senkronun ilk yarısı olabilir
+                konum = max(konum, len(self._tampon) - 1)
+                break
+            baslik = _baslik_coz(self._tampon, bas)
+            if baslik is ...:
+                konum = bas
+                break
+            if baslik is None:
+                konum = bas + 1
+                continue
+            son = bas + baslik[0] + baslik[-1] + 2
+            if son > len(self._tampon):
+                konum = bas
+                break
+            sonuc = self.parca_isle(self._tampon[bas:son])
+            if sonuc is None:
+                konum = bas + 1  # CRC hatası: yanlış senkron olabilir, bir byte ilerle
+                continue
+            tamamlanan.extend(sonuc)
+            konum = son
+
+        del self._tampon[:konum]
+        if len(self._tampon) > self.maks_tampon:
+            del self._tampon[:-_PARCA_BASLIK_FEC.size]
+        return tamamlanan
+
+    def parca_isle(self, parca):
+        """
+        Tek bir parçayı işler. CRC/biçim hatasında None, aksi halde
+        tamamlanan karelerin listesini (çoğunlukla boş) döndürür.
+        """
+        if len(parca) < PARCA_EK_YUKU or bytes(parca[:2]) != PARCA_SENKRON:
+            return None
+        baslik = _baslik_coz(parca)
+        if baslik is None or baslik is ...:
+            return None
+        baslik_boyutu, kare_id, indeks, k, m, kare_boyutu, uzunluk = baslik
+        if len(parca) != baslik_boyutu + uzunluk + 2:
+            return None
+        crc = struct.unpack_from('<H', parca, len(parca) - 2)[0]
+        if crc16_ccitt(memoryview(parca)[2:-2]) != crc:
+            self.crc_hatasi += 1
+            return None
+
+        simdi = self.saat()
+        self._zaman_asimlarini_temizle(simdi)
+
+        if self._son_tamamlanan is not None and not _daha_yeni(kare_id, self._son_tamamlanan):
+            fark = (self._son_tamamlanan - kare_id) % KARE_ID_MODU
+            if fark == 0:
+                self.fazla_parca += 1
+                return []
+            if fark <= YENIDEN_BASLAMA_ESIGI:
+                self.eski_parca += 1
+                return []
+            self._son_tamamlanan = None
+            self._kareler.clear()
+
+        kare = self._kareler.get(kare_id)
+        if kare is None or (kare.k, kare.m) != (k, m):
+            kare = self._kareler[kare_id] = _YarimKare(k, m, kare_boyutu, simdi)
+        kare.parcalar[indeks] = bytes(parca[baslik_boyutu:baslik_boyutu + uzunluk])
+        if len(kare.parcalar) < kare.k:
+            return []
+
+        veri = self._kare_olustur(kare)
+        if veri is None:
+            return []
+        del self._kareler[kare_id]
+        if self._son_tamamlanan is not None:
+            self.kayip_kare += (kare_id - self._son_tamamlanan - 1) % KARE_ID_MODU
+        self._son_tamamlanan = kare_id
+        self.tamamlanan += 1
+        # Bu kareden eski yarım kareler artık gösterilmeyecek
+        for eski_id in [k for k in self._kareler if not _daha_yeni(k, kare_id)]:
+            del self._kareler[eski_id]
+            self.eski_atilan_kare += 1
+        return [(kare_id, veri)]
+
+    def _kare_olustur(self, kare: _YarimKare):
+        """k parça geldiğinde kareyi birleştirir; gerekirse paritelerden kurtarır"""
+        parcalar = kare.parcalar
+        if all(i in parcalar for i in range(kare.k)):
+            veri = b"".join(parcalar[i] for i in range(kare.k))
+            return veri[:kare.kare_boyutu] if kare.kare_boyutu is not None else veri
+
+        try:
+            veriler = kurtar(parcalar, kare.k, kare.m)
+        except ValueError:
+            return None
+        self.kurtarilan += 1
+        return b"".join(veriler)[:kare.kare_boyutu]
+
+    def _zaman_asimlarini_temizle(self, simdi):
+        for kare_id in [k for k, v in self._kareler.items() if simdi - v.ilk_zaman > self.zaman_asimi]:
+            del self._kareler[kare_id]
+            self.zaman_asimi_kare += 1
+
+    def get_istatistikler(self) -> dict:
+        return {
+            'tamamlanan': self.tamamlanan,
+            'kurtarilan': self.kurtarilan,
+            'kayip_kare': self.kayip_kare,
+            'crc_hatasi': self.crc_hatasi,
+            'zaman_asimi': self.zaman_asimi_kare,
+            'eski_atilan_kare': self.eski_atilan_kare,
+            'eski_parca': self.eski_parca,
+            'fazla_parca': self.fazla_parca,
+            'yarim_kare': len(self._kareler)
+        }
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import os
+    import random
+
+    random.seed(1)
+
+    # 1) Kayıpsız akış, telemetri satırlarıyla karışık ve rastgele okuma parçaları
+    for oran in (0.0, 0.15):
+        parcalayici = VideoParcalayici(parca_boyutu=100, parite_orani=oran)
+        birlestirici = VideoBirlestirici()
+        kareler = [os.urandom(random.randint(2000, 5000)) for _ in range(20)]
+        akis = bytearray()
+        for kare in kareler:
+            parcalar = parcalayici.parcala(kare)
+            assert all(len(p) == 100 for p in parcalar[:-1]), "Parçalar dilim hizasında olmalı"
+            for parca in parcalar:
+                akis += parca
+            akis += b"$1,0,000000,17/10/2026 12:00:00,...*5A\n"
+        alinan = []
+        konum = 0
+        while konum < len(akis):
+            n = random.randint(1, 300)
+            alinan += birlestirici.besle(bytes(akis[konum:konum + n]))
+            konum += n
+        assert [k for _, k in alinan] == kareler, "Kayıpsız akışta tüm kareler birebir gelmeli"
+        print(f"✅ Kayıpsız (parite %{oran * 100:.0f}): {len(alinan)}/{len(kareler)} kare")
+
+    # 2) Parça kaybı (API modu: parça başına payload); 412-707 m'de ölçülen
+    #    kayıplara göre parite oranını ayarlamak için tablo
+    print("📉 Parça kaybı -> tam kare oranı (4 FPS, 2-5 KB kare)")
+    for kayip in (0.01, 0.03, 0.05, 0.10):
+        satir = []
+        for oran in (0.0, 0.1, 0.2, 0.3):
+            random.seed(2)
+            zaman = [0.0]
+            parcalayici = VideoParcalayici(parca_boyutu=100, parite_orani=oran)
+            birlestirici = VideoBirlestirici(saat=lambda: zaman[0])
+            gonderilen = bayt = 0
+            for n in range(200):
+                zaman[0] = n * 0.25
+                kare = os.urandom(random.randint(2000, 5000))
+                gonderilen += 1
+                for parca in parcalayici.parcala(kare):
+                    bayt += len(parca)
+                    r = random.random()
+                    if r < kayip / 2:
+                        continue
+                    if r < kayip:
+                        parca = bytearray(parca)
+                        parca[random.randrange(len(parca))] ^= 0x40
+                    sonuc = birlestirici.parca_isle(bytes(parca))
+                    if sonuc:
+                        assert sonuc[0][1] == kare
+            ist = birlestirici.get_istatistikler()
+            satir.append(f"%{oran * 100:2.0f} parite: {ist['tamamlanan']:3d}/{gonderilen} "
+                         f"(kurtarılan {ist['kurtarilan']:3d}, {bayt / gonderilen / 1024:.1f} KB/kare)")
+        print(f"   kayıp %{kayip * 100:2.0f} | " + " | ".join(satir))
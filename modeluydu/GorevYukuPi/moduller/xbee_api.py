@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""
+XBee API Frame Modülü
+
+Bu modül, XBee API modu (AP=1) frame'lerinin akış halinde çözülmesinden
+sorumludur:
+1. Okumalar arasında durum tutan halka tampon (okuma/yazma imleci)
+2. 0x7E ile yeniden senkronizasyon (bytearray.find)
+3. Checksum doğrulama
+4. Kopyasız (memoryview) payload dilimleri
+5. Tipli frame'ler: 0x90 RX, 0x8B TX Status, 0x88 AT Response
+6. Gönderim için 0x10 Transmit Request frame'i oluşturma
+
+API frame yapısı: 0x7E | Length MSB | Length LSB | Frame Data | Checksum
+Checksum: 0xFF - (Frame Data byte'larının toplamı & 0xFF)
+"""
+
+from collections import namedtuple
+
+# API frame sabitleri
+API_BASLANGIC = 0x7E
+API_BASLANGIC_BAYTI = b'\x7e'
+API_BASLIK_BOYUTU = 3  # 0x7E + 2 byte uzunluk
+
+# Frame tipleri
+CERCEVE_TX_ISTEGI = 0x10
+CERCEVE_AT_YANITI = 0x88
+CERCEVE_TX_DURUMU = 0x8B
+CERCEVE_RX = 0x90
+
+# XBee RF payload'u birkaç yüz byte'ı geçmez; bundan büyük uzunluk alanı
+# büyük ihtimalle veri içinde rastlantısal bir 0x7E'dir (yanlış başlangıç)
+MAKS_CERCEVE_UZUNLUGU = 1024
+
+# 0x10 Transmit Request adresleme
+HEDEF64_KOORDINATOR = 0x0000000000000000
+HEDEF64_YAYIN = 0x000000000000FFFF
+HEDEF16_BILINMIYOR = 0xFFFE
+TX_ISTEGI_BASLIK_BOYUTU = 14  # tip + id + 64-bit + 16-bit + radius + options
+TX_ISTEGI_EK_YUKU = API_BASLIK_BOYUTU + TX_ISTEGI_BASLIK_BOYUTU + 1  # + checksum
+
+# 0x8B teslim durumu (0x00 dışındaki her değer teslim edilemedi demektir)
+TESLIM_BASARILI = 0x00
+
+
+class RxCercevesi(namedtuple('RxCercevesi', 'kaynak64 kaynak16 secenekler veri')):
+    """0x90 RX Indicator - uzak XBee'den gelen veri (veri: memoryview)"""
+    __slots__ = ()
+    TIP = CERCEVE_RX
+
+
+class TxDurumCercevesi(namedtuple('TxDurumCercevesi',
+                                  'cerceve_id hedef16 yeniden_deneme teslim_durumu kesif_durumu')):
+    """0x8B Transmit Status - gönderilen frame'in teslim sonucu"""
+    __slots__ = ()
+    TIP = CERCEVE_TX_DURUMU
+
+
+class ATYanitCercevesi(namedtuple('ATYanitCercevesi', 'cerceve_id komut durum veri')):
+    """0x88 AT Command Response (veri: memoryview)"""
+    __slots__ = ()
+    TIP = CERCEVE_AT_YANITI
+
+
+class BilinmeyenCerceve(namedtuple('BilinmeyenCerceve', 'tip veri')):
+    """Bu modülün ayrıştırmadığı frame tipleri (veri: memoryview)"""
+    __slots__ = ()
+
+    @property
+    def TIP(self):
+        return self.tip
+
+
+def checksum_hesapla(frame_data) -> int:
+    """API frame checksum'ı (Frame Data byte'ları üzerinden)"""
+    return 0xFF - (sum(frame_data) & 0xFF)
+
+
+def tx_istegi_olustur(veri, cerceve_id=1, hedef64=HEDEF64_KOORDINATOR,
+                      hedef16=HEDEF16_BILINMIYOR, yayin_yaricapi=0, secenekler=0) -> bytes:
+    """
+    0x10 Transmit Request frame'i oluşturur (0x7E ... checksum).
+    cerceve_id=0 ise XBee 0x8B TX Status göndermez.
+    """
+    frame = bytearray(API_BASLIK_BOYUTU + TX_ISTEGI_BASLIK_BOYUTU + len(veri) + 1)
+    uzunluk = TX_ISTEGI_BASLIK_BOYUTU + len(veri)
+    frame[0] = API_BASLANGIC
+    frame[1] = uzunluk >> 8
+    frame[2] = uzunluk & 0xFF
+    frame[3] = CERCEVE_TX_ISTEGI
+    frame[4] = cerceve_id
+    frame[5:13] = hedef64.to_bytes(8, 'big')
+    frame[13] = hedef16 >> 8
+    frame[14] = hedef16 & 0xFF
+    frame[15] = yayin_yaricapi
+    frame[16] = secenekler
+    frame[17:-1] = veri
+    frame[-1] = checksum_hesapla(memoryview(frame)[API_BASLIK_BOYUTU:-1])
+    return bytes(frame)
+
+
+def api_cercevesi_olustur(frame_data) -> bytes:
+    """Frame Data'yı (tip byte'ı dahil) 0x7E + uzunluk + checksum ile sarar"""
+    uzunluk = len(frame_data)
+    return (bytes((API_BASLANGIC, uzunluk >> 8, uzunluk & 0xFF)) + bytes(frame_data)
+            + bytes((checksum_hesapla(frame_data),)))
+
+
+def rx_cercevesi_olustur(veri, kaynak64=HEDEF64_KOORDINATOR, kaynak16=HEDEF16_BILINMIYOR,
+                         secenekler=0x01) -> bytes:
+    """0x90 RX Indicator frame'i oluşturur (emülatör/test için; XBee'nin ürettiği frame)"""
+    return api_cercevesi_olustur(
+        bytes((CERCEVE_RX,)) + kaynak64.to_bytes(8, 'big')
+        + bytes((kaynak16 >> 8, kaynak16 & 0xFF, secenekler)) + bytes(veri)
+    )
+
+
+def tx_durumu_olustur(cerceve_id, teslim_durumu=TESLIM_BASARILI, hedef16=HEDEF16_BILINMIYOR,
+                      yeniden_deneme=0, kesif_durumu=0) -> bytes:
+    """0x8B Transmit Status frame'i oluşturur (emülatör/test için)"""
+    return api_cercevesi_olustur(bytes((
+        CERCEVE_TX_DURUMU, cerceve_id, hedef16 >> 8, hedef16 & 0xFF,
+        yeniden_deneme, teslim_durumu, kesif_durumu
+    )))
+
+
+def cerceve_ayristir(frame_data):
+    """
+    Checksum'ı doğrulanmış Frame Data'yı (tip byte'ı dahil, checksum hariç)
+    tipli frame nesnesine çevirir. Kısa/bozuk frame'lerde None döner.
+    """
+    if len(frame_data) < 1:
+        return None
+
+    tip = frame_data[0]
+
+    if tip == CERCEVE_RX:
+        # 64-bit kaynak (8) + 16-bit kaynak (2) + options (1) = 11 byte adresleme
+        if len(frame_data) < 12:
+            return None
+        return RxCercevesi(
+            int.from_bytes(frame_data[1:9], 'big'),
+            (frame_data[9] << 8) | frame_data[10],
+            frame_data[11],
+            frame_data[12:]
+        )
+
+    if tip == CERCEVE_TX_DURUMU:
+        if len(frame_data) < 7:
+            return None
+        return TxDurumCercevesi(
+            frame_data[1],
+            (frame_data[2] << 8) | frame_data[3],
+            frame_data[4],
+            frame_data[5],
+            frame_data[6]
+        )
+
+    if tip == CERCEVE_AT_YANITI:
+        if len(frame_data) < 5:
+            return None
+        return ATYanitCercevesi(
+            frame_data[1],
+            bytes(frame_data[2:4]).decode('ascii', errors='replace'),
+            frame_data[4],
+            frame_data[5:]
+        )
+
+    return BilinmeyenCerceve(tip, frame_data[1:])
+
+
+def tek_cerceve_coz(ham_frame: bytes):
+    """
+    Tek ve tam bir API frame'ini (0x7E ... checksum) çözer.
+    Geçersizse None döner. Akış halindeki veri için XBeeAPICozucu kullanın.
+    """
+    if len(ham_frame) < API_BASLIK_BOYUTU + 2 or ham_frame[0] != API_BASLANGIC:
+        return None
+    uzunluk = (ham_frame[1] << 8) | ham_frame[2]
+    son = API_BASLIK_BOYUTU + uzunluk + 1
+    if len(ham_frame) < son:
+        return None
+    gorunum = memoryview(ham_frame)
+    if sum(gorunum[API_BASLIK_BOYUTU:son]) & 0xFF != 0xFF:
+        return None
+    return cerceve_ayristir(gorunum[API_BASLIK_BOYUTU:son - 1])
+
+
+class XBeeAPICozucu:
+    """
+    Akış halinde (incremental) XBee API frame çözücü.
+
+    Seri porttan gelen her parça besle() ile verilir; çözücü yarım kalan
+    frame'i bir sonraki okumaya kadar saklar. Tampon baştan ayrılır ve
+    büyümez: imleçler ilerler, yazma imleci sona ulaştığında yalnızca
+    tüketilmemiş kuyruk başa taşınır. Böylece her byte sabit iş ile işlenir
+    (eski del buffer[i:j] yaklaşımındaki O(n²) kopyalama yok).
+
+    NOT: Frame'lerdeki memoryview payload'ları bir sonraki besle() çağrısına
+    kadar geçerlidir. Saklanacaksa bytes(...) ile kopyalanmalıdır.
+    """
+
+    def __init__(self, kapasite=8192, maks_cerceve_uzunlugu=MAKS_CERCEVE_UZUNLUGU):
+        self.kapasite = kapasite
+        self.maks_cerceve_uzunlugu = min(maks_cerceve_uzunlugu, kapasite - API_BASLIK_BOYUTU - 1)
+
+        # Sabit boyutlu tampon (memoryview export'u varken boyutu değişmemeli)
+        self._tampon = bytearray(kapasite)
+        self._gorunum = memoryview(self._tampon)
+        self._okuma = 0  # Sonraki işlenecek byte
+        self._yazma = 0  # Sonraki yazılacak konum
+
+        # Frame dışı byte'lar (ör. transparent metin) için frame_disi(memoryview);
+        # frame'lerle aynı sırada, aradaki frame yield edilmeden önce çağrılır
+        self.frame_disi = None
+
+        # İstatistikler
+        self.cerceve_sayisi = 0
+        self.checksum_hatasi = 0
+        self.senkron_kaybi = 0      # 0x7E aranırken atlanan bölüm sayısı
+        self.atlanan_bayt = 0       # Frame dışı (ör. transparent metin) byte sayısı
+        self.tasma_sayisi = 0       # Tampon taşması nedeniyle atılan bölüm sayısı
+
+    @property
+    def bekleyen_bayt(self) -> int:
+        """Tamponda henüz frame'e dönüşmemiş byte sayısı"""
+        return self._yazma - self._okuma
+
+    def sifirla(self):
+        """Tamponu boşalt (istatistikler korunur)"""
+        self._okuma = 0
+        self._yazma = 0
+
+    def besle(self, veri):
+        """
+        Yeni gelen byte'ları tampona ekler ve tamamlanan frame'leri
+        sırayla döndüren bir iterator verir.
+        """
+        self._ekle(veri)
+        return self._cerceveler()
+
+    def _ekle(self, veri):
+        n = len(veri)
+        if n == 0:
+            return
+
+        if n >= self.kapasite:
+            # Tek parça tamponu aşıyor: sadece en yeni kısmı tut
+            self.tasma_sayisi += 1
+            self._tampon[:] = veri[n - self.kapasite:]
+            self._okuma = 0
+            self._yazma = self.kapasite
+            return
+
+        if self._yazma + n > self.kapasite:
+            bekleyen = self._yazma - self._okuma
+            if bekleyen + n > self.kapasite:
+                # Taşma: en eski byte'ları at (DoS koruması)
+                self.tasma_sayisi += 1
+                self._okuma += bekleyen + n - self.kapasite
+                bekleyen = self._yazma - self._okuma
+            # Tüketilmemiş kuyruğu başa taşı (aynı boyutlu atama - export güvenli)
+            self._tampon[0:bekleyen] = self._gorunum[self._okuma:self._yazma]
+            self._okuma = 0
+            self._yazma = bekleyen
+
+        self._tampon[self._yazma:self._yazma + n] = veri
+        self._yazma += n
+
+    def _cerceveler(self):
+        tampon = self._tampon
+        gorunum = self._gorunum
+
+        while self._okuma < self._yazma:
+            bas = tampon.find(API_BASLANGIC_BAYTI, self._okuma, self._yazma)
+            if bas < 0:
+                self._atla(self._okuma, self._yazma)
+                self._okuma = self._yazma
+                return
+            if bas != self._okuma:
+                self._atla(self._okuma, bas)
+                self._okuma = bas
+
+            if self._yazma - bas < API_BASLIK_BOYUTU:
+                return  # Başlık henüz tam değil
+
+            uzunluk = (tampon[bas + 1] << 8) | tampon[bas + 2]
+            if uzunluk == 0 or uzunluk > self.maks_cerceve_uzunlugu:
+                # Yanlış başlangıç: bir sonraki 0x7E'den devam et
+                self.senkron_kaybi += 1
+                self._frame_disi_bildir(bas, bas + 1)
+                self._okuma = bas + 1
+                continue
+
+            son = bas + API_BASLIK_BOYUTU + uzunluk + 1
+            if son > self._yazma:
+                return  # Frame henüz tam değil, daha fazla veri bekle
+
+            if sum(gorunum[bas + API_BASLIK_BOYUTU:son]) & 0xFF != 0xFF:
+                self.checksum_hatasi += 1
+                self.senkron_kaybi += 1
+                self._frame_disi_bildir(bas, bas + 1)
+                self._okuma = bas + 1
+                continue
+
+            self._okuma = son
+            cerceve = cerceve_ayristir(gorunum[bas + API_BASLIK_BOYUTU:son - 1])
+            if cerceve is not None:
+                self.cerceve_sayisi += 1
+                yield cerceve
+
+    def _atla(self, bas, son):
+        self.senkron_kaybi += 1
+        self.atlanan_bayt += son - bas
+        self._frame_disi_bildir(bas, son)
+
+    def _frame_disi_bildir(self, bas, son):
+        if self.frame_disi is not None:
+            self.frame_disi(self._gorunum[bas:son])
+
+    def get_istatistikler(self) -> dict:
+        """Çözücü sayaçları"""
+        return {
+            'cerceve_sayisi': self.cerceve_sayisi,
+            'checksum_hatasi': self.checksum_hatasi,
+            'senkron_kaybi': self.senkron_kaybi,
+            'atlanan_bayt': self.atlanan_bayt,
+            'tasma_sayisi': self.tasma_sayisi,
+            'bekleyen_bayt': self.bekleyen_bayt
+        }
+
+
+class GelenAkisAyristirici:
+    """
+    XBee'den gelen karışık akışı (API frame'leri + transparent mod metin
+    satırları) mesajlara ayırır. Parça API çözücüye verilir; çözücünün
+    frame dışı saydığı byte'lar satır tamponuna gider (frame byte'ları metne
+    karışmaz). besle() tipli frame'leri ve tamamlanan metin satırlarını
+    (str) akıştaki sırasıyla döndürür.
+    """
+
+    def __init__(self, kapasite=8192, maks_metin_tamponu=4096):
+        self.api_cozucu = XBeeAPICozucu(kapasite=kapasite)
+        self.api_cozucu.frame_disi = self._metin_besle
+        self.maks_metin_tamponu = maks_metin_tamponu
+        self._metin_tamponu = ""
+        self._mesajlar = []
+        self.metin_tasma_sayisi = 0
+
+    def besle(self, veri):
+        """Parçayı işler, tamamlanan frame ve satırların listesini döndürür"""
+        mesajlar = self._mesajlar = []
+        for cerceve in self.api_cozucu.besle(veri):
+            # Frame'den önceki metin satırları _metin_besle ile zaten eklendi
+            mesajlar.append(cerceve)
+        return mesajlar
+
+    def _metin_besle(self, parca):
+        """Frame dışı byte'ları satır tamponuna ekler, tamamlanan satırları mesajlara katar"""
+        tampon = self._metin_tamponu + bytes(parca).decode('utf-8', errors='ignore')
+        if len(tampon) > self.maks_metin_tamponu:
+            tampon = tampon[-self.maks_metin_tamponu // 2:]
+            self.metin_tasma_sayisi += 1
+
+        # Satır sonu karakterine göre ayır, son tamamlanmamış satırı sakla
+        satirlar = tampon.split('\n')
+        self._metin_tamponu = satirlar[-1]
+        for satir in satirlar[:-1]:
+            satir = satir.strip()
+            if satir:
+                self._mesajlar.append(satir)
+
+    def metin_tamponunu_temizle(self):
+        self._metin_tamponu = ""
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import time
+
+    ornek_rx_frame = rx_cercevesi_olustur
+
+    cozucu = XBeeAPICozucu()
+
+    # Parçalı gelen frame
+    frame = ornek_rx_frame(b"SAHA:BASINC2:1012.45")
+    sonuc = list(cozucu.besle(frame[:7])) + list(cozucu.besle(frame[7:]))
+    assert len(sonuc) == 1 and bytes(sonuc[0].veri) == b"SAHA:BASINC2:1012.45"
+
+    # Çöp + bozuk checksum + geçerli frame
+    bozuk = bytearray(ornek_rx_frame(b"IOT:1:25.3"))
+    bozuk[-1] ^= 0xFF
+    sonuc = [bytes(c.veri) for c in cozucu.besle(b"metin\n" + bytes(bozuk) + ornek_rx_frame(b"IOT:2:23.1"))]
+    assert sonuc == [b"IOT:2:23.1"], sonuc
+    print(f"İstatistikler: {cozucu.get_istatistikler()}")
+
+    # Karışık akış: metin satırları ve frame'ler akıştaki sırasıyla, frame byte'ları metne karışmadan
+    ayristirici = GelenAkisAyristirici()
+    akis = b'SAHA:BASINC2:1000\n' + ornek_rx_frame(b'IOT:2:20.0') + b'\nKOMUT:X'
+    sonuc = ayristirici.besle(akis[:25]) + ayristirici.besle(akis[25:]) + ayristirici.besle(b'\n')
+    sonuc = [m if isinstance(m, str) else bytes(m.veri) for m in sonuc]
+    assert sonuc == ['SAHA:BASINC2:1000', b'IOT:2:20.0', 'KOMUT:X'], sonuc
+
+    # Verim ölçümü: 57600 baud'da ~5.7 KB/s; burada MB/s mertebesinde olmalı
+    akis = ornek_rx_frame(bytes(range(100))) * 5000
+    parca = 64
+    baslangic = time.perf_counter()
+    adet = 0
+    for i in range(0, len(akis), parca):
+        for _ in cozucu.besle(akis[i:i + parca]):
+            adet += 1
+    sure = time.perf_counter() - baslangic
+    print(f"{adet} frame, {len(akis) / sure / 1e6:.2f} MB/s")
@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""
+XBee Link Modülü (asyncio taşıma katmanı)
+
+Bu modül, birleşik XBee seri portunun tüm G/Ç'sini tek bir asyncio olay
+döngüsünde toplar:
+1. Okuma: loop.add_reader ile seri port fd'si hazır olduğunda uyanılır
+2. Yazma: tek yazıcı görev, parçaları TxZamanlayici'dan öncelik ve hava
+   süresi bütçesine göre çeker (thread'ler arası iç içe geçmiş yarım yazma olmaz)
+3. async send(frame, priority) ve çözülmüş gelen mesajlar için async iterator
+4. Thread-safe adaptörler (send_threadsafe / send_telemetry): telemetri ve
+   kamera thread'leri değişmeden kullanmaya devam eder
+
+Olay döngüsü kendi daemon thread'inde çalışır.
+"""
+
+import asyncio
+import errno
+import logging
+import os
+import threading
+
+from moduller.xbee_api import GelenAkisAyristirici, RxCercevesi
+from moduller.tx_zamanlayici import TxZamanlayici, ONCELIK_TELEMETRI, ONCELIK_VIDEO, TX_YAZMA_DENEMESI
+
+GELEN_KUYRUK_BOYUTU = 256  # Async iterator için bekleyen mesaj sınırı
+OKUMA_PARCA_BOYUTU = 4096
+OKUMA_HATA_SINIRI = 3  # Art arda okuma hatasında link kapatılır (ör. USB adaptör çıkarıldı)
+
+logger = logging.getLogger('XBeeLink')
+
+
+class XBeeLink:
+    """
+    Seri portun sahibi olan asyncio tabanlı XBee bağlantısı.
+
+    Args:
+        seri_port: Açık serial.Serial nesnesi (fileno() desteklemeli)
+        mesaj_callback: Her çözülmüş gelen mesaj için döngü thread'inde
+            çağrılır (RxCercevesi/TxDurumCercevesi/... veya metin satırı)
+        ayristirici: Gelen akış ayrıştırıcısı (varsayılan: GelenAkisAyristirici)
+        zamanlayici: TX zamanlayıcı (varsayılan: yapılandırmadaki baud ile TxZamanlayici)
+        metrikler: İsteğe bağlı XBeeMetrikleri (okunan/yazılan byte sayaçları)
+        yakalama: İsteğe bağlı YakalamaKaydedici (okunan ham parçalar)
+        yazilamadi: Yazma denemeleri tükenen zamanlayıcı öğesi için döngü
+            thread'inde çağrılır (ör. telemetri deposuna almak için)
+    """
+
+    def __init__(self, seri_port, mesaj_callback=None, ayristirici=None, zamanlayici=None,
+                 metrikler=None, yakalama=None, yazilamadi=None):
+        self.seri_port = seri_port
+        self.mesaj_callback = mesaj_callback
+        self.ayristirici = ayristirici or GelenAkisAyristirici()
+        self.zamanlayici = zamanlayici or TxZamanlayici()
+        self.metrikler = metrikler
+        self.yakalama = yakalama
+        self.yazilamadi = yazilamadi
+
+        self.loop = None
+        self._thread = None
+        self._hazir = threading.Event()
+        self._durdur_olayi = None
+        self._fd = None
+
+        self._tx_olayi = None  # asyncio.Event: zamanlayıcıya yeni veri eklendi
+        self._gelen = None     # asyncio.Queue: çözülmüş mesajlar
+        self._tuketici = False  # async for ile okuyan var mı (yoksa ve callback varsa kuyruğa alınmaz)
+        self._bekleyen_gonderimler = set()  # send() future'ları
+
+        # İstatistikler
+        self.yazilan_bayt = 0
+        self.okunan_bayt = 0
+        self.dusurulen_gelen = 0
+        self._okuma_hatasi = 0
+
+    # ------------------------------------------------------------------
+    # Yaşam döngüsü
+    # ------------------------------------------------------------------
+    def baslat(self, zaman_asimi=5.0) -> bool:
+        """Olay döngüsü thread'ini başlat ve hazır olmasını bekle"""
+        self._thread = threading.Thread(target=self._dongu_calistir, daemon=True)
+        self._thread.start()
+        return self._hazir.wait(zaman_asimi)
+
+    def durdur(self, zaman_asimi=3.0):
+        """Olay döngüsünü durdur (bekleyen gönderimler iptal edilir)"""
+        if self.loop and self._durdur_olayi and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._durdur_olayi.set)
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=zaman_asimi)
+
+    @property
+    def calisiyor(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _dongu_calistir(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._ana())
+        except Exception as e:
+            logger.error(f"XBee link olay döngüsü hatası: {e}")
+        finally:
+            self.loop.close()
+
+    async def _ana(self):
+        self._durdur_olayi = asyncio.Event()
+        self._tx_olayi = asyncio.Event()
+        self._gelen = asyncio.Queue(maxsize=GELEN_KUYRUK_BOYUTU)
+        self._fd = self.seri_port.fileno()
+        self.zamanlayici.bildirim = self._tx_bildir
+
+        self.loop.add_reader(self._fd, self._okunabilir)
+        yazici = asyncio.ensure_future(self._yazici())
+        self._hazir.set()
+        try:
+            await self._durdur_olayi.wait()
+        finally:
+            self.zamanlayici.bildirim = None
+            self.loop.remove_reader(self._fd)
+            yazici.cancel()
+            try:
+                await yazici
+            except asyncio.CancelledError:
+                pass
+            # Bekleyen gönderimleri iptal et, iterator'ları sonlandır
+            self.zamanlayici.bosalt()
+            for sonuc in self._bekleyen_gonderimler:
+                if not sonuc.done():
+                    sonuc.cancel()
+            self._bekleyen_gonderimler.clear()
+            self._gelen_ekle(None)
+            # İptal edilen gönderimleri bekleyen görevler döngü kapanmadan sonlansın
+            await asyncio.sleep(0)
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+    def _okunabilir(self):
+        """add_reader geri çağrısı: fd hazır, bekleyen byte'ları oku"""
+        try:
+            veri = os.read(self._fd, OKUMA_PARCA_BOYUTU)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logger.error(f"XBee link okuma hatası: {e}")
+            self._okuma_hatasi += 1
+            if self._okuma_hatasi >= OKUMA_HATA_SINIRI:
+                self._okuma_kapat(f"art arda {self._okuma_hatasi} okuma hatası")
+            return
+        if not veri:
+            # EOF: fd hep okunabilir kalır, okuyucu kaldırılmazsa döngü boşa döner
+            self._okuma_kapat("seri port EOF")
+            return
+        self._okuma_hatasi = 0
+        self.okunan_bayt += len(veri)
+        if self.metrikler is not None:
+            self.metrikler.rx(len(veri))
+        if self.yakalama is not None:
+            self.yakalama.yaz(veri)
+
+        for mesaj in self.ayristirici.besle(veri):
+            # memoryview payload'lar bir sonraki okumada geçersizleşir
+            if isinstance(mesaj, RxCercevesi):
+                mesaj = mesaj._replace(veri=bytes(mesaj.veri))
+            if self.mesaj_callback:
+                try:
+                    self.mesaj_callback(mesaj)
+                except Exception as e:
+                    logger.error(f"XBee link mesaj callback hatası: {e}")
+            if self._tuketici or not self.mesaj_callback:
+                self._gelen_ekle(mesaj)
+
+    def _okuma_kapat(self, neden):
+        """Okunamayan fd: okuyucuyu kaldır, linki kapat (gönderimler iptal, iterator'lar sonlanır)"""
+        logger.error(f"XBee link kapatılıyor: {neden}")
+        self.loop.remove_reader(self._fd)
+        self._durdur_olayi.set()
+
+    def _gelen_ekle(self, mesaj):
+        if self._gelen.full():
+            # Tüketici yoksa en eski mesajı düşür (bellek sınırı)
+            self._gelen.get_nowait()
+            self.dusurulen_gelen += 1
+        self._gelen.put_nowait(mesaj)
+
+    def __aiter__(self):
+        # Bundan sonra gelen mesajlar (callback olsa da) kuyruğa alınır
+        self._tuketici = True
+        return self
+
+    async def __anext__(self):
+        """Çözülmüş gelen mesajlar (link durdurulunca sonlanır)"""
+        mesaj = await self._gelen.get()
+        if mesaj is None:
+            raise StopAsyncIteration
+        return mesaj
+
+    # ------------------------------------------------------------------
+    # Yazma
+    # ------------------------------------------------------------------
+    async def send(self, frame, priority=ONCELIK_TELEMETRI, bolunebilir=False):
+        """
+        Frame'i gönderim kuyruğuna ekler ve tamamen yazılana kadar bekler.
+        Yazılan byte sayısını döndürür. Frame kuyruk taşmasıyla atılırsa veya
+        link kapanırsa CancelledError, yazılamazsa yazma hatası fırlatılır.
+        """
+        veri = bytes(frame)
+        sonuc = self.loop.create_future()
+        self._bekleyen_gonderimler.add(sonuc)
+        sonuc.add_done_callback(self._bekleyen_gonderimler.discard)
+
+        def yazildi(_gecikme):
+            # Yazıcı görevden (döngü thread'i) çağrılır
+            if not sonuc.done():
+                sonuc.set_result(len(veri))
+
+        def sonlandir(hata):
+            if sonuc.done():
+                return
+            if hata is None:
+                sonuc.cancel()
+            else:
+                sonuc.set_exception(hata)
+
+        def dusuruldu(hata):
+            # Taşma başka bir thread'in ekle() çağrısında da olabilir
+            try:
+                self.loop.call_soon_threadsafe(sonlandir, hata)
+            except RuntimeError:
+                pass  # Döngü kapandı; future kapanışta iptal edildi
+
+        self.zamanlayici.ekle(veri, priority, bolunebilir, tamamlandi=yazildi, dusuruldu=dusuruldu)
+        return await sonuc
+
+    def _tx_bildir(self):
+        """Zamanlayıcıya veri eklendi (herhangi bir thread'den): yazıcıyı uyandır"""
+        try:
+            self.loop.call_soon_threadsafe(self._tx_olayi.set)
+        except RuntimeError:
+            pass  # Döngü kapanıyor
+
+    async def _yazici(self):
+        """Tek yazıcı: zamanlayıcının verdiği parçaları sırayla yazar"""
+        hata_sayisi = 0
+        while True:
+            self._tx_olayi.clear()
+            parca, bekleme, biten = self.zamanlayici.al()
+            if parca is None:
+                if bekleme is None:
+                    await self._tx_olayi.wait()
+                else:
+                    await asyncio.sleep(bekleme)
+                continue
+            try:
+                await self._tamamen_yaz(parca)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"XBee link yazma hatası: {e}")
+                hata_sayisi += 1
+                if hata_sayisi < TX_YAZMA_DENEMESI:
+                    # Parça kaybolmasın: aynı parça bir sonraki turda yeniden yazılır
+                    self.zamanlayici.geri_al()
+                else:
+                    hata_sayisi = 0
+                    oge = self.zamanlayici.vazgec(e)
+                    if oge is not None and self.yazilamadi:
+                        self.yazilamadi(oge)
+                await asyncio.sleep(0.1)
+                continue
+            hata_sayisi = 0
+            if biten is not None:
+                self.zamanlayici.tamamlandi(biten)
+
+    async def _tamamen_yaz(self, veri):
+        """Non-blocking fd'ye yazar; tampon doluysa fd yazılabilir olana kadar bekler"""
+        gorunum = memoryview(veri)
+        while gorunum:
+            try:
+                n = os.write(self._fd, gorunum)
+            except BlockingIOError:
+                n = 0
+            except InterruptedError:
+                continue
+            except OSError as e:
+                if e.errno != errno.EAGAIN:
+                    raise
+                n = 0
+
+            if n:
+                self.yazilan_bayt += n
+                if self.metrikler is not None:
+                    self.metrikler.tx(n)
+                gorunum = gorunum[n:]
+            else:
+                await self._yazilabilir_bekle()
+
+    def _yazilabilir_bekle(self):
+        bekleyen = self.loop.create_future()
+
+        def hazir():
+            self.loop.remove_writer(self._fd)
+            if not bekleyen.done():
+                bekleyen.set_result(None)
+
+        self.loop.add_writer(self._fd, hazir)
+        return bekleyen
+
+    # ------------------------------------------------------------------
+    # Thread-safe adaptörler
+    # ------------------------------------------------------------------
+    def send_threadsafe(self, frame, priority=ONCELIK_TELEMETRI, bolunebilir=False) -> bool:
+        """
+        Başka bir thread'den gönderim: frame zamanlayıcıya eklenir, çağıran
+        bloklanmaz. Link çalışmıyorsa False döner.
+        """
+        if (not self.loop or self.loop.is_closed() or not self._hazir.is_set()
+                or self._durdur_olayi.is_set()):
+            return False
+        return self.zamanlayici.ekle(bytes(frame), priority, bolunebilir)
+
+    def send_telemetry(self, telemetry_data, priority=ONCELIK_TELEMETRI) -> bool:
+        """BirlesikXBeeAlici.send_telemetry ile aynı sözleşme (str'ye satır sonu eklenir)"""
+        if isinstance(telemetry_data, str):
+            telemetry_data = (telemetry_data + '\n').encode('utf-8')
+        return self.send_threadsafe(telemetry_data, priority)
+
+    def calistir(self, coro, zaman_asimi=None):
+        """Link döngüsünde bir coroutine çalıştır ve sonucunu bekle (başka thread'den)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(zaman_asimi)
+
+    def get_istatistikler(self) -> dict:
+        return {
+            'yazilan_bayt': self.yazilan_bayt,
+            'okunan_bayt': self.okunan_bayt,
+            'bekleyen_gelen': self._gelen.qsize() if self._gelen else 0,
+            'dusurulen_gelen': self.dusurulen_gelen,
+            'tx': self.zamanlayici.get_istatistikler()
+        }
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import pty
+    import time
+    import tty
+    import serial
+
+    # Sahte XBee: PTY çiftinin master ucu
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    port = serial.Serial(os.ttyname(slave), 57600, timeout=0)
+
+    link = XBeeLink(port, mesaj_callback=lambda m: print(f"📡 Gelen: {m}"))
+    assert link.baslat()
+
+    # Thread'lerden eşzamanlı gönderim
+    def gonderici(etiket, oncelik):
+        for i in range(5):
+            link.send_telemetry(f"{etiket}:{i}", oncelik)
+
+    thread_listesi = [threading.Thread(target=gonderici, args=(e, o))
+                      for e, o in (("TELEMETRI", ONCELIK_TELEMETRI), ("VIDEO", ONCELIK_VIDEO))]
+    for t in thread_listesi:
+        t.start()
+    for t in thread_listesi:
+        t.join()
+
+    async def ilk_iki_mesaj():
+        # Callback varken mesajlar ancak iterator alındıktan sonra kuyruğa girer
+        gelenler = link.__aiter__()
+        os.write(master, b"SAHA:BASINC2:1012.45\n!xT!\n")
+        return [await gelenler.__anext__(), await gelenler.__anext__()]
+
+    print(f"Async iterator: {link.calistir(ilk_iki_mesaj(), zaman_asimi=2)}")
+    time.sleep(0.2)
+    gelen = os.read(master, 4096).decode()
+    assert all(len(satir.split(':')) == 2 for satir in gelen.split()), "Satırlar iç içe geçmemeli"
+    print(f"Karşı uca yazılan:\n{gelen}")
+    print(f"İstatistikler: {link.get_istatistikler()}")
+    link.durdur()
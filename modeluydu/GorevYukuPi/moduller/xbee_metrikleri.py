@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+XBee Link Metrikleri Modülü
+
+BirlesikXBeeAlici'nin link katmanı sayaçları:
+1. Gelen/giden byte ve byte/s
+2. Frame tipine göre sayım (API frame tipleri + metin satırları)
+3. API checksum hatası, yeniden senkronizasyon, tampon taşması
+   (ayrıştırıcının kendi sayaçlarından, snapshot anında okunur)
+4. Reddedilen binary IoT paketleri (nedene göre)
+5. Kaynak başına (SAHA, IoT1, IoT2) varışlar arası süre histogramı
+
+Her sayacın tek bir yazıcı thread'i vardır (okuyucu veya TX yazıcısı),
+bu yüzden kilit kullanılmaz. snapshot() JSON'a yazılabilir bir sözlük
+döndürür ve ana döngünün 30 saniyede bir SD karta yazması için ucuzdur.
+"""
+
+import time
+
+# Varışlar arası süre histogramı kova üst sınırları (s); son kova "üstü"
+VARIS_KOVALARI = (0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+VARIS_KAYNAKLARI = ('saha', 'iot1', 'iot2')
+
+
+class _VarisHistogrami:
+    """Tek kaynağın varışlar arası süre histogramı"""
+
+    __slots__ = ('kovalar', 'adet', 'son', 'en_kisa', 'en_uzun')
+
+    def __init__(self):
+        self.kovalar = [0] * (len(VARIS_KOVALARI) + 1)
+        self.adet = 0
+        self.son = None
+        self.en_kisa = None
+        self.en_uzun = None
+
+    def ekle(self, zaman: float):
+        self.adet += 1
+        if self.son is not None:
+            fark = zaman - self.son
+            i = 0
+            while i < len(VARIS_KOVALARI) and fark > VARIS_KOVALARI[i]:
+                i += 1
+            self.kovalar[i] += 1
+            if self.en_kisa is None or fark < self.en_kisa:
+                self.en_kisa = fark
+            if self.en_uzun is None or fark > self.en_uzun:
+                self.en_uzun = fark
+        self.son = zaman
+
+    def ozet(self, simdi: float) -> dict:
+        etiketler = [f"<={s:g}s" for s in VARIS_KOVALARI] + [f">{VARIS_KOVALARI[-1]:g}s"]
+        return {
+            'adet': self.adet,
+            'son_yas_s': round(simdi - self.son, 3) if self.son is not None else None,
+            'en_kisa_s': round(self.en_kisa, 3) if self.en_kisa is not None else None,
+            'en_uzun_s': round(self.en_uzun, 3) if self.en_uzun is not None else None,
+            'kovalar': dict(zip(etiketler, self.kovalar))
+        }
+
+
+class XBeeMetrikleri:
+    """
+    Link katmanı sayaçları.
+
+    Args:
+        ayristirici: GelenAkisAyristirici (checksum/senkron/taşma sayaçları
+            snapshot anında buradan okunur)
+        saat: Zaman fonksiyonu (varsayılan time.monotonic)
+    """
+
+    def __init__(self, ayristirici=None, saat=time.monotonic):
+        self.ayristirici = ayristirici
+        self.saat = saat
+        self.baslangic = saat()
+
+        self.rx_bayt = 0
+        self.tx_bayt = 0
+        self.cerceveler = {}       # "0x90"/"0x8B"/.../"metin" -> adet
+        self.iot_reddedilen = {}   # neden -> adet
+        self.hatalar = {}          # "decode"/"seri_port"/... -> adet
+        self.varis = {kaynak: _VarisHistogrami() for kaynak in VARIS_KAYNAKLARI}
+
+        # byte/s: önceki snapshot'tan bu yana
+        self._onceki = (self.baslangic, 0, 0)
+
+    # Yazıcı tarafı (okuyucu / TX thread'i)
+    def rx(self, n: int):
+        self.rx_bayt += n
+
+    def tx(self, n: int):
+        self.tx_bayt += n
+
+    def cerceve(self, tip: str):
+        self.cerceveler[tip] = self.cerceveler.get(tip, 0) + 1
+
+    def iot_reddedildi(self, neden: str):
+        self.iot_reddedilen[neden] = self.iot_reddedilen.get(neden, 0) + 1
+
+    def hata(self, tur: str):
+        self.hatalar[tur] = self.hatalar.get(tur, 0) + 1
+
+    def varis_kaydet(self, kaynak: str):
+        histogram = self.varis.get(kaynak)
+        if histogram is not None:
+            histogram.ekle(self.saat())
+
+    # Okuyucu tarafı
+    def snapshot(self) -> dict:
+        """Tüm sayaçların JSON'a yazılabilir kopyası"""
+        simdi = self.saat()
+        rx_bayt, tx_bayt = self.rx_bayt, self.tx_bayt
+        onceki_zaman, onceki_rx, onceki_tx = self._onceki
+        aralik = simdi - onceki_zaman
+        self._onceki = (simdi, rx_bayt, tx_bayt)
+
+        goruntu = {
+            'zaman': time.time(),
+            'calisma_suresi_s': round(simdi - self.baslangic, 1),
+            'rx_bayt': rx_bayt,
+            'tx_bayt': tx_bayt,
+            'rx_bayt_s': round((rx_bayt - onceki_rx) / aralik, 1) if aralik > 0 else 0.0,
+            'tx_bayt_s': round((tx_bayt - onceki_tx) / aralik, 1) if aralik > 0 else 0.0,
+            'cerceveler': dict(self.cerceveler),
+            'iot_reddedilen': dict(self.iot_reddedilen),
+            'hatalar': dict(self.hatalar),
+            'varis': {kaynak: h.ozet(simdi) for kaynak, h in self.varis.items()}
+        }
+
+        if self.ayristirici is not None:
+            api = self.ayristirici.api_cozucu
+            goruntu.update({
+                'checksum_hatasi': api.checksum_hatasi,
+                'senkron_kaybi': api.senkron_kaybi,
+                'atlanan_bayt': api.atlanan_bayt,
+                'tasma_api': api.tasma_sayisi,
+                'tasma_metin': self.ayristirici.metin_tasma_sayisi
+            })
+        return goruntu
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import json
+    from moduller.xbee_api import GelenAkisAyristirici
+
+    ayristirici = GelenAkisAyristirici()
+    zaman = [0.0]
+    metrikler = XBeeMetrikleri(ayristirici, saat=lambda: zaman[0])
+
+    # 60 s: SAHA 1 Hz, IoT1 2 Hz, IoT2 arada bir 12 s kesinti ile 1 Hz
+    for adim in range(120):
+        zaman[0] = adim * 0.5
+        satir = b""
+        if adim % 2 == 0:
+            satir += b"SAHA:BASINC2:1012.45\n"
+            metrikler.varis_kaydet('saha')
+            if not 40 <= adim < 64:
+                satir += b"IOT:2:24.0\n"
+                metrikler.varis_kaydet('iot2')
+        satir += b"IOT:1:25.3\n"
+        metrikler.varis_kaydet('iot1')
+        metrikler.rx(len(satir))
+        for mesaj in ayristirici.besle(satir):
+            metrikler.cerceve('metin' if isinstance(mesaj, str) else f"0x{mesaj.TIP:02X}")
+        metrikler.tx(100)
+
+    # Bozuk checksum'lı API frame + hatalı IoT paketi
+    ayristirici.besle(b"\x7e\x00\x02\x90\x01\x00")
+    metrikler.iot_reddedildi('checksum')
+
+    print(json.dumps(metrikler.snapshot(), ensure_ascii=False, indent=2))
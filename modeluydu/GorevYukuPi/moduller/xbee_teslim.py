@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+XBee Teslim Takip Modülü (API modu gönderim yolu)
+
+Bu modül, API modunda (AP=1) giden verinin teslimini takip eder:
+1. TxZamanlayici'nın verdiği her parça yazılmadan hemen önce 0x10 Transmit
+   Request frame'ine çevrilir ve 1..255 arası dönen bir frame ID alır
+2. Gelen 0x8B TX Status frame'leri ID üzerinden bekleyen gönderimle eşlenir
+3. Parçalarından biri teslim edilemeyen mesaj, sınırlı sayıda baştan
+   yeniden gönderilir (yer istasyonu bozuk satırı atar, tam satırı ayrıştırır)
+4. Hedef adres başına teslim oranı ve son sonuçlardan video yavaşlatma katsayısı
+
+Video mesajları yeniden gönderilmez (bayat kare göndermenin anlamı yok);
+bunun yerine teslim hatası arttıkça video_katsayisi() düşer. Yeniden
+denemeleri tükenen diğer mesajlar vazgecildi(veri, oncelik) ile bildirilir
+(ör. telemetri deposuna alınır).
+"""
+
+import threading
+import time
+from collections import deque, OrderedDict
+
+from moduller.yapilandirma import XBEE_HEDEF_ADRES64, XBEE_TX_MAKS_DENEME, XBEE_TX_DURUM_ZAMAN_ASIMI
+from moduller.xbee_api import tx_istegi_olustur, TX_ISTEGI_EK_YUKU, TESLIM_BASARILI
+from moduller.tx_zamanlayici import ONCELIK_TELEMETRI, ONCELIK_VIDEO
+
+MAKS_CERCEVE_ID = 255
+SON_SONUC_PENCERESI = 50      # Video katsayısı için son frame sonucu sayısı
+VIDEO_MIN_KATSAYI = 0.25      # Teslim hatası ne kadar yüksek olursa olsun video bu oranın altına inmez
+VIDEO_KATSAYI_MIN_ORNEK = 10  # Bu kadar sonuç birikmeden video yavaşlatılmaz
+
+
+class _Gonderim:
+    """Tek bir mesajın (tüm parçalarıyla) teslim durumu"""
+    __slots__ = ('veri', 'oncelik', 'bolunebilir', 'hedef64', 'deneme',
+                 'cercevelenen', 'bekleyen', 'basarisiz', 'birakildi')
+
+    def __init__(self, veri, oncelik, bolunebilir, hedef64):
+        self.veri = veri
+        self.oncelik = oncelik
+        self.bolunebilir = bolunebilir
+        self.hedef64 = hedef64
+        self.deneme = 0
+        self.cercevelenen = 0  # 0x10 frame'ine çevrilmiş payload byte'ı
+        self.bekleyen = 0      # 0x8B beklenen frame sayısı
+        self.basarisiz = False
+        self.birakildi = False  # Yazılamadı, başka yoldan (depo) gönderilecek
+
+
+class TeslimTakipcisi:
+    """
+    0x10 gönderim / 0x8B durum eşleştirici (thread-safe).
+
+    Args:
+        zamanlayici: Giden veriyi yazan TxZamanlayici (cerceveleyici olarak bağlanır)
+        hedef64: Varsayılan 64-bit hedef adres
+        maks_deneme: Teslim edilemeyen mesaj için yeniden gönderim sınırı
+        zaman_asimi: 0x8B gelmezse frame'in teslim edilemedi sayılacağı süre (s)
+    """
+
+    def __init__(self, zamanlayici, hedef64=XBEE_HEDEF_ADRES64, maks_deneme=XBEE_TX_MAKS_DENEME,
+                 zaman_asimi=XBEE_TX_DURUM_ZAMAN_ASIMI, saat=time.monotonic):
+        self.zamanlayici = zamanlayici
+        self.hedef64 = hedef64
+        self.maks_deneme = maks_deneme
+        self.zaman_asimi = zaman_asimi
+        self.saat = saat
+
+        self._kilit = threading.Lock()
+        self._son_id = 0
+        self._bekleyen = OrderedDict()  # cerceve_id -> (gonderim, hedef64, zaman), eskiden yeniye
+
+        # İstatistikler
+        self._hedef_sonuclari = {}  # hedef64 -> [basarili, basarisiz]
+        self._son_sonuclar = deque(maxlen=SON_SONUC_PENCERESI)
+        self._durum_gecikmeleri = deque(maxlen=SON_SONUC_PENCERESI)  # 0x10 yazımı -> 0x8B (s)
+        self.durum_kodlari = {}     # teslim_durumu -> adet
+        self.yeniden_gonderilen = 0
+        self.vazgecilen = 0
+        self.zaman_asimi_sayisi = 0
+
+        # Yeniden denemeleri tükenen (video dışı) mesajlar: vazgecildi(veri, oncelik)
+        self.vazgecildi = None
+        self._vazgecilenler = []
+        self._ertelenen_yeniden = []  # _yeni_id'nin zorla sonuçlandırdığı, yeniden gönderilecek mesajlar
+
+        zamanlayici.cerceveleyici = self._cercevele
+        zamanlayici.parca_ek_yuku = TX_ISTEGI_EK_YUKU
+
+    def gonder(self, veri, oncelik=ONCELIK_TELEMETRI, bolunebilir=False, hedef64=None) -> bool:
+        """Mesajı teslim takibiyle zamanlayıcıya ekler (çağıran bloklanmaz)"""
+        gonderim = _Gonderim(bytes(veri), oncelik, bolunebilir,
+                             self.hedef64 if hedef64 is None else hedef64)
+        return self.zamanlayici.ekle(gonderim.veri, oncelik, bolunebilir, etiket=gonderim)
+
+    def _cercevele(self, parca, gonderim):
+        """Zamanlayıcı cerceveleyici'si: parçayı 0x10 frame'ine çevir, ID'yi kaydet"""
+        if gonderim is None:
+            # Takipsiz gönderim (ör. XBeeLink.send): ID 0 ile 0x8B istenmez
+            return tx_istegi_olustur(parca, 0, self.hedef64)
+
+        with self._kilit:
+            cerceve_id = self._yeni_id()
+            self._bekleyen[cerceve_id] = (gonderim, gonderim.hedef64, self.saat())
+            gonderim.cercevelenen += len(parca)
+            gonderim.bekleyen += 1
+        return tx_istegi_olustur(parca, cerceve_id, gonderim.hedef64)
+
+    def _yeni_id(self) -> int:
+        """Dönen frame ID (1..255); bekleyen ID'ler atlanır (kilit altında çağrılır)"""
+        for _ in range(MAKS_CERCEVE_ID):
+            self._son_id = self._son_id % MAKS_CERCEVE_ID + 1
+            if self._son_id not in self._bekleyen:
+                return self._son_id
+        # 255 frame birden beklemede: en eskisini zaman aşımına uğramış say.
+        # Yeniden gönderimi zamanlayıcı kilidi altında eklenemez; bir sonraki
+        # zaman aşımı kontrolünde gönderilir
+        eski_id = next(iter(self._bekleyen))
+        self.zaman_asimi_sayisi += 1
+        self._ertelenen_yeniden += self._sonuc_kaydet(eski_id, None)
+        self._son_id = eski_id
+        return eski_id
+
+    def birak(self, gonderim):
+        """
+        Yazıcının vazgeçtiği (seri porta yazılamayan) mesaj: bekleyen
+        frame'lerinin sonucu istatistiğe işlenir ama yeniden gönderilmez
+        ve vazgecildi ile bildirilmez (çağıran kendisi depolar)
+        """
+        with self._kilit:
+            gonderim.birakildi = True
+
+    def durum_isle(self, cerceve) -> bool:
+        """
+        0x8B TX Status frame'ini bekleyen gönderimle eşler.
+        Bilinmeyen/eski ID ise False döner.
+        """
+        with self._kilit:
+            self.durum_kodlari[cerceve.teslim_durumu] = self.durum_kodlari.get(cerceve.teslim_durumu, 0) + 1
+            eslesti = cerceve.cerceve_id in self._bekleyen
+            yeniden = self._sonuc_kaydet(cerceve.cerceve_id, cerceve.teslim_durumu)
+            yeniden += self._zaman_asimlarini_topla()
+        self._yeniden_gonder(yeniden)
+        return eslesti
+
+    def zaman_asimlarini_kontrol(self):
+        """Süresi içinde 0x8B gelmeyen frame'leri teslim edilemedi say"""
+        with self._kilit:
+            yeniden = self._zaman_asimlarini_topla()
+        self._yeniden_gonder(yeniden)
+
+    def _zaman_asimlarini_topla(self) -> list:
+        sinir = self.saat() - self.zaman_asimi
+        yeniden, self._ertelenen_yeniden = self._ertelenen_yeniden, []
+        while self._bekleyen:
+            cerceve_id, (_, _, zaman) = next(iter(self._bekleyen.items()))
+            if zaman > sinir:
+                break
+            self.zaman_asimi_sayisi += 1
+            yeniden += self._sonuc_kaydet(cerceve_id, None)
+        return yeniden
+
+    def _sonuc_kaydet(self, cerceve_id, teslim_durumu) -> list:
+        """
+        Frame sonucunu işler (kilit altında). teslim_durumu None ise zaman aşımı.
+        Mesajın tüm parçaları sonuçlandıysa ve yeniden gönderilmesi gerekiyorsa
+        [gonderim] döner.
+        """
+        kayit = self._bekleyen.pop(cerceve_id, None)
+        if kayit is None:
+            return []
+        gonderim, hedef64, zaman = kayit
+        if teslim_durumu is not None:
+            self._durum_gecikmeleri.append(self.saat() - zaman)
+
+        basarili = teslim_durumu == TESLIM_BASARILI
+        sonuclar = self._hedef_sonuclari.setdefault(hedef64, [0, 0])
+        sonuclar[0 if basarili else 1] += 1
+        self._son_sonuclar.append(basarili)
+
+        gonderim.bekleyen -= 1
+        if not basarili:
+            gonderim.basarisiz = True
+        if gonderim.birakildi:
+            return []
+
+        # Mesajın tüm parçaları yazılıp sonuçlanmadıysa karar verilemez
+        if gonderim.bekleyen > 0 or gonderim.cercevelenen < len(gonderim.veri):
+            return []
+        if not gonderim.basarisiz:
+            return []
+        if gonderim.oncelik == ONCELIK_VIDEO or gonderim.deneme >= self.maks_deneme:
+            self.vazgecilen += 1
+            if gonderim.oncelik != ONCELIK_VIDEO and self.vazgecildi is not None:
+                self._vazgecilenler.append(gonderim)
+            return []
+
+        gonderim.deneme += 1
+        gonderim.cercevelenen = 0
+        gonderim.basarisiz = False
+        return [gonderim]
+
+    def _yeniden_gonder(self, gonderimler):
+        # Zamanlayıcı kilidi alınacağı için takipçi kilidi dışında çağrılır
+        for gonderim in gonderimler:
+            self.yeniden_gonderilen += 1
+            self.zamanlayici.ekle(gonderim.veri, gonderim.oncelik, gonderim.bolunebilir, etiket=gonderim)
+        if self._vazgecilenler:
+            with self._kilit:
+                vazgecilenler, self._vazgecilenler = self._vazgecilenler, []
+            for gonderim in vazgecilenler:
+                self.vazgecildi(gonderim.veri, gonderim.oncelik)
+
+    def teslim_orani(self, hedef64=None) -> float:
+        """Hedef (varsayılan: tüm hedefler) için başarılı teslim oranı (0..1)"""
+        with self._kilit:
+            if hedef64 is None:
+                basarili = sum(s[0] for s in self._hedef_sonuclari.values())
+                toplam = basarili + sum(s[1] for s in self._hedef_sonuclari.values())
+            else:
+                basarili, basarisiz = self._hedef_sonuclari.get(hedef64, (0, 0))
+                toplam = basarili + basarisiz
+        return basarili / toplam if toplam else 1.0
+
+    def son_teslim_orani(self) -> float:
+        """Son SON_SONUC_PENCERESI frame'in teslim oranı (az örnekte 1.0)"""
+        son = list(self._son_sonuclar)
+        if len(son) < VIDEO_KATSAYI_MIN_ORNEK:
+            return 1.0
+        return son.count(True) / len(son)
+
+    def durum_gecikmesi(self) -> float:
+        """
+        Son 0x8B frame'lerinin ortalama gecikmesi (s). XBee MAC yeniden
+        denemeleri ve modül tamponunda bekleme arttıkça yükselir.
+        """
+        son = list(self._durum_gecikmeleri)
+        return sum(son) / len(son) if son else 0.0
+
+    def video_katsayisi(self) -> float:
+        """
+        Video gönderim hızı çarpanı (VIDEO_MIN_KATSAYI..1.0): son frame'lerin
+        teslim hatası oranı arttıkça düşer.
+        """
+        return max(VIDEO_MIN_KATSAYI, self.son_teslim_orani())
+
+    def get_istatistikler(self) -> dict:
+        self.zaman_asimlarini_kontrol()
+        with self._kilit:
+            hedefler = {
+                f"{hedef:016X}": {
+                    'basarili': s[0],
+                    'basarisiz': s[1],
+                    'oran': s[0] / (s[0] + s[1]) if (s[0] + s[1]) else 1.0
+                }
+                for hedef, s in self._hedef_sonuclari.items()
+            }
+            return {
+                'bekleyen_cerceve': len(self._bekleyen),
+                'hedefler': hedefler,
+                'durum_kodlari': {f"0x{k:02X}": v for k, v in self.durum_kodlari.items()},
+                'yeniden_gonderilen': self.yeniden_gonderilen,
+                'vazgecilen': self.vazgecilen,
+                'zaman_asimi': self.zaman_asimi_sayisi,
+                'durum_gecikmesi_ms': self.durum_gecikmesi() * 1000.0,
+                'video_katsayisi': self.video_katsayisi()
+            }
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import random
+    from moduller.tx_zamanlayici import TxZamanlayici, ONCELIK_ONAY
+    from moduller.xbee_api import tek_cerceve_coz, TxDurumCercevesi
+
+    # Sanal XBee: her 0x10 frame'i %20 olasılıkla teslim edemez (0x01 MAC ACK hatası)
+    random.seed(1)
+    sanal_zaman = [0.0]
+    zamanlayici = TxZamanlayici(saat=lambda: sanal_zaman[0])
+    takipci = TeslimTakipcisi(zamanlayici, saat=lambda: sanal_zaman[0])
+
+    yer_istasyonu = bytearray()
+    for i in range(20):
+        takipci.gonder(f"$TELEMETRI,{i},{'X' * 150}\n".encode(), ONCELIK_TELEMETRI)
+        takipci.gonder(f"KOMUT_OK:{i}\n".encode(), ONCELIK_ONAY)
+        for _ in range(1000):
+            sanal_zaman[0] += 0.001
+            frame, _, biten = zamanlayici.al()
+            if frame is None:
+                continue
+            if biten is not None:
+                zamanlayici.tamamlandi(biten)
+            cozulen = tek_cerceve_coz(frame)
+            cerceve_id = frame[4]
+            teslim = random.random() > 0.2
+            if teslim:
+                yer_istasyonu += bytes(cozulen.veri[13:])  # 0x10 payload'u (adresleme sonrası)
+            takipci.durum_isle(TxDurumCercevesi(cerceve_id, 0xFFFE, 0, 0x00 if teslim else 0x01, 0))
+
+    # Yer istasyonu gibi satır sonu ve '$' ile yeniden senkronize ol
+    metin = yer_istasyonu.decode(errors='replace').replace('$', '\n$')
+    tam_satirlar = [s for s in metin.split('\n')
+                    if s.startswith('$TELEMETRI') and len(s) > 150 and s.count(',') == 2]
+    print(f"Yer istasyonunda tam telemetri satırı: {len(set(s.split(',')[1] for s in tam_satirlar))}/20")
+    print(f"Teslim oranı: {takipci.teslim_orani():.2f}")
+    print(f"İstatistikler: {takipci.get_istatistikler()}")
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+XBee Yakalama (Capture) ve Tekrar Oynatma Modülü
+
+Seri porttan okunan ham byte parçalarını, okuma anının monotonic zaman
+damgasıyla birlikte dosyaya yazar; uçuşta görülen hatalar (tampon taşması,
+karışık metin/API akışı) aynı parça sınırlarıyla yeniden üretilebilir.
+
+Dosya biçimi (.xbk, little-endian):
+    Başlık : b"XBKAYIT" + sürüm (1 byte) + başlangıç zamanı (epoch, <d)
+    Kayıt  : zaman (<d, başlangıçtan itibaren s) + uzunluk (<I) + veri
+
+Dizin (.xbk.idx): kayıt başına ofset (<Q) + zaman (<d). Dizin, belirli bir
+zamana/kayda atlamak ve kayıt sayısını dosyayı taramadan bulmak içindir;
+kaybolursa YakalamaOkuyucu ana dosyayı tarayarak devam eder.
+"""
+
+import os
+import struct
+import time
+
+YAKALAMA_IMZASI = b"XBKAYIT"
+YAKALAMA_SURUMU = 1
+_BASLIK = struct.Struct('<7sBd')
+_KAYIT = struct.Struct('<dI')
+_DIZIN = struct.Struct('<Qd')
+
+FLUSH_ARALIGI = 1.0  # s - çökme durumunda en fazla bu kadar veri kaybolur
+
+
+class YakalamaKaydedici:
+    """
+    Okunan parçaları yakalama dosyasına ekler. Okuyucu thread'inden
+    çağrılır; yazma tamponludur ve FLUSH_ARALIGI'nda bir diske aktarılır.
+    """
+
+    def __init__(self, dosya_yolu: str, saat=time.monotonic):
+        self.dosya_yolu = dosya_yolu
+        self.saat = saat
+        klasor = os.path.dirname(dosya_yolu)
+        if klasor:
+            os.makedirs(klasor, exist_ok=True)
+        self._dosya = open(dosya_yolu, 'wb')
+        self._dizin = open(dosya_yolu + '.idx', 'wb')
+        self._dosya.write(_BASLIK.pack(YAKALAMA_IMZASI, YAKALAMA_SURUMU, time.time()))
+        self._ofset = _BASLIK.size
+        self._baslangic = saat()
+        self._son_flush = self._baslangic
+
+        self.kayit_sayisi = 0
+        self.bayt_sayisi = 0
+
+    def yaz(self, veri, zaman: float = None):
+        """Bir okuma parçasını kaydeder (zaman: monotonic, varsayılan şimdi)"""
+        if self._dosya is None or not veri:
+            return
+        zaman = self.saat() if zaman is None else zaman
+        goreli = zaman - self._baslangic
+        self._dosya.write(_KAYIT.pack(goreli, len(veri)))
+        self._dosya.write(veri)
+        self._dizin.write(_DIZIN.pack(self._ofset, goreli))
+        self._ofset += _KAYIT.size + len(veri)
+        self.kayit_sayisi += 1
+        self.bayt_sayisi += len(veri)
+
+        if zaman - self._son_flush >= FLUSH_ARALIGI:
+            self._dosya.flush()
+            self._dizin.flush()
+            self._son_flush = zaman
+
+    def kapat(self):
+        if self._dosya is not None:
+            self._dosya.close()
+            self._dizin.close()
+            self._dosya = None
+
+
+class YakalamaOkuyucu:
+    """Yakalama dosyasını (zaman, veri) kayıtları olarak okur"""
+
+    def __init__(self, dosya_yolu: str):
+        self.dosya_yolu = dosya_yolu
+        with open(dosya_yolu, 'rb') as f:
+            self._veri = f.read()
+        if len(self._veri) < _BASLIK.size:
+            raise ValueError(f"Yakalama dosyası çok kısa: {dosya_yolu}")
+        imza, surum, self.baslangic_zamani = _BASLIK.unpack_from(self._veri)
+        if imza != YAKALAMA_IMZASI or surum != YAKALAMA_SURUMU:
+            raise ValueError(f"Geçersiz yakalama dosyası: {dosya_yolu}")
+        self._dizin = self._dizin_oku()
+
+    def _dizin_oku(self):
+        """(ofset, zaman) listesi; dizin yoksa/eksikse dosya taranır"""
+        dizin = []
+        try:
+            with open(self.dosya_yolu + '.idx', 'rb') as f:
+                ham = f.read()
+            dizin = [_DIZIN.unpack_from(ham, i) for i in range(0, len(ham) - _DIZIN.size + 1, _DIZIN.size)]
+        except OSError:
+            pass
+
+        # Dizinin son kaydından sonrasını (flush edilmemiş dizin) tara
+        ofset = _BASLIK.size
+        if dizin:
+            son_ofset = dizin[-1][0]
+            _, uzunluk = _KAYIT.unpack_from(self._veri, son_ofset)
+            ofset = son_ofset + _KAYIT.size + uzunluk
+        while ofset + _KAYIT.size <= len(self._veri):
+            zaman, uzunluk = _KAYIT.unpack_from(self._veri, ofset)
+            if ofset + _KAYIT.size + uzunluk > len(self._veri):
+                break  # Yarım kalmış son kayıt (çökme)
+            dizin.append((ofset, zaman))
+            ofset += _KAYIT.size + uzunluk
+        return dizin
+
+    def __len__(self):
+        return len(self._dizin)
+
+    @property
+    def sure(self) -> float:
+        return self._dizin[-1][1] if self._dizin else 0.0
+
+    def kayit(self, sira: int):
+        """sira'ncı kayıt: (zaman, memoryview)"""
+        ofset, zaman = self._dizin[sira]
+        _, uzunluk = _KAYIT.unpack_from(self._veri, ofset)
+        bas = ofset + _KAYIT.size
+        return zaman, memoryview(self._veri)[bas:bas + uzunluk]
+
+    def zamandan_itibaren(self, zaman: float) -> int:
+        """zaman'a eşit/sonraki ilk kaydın sırası (ikili arama)"""
+        alt, ust = 0, len(self._dizin)
+        while alt < ust:
+            orta = (alt + ust) // 2
+            if self._dizin[orta][1] < zaman:
+                alt = orta + 1
+            else:
+                ust = orta
+        return alt
+
+    def __iter__(self):
+        for sira in range(len(self._dizin)):
+            yield self.kayit(sira)
+
+
+def tekrar_oynat(okuyucu: YakalamaOkuyucu, hedef, hizli: bool = True, baslangic: float = None,
+                 hiz_carpani: float = 1.0) -> dict:
+    """
+    Kayıtları hedef(veri: bytes) fonksiyonuna besler.
+
+    Args:
+        hizli: True ise bekleme yok (verim ölçümü / regresyon), False ise
+            kayıttaki zamanlamayla (hiz_carpani ile ölçekli)
+        baslangic: Bu zamandan (s) itibaren oynat (None: baştan)
+    Returns:
+        {'kayit', 'bayt', 'sure_s', 'mb_s'}
+    """
+    ilk = 0 if baslangic is None else okuyucu.zamandan_itibaren(baslangic)
+    kayit = bayt = 0
+    t0 = time.perf_counter()
+    kayit_t0 = None
+    for sira in range(ilk, len(okuyucu)):
+        zaman, veri = okuyucu.kayit(sira)
+        if not hizli:
+            if kayit_t0 is None:
+                kayit_t0 = zaman
+            bekleme = (zaman - kayit_t0) / hiz_carpani - (time.perf_counter() - t0)
+            if bekleme > 0:
+                time.sleep(bekleme)
+        hedef(bytes(veri))
+        kayit += 1
+        bayt += len(veri)
+    sure = time.perf_counter() - t0
+    return {
+        'kayit': kayit,
+        'bayt': bayt,
+        'sure_s': sure,
+        'mb_s': bayt / sure / 1e6 if sure > 0 else 0.0
+    }
+
+
+# Test için örnek kullanım
+if __name__ == '__main__':
+    import random
+    import tempfile
+    from moduller.xbee_api import GelenAkisAyristirici, rx_cercevesi_olustur
+    from moduller.iot_paketi import iot_paketi_olustur
+
+    # Karışık akış: API frame'leri + transparent satırlar + çöp, rastgele parça sınırları
+    random.seed(0)
+    iot = iot_paketi_olustur(1, 7, 24.5, 90)
+    akis = bytearray()
+    for i in range(20000):
+        secim = i % 4
+        if secim == 0:
+            akis += rx_cercevesi_olustur(b"SAHA:BASINC2:95012")
+        elif secim == 1:
+            akis += rx_cercevesi_olustur(iot)
+        elif secim == 2:
+            akis += b"IOT:2:23.1\n"
+        else:
+            akis += bytes(random.getrandbits(8) for _ in range(4))
+
+    dosya = os.path.join(tempfile.mkdtemp(), "ornek.xbk")
+    kaydedici = YakalamaKaydedici(dosya, saat=lambda: 0.0)  # Zamanlar 57600 baud'a göre benzetilir
+    konum, zaman = 0, 0.0
+    while konum < len(akis):
+        n = random.randint(1, 256)
+        kaydedici.yaz(bytes(akis[konum:konum + n]), zaman)
+        konum += n
+        zaman += n * 10 / 57600
+    kaydedici.kapat()
+    print(f"📼 {kaydedici.kayit_sayisi} kayıt, {kaydedici.bayt_sayisi} byte -> {dosya}")
+
+    okuyucu = YakalamaOkuyucu(dosya)
+    assert b"".join(bytes(v) for _, v in okuyucu) == bytes(akis), "Yakalama birebir olmalı"
+
+    # Deterministik: iki hızlı oynatma aynı sonucu vermeli
+    sonuclar = []
+    for _ in range(2):
+        ayristirici = GelenAkisAyristirici()
+        adet = [0]
+
+        def besle(veri):
+            adet[0] += len(ayristirici.besle(veri))
+
+        istatistik = tekrar_oynat(okuyucu, besle)
+        sonuclar.append((adet[0], ayristirici.api_cozucu.get_istatistikler()))
+        print(f"⏩ Hızlı oynatma: {istatistik['kayit']} kayıt, {istatistik['mb_s']:.2f} MB/s, "
+              f"{adet[0]} mesaj")
+    assert sonuclar[0] == sonuclar[1], "Tekrar oynatma deterministik olmalı"
+
+    istatistik = tekrar_oynat(okuyucu, lambda veri: None, hizli=False, baslangic=okuyucu.sure - 0.2)
+    print(f"▶️ Gerçek hızda son 0.2 s: {istatistik['kayit']} kayıt, {istatistik['sure_s']:.2f} s")
@@ -201,6 +201,54 @@ SERIAL_PORT_XBEE = "/dev/serial0"  # Hardware UART (Pin 8/10)
 SERIAL_BAUD_XBEE = 57600  # 🚀 VIDEO İÇİN OPTİMİZE EDİLMİŞ BAUD RATE
 print(f"📡 XBee Port: {SERIAL_PORT_XBEE}")
 
+# XBee okuma modu: "select" = seri port fd'si üzerinde olay tabanlı bekleme
+# (komut gecikmesi birkaç ms), "poll" = eski in_waiting + 100 ms uyku döngüsü
+XBEE_OKUMA_MODU = "select"
+XBEE_OKUMA_ZAMAN_ASIMI = 0.5  # Saniye - running bayrağı kontrolü için üst sınır
+
+# XBee G/Ç modu: "thread" = okuma thread'i + kilitli senkron yazma,
+# "asyncio" = XBeeLink (tek olay döngüsü, öncelikli tek yazıcı)
+XBEE_GIRIS_CIKIS_MODU = "thread"
+
+# TX zamanlayıcı: tek yazmada en fazla byte (XBee RF payload sınırı - ATNP ile
+# doğrulayın) ve hat kapasitesinin kullanılabilecek oranı (token bucket)
+XBEE_TX_PARCA_BOYUTU = 100
+XBEE_HAVA_BUTCESI = 0.9
+
+# XBee API modu gönderimi: True ise görev yükü XBee'si AP=1 olmalı; çıkan veri
+# 0x10 Transmit Request frame'leri ile gönderilir, 0x8B ile teslim takip edilir
+XBEE_API_MODU = False
+XBEE_HEDEF_ADRES64 = 0x0000000000000000  # Yer istasyonu (koordinatör)
+XBEE_TX_MAKS_DENEME = 3          # Teslim edilemeyen mesaj için yeniden deneme sayısı
+XBEE_TX_DURUM_ZAMAN_ASIMI = 2.0  # Saniye - 0x8B gelmezse frame teslim edilemedi sayılır
+
+# Ham seri akış yakalama: klasör verilirse okunan her parça zaman damgasıyla
+# xbee_yakalama_<zaman>.xbk dosyasına yazılır (xbee_tekrar_oynat.py ile oynatılır)
+XBEE_YAKALAMA_KLASORU = None  # ör. "kayitlar"
+
+# Zarflı komutlar (@<id>:<komut>): son çalıştırılan kimlikler bu kadar
+# tutulur, tekrar gelen komut yeniden çalıştırılmadan ACK:<id>:<sonuç> alır
+KOMUT_ONBELLEK_BOYUTU = 64
+KOMUT_ONBELLEK_SURESI = 300.0  # Saniye - yer istasyonu yeniden başlarsa kimlikler tekrar kullanılabilir
+
+# Telemetri deposu (store-and-forward): link kesikken gönderilemeyen veya API
+# modunda teslim edilemeyen telemetri sınırlı bir kuyrukta (dosya destekli)
+# tutulur; link düzelince canlı telemetriden sonra, hız sınırlı boşaltılır
+TELEMETRI_DEPOSU_DOSYASI = os.path.join(BASE_DIR, "telemetri_deposu.bin")  # None: yalnızca bellek
+TELEMETRI_DEPOSU_KAPASITESI = 1800    # Paket (1 Hz'de 30 dakika); dolunca en eskisi atılır
+TELEMETRI_DEPOSU_BOSALTMA_HIZI = 4.0  # Paket/s - canlı telemetriye ek
+TELEMETRI_DEPOSU_KUYRUK_ESIGI = 5     # TX kuyruğunda bu kadar geçmiş paket varsa yenisi verilmez
+TELEMETRI_DEPOSU_MIN_TESLIM = 0.5     # API modunda son teslim oranı bunun altındaysa link kesik sayılır
+
+# Paket geçmişi: son gönderilen telemetri paketleri numarayla tutulur,
+# yer istasyonu #RESEND:<ilk>-<son># ile eksikleri yeniden isteyebilir
+TELEMETRI_HALKA_BOYUTU = 600  # Paket (1 Hz'de 10 dakika)
+
+# Kanal geçmişi: tüm telemetri kanallarının son N örneği (NumPy halkası);
+# pencere istatistikleri durum makinesi, ARAS ve SD özeti için
+KANAL_GECMISI_BOYUTU = 600    # Örnek (1 Hz'de 10 dakika)
+KANAL_OZETI_SURESI = 30       # s - SD'ye yazılan periyodik özet penceresi
+
 # GPS Modülü (Raspberry Pi Hardware UART)
 # GY-GPS6MV2 doğrudan GPIO'ya bağlı
 SERIAL_PORT_GPS = "/dev/ttyS0"  # GPIO seri port  # Hardware UART (GPIO 14/15)
@@ -234,6 +282,13 @@ PIN_POWER_LED = 20          # GPIO 20 - Güç LED'i çıkışı
 # Görev Frekansı
 TELEMETRI_GONDERIM_SIKLIGI = 1.0 # Saniye (1 Hz)
 
+# Telemetri downlink formatı: "ascii" ($...*CS, ~200 byte), "binary"
+# (sürümlü little-endian struct + CRC-16, ~90 byte) veya "delta" (her
+# TELEMETRI_ANAHTAR_KARE_ARALIGI pakette bir binary anahtar kare, arada
+# yalnızca değişen alanların farkları). SD kaydı her zaman ASCII.
+TELEMETRI_DOWNLINK_FORMATI = "ascii"
+TELEMETRI_ANAHTAR_KARE_ARALIGI = 10
+
 # ARAS (Arayüz Alarm Sistemi) Limitleri
 # -------------------------------------------------
 AYRILMA_YUKSEKLIK = 400.0 # metre
@@ -244,6 +299,20 @@ HIZ_LIMIT_MODEL_UYDU_MAX = 14.0 # m/s
 HIZ_LIMIT_GOREV_YUKU_MIN = 6.0  # m/s
 HIZ_LIMIT_GOREV_YUKU_MAX = 8.0
 
+# Uçuş durum makinesi (ucus_durumu.py): eşikler zeminden (kalkış yeri 0 m) yüksekliğe uygulanır
+UCUS_DURUMU_ONAY_ORNEK = 3   # Geçiş koşulu art arda bu kadar örnekte sağlanmalı (histerezis)
+UCUS_KALKIS_HIZI = 3.0       # m/s - bundan hızlı yükselme kalkış sayılır
+UCUS_KALKIS_IRTIFASI = 10.0  # m - kalkış için zeminden en az yükseklik
+UCUS_TEPE_HIZI = 2.0         # m/s - tepe sonrası bundan hızlı alçalma
+UCUS_TEPE_PAYI = 5.0         # m - tepe için en yüksek irtifadan en az düşüş
+UCUS_AYRILMA_FARKI = 10.0    # m - görev yükü - taşıyıcı irtifa farkı bunu aşınca ayrılma gerçekleşmiş
+
+# İrtifa/iniş hızı Kalman filtresi (irtifa_filtresi.py)
+IRTIFA_FILTRESI_OLCUM_STD = 0.5      # m - barometrik irtifa gürültüsü
+IRTIFA_FILTRESI_IVME_STD = 2.0       # m/s² - modellenmeyen dikey ivme (paraşüt, ayrılma)
+IRTIFA_FILTRESI_KAPI = 5.0           # sigma - bundan büyük inovasyonlu ölçüm aykırı sayılır
+IRTIFA_FILTRESI_IVME_KULLAN = False  # IMU dikey ivmesini girdi olarak kullan (montaj yönü doğrulanınca açın)
+
 # Kurtarma Modu
 KURTARMA_SURESI = 10 # Saniye (yere indikten sonra veri gönderimine devam etme süresi)
 BUZZER_IKAZ_SURESI = 3600 # Saniye (1 saat boyunca sesli ikaz)
@@ -330,12 +399,36 @@ VIDEO_XBEE_FPS = 2                  # 🔧 FIX: 2 FPS (1'den yüksek ama hala ha
 VIDEO_XBEE_JPEG_QUALITY = 20       # 🔧 FIX: %20 JPEG kalitesi (daha sıkıştırılmış)
 VIDEO_MAX_FRAME_SIZE_KB = 6         # 🔧 FIX: 6KB limit (daha küçük paketler)
 
+# Canlı yayın parçalama: True ise kareler tek blob (#VIDEO:base64# / DEADBEEF)
+# yerine CRC'li, XBEE_TX_PARCA_BOYUTU'na sığan parçalarla gönderilir
+# (moduller/video_parcalama.py). Yer istasyonu parça birleştiricisi gerektirir.
+VIDEO_PARCALAMA = False
+# Parçalı videoda kare başına parite parçası oranı (Reed-Solomon, ör. 0.2 =
+# 10 veri parçasına 2 parite; herhangi k parça kareyi kurtarır). Video
+# yeniden gönderilmez; oranı sahada ölçülen parça kaybına göre ayarlayın
+# (python3 -m moduller.video_parcalama kayıp/parite tablosu). 0: FEC kapalı
+VIDEO_FEC_PARITE_ORANI = 0.2
+
 # 🛡️ GÜVENLİ XBee Bandwidth Hesabı (250 Kbps limit) - YENİ HESAPLAMA:
 # 📡 Video: ~3KB/frame × 2 FPS = 6 KB/s = 48 Kbps (optimize edilmiş)
 # 📡 Telemetri: ~150 byte/packet × 1 Hz = 1.2 Kbps  
 # 📡 IoT/SAHA traffic: ~5 Kbps (tahmin)
 # TOPLAM: ~54 Kbps < 250 Kbps ✅ (%22 kullanım - hala çok güvenli)
 # REZERV: 196 Kbps (%78 - XBee retry/buffer için güvenli)
+# Bu hesap el ile yapılmıştır; uçuşta gerçek değerler link tahmincisi ile
+# ölçülür (moduller/link_tahmincisi.py) ve SD metrik dosyasına yazılır.
+
+# 📊 Link kapasite tahmincisi: yazılan byte, 0x8B gecikmesi ve RX birikiminden
+# video bütçesi hesaplanır; kameralar FPS/kare boyutunu buna göre ayarlar
+LINK_TAHMIN_ARALIGI = 1.0          # Saniye - tahmin güncelleme aralığı
+LINK_TAHMIN_YUMUSATMA = 0.3        # Hız ölçümleri için EWMA katsayısı
+LINK_GUVENLIK_PAYI = 0.2           # Bütçenin boş bırakılan oranı (yeniden deneme/patlama için)
+LINK_HEDEF_DURUM_GECIKMESI = 0.3   # Saniye - 0x8B gecikmesi bunu aşarsa kapasite orantılı düşürülür
+LINK_RX_BIRIKIM_SINIRI = 1024      # Byte - okunmamış RX birikimi bunu aşarsa video yarıya iner
+LINK_KUYRUK_BOSALTMA_SURESI = 2.0  # Saniye - TX kuyruğundaki birikim bu sürede eritilecek şekilde pay ayrılır
+LINK_VIDEO_MIN_FPS = 1.0           # Bunun altına inmeden önce kare boyutu küçültülür
+LINK_VIDEO_MAKS_FPS = 4.0          # Kamera döngülerinin en yüksek hızı
+LINK_VIDEO_MIN_BOYUT_ORANI = 0.3   # Kare boyutu sınırı en fazla bu orana kadar küçültülür
 
 # 🔧 DÜZELTME: ARAS Hata Kodu Validation (Analiz3'ten)
 def validate_hata_kodu(hata_kodu):
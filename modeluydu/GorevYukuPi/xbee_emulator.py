@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+XBEE LINK EMÜLATÖRÜ - Radyo olmadan uçtan uca BirlesikXBeeAlici testi
+
+Bir pseudo-terminal (PTY) çifti oluşturur. BirlesikXBeeAlici slave ucunu
+gerçek XBee portu gibi açar; emülatör master ucunda:
+- Baud hızında UART (byte başına 10 bit) her iki yönde de hız sınırlar
+- Hava gecikmesi ve paket kaybı uygular
+- API modunda 0x90 RX frame'leri üretir, gelen 0x10 Transmit Request'lere
+  0x8B TX Status ile yanıt verir (kayıpta 0x21)
+- Taşıyıcı (SAHA:BASINC2), IoT1/IoT2 (16 byte binary) ve yer istasyonu
+  komut trafiği üretir
+- Yer istasyonu tarafında telemetri satırlarını XOR checksum ile doğrular,
+  parçalı video karelerini (VIDEO_PARCALAMA) yeniden birleştirir
+
+Kullanım:
+    python3 xbee_emulator.py                      # 57600 ve 115200 baud kıyaslama
+    python3 xbee_emulator.py --baud 57600 --kayip 0.05 --sure 30
+    python3 xbee_emulator.py --transparent        # API yerine transparent mod
+    python3 xbee_emulator.py --kayip 0.01 --parcali-video
+"""
+
+import argparse
+import base64
+import heapq
+import itertools
+import os
+import pty
+import random
+import threading
+import time
+import tty
+
+from moduller.iot_paketi import iot_paketi_olustur
+from moduller.telemetri_kodlayici import xor_checksum
+from moduller.video_parcalama import VideoBirlestirici, VideoParcalayici, PARCA_SENKRON
+from moduller.telemetri_deposu import TelemetriDeposu
+from moduller.xbee_api import (
+    XBeeAPICozucu, rx_cercevesi_olustur, tx_durumu_olustur,
+    CERCEVE_TX_ISTEGI, TX_ISTEGI_BASLIK_BOYUTU, TESLIM_BASARILI
+)
+
+# Gönderen XBee'lerin 64-bit adresleri (yalnızca 0x90 frame'lerinde görünür)
+ADRES_TASIYICI = 0x0013A20041000001
+ADRES_IOT1 = 0x0013A20041000002
+ADRES_IOT2 = 0x0013A20041000003
+ADRES_YER_ISTASYONU = 0x0013A20041000004
+
+TESLIM_AG_ACK_HATASI = 0x21  # 0x8B: Network ACK failure
+ORNEK_KOMUTLAR = ("!6R7G!", "!2B4R!", "!9G1B!")
+
+
+def telemetri_satiri_dogru_mu(satir: str) -> bool:
+    """$<veri>*<XOR checksum> biçimindeki satırı doğrular"""
+    if not satir.startswith("$") or "*" not in satir:
+        return False
+    govde, _, cs = satir[1:].rpartition("*")
+    try:
+        return int(cs, 16) == xor_checksum(govde)
+    except ValueError:
+        return False
+
+
+class XBeeEmulator:
+    """
+    PTY tabanlı XBee link emülatörü.
+
+    Args:
+        baud: UART hızı (her iki yön)
+        kayip_orani: RF paketi kayıp olasılığı (0-1)
+        gecikme_ms: Hava gecikmesi (RF paketi başına)
+        api_modu: True ise AP=1 (0x90/0x10/0x8B), değilse transparent satırlar
+        trafik: True ise SAHA/IoT/komut trafiği üretilir
+        tohum: random tohum (tekrarlanabilir kayıp)
+    """
+
+    def __init__(self, baud=57600, kayip_orani=0.0, gecikme_ms=20.0, api_modu=True,
+                 trafik=True, saha_hz=1.0, iot_hz=1.0, komut_araligi=5.0, tohum=None):
+        self.baud = baud
+        self.bayt_suresi = 10.0 / baud  # start + 8 data + stop
+        self.kayip_orani = kayip_orani
+        self.gecikme = gecikme_ms / 1000.0
+        self.api_modu = api_modu
+        self.trafik = trafik
+        self.saha_hz = saha_hz
+        self.iot_hz = iot_hz
+        self.komut_araligi = komut_araligi
+        self.rastgele = random.Random(tohum)
+
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+
+        self.running = False
+        self._threadler = []
+        self._kosul = threading.Condition()
+        self._kuyruk = []  # heap: (teslim_zamani, sira, bayt)
+        self._sira = itertools.count()
+
+        # Yer istasyonu tarafı (DUT -> emülatör)
+        self._uplink_cozucu = XBeeAPICozucu()
+        self._uplink_satir = bytearray()
+        self.video_birlestirici = VideoBirlestirici()
+
+        # İstatistikler
+        self.downlink_bayt = 0
+        self.uplink_bayt = 0
+        self.uretilen = {'saha': 0, 'iot1': 0, 'iot2': 0, 'komut': 0}
+        self.kaybedilen_downlink = 0
+        self.tx_istegi = 0
+        self.kaybedilen_uplink = 0
+        self.telemetri_saglam = 0
+        self.telemetri_numaralari = set()  # Yer istasyonuna ulaşan paket numaraları
+        self.telemetri_bozuk = 0
+        self.video_kare = 0
+        self.video_bayt = 0
+        self.diger_satir = 0
+
+    # ------------------------------------------------------------------
+    # Downlink: emülatör -> DUT
+    # ------------------------------------------------------------------
+    def gonder_rf(self, veri: bytes, kaynak64=ADRES_YER_ISTASYONU) -> bool:
+        """Uzak bir XBee'den RF paketi gönderir (kayıp + gecikme uygulanır)"""
+        if self.rastgele.random() < self.kayip_orani:
+            self.kaybedilen_downlink += 1
+            return False
+        if self.api_modu:
+            cerceve = rx_cercevesi_olustur(veri, kaynak64)
+        else:
+            cerceve = bytes(veri) + b"\n"
+        self._planla(cerceve, self.gecikme)
+        return True
+
+    def _planla(self, bayt: bytes, gecikme: float):
+        with self._kosul:
+            heapq.heappush(self._kuyruk, (time.monotonic() + gecikme, next(self._sira), bayt))
+            self._kosul.notify()
+
+    def _downlink_dongusu(self):
+        """Planlanan byte'ları zamanı gelince baud hızında PTY'ye yazar"""
+        hat_bos = time.monotonic()
+        while self.running:
+            with self._kosul:
+                while self.running and not self._kuyruk:
+                    self._kosul.wait(0.5)
+                if not self.running:
+                    return
+                zaman, _, bayt = self._kuyruk[0]
+                bekleme = zaman - time.monotonic()
+                if bekleme > 0:
+                    self._kosul.wait(bekleme)
+                    continue
+                heapq.heappop(self._kuyruk)
+
+            # UART: byte'lar hattı bayt_suresi aralıkla terk eder
+            hat_bos = max(hat_bos, time.monotonic())
+            for i in range(0, len(bayt), 64):
+                parca = bayt[i:i + 64]
+                try:
+                    os.write(self.master, parca)
+                except OSError:
+                    return
+                self.downlink_bayt += len(parca)
+                hat_bos += len(parca) * self.bayt_suresi
+                kalan = hat_bos - time.monotonic()
+                if kalan > 0:
+                    time.sleep(kalan)
+
+    # ------------------------------------------------------------------
+    # Uplink: DUT -> emülatör (yer istasyonu)
+    # ------------------------------------------------------------------
+    def _uplink_dongusu(self):
+        """PTY'den baud hızında okur; okunmayan byte'lar DUT'un write()'ını bekletir"""
+        parca_boyutu = max(1, int(0.01 / self.bayt_suresi))  # ~10 ms'lik veri
+        hat_bos = time.monotonic()
+        while self.running:
+            try:
+                veri = os.read(self.master, parca_boyutu)
+            except OSError:
+                return
+            if not veri:
+                continue
+            self.uplink_bayt += len(veri)
+            if self.api_modu:
+                for cerceve in self._uplink_cozucu.besle(veri):
+                    self._tx_istegi_isle(cerceve)
+            else:
+                # Transparent modda XBee satırları paketlere böler; kayıp satır başına
+                self._yer_istasyonu_besle(veri, satir_kaybi=True)
+
+            hat_bos = max(hat_bos, time.monotonic()) + len(veri) * self.bayt_suresi
+            kalan = hat_bos - time.monotonic()
+            if kalan > 0:
+                time.sleep(kalan)
+
+    def _tx_istegi_isle(self, cerceve):
+        if getattr(cerceve, 'TIP', None) != CERCEVE_TX_ISTEGI:
+            return
+        self.tx_istegi += 1
+        veri = bytes(cerceve.veri)
+        cerceve_id = veri[0]
+        payload = veri[TX_ISTEGI_BASLIK_BOYUTU - 1:]
+
+        if self.rastgele.random() < self.kayip_orani:
+            self.kaybedilen_uplink += 1
+            durum = TESLIM_AG_ACK_HATASI
+        elif payload[:2] == PARCA_SENKRON:
+            # Video parçası: her 0x10 payload'u tek parça
+            durum = TESLIM_BASARILI
+            self._video_parcasi_say(self.video_birlestirici.parca_isle(payload))
+        else:
+            durum = TESLIM_BASARILI
+            self._yer_istasyonu_besle(payload)
+
+        if cerceve_id:
+            # MAC ACK'leri beklenene kadar hava gecikmesi kadar sonra
+            self._planla(tx_durumu_olustur(cerceve_id, durum), self.gecikme)
+
+    def _video_parcasi_say(self, kareler):
+        for _, kare in kareler or ():
+            self.video_kare += 1
+            self.video_bayt += len(kare)
+
+    def _yer_istasyonu_besle(self, veri: bytes, satir_kaybi=False):
+        if not self.api_modu:
+            # Transparent modda parçalar satır akışının içinde; senkron + CRC ile ayıklanır
+            self._video_parcasi_say(self.video_birlestirici.besle(veri))
+        self._uplink_satir += veri
+        while True:
+            konum = self._uplink_satir.find(b"\n")
+            if konum < 0:
+                break
+            satir = bytes(self._uplink_satir[:konum]).decode('utf-8', errors='replace').strip()
+            del self._uplink_satir[:konum + 1]
+            if satir_kaybi and self.rastgele.random() < self.kayip_orani:
+                self.kaybedilen_uplink += 1
+                continue
+            self._satir_say(satir)
+        if len(self._uplink_satir) > 65536:
+            del self._uplink_satir[:-4096]
+
+    def _satir_say(self, satir: str):
+        if not satir.startswith("$") and telemetri_satiri_dogru_mu(satir[satir.rfind("$"):]):
+            # Önünde video parçası artığı var: son '$'tan yeniden senkronize ol
+            self._telemetri_say(satir[satir.rfind("$"):])
+        elif satir.startswith("$"):
+            if telemetri_satiri_dogru_mu(satir):
+                self._telemetri_say(satir)
+            else:
+                self.telemetri_bozuk += 1
+        elif satir.startswith("#VIDEO:") and satir.endswith("#"):
+            self.video_kare += 1
+            self.video_bayt += len(satir)
+        elif satir:
+            self.diger_satir += 1
+
+    def _telemetri_say(self, satir: str):
+        self.telemetri_saglam += 1
+        self.telemetri_numaralari.add(satir[1:].split(",", 1)[0])
+
+    # ------------------------------------------------------------------
+    # Trafik üreteci: taşıyıcı, IoT istasyonları, yer istasyonu
+    # ------------------------------------------------------------------
+    def _trafik_dongusu(self):
+        baslangic = time.monotonic()
+        sonraki = {'saha': baslangic, 'iot1': baslangic + 0.3, 'iot2': baslangic + 0.6,
+                   'komut': baslangic + self.komut_araligi}
+        araliklar = {'saha': 1.0 / self.saha_hz, 'iot1': 1.0 / self.iot_hz,
+                     'iot2': 1.0 / self.iot_hz, 'komut': self.komut_araligi}
+        paket_no = {1: 0, 2: 0}
+
+        while self.running:
+            simdi = time.monotonic()
+            kaynak = min(sonraki, key=sonraki.get)
+            if sonraki[kaynak] > simdi:
+                time.sleep(min(sonraki[kaynak] - simdi, 0.1))
+                continue
+            sonraki[kaynak] += araliklar[kaynak]
+            self.uretilen[kaynak] += 1
+
+            if kaynak == 'saha':
+                # Taşıyıcı: Pascal, ondalıksız (TasiyiciKontrol.ino)
+                basinc = 95000 + self.rastgele.uniform(-50, 50)
+                self.gonder_rf(f"SAHA:BASINC2:{basinc:.0f}".encode(), ADRES_TASIYICI)
+            elif kaynak in ('iot1', 'iot2'):
+                istasyon_id = 1 if kaynak == 'iot1' else 2
+                paket_no[istasyon_id] += 1
+                sicaklik = 24.0 + self.rastgele.uniform(-2.0, 2.0)
+                adres = ADRES_IOT1 if istasyon_id == 1 else ADRES_IOT2
+                if self.api_modu:
+                    self.gonder_rf(iot_paketi_olustur(istasyon_id, paket_no[istasyon_id], sicaklik,
+                                                      zaman_damgasi=int(time.monotonic() * 1000)), adres)
+                else:
+                    # Binary paket transparent satır akışında taşınamaz
+                    self.gonder_rf(f"IOT:{istasyon_id}:{sicaklik:.1f}".encode(), adres)
+            else:
+                self.gonder_rf(self.rastgele.choice(ORNEK_KOMUTLAR).encode(), ADRES_YER_ISTASYONU)
+
+    # ------------------------------------------------------------------
+    def baslat(self):
+        self.running = True
+        hedefler = [self._downlink_dongusu, self._uplink_dongusu]
+        if self.trafik:
+            hedefler.append(self._trafik_dongusu)
+        for hedef in hedefler:
+            t = threading.Thread(target=hedef, daemon=True)
+            t.start()
+            self._threadler.append(t)
+        return self.port
+
+    def durdur(self):
+        self.running = False
+        with self._kosul:
+            self._kosul.notify_all()
+        for t in self._threadler:
+            t.join(timeout=2.0)
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def get_istatistikler(self) -> dict:
+        return {
+            'downlink_bayt': self.downlink_bayt,
+            'uplink_bayt': self.uplink_bayt,
+            'uretilen': dict(self.uretilen),
+            'kaybedilen_downlink': self.kaybedilen_downlink,
+            'tx_istegi': self.tx_istegi,
+            'kaybedilen_uplink': self.kaybedilen_uplink,
+            'telemetri_saglam': self.telemetri_saglam,
+            'telemetri_benzersiz': len(self.telemetri_numaralari),
+            'telemetri_bozuk': self.telemetri_bozuk,
+            'video_kare': self.video_kare,
+            'video_bayt': self.video_bayt,
+            'video_parcalama': self.video_birlestirici.get_istatistikler(),
+            'diger_satir': self.diger_satir
+        }
+
+
+def kiyasla(baud, sure=20.0, kayip_orani=0.0, gecikme_ms=20.0, api_modu=True,
+            video_boyutu=1500, video_hz=4.0, tohum=1, yakalama_klasoru=None, parcali_video=False,
+            fec_orani=None, uyarlamali_video=False, kesinti=None):
+    """
+    BirlesikXBeeAlici'yi emülatöre bağlayıp 1 Hz telemetri + video yükü ile
+    uçtan uca çalıştırır, sonuçları sözlük olarak döndürür. yakalama_klasoru
+    verilirse alıcının okuduğu ham akış kaydedilir (xbee_tekrar_oynat.py).
+    parcali_video=True ise video #VIDEO: satırı yerine send_video ile gider;
+    fec_orani verilirse VIDEO_FEC_PARITE_ORANI yerine kullanılır.
+    uyarlamali_video=True ise video, kamera döngüleri gibi link tahmincisine
+    abone olur: kare hızı ve boyutu tahmine göre ayarlanır.
+    kesinti=(başlangıç_s, süre_s) verilirse bu aralıkta RF linki tamamen
+    kesilir (telemetri deposu ve boşaltması sınanır).
+    """
+    from moduller.birlesik_xbee_alici import BirlesikXBeeAlici
+    from moduller.telemetri_kodlayici import ascii_kodla, xbee_satiri, TAKIM_NUMARASI
+
+    emulator = XBeeEmulator(baud=baud, kayip_orani=kayip_orani, gecikme_ms=gecikme_ms,
+                            api_modu=api_modu, tohum=tohum)
+    port = emulator.baslat()
+
+    komutlar = []
+    alici = BirlesikXBeeAlici(command_callback=komutlar.append, debug=False, simulate=False,
+                              port=port, baud=baud, api_modu=api_modu)
+    if yakalama_klasoru:
+        alici.yakalama_baslat(yakalama_klasoru)
+    if fec_orani is not None:
+        alici.video_parcalayici = VideoParcalayici(alici.tx_zamanlayici.parca_boyutu, fec_orani)
+    # Kıyaslama gerçek depo dosyasına dokunmasın
+    alici.telemetri_deposu = TelemetriDeposu(None, alici.telemetri_deposu.kapasite, alici.telemetri_deposu.hiz)
+    if not alici.connect_xbee() or not alici.start_listening():
+        emulator.durdur()
+        raise RuntimeError(f"BirlesikXBeeAlici emülatöre bağlanamadı: {port}")
+
+    degerler = {
+        'paket_numarasi': 0, 'uydu_statusu': 1, 'hata_kodu': '000000',
+        'gonderme_saati': '17/10/2026 12:00:00', 'basinc1': 96512, 'basinc2': 95000,
+        'yukseklik1': 402.391, 'yukseklik2': 455.102, 'irtifa_farki': -52.711,
+        'inis_hizi': 7.12, 'sicaklik': 24.2, 'pil_gerilimi': 7.38,
+        'gps1_latitude': 39.925533, 'gps1_longitude': 32.866287, 'gps1_altitude': 1012.45,
+        'pitch': 10.1, 'roll': -5.3, 'yaw': 180.7,
+        'ivme_x': 0.12, 'ivme_y': -0.08, 'ivme_z': 9.81,
+        'gyro_x': 1.25, 'gyro_y': -350.5, 'gyro_z': 0.0,
+        'mag_x': 231, 'mag_y': -118, 'mag_z': 402,
+        'rhrh': '00', 'iot_s1': 25.2, 'iot_s2': 24.8, 'takim_no': TAKIM_NUMARASI
+    }
+    kamera = {'hz': video_hz, 'oran': 1.0}
+    if uyarlamali_video:
+        def kamera_ayarla(tahmin):
+            kamera['hz'] = tahmin['video_fps']
+            kamera['oran'] = tahmin['video_boyut_orani']
+        alici.link_tahmincisi.abone_ol(kamera_ayarla)
+
+    baslangic = time.monotonic()
+    sonraki_telemetri = sonraki_video = baslangic
+    gonderilen_telemetri = 0
+    while time.monotonic() - baslangic < sure:
+        simdi = time.monotonic()
+        if kesinti:
+            gecen = simdi - baslangic
+            emulator.kayip_orani = 1.0 if kesinti[0] <= gecen < kesinti[0] + kesinti[1] else kayip_orani
+        if simdi >= sonraki_telemetri:
+            gonderilen_telemetri += 1
+            degerler['paket_numarasi'] = gonderilen_telemetri
+            alici.send_telemetry(xbee_satiri(ascii_kodla(degerler)))
+            sonraki_telemetri += 1.0
+        if simdi >= sonraki_video:
+            if kamera['hz'] > 0:  # 0: link tahmini videoya bütçe bırakmıyor
+                kare = os.urandom(int(video_boyutu * kamera['oran']))
+                if parcali_video:
+                    alici.send_video(kare)
+                else:
+                    alici.send_telemetry("#VIDEO:" + base64.b64encode(kare).decode() + "#")
+            sonraki_video = max(sonraki_video + (1.0 / kamera['hz'] if kamera['hz'] > 0 else 1.0), simdi)
+        time.sleep(max(0.0, min(sonraki_telemetri, sonraki_video) - time.monotonic()))
+
+    time.sleep(1.0 + gecikme_ms / 1000.0)  # Kuyruktaki son telemetri boşalsın
+    alici.stop_listening()
+    emulator.durdur()
+
+    emu = emulator.get_istatistikler()
+    metrik = alici.get_link_metrikleri()
+    tx = metrik['tx']
+    return {
+        'baud': baud,
+        'sure': sure,
+        'telemetri': f"{emu['telemetri_saglam']}/{gonderilen_telemetri}",
+        'telemetri_benzersiz': emu['telemetri_benzersiz'],
+        'telemetri_deposu': metrik['telemetri_deposu'],
+        'telemetri_bozuk': emu['telemetri_bozuk'],
+        'video_kare_s': emu['video_kare'] / sure,
+        'video_parcalama': emu['video_parcalama'] if parcali_video else None,
+        'uplink_kullanim': emu['uplink_bayt'] * 10.0 / baud / sure,
+        'downlink_kullanim': emu['downlink_bayt'] * 10.0 / baud / sure,
+        'telemetri_p99_ms': tx.get('telemetri_gecikme_p99_ms', 0.0),
+        'alinan': {kaynak: metrik['varis'][kaynak]['adet'] for kaynak in ('saha', 'iot1', 'iot2')},
+        'uretilen': emu['uretilen'],
+        'komut': f"{len(komutlar)}/{emu['uretilen']['komut']}",
+        'komut_gecikme_p99_ms': alici.get_komut_gecikmesi()['p99_ms'],
+        'iot_reddedilen': metrik['iot_reddedilen'],
+        'checksum_hatasi': metrik.get('checksum_hatasi', 0),
+        'dusurulen': tx['dusurulen'],
+        'link_tahmini': metrik['link_tahmini']['son'],
+        'emulator': emu
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PTY tabanlı XBee link emülatörü / kıyaslama")
+    parser.add_argument('--baud', type=int, nargs='+', default=[57600, 115200])
+    parser.add_argument('--sure', type=float, default=20.0, help="Kıyaslama süresi (s)")
+    parser.add_argument('--kayip', type=float, default=0.0, help="RF paket kaybı oranı (0-1)")
+    parser.add_argument('--gecikme', type=float, default=20.0, help="Hava gecikmesi (ms)")
+    parser.add_argument('--transparent', action='store_true', help="API yerine transparent mod")
+    parser.add_argument('--yakalama', metavar='KLASOR',
+                        help="Alıcının okuduğu ham akışı bu klasöre kaydet")
+    parser.add_argument('--sadece-emulator', action='store_true',
+                        help="Kıyaslama yapma, PTY'yi aç ve trafik üret (harici test için)")
+    parser.add_argument('--parcali-video', action='store_true',
+                        help="Videoyu CRC'li parçalarla gönder (send_video)")
+    parser.add_argument('--fec', type=float, metavar='ORAN',
+                        help="Parçalı video parite oranı (varsayılan VIDEO_FEC_PARITE_ORANI)")
+    parser.add_argument('--video-boyutu', type=int, default=1500, help="Video karesi boyutu (byte)")
+    parser.add_argument('--video-hz', type=float, default=4.0, help="Video kare hızı")
+    parser.add_argument('--uyarlamali-video', action='store_true',
+                        help="Video hızı/boyutu link tahmincisine göre ayarlansın")
+    parser.add_argument('--kesinti', type=float, nargs=2, metavar=('BASLANGIC', 'SURE'),
+                        help="Bu aralıkta RF linkini tamamen kes (s)")
+    args = parser.parse_args()
+
+    if args.sadece_emulator:
+        emulator = XBeeEmulator(baud=args.baud[0], kayip_orani=args.kayip,
+                                gecikme_ms=args.gecikme, api_modu=not args.transparent)
+        print(f"🔌 XBee emülatörü: {emulator.baslat()} ({args.baud[0]} baud) - CTRL+C ile durdurun")
+        try:
+            while True:
+                time.sleep(5)
+                print(f"📊 {emulator.get_istatistikler()}")
+        except KeyboardInterrupt:
+            emulator.durdur()
+        return
+
+    mod = "transparent" if args.transparent else "API"
+    print(f"🔧 XBee emülatör kıyaslaması: {mod} mod, kayıp %{args.kayip * 100:.0f}, "
+          f"gecikme {args.gecikme:.0f} ms, {args.sure:.0f} s")
+    for baud in args.baud:
+        s = kiyasla(baud, sure=args.sure, kayip_orani=args.kayip, gecikme_ms=args.gecikme,
+                    api_modu=not args.transparent, yakalama_klasoru=args.yakalama,
+                    parcali_video=args.parcali_video, fec_orani=args.fec,
+                    video_boyutu=args.video_boyutu, video_hz=args.video_hz,
+                    uyarlamali_video=args.uyarlamali_video, kesinti=args.kesinti)
+        print(f"\n📡 {baud} baud")
+        print(f"   Telemetri (sağlam/gönderilen): {s['telemetri']}, benzersiz: {s['telemetri_benzersiz']}, "
+              f"bozuk: {s['telemetri_bozuk']}, gecikme p99: {s['telemetri_p99_ms']:.1f} ms")
+        d = s['telemetri_deposu']
+        if d['eklenen']:
+            print(f"   Telemetri deposu: {d['eklenen']} eklendi, {d['gonderilen']} boşaltıldı, "
+                  f"kalan {d['derinlik']}, boşaltma süresi {d['son_bosaltma_suresi_s']} s")
+        print(f"   Video: {s['video_kare_s']:.2f} kare/s, uplink kullanımı %{s['uplink_kullanim'] * 100:.0f}, "
+              f"downlink kullanımı %{s['downlink_kullanim'] * 100:.1f}")
+        if s['video_parcalama']:
+            v = s['video_parcalama']
+            print(f"   Video parçaları: {v['tamamlanan']} kare ({v['kurtarilan']} pariteyle kurtarıldı), "
+                  f"kayıp {v['kayip_kare']}, CRC hatası {v['crc_hatasi']}")
+        print(f"   Alınan (SAHA/IoT1/IoT2): {s['alinan']} / üretilen {s['uretilen']}")
+        print(f"   Komut: {s['komut']}, gecikme p99: {s['komut_gecikme_p99_ms']:.1f} ms, "
+              f"IoT reddedilen: {s['iot_reddedilen']}, checksum hatası: {s['checksum_hatasi']}")
+        t = s['link_tahmini']
+        if t:
+            print(f"   Link tahmini: kapasite {t['kapasite_bps']:.0f} B/s, goodput {t['goodput_bps']:.0f} B/s, "
+                  f"video bütçesi {t['video_butcesi_bps']:.0f} B/s -> {t['video_fps']:.2f} FPS "
+                  f"x %{t['video_boyut_orani'] * 100:.0f}, 0x8B gecikmesi {t['durum_gecikmesi_ms']:.0f} ms, "
+                  f"atılan öğe {s['dusurulen']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+XBEE YAKALAMA TEKRAR OYNATICI - Kaydedilmiş ham seri akışı yeniden işler
+
+Yakalama dosyaları (.xbk) XBEE_YAKALAMA_KLASORU ayarı veya
+`xbee_emulator.py --yakalama KLASOR` ile oluşturulur.
+
+Hedefler:
+- ayristirici: Yalnızca GelenAkisAyristirici (ayrıştırıcı verimi, MB/s)
+- alici: BirlesikXBeeAlici._isle_ham_veri (dağıtıcı, IoT/SAHA işleme,
+  metrikler); sonuç özeti regresyon karşılaştırması için JSON olarak
+  kaydedilebilir/karşılaştırılabilir
+
+--iot-analiz: Kayıttaki 16 byte'lık IoT paketlerini toplayıp tek vektörel
+geçişte çözer (NumPy), istasyon başına özet basar / CSV'ye yazar
+
+Kullanım:
+    python3 xbee_tekrar_oynat.py kayitlar/xbee_yakalama_20261017_120000.xbk
+    python3 xbee_tekrar_oynat.py kayit.xbk --hedef ayristirici --tekrar 5
+    python3 xbee_tekrar_oynat.py kayit.xbk --gercek-hiz --hiz-carpani 4
+    python3 xbee_tekrar_oynat.py kayit.xbk --ozet-kaydet beklenen.json
+    python3 xbee_tekrar_oynat.py kayit.xbk --beklenen beklenen.json   # fark varsa çıkış kodu 1
+    python3 xbee_tekrar_oynat.py kayit.xbk --iot-analiz iot.csv
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from moduller.xbee_api import GelenAkisAyristirici, RxCercevesi
+from moduller.iot_paketi import iot_paketlerini_coz, IOT_PAKET_BOYUTU, IOT_ISTASYONLARI
+from moduller.xbee_yakalama import YakalamaOkuyucu, tekrar_oynat
+
+
+def ayristiriciya_oynat(okuyucu, hizli=True, hiz_carpani=1.0):
+    """Yalnızca ayrıştırıcı: mesaj sayıları + ayrıştırıcı sayaçları"""
+    ayristirici = GelenAkisAyristirici()
+    sayac = {}
+
+    def besle(veri):
+        for mesaj in ayristirici.besle(veri):
+            tip = 'metin' if isinstance(mesaj, str) else f"0x{mesaj.TIP:02X}"
+            sayac[tip] = sayac.get(tip, 0) + 1
+
+    istatistik = tekrar_oynat(okuyucu, besle, hizli=hizli, hiz_carpani=hiz_carpani)
+    ozet = {
+        'mesajlar': dict(sorted(sayac.items())),
+        'ayristirici': ayristirici.api_cozucu.get_istatistikler(),
+        'metin_tasma': ayristirici.metin_tasma_sayisi
+    }
+    return istatistik, ozet
+
+
+def aliciya_oynat(okuyucu, hizli=True, hiz_carpani=1.0):
+    """Tam alıcı yolu: seri port olmadan BirlesikXBeeAlici'ye besler"""
+    from moduller.birlesik_xbee_alici import BirlesikXBeeAlici
+
+    komutlar = []
+    alici = BirlesikXBeeAlici(command_callback=komutlar.append, debug=False, simulate=True)
+
+    def besle(veri):
+        alici._okuma_referansi = time.monotonic()
+        alici._isle_ham_veri(veri)
+
+    istatistik = tekrar_oynat(okuyucu, besle, hizli=hizli, hiz_carpani=hiz_carpani)
+    metrik = alici.metrikler.snapshot()
+    goruntu = alici.get_anlik_goruntu()
+    ozet = {
+        'cerceveler': dict(sorted(metrik['cerceveler'].items())),
+        'iot_reddedilen': dict(sorted(metrik['iot_reddedilen'].items())),
+        'varis': {kaynak: h['adet'] for kaynak, h in metrik['varis'].items()},
+        'checksum_hatasi': metrik['checksum_hatasi'],
+        'senkron_kaybi': metrik['senkron_kaybi'],
+        'tasma_api': metrik['tasma_api'],
+        'tasma_metin': metrik['tasma_metin'],
+        'komutlar': len(komutlar),
+        'dagitici': alici.dagitici.get_istatistikler(),
+        'son_basinc2': goruntu.basinc2,
+        'son_iot': [goruntu.iot1_sicaklik, goruntu.iot2_sicaklik]
+    }
+    return istatistik, ozet
+
+
+def iot_analizi(okuyucu, csv_yolu=None):
+    """Kayıttaki 0x90 payload'larından IoT paketlerini toplayıp toplu çözer"""
+    ayristirici = GelenAkisAyristirici()
+    blob = bytearray()
+    for _, veri in okuyucu:
+        for mesaj in ayristirici.besle(veri):
+            if isinstance(mesaj, RxCercevesi) and len(mesaj.veri) == IOT_PAKET_BOYUTU:
+                blob += mesaj.veri
+
+    sonuc = iot_paketlerini_coz(bytes(blob))
+    gecerli = ~sonuc['gecersiz']
+    print(f"🌡️ IoT paketleri: {len(sonuc['gecersiz'])}, geçersiz {int(sonuc['gecersiz'].sum())}")
+    for istasyon in IOT_ISTASYONLARI:
+        secim = gecerli & (sonuc['istasyon'] == istasyon)
+        if not secim.any():
+            print(f"   IoT{istasyon}: paket yok")
+            continue
+        sicaklik = sonuc['sicaklik'][secim]
+        paket_no = sonuc['paket_no'][secim]
+        eksik = int(paket_no.max()) - int(paket_no.min()) + 1 - len(set(paket_no.tolist()))
+        print(f"   IoT{istasyon}: {int(secim.sum())} paket, {sicaklik.min():.1f}..{sicaklik.max():.1f}°C "
+              f"(ort. {sicaklik.mean():.2f}), eksik paket no: {eksik}")
+
+    if csv_yolu:
+        with open(csv_yolu, 'w', encoding='utf-8') as f:
+            f.write("istasyon,paket_no,sicaklik,pil,zaman_damgasi,gecersiz\n")
+            for satir in zip(sonuc['istasyon'].tolist(), sonuc['paket_no'].tolist(),
+                             sonuc['sicaklik'].tolist(), sonuc['pil'].tolist(),
+                             sonuc['zaman_damgasi'].tolist(), sonuc['gecersiz'].tolist()):
+                f.write(f"{satir[0]},{satir[1]},{satir[2]:.2f},{satir[3]},{satir[4]},{int(satir[5])}\n")
+        print(f"💾 IoT CSV kaydedildi: {csv_yolu}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="XBee yakalama dosyasını tekrar oynat")
+    parser.add_argument('dosya', help="Yakalama dosyası (.xbk)")
+    parser.add_argument('--hedef', choices=('alici', 'ayristirici'), default='alici')
+    parser.add_argument('--gercek-hiz', action='store_true', help="Kayıttaki zamanlamayla oynat")
+    parser.add_argument('--hiz-carpani', type=float, default=1.0)
+    parser.add_argument('--tekrar', type=int, default=1, help="Verim ölçümü için tekrar sayısı")
+    parser.add_argument('--ozet-kaydet', metavar='JSON', help="Sonuç özetini dosyaya yaz")
+    parser.add_argument('--beklenen', metavar='JSON', help="Sonuç özetini bununla karşılaştır")
+    parser.add_argument('--iot-analiz', metavar='CSV', nargs='?', const='',
+                        help="IoT paketlerini toplu çöz (isteğe bağlı CSV çıktısı)")
+    args = parser.parse_args()
+
+    okuyucu = YakalamaOkuyucu(args.dosya)
+    toplam_bayt = sum(len(veri) for _, veri in okuyucu)
+    print(f"📼 {args.dosya}: {len(okuyucu)} kayıt, {toplam_bayt} byte, {okuyucu.sure:.1f} s "
+          f"(başlangıç {time.strftime('%d/%m/%Y %H:%M:%S', time.localtime(okuyucu.baslangic_zamani))})")
+
+    if args.iot_analiz is not None:
+        iot_analizi(okuyucu, args.iot_analiz or None)
+        return
+
+    oynat = aliciya_oynat if args.hedef == 'alici' else ayristiriciya_oynat
+    en_iyi = None
+    ozet = None
+    for _ in range(max(1, args.tekrar)):
+        istatistik, yeni_ozet = oynat(okuyucu, hizli=not args.gercek_hiz, hiz_carpani=args.hiz_carpani)
+        if ozet is not None and yeni_ozet != ozet:
+            print("⚠️ Tekrar oynatma deterministik değil!")
+        ozet = yeni_ozet
+        if en_iyi is None or istatistik['mb_s'] > en_iyi['mb_s']:
+            en_iyi = istatistik
+
+    print(f"⏩ Hedef: {args.hedef}, {en_iyi['kayit']} kayıt, {en_iyi['sure_s'] * 1000:.1f} ms, "
+          f"{en_iyi['mb_s']:.2f} MB/s")
+    print(json.dumps(ozet, ensure_ascii=False, indent=2))
+
+    if args.ozet_kaydet:
+        with open(args.ozet_kaydet, 'w', encoding='utf-8') as f:
+            json.dump(ozet, f, ensure_ascii=False, indent=2)
+        print(f"💾 Özet kaydedildi: {args.ozet_kaydet}")
+
+    if args.beklenen:
+        with open(args.beklenen, encoding='utf-8') as f:
+            beklenen = json.load(f)
+        # JSON gidiş-dönüşü (tuple -> list vb.) sonrası karşılaştır
+        ozet = json.loads(json.dumps(ozet))
+        farklar = {k: (beklenen.get(k), ozet.get(k)) for k in set(beklenen) | set(ozet)
+                   if beklenen.get(k) != ozet.get(k)}
+        if farklar:
+            print("❌ Regresyon: beklenen özetten farklı alanlar")
+            for alan, (eski, yeni) in sorted(farklar.items()):
+                print(f"   {alan}: {eski} -> {yeni}")
+            sys.exit(1)
+        print("✅ Özet beklenenle aynı")
+
+
+if __name__ == "__main__":
+    main()